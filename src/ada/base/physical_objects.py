@@ -255,6 +255,18 @@ class BackendGeom(Root):
     @placement.setter
     def placement(self, value: Placement):
         self._placement = value
+        self._mark_modified()
+
+    def _mark_modified(self) -> None:
+        """Flag a change of this object to the part it belongs to, which keeps track of changes for IFC and cache"""
+        from ada.base.changes import ChangeAction
+
+        if self.change_type in (ChangeAction.NOCHANGE, ChangeAction.NOTDEFINED):
+            self.change_type = ChangeAction.MODIFIED
+
+        mark_cache_dirty = getattr(self.parent, "mark_cache_dirty", None)
+        if mark_cache_dirty is not None:
+            mark_cache_dirty()
 
     def _repr_html_(self):
         from ada.config import Settings
@@ -55,6 +55,19 @@ class Root:
 
         self._name = value.strip()
 
+    @property
+    def change_type(self) -> ChangeAction:
+        return self._change_type
+
+    @change_type.setter
+    def change_type(self, value: ChangeAction):
+        self._change_type = value
+
+        # Objects in a Part are recorded in its change journal, which is consumed by IfcStore.sync
+        record_change = getattr(self.parent, "record_change", None)
+        if record_change is not None:
+            record_change(self)
+
     @property
     def guid(self):
         return self._guid
@@ -114,6 +127,9 @@ class Root:
             logging.error(f"Unable to delete {self.name} as it does not have a parent")
             return
 
+        if isinstance(self.parent, Part):
+            self.parent.discard_change(self)
+
         if issubclass(type(self), Part):
             self.parent.parts.pop(self.name)
         elif issubclass(type(self), Shape):
@@ -2,16 +2,48 @@ import json
 import logging
 
 import h5py
-
-from ada import Beam, Material, Section
+import numpy as np
+
+from ada import (
+    Beam,
+    Material,
+    Pipe,
+    Plate,
+    PrimBox,
+    PrimCyl,
+    PrimExtrude,
+    PrimRevolve,
+    PrimSphere,
+    Section,
+    Shape,
+    Wall,
+)
 from ada.concepts.containers import Beams, Materials, Nodes, Sections
-from ada.concepts.points import Node
 from ada.concepts.spatial import Assembly, Part
-from ada.fem import FEM, Elem
-from ada.fem.containers import FemElements
+from ada.concepts.transforms import Placement
+from ada.fem import (
+    FEM,
+    Bc,
+    Connector,
+    ConnectorSection,
+    Constraint,
+    Csys,
+    Elem,
+    FemSection,
+    FemSet,
+    Load,
+    LoadGravity,
+    LoadPoint,
+    Mass,
+    StepEigen,
+    StepExplicit,
+    StepImplicit,
+)
+from ada.fem.containers import FemElements, FemSections, FemSets
+from ada.fem.steps import StepEigenComplex
 from ada.materials.metals import CarbonSteel
 
-from .utils import from_safe_name, str_fix
+from .utils import from_safe_name, get_ragged_from_cache, str_fix
 
 
 def read_assembly_from_cache(h5_filename, assembly=None):
@@ -20,7 +52,11 @@ def read_assembly_from_cache(h5_filename, assembly=None):
     with h5py.File(h5_filename, "r") as f:
         info = f["INFO"].attrs
         a = Assembly(info["NAME"]) if assembly is None else assembly
+        meta_str = info.get("METADATA")
+        if meta_str is not None:
+            a.metadata.update(json.loads(meta_str))
         walk_parts(f.get("PARTS"), a)
+        get_part_content_from_cache(f["INFO"], a)
 
     return a
 
@@ -44,10 +80,12 @@ def get_part_from_cache(name, part_cache):
         metadata = json.loads(meta_str)
 
     p = Part(name, metadata=metadata)
-    fem = part_cache.get("FEM")
-    if fem is not None:
-        p._fem = get_fem_from_cache(fem)
+    get_part_content_from_cache(part_cache, p)
 
+    return p
+
+
+def get_part_content_from_cache(part_cache, p: Part):
     node_group = part_cache.get("NODES")
     if node_group is not None:
         p._nodes = get_nodes_from_cache(node_group, p)
@@ -64,7 +102,22 @@ def get_part_from_cache(name, part_cache):
     if beams is not None:
         p._beams = beams
 
-    return p
+    for pl in get_plates_from_cache(part_cache, p):
+        p.add_plate(pl)
+
+    for pipe in get_pipes_from_cache(part_cache, p):
+        p.add_pipe(pipe)
+
+    for wall in get_walls_from_cache(part_cache):
+        p.add_wall(wall)
+
+    for shp in get_shapes_from_cache(part_cache, p):
+        p.add_shape(shp)
+
+    # FEM sections refer to the materials and sections of the part, so the FEM is read last
+    fem = part_cache.get("FEM")
+    if fem is not None:
+        p._fem = get_fem_from_cache(fem, p)
 
 
 def get_beams_from_cache(part_cache, parent: Part):
@@ -90,6 +143,132 @@ def get_beams_from_cache(part_cache, parent: Part):
     return Beams([bm_from_cache(bm_str, bm_int, bm_up) for bm_str, bm_int, bm_up in bm_zip], parent=parent)
 
 
+def get_plates_from_cache(part_cache, parent: Part):
+    prefix = "PLATES"
+    pl_str = part_cache.get(f"{prefix}_STR")
+    if pl_str is None:
+        return []
+
+    pl_float = part_cache[f"{prefix}_FLOAT"][()]
+    pl_points = get_ragged_from_cache(part_cache, f"{prefix}_POINTS")
+
+    def pl_from_cache(str_row, float_row, points):
+        guid, name, mat_name, meta_str = str_fix(str_row)
+        t, offset, opacity = float_row[:3]
+        return Plate(
+            name,
+            floats_to_points2d(points),
+            t,
+            mat=parent.materials.get_by_name(mat_name),
+            placement=floats_to_placement(float_row[6:15]),
+            offset=None if np.isnan(offset) else offset,
+            colour=floats_to_colour(float_row[3:6]),
+            opacity=opacity,
+            metadata=json.loads(meta_str),
+            guid=guid,
+            parent=parent,
+        )
+
+    return [pl_from_cache(*row) for row in zip(pl_str, pl_float, pl_points)]
+
+
+def get_pipes_from_cache(part_cache, parent: Part):
+    prefix = "PIPES"
+    pipe_str = part_cache.get(f"{prefix}_STR")
+    if pipe_str is None:
+        return []
+
+    pipe_float = part_cache[f"{prefix}_FLOAT"][()]
+    pipe_points = get_ragged_from_cache(part_cache, f"{prefix}_POINTS")
+
+    def pipe_from_cache(str_row, float_row, points):
+        guid, name, sec_name, mat_name, meta_str = str_fix(str_row)
+        return Pipe(
+            name,
+            [tuple(p) for p in points],
+            sec=parent.sections.get_by_name(sec_name),
+            mat=parent.materials.get_by_name(mat_name),
+            metadata=json.loads(meta_str),
+            colour=floats_to_colour(float_row),
+            guid=guid,
+        )
+
+    return [pipe_from_cache(*row) for row in zip(pipe_str, pipe_float, pipe_points)]
+
+
+def get_walls_from_cache(part_cache):
+    prefix = "WALLS"
+    wall_str = part_cache.get(f"{prefix}_STR")
+    if wall_str is None:
+        return []
+
+    wall_float = part_cache[f"{prefix}_FLOAT"][()]
+    wall_points = get_ragged_from_cache(part_cache, f"{prefix}_POINTS")
+
+    def wall_from_cache(str_row, float_row, points):
+        guid, name, meta_str = str_fix(str_row)
+        height, thickness, offset, opacity = float_row[:4]
+        return Wall(
+            name,
+            [tuple(p) for p in points],
+            height,
+            thickness,
+            placement=floats_to_placement(float_row[7:16]),
+            offset=float(offset),
+            metadata=json.loads(meta_str),
+            colour=floats_to_colour(float_row[4:7]),
+            guid=guid,
+            opacity=opacity,
+        )
+
+    return [wall_from_cache(*row) for row in zip(wall_str, wall_float, wall_points)]
+
+
+def get_shapes_from_cache(part_cache, parent: Part):
+    prefix = "SHAPES"
+    shp_str = part_cache.get(f"{prefix}_STR")
+    if shp_str is None:
+        return []
+
+    shp_float = part_cache[f"{prefix}_FLOAT"][()]
+    shp_params = get_ragged_from_cache(part_cache, f"{prefix}_PARAMS")
+    shp_points = get_ragged_from_cache(part_cache, f"{prefix}_POINTS")
+
+    def shp_from_cache(str_row, float_row, params, points):
+        guid, name, shp_type, mat_name, meta_str, brep = str_fix(str_row)
+        opacity, mass = float_row[:2]
+        cog = None if np.isnan(float_row[2]) else tuple(float_row[2:5])
+        props = dict(
+            colour=floats_to_colour(float_row[5:8]),
+            opacity=opacity,
+            mass=None if np.isnan(mass) else mass,
+            metadata=json.loads(meta_str),
+            guid=guid,
+            material=parent.materials.get_by_name(mat_name) if mat_name != "" else None,
+        )
+
+        if shp_type == "PrimBox":
+            return PrimBox(name, tuple(params[:3]), tuple(params[3:6]), cog=cog, **props)
+        elif shp_type == "PrimSphere":
+            return PrimSphere(name, tuple(params[:3]), params[3], **props)
+        elif shp_type == "PrimCyl":
+            return PrimCyl(name, params[:3], params[3:6], params[6], cog=cog, **props)
+        elif shp_type in ("PrimExtrude", "PrimRevolve"):
+            pl = floats_to_placement(params[1:10])
+            points2d = floats_to_points2d(points)
+            if shp_type == "PrimExtrude":
+                return PrimExtrude(name, points2d, params[0], pl.zdir, pl.origin, pl.xdir, cog=cog, **props)
+            return PrimRevolve(name, points2d, pl.origin, pl.xdir, pl.zdir, params[0], cog=cog, **props)
+
+        from OCC.Core.BRepTools import BRepTools_ShapeSet
+
+        ss = BRepTools_ShapeSet()
+        ss.ReadFromString(brep)
+        return Shape(name, ss.Shape(ss.NbShapes()), cog=cog, **props)
+
+    return [shp_from_cache(*row) for row in zip(shp_str, shp_float, shp_params, shp_points)]
+
+
 def get_sections_from_cache(part_cache, parent):
     sections_str = part_cache.get("SECTIONS_STR")
     sections_int = part_cache.get("SECTIONS_INT")
@@ -142,20 +321,310 @@ def get_materials_from_cache(part_cache, parent):
     return Materials([mat_from_list(mat_int, mat_str) for mat_int, mat_str in zip(mat_int, mat_str)], parent=parent)
 
 
-def get_fem_from_cache(cache_fem):
+def get_fem_from_cache(cache_fem, parent: Part = None):
     node_groups = cache_fem["NODES"]
-    fem = FEM(cache_fem.attrs["NAME"])
+    meta_str = cache_fem.attrs.get("METADATA")
+    fem = FEM(cache_fem.attrs["NAME"], parent=parent)
+    if meta_str is not None:
+        fem.metadata = json.loads(meta_str)
+
     fem.nodes = get_nodes_from_cache(node_groups, fem)
-    elements = []
-    for eltype, mesh in cache_fem["MESH"].items():
-        el_ids = mesh["ELEMENTS"][()]
-        elements += [Elem(el_id[0], [fem.nodes.from_id(eli) for eli in el_id[1:]], eltype) for el_id in el_ids]
-    fem.elements = FemElements(elements, fem)
+    elements = get_elements_from_cache(cache_fem["MESH"], fem)
+    masses = get_masses_from_cache(cache_fem, fem)
+    fem.connector_sections = {cs.name: cs for cs in get_connector_sections_from_cache(cache_fem, fem)}
+    connectors = get_connectors_from_cache(cache_fem, fem)
+    fem.elements = FemElements(elements + masses + connectors, fem)
+
+    fem_sets = get_fem_sets_from_cache(cache_fem, fem)
+    fem.sets = FemSets(fem_sets, parent=fem)
+    mass_set_indices = cache_fem["MASSES_INT"][:, 1] if len(masses) > 0 else []
+    for mass, set_index in zip(masses, mass_set_indices):
+        if set_index != -1:
+            mass.elset = fem_sets[set_index]
+
+    fem_sections = get_fem_sections_from_cache(cache_fem, fem, fem_sets, parent)
+    fem.sections = FemSections(fem_sections)
+    fem.sections.parent = fem
+    [fem_sec.link_elements() for fem_sec in fem_sections]
+
+    fem.bcs = get_bcs_from_cache(cache_fem, fem, fem_sets)
+    fem.constraints = {con.name: con for con in get_constraints_from_cache(cache_fem, fem, fem_sets)}
+    fem.steps = get_steps_from_cache(cache_fem, fem, fem_sets)
 
     return fem
 
 
+def get_elements_from_cache(mesh_group, fem: FEM):
+    """Build the elements of all element types in order of element id. Node lookups are vectorized per type"""
+    el_ids, el_types, el_nodes = [], [], []
+    for eltype, mesh in mesh_group.items():
+        elements = mesh["ELEMENTS"][()].astype(np.int64)
+        el_ids.append(elements[:, 0])
+        el_types += [eltype] * len(elements)
+        el_nodes += fem.nodes.from_ids(elements[:, 1:]).tolist()
+
+    if len(el_ids) == 0:
+        return []
+
+    el_ids = np.concatenate(el_ids)
+    id_list = el_ids.tolist()
+    return [Elem(id_list[i], el_nodes[i], el_types[i], parent=fem) for i in np.argsort(el_ids, kind="stable").tolist()]
+
+
+def get_fem_sets_from_cache(cache_fem, fem: FEM):
+    prefix = "SETS"
+    sets_str = cache_fem.get(f"{prefix}_STR")
+    if sets_str is None:
+        return []
+
+    members = get_ragged_from_cache(cache_fem, f"{prefix}_MEMBERS")
+
+    def set_from_cache(set_str, set_members):
+        name, set_type, meta_str = str_fix(set_str)
+        container = fem.nodes if set_type == FemSet.TYPES.NSET else fem.elements
+        set_members = [container.from_id(m) for m in set_members.tolist()]
+        return FemSet(name, set_members, set_type, metadata=json.loads(meta_str), parent=fem)
+
+    return [set_from_cache(set_str, set_members) for set_str, set_members in zip(sets_str, members)]
+
+
+def get_masses_from_cache(cache_fem, fem: FEM):
+    prefix = "MASSES"
+    mass_str = cache_fem.get(f"{prefix}_STR")
+    if mass_str is None:
+        return []
+
+    mass_int = cache_fem[f"{prefix}_INT"][()]
+    members = get_ragged_from_cache(cache_fem, f"{prefix}_MEMBERS")
+    values = get_ragged_from_cache(cache_fem, f"{prefix}_VALUES")
+
+    def mass_from_cache(str_row, int_row, mass_members, mass_values):
+        name, mass_type, ptype, units, meta_str = str_fix(str_row)
+        return Mass(
+            name,
+            [fem.nodes.from_id(nid) for nid in mass_members.tolist()],
+            mass_values.tolist(),
+            mass_type=mass_type,
+            ptype=ptype if ptype != "" else None,
+            mass_id=int(int_row[0]),
+            units=units if units != "" else None,
+            metadata=json.loads(meta_str),
+            parent=fem,
+        )
+
+    return [mass_from_cache(*row) for row in zip(mass_str, mass_int, members, values)]
+
+
+def get_fem_sections_from_cache(cache_fem, fem: FEM, fem_sets, parent: Part):
+    prefix = "FEM_SECTIONS"
+    sec_str = cache_fem.get(f"{prefix}_STR")
+    if sec_str is None:
+        return []
+
+    sec_int = cache_fem[f"{prefix}_INT"][()]
+    sec_float = cache_fem[f"{prefix}_FLOAT"][()]
+
+    def fem_sec_from_cache(str_row, int_row, float_row):
+        name, sec_type, mat_name, sec_name, meta_str = str_fix(str_row)
+        sec_id, set_index, int_points, is_rigid = int_row
+        thickness = float_row[0]
+        return FemSection(
+            name,
+            sec_type,
+            fem_sets[set_index],
+            parent.materials.get_by_name(mat_name),
+            section=parent.sections.get_by_name(sec_name) if sec_name != "" else None,
+            local_z=float_row[1:4],
+            local_y=float_row[4:7],
+            thickness=None if np.isnan(thickness) else thickness,
+            int_points=int(int_points),
+            metadata=json.loads(meta_str),
+            parent=fem,
+            sec_id=int(sec_id),
+            is_rigid=bool(is_rigid),
+        )
+
+    return [fem_sec_from_cache(*row) for row in zip(sec_str, sec_int, sec_float)]
+
+
+def get_connector_sections_from_cache(cache_fem, fem: FEM):
+    prefix = "CONNECTOR_SECTIONS"
+    con_sec_str = cache_fem.get(f"{prefix}_STR")
+    if con_sec_str is None:
+        return []
+
+    def con_sec_from_cache(str_row):
+        name, components, meta_str = str_fix(str_row)
+        elastic_comp, damping_comp, plastic_comp, rigid_dofs, soft_elastic_dofs = json.loads(components)
+        return ConnectorSection(
+            name,
+            elastic_comp=elastic_comp,
+            damping_comp=damping_comp,
+            plastic_comp=plastic_comp,
+            rigid_dofs=rigid_dofs,
+            soft_elastic_dofs=soft_elastic_dofs,
+            metadata=json.loads(meta_str),
+            parent=fem,
+        )
+
+    return [con_sec_from_cache(str_row) for str_row in con_sec_str]
+
+
+def get_connectors_from_cache(cache_fem, fem: FEM):
+    prefix = "CONNECTORS"
+    con_str = cache_fem.get(f"{prefix}_STR")
+    if con_str is None:
+        return []
+
+    con_int = cache_fem[f"{prefix}_INT"][()]
+
+    def csys_from_cache(csys_data: dict):
+        nodes = csys_data["nodes"]
+        return Csys(
+            csys_data["name"],
+            definition=csys_data["definition"],
+            system=csys_data["system"],
+            nodes=[fem.nodes.from_id(nid) for nid in nodes] if nodes is not None else None,
+            coords=csys_data["coords"],
+            parent=fem,
+        )
+
+    def con_from_cache(str_row, int_row):
+        name, con_type, con_sec_name, preload, csys_str, meta_str = str_fix(str_row)
+        el_id, n1, n2 = int_row.tolist()
+        return Connector(
+            name,
+            el_id,
+            fem.nodes.from_id(n1),
+            fem.nodes.from_id(n2),
+            con_type,
+            fem.connector_sections[con_sec_name],
+            preload=json.loads(preload),
+            csys=csys_from_cache(json.loads(csys_str)),
+            metadata=json.loads(meta_str),
+            parent=fem,
+        )
+
+    return [con_from_cache(*row) for row in zip(con_str, con_int)]
+
+
+def get_steps_from_cache(cache_fem, fem: FEM, fem_sets):
+    prefix = "STEPS"
+    steps_str = cache_fem.get(f"{prefix}_STR")
+    if steps_str is None:
+        return []
+
+    step_types = {cls.__name__: cls for cls in (StepImplicit, StepEigen, StepEigenComplex, StepExplicit)}
+
+    def step_from_cache(str_row):
+        name, step_type, params, meta_str = str_fix(str_row)
+        return step_types[step_type](name, metadata=json.loads(meta_str), parent=fem, **json.loads(params))
+
+    steps = [step_from_cache(str_row) for str_row in steps_str]
+
+    step_bcs = get_bcs_from_cache(cache_fem, fem, fem_sets, prefix="STEP_BCS")
+    if len(step_bcs) > 0:
+        for step_index, bc in zip(cache_fem["STEP_BCS_STEP"][()].tolist(), step_bcs):
+            steps[step_index].add_bc(bc)
+
+    for step_index, load in get_loads_from_cache(cache_fem, fem_sets):
+        steps[step_index].add_load(load)
+
+    return steps
+
+
+def get_loads_from_cache(cache_fem, fem_sets):
+    prefix = "LOADS"
+    loads_str = cache_fem.get(f"{prefix}_STR")
+    if loads_str is None:
+        return []
+
+    loads_int = cache_fem[f"{prefix}_INT"][()]
+    loads_float = cache_fem[f"{prefix}_FLOAT"][()]
+    dofs = get_ragged_from_cache(cache_fem, f"{prefix}_DOFS")
+
+    def load_from_cache(str_row, int_row, magnitude, load_dofs):
+        name, load_class, load_type, meta_str = str_fix(str_row)
+        step_index, set_index, follower_force = int_row.tolist()
+        fem_set = fem_sets[set_index] if set_index != -1 else None
+        dof = [None if np.isnan(x) else x for x in load_dofs.tolist()] if len(load_dofs) > 0 else None
+        magnitude = float(magnitude)
+        if load_class == LoadGravity.__name__:
+            load = LoadGravity(name, magnitude)
+        elif load_class == LoadPoint.__name__:
+            load = LoadPoint(name, magnitude, fem_set, dof, follower_force=bool(follower_force))
+        else:
+            load = Load(name, load_type, magnitude, fem_set, dof, follower_force=bool(follower_force))
+        load.metadata.update(json.loads(meta_str))
+        return step_index, load
+
+    return [load_from_cache(*row) for row in zip(loads_str, loads_int, loads_float, dofs)]
+
+
+def get_bcs_from_cache(cache_fem, fem: FEM, fem_sets, prefix="BCS"):
+    bcs_str = cache_fem.get(f"{prefix}_STR")
+    if bcs_str is None:
+        return []
+
+    bcs_int = cache_fem[f"{prefix}_INT"][()]
+    dofs = get_ragged_from_cache(cache_fem, f"{prefix}_DOFS")
+    magnitudes = get_ragged_from_cache(cache_fem, f"{prefix}_MAGNITUDES")
+
+    def bc_from_cache(str_row, set_index, bc_dofs, bc_magnitudes):
+        name, bc_type, meta_str = str_fix(str_row)
+        return Bc(
+            name,
+            fem_sets[set_index],
+            bc_dofs.tolist(),
+            magnitudes=[None if np.isnan(m) else m for m in bc_magnitudes.tolist()],
+            bc_type=bc_type,
+            metadata=json.loads(meta_str),
+            parent=fem,
+        )
+
+    return [bc_from_cache(*row) for row in zip(bcs_str, bcs_int, dofs, magnitudes)]
+
+
+def get_constraints_from_cache(cache_fem, fem: FEM, fem_sets):
+    prefix = "CONSTRAINTS"
+    con_str = cache_fem.get(f"{prefix}_STR")
+    if con_str is None:
+        return []
+
+    con_int = cache_fem[f"{prefix}_INT"][()]
+    con_float = cache_fem[f"{prefix}_FLOAT"][()]
+    dofs = get_ragged_from_cache(cache_fem, f"{prefix}_DOFS")
+
+    def con_from_cache(str_row, int_row, float_row, con_dofs):
+        name, con_type, mpc_type, meta_str = str_fix(str_row)
+        pos_tol, influence_distance = [None if np.isnan(x) else x for x in float_row]
+        return Constraint(
+            name,
+            con_type,
+            fem_sets[int_row[0]],
+            fem_sets[int_row[1]],
+            dofs=con_dofs.tolist(),
+            pos_tol=pos_tol,
+            mpc_type=mpc_type if mpc_type != "" else None,
+            parent=fem,
+            metadata=json.loads(meta_str),
+            influence_distance=influence_distance,
+        )
+
+    return [con_from_cache(*row) for row in zip(con_str, con_int, con_float, dofs)]
+
+
 def get_nodes_from_cache(node_group, parent):
-    points_in = node_group[()]
-    points = [Node(n[1:], n[0]) for n in points_in]
-    return Nodes(points, parent=parent)
+    return Nodes(from_np_array=node_group[()], parent=parent)
+
+
+def floats_to_colour(values):
+    return None if np.isnan(values[0]) else tuple(values.tolist())
+
+
+def floats_to_placement(values) -> Placement:
+    return Placement(values[:3], xdir=values[3:6], zdir=values[6:9])
+
+
+def floats_to_points2d(values):
+    return [tuple(p[:2]) if np.isnan(p[2]) else tuple(p) for p in values.tolist()]
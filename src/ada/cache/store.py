@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
@@ -13,6 +14,11 @@ if TYPE_CHECKING:
 
 @dataclass
 class CacheStore:
+    """Keeps an HDF5 cache of an Assembly up to date with its source files.
+
+    A cache entry is keyed on the content hash of each source file together with the ada version and settings. File
+    modification times are only used to skip re-hashing of unchanged files."""
+
     name: str
     state_file: pathlib.Path = field(default=None)
     cache_file: pathlib.Path = field(default=None)
@@ -52,23 +58,26 @@ class CacheStore:
         if state_file.exists() is True:
             with open(state_file, "r") as f:
                 state = json.load(f)
-                return state
-        return dict()
+                if "files" in state.keys():
+                    return state
+        return dict(files=dict())
+
+    def _write_file_state(self, state: dict):
+        os.makedirs(self.state_file.parent, exist_ok=True)
+        with open(self.state_file, "w") as f:
+            json.dump(state, f, indent=4)
 
     def _update_file_state(self, input_file=None):
         in_file = pathlib.Path(input_file)
-        fna = in_file.name
-        last_modified = os.path.getmtime(in_file)
-        state_file = self.state_file
         state = self._get_file_state()
+        state["files"][in_file.name] = dict(fp=str(in_file), hash=get_file_hash(in_file), **get_file_stat(in_file))
+        state.update(get_environment_state())
+        self._write_file_state(state)
 
-        state.get(fna, dict())
-        state[fna] = dict(lm=last_modified, fp=str(in_file))
-
-        os.makedirs(state_file.parent, exist_ok=True)
-
-        with open(state_file, "w") as f:
-            json.dump(state, f, indent=4)
+    def is_environment_changed(self) -> bool:
+        """True if the ada version or settings differ from the ones used when the cache was written"""
+        state = self._get_file_state()
+        return any(state.get(key, None) != value for key, value in get_environment_state().items())
 
     def to_cache(self, assembly: Assembly, input_file, write_to_cache: bool):
         self._update_file_state(input_file)
@@ -79,36 +88,113 @@ class CacheStore:
         from ada.cache.reader import read_assembly_from_cache
 
         read_assembly_from_cache(self.cache_file, assembly)
+        for part in assembly.get_all_parts_in_assembly(True):
+            part.mark_cache_clean()
+
+        self._cache_loaded = True
         print(f"Finished Loading model from cache {self.cache_file}")
 
     def update_cache(self, assembly: Assembly):
-        from ada.cache.writer import write_assembly_to_cache
+        """Write the assembly to the cache. If the cache is valid for the current environment, only the parts that
+        have changed since they were last written to or read from the cache are rewritten"""
+        from ada.cache.writer import (
+            check_assembly_is_cacheable,
+            update_assembly_in_cache,
+            write_assembly_to_cache,
+        )
+
+        try:
+            check_assembly_is_cacheable(assembly)
+        except ValueError as e:
+            logging.warning(f"Model is not cached. {e}")
+            if self.cache_file.exists():
+                os.remove(self.cache_file)
+            return
+
+        if self.cache_file.exists() and self.is_environment_changed() is False:
+            update_assembly_in_cache(assembly, self.cache_file)
+        else:
+            write_assembly_to_cache(assembly, self.cache_file)
 
-        write_assembly_to_cache(assembly, self.cache_file)
+        for part in assembly.get_all_parts_in_assembly(True):
+            part.mark_cache_clean()
+
+        state = self._get_file_state()
+        state.update(get_environment_state())
+        self._write_file_state(state)
 
     def is_cache_outdated(self, input_file=None):
         is_cache_outdated = False
         state = self._get_file_state()
+        is_state_modified = False
 
-        for name, props in state.items():
+        for name, props in state["files"].items():
             in_file = pathlib.Path(props.get("fp"))
-            last_modified_state = props.get("lm")
             if in_file.exists() is False:
                 is_cache_outdated = True
                 break
 
-            last_modified = os.path.getmtime(in_file)
-            if last_modified != last_modified_state:
+            file_stat = get_file_stat(in_file)
+            if all(props.get(key) == value for key, value in file_stat.items()):
+                continue
+
+            # The file was touched. Only a change of content invalidates the cache
+            if get_file_hash(in_file) != props.get("hash"):
                 is_cache_outdated = True
                 break
 
+            props.update(file_stat)
+            is_state_modified = True
+
+        if is_state_modified and is_cache_outdated is False:
+            self._write_file_state(state)
+
+        if self.is_environment_changed():
+            logging.debug("Cache was written by a different ada version or using different settings")
+            is_cache_outdated = True
+
         if self.cache_file.exists() is False:
             logging.debug("Cache file not found")
             is_cache_outdated = True
 
         if input_file is not None:
             curr_in_file = pathlib.Path(input_file)
-            if curr_in_file.name not in state.keys():
+            if curr_in_file.name not in state["files"].keys():
                 is_cache_outdated = True
 
         return is_cache_outdated
+
+
+def get_file_hash(file_path: os.PathLike, chunk_size: int = 2**20) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_file_stat(file_path: os.PathLike) -> dict:
+    stat = os.stat(file_path)
+    return dict(lm=stat.st_mtime, size=stat.st_size)
+
+
+def get_environment_state() -> dict:
+    """Returns the ada version and a hash of the settings that affect the content of a cached model"""
+    from importlib.metadata import PackageNotFoundError
+
+    from ada.config import Settings
+    from ada.core.utils import get_version
+
+    try:
+        version = get_version()
+    except PackageNotFoundError:
+        version = "unknown"
+
+    settings = {
+        key: value
+        for key, value in vars(Settings).items()
+        if key.startswith("_") is False and isinstance(value, (bool, int, float, str, list))
+    }
+    settings_hash = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    return dict(ada_version=version, settings=settings_hash)
@@ -1,3 +1,8 @@
+from typing import Iterable, List
+
+import numpy as np
+
+
 def str_fix(s):
     return [x.decode("utf-8") for x in s]
 
@@ -8,3 +13,22 @@ def to_safe_name(name):
 
 def from_safe_name(name):
     return name.replace("__", "/")
+
+
+def add_ragged_to_cache(group, name: str, rows: Iterable, dtype=float):
+    """Store a list of variable length rows as a single flat dataset and a dataset of row offsets"""
+    rows = [np.asarray(row, dtype=dtype) for row in rows]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(row) for row in rows])
+    non_empty = [row for row in rows if len(row) > 0]
+    width = non_empty[0].shape[1:] if len(non_empty) > 0 else ()
+    flat = np.concatenate([row.reshape(-1, *width) for row in rows]) if len(rows) > 0 else np.empty(0, dtype=dtype)
+    group.create_dataset(name, data=flat)
+    group.create_dataset(f"{name}_OFFSETS", data=offsets)
+
+
+def get_ragged_from_cache(group, name: str) -> List[np.ndarray]:
+    """Returns the rows of a dataset written by add_ragged_to_cache"""
+    flat = group[name][()]
+    offsets = group[f"{name}_OFFSETS"][()]
+    return [flat[i:j] for i, j in zip(offsets[:-1], offsets[1:])]
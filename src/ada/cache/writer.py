@@ -1,34 +1,44 @@
+from __future__ import annotations
+
 import json
 import logging
 import os
 import pathlib
-from itertools import groupby
+from itertools import chain, groupby
 from operator import attrgetter
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
 import numpy as np
 
 from ada import Beam, Material, Part, Section
 from ada.concepts.containers import Nodes
+from ada.fem import Connector, Mass
 
-from .utils import to_safe_name
+from .utils import add_ragged_to_cache, to_safe_name
 
 if TYPE_CHECKING:
-    from ada import FEM, Assembly
+    from ada import FEM, Assembly, Pipe, Plate, Shape, Wall
+    from ada.concepts.transforms import Placement
+    from ada.fem import Bc, ConnectorSection, Load
+    from ada.fem.steps import Step
+
+_NAN3 = [np.nan, np.nan, np.nan]
 
 
 def write_assembly_to_cache(assembly: "Assembly", cache_file_path):
     """Write the Assembly information to a HDF5 file format for High performance cache."""
     import h5py
 
-    # TODO: Add support for FEM only to begin with
+    check_assembly_is_cacheable(assembly)
 
     cache_file_path = pathlib.Path(cache_file_path)
     os.makedirs(cache_file_path.parent, exist_ok=True)
     h5_filename = cache_file_path.with_suffix(".h5")
     with h5py.File(h5_filename, "w") as f:
+        # The content of the assembly itself, such as the FEM holding the analysis steps, is stored with its info
         info = f.create_group("INFO")
         info.attrs.create("NAME", assembly.name)
+        add_part_content_to_cache(assembly, info)
 
         parts_group = f.create_group("PARTS")
 
@@ -37,6 +47,33 @@ def write_assembly_to_cache(assembly: "Assembly", cache_file_path):
     print(f'Saved cached model at "{cache_file_path}"')
 
 
+def update_assembly_in_cache(assembly: "Assembly", cache_file_path) -> List[Part]:
+    """Rewrite only the groups of parts that have changed since they were last written to or read from the cache.
+
+    Groups of parts which are no longer in the assembly are removed. Returns the list of rewritten parts."""
+    import h5py
+
+    h5_filename = pathlib.Path(cache_file_path).with_suffix(".h5")
+    if h5_filename.exists() is False:
+        write_assembly_to_cache(assembly, cache_file_path)
+        return assembly.get_all_subparts()
+
+    check_assembly_is_cacheable(assembly)
+
+    updated_parts = []
+    with h5py.File(h5_filename, "a") as f:
+        info = f["INFO"]
+        if assembly.is_cache_dirty:
+            clear_part_group(info)
+            add_part_content_to_cache(assembly, info)
+        info.attrs["NAME"] = assembly.name
+
+        update_parts(f["PARTS"], assembly, updated_parts)
+
+    logging.info(f'Updated {len(updated_parts)} part(s) in cached model at "{h5_filename}"')
+    return updated_parts
+
+
 def walk_parts(cache_p, part):
     for p in part.parts.values():
         part_group = add_part_to_cache(p, cache_p)
@@ -44,9 +81,51 @@ def walk_parts(cache_p, part):
         walk_parts(part_group, p)
 
 
+def update_parts(cache_p, part: Part, updated_parts: List[Part]):
+    part_names = set()
+    for p in part.parts.values():
+        name = to_safe_name(p.name)
+        part_names.add(name)
+        part_group = cache_p.get(name, None)
+        if part_group is None:
+            part_group = add_part_to_cache(p, cache_p)
+        elif p.is_cache_dirty:
+            clear_part_group(part_group)
+            add_part_content_to_cache(p, part_group)
+        else:
+            update_parts(part_group, p, updated_parts)
+            continue
+
+        part_group.attrs["PARENT"] = to_safe_name(p.parent.name)
+        updated_parts.append(p)
+        update_parts(part_group, p, updated_parts)
+
+    for name in [name for name, group in cache_p.items() if is_part_group(group) and name not in part_names]:
+        del cache_p[name]
+
+
+def is_part_group(group) -> bool:
+    import h5py
+
+    return isinstance(group, h5py.Group) and "PARENT" in group.attrs
+
+
+def clear_part_group(part_group):
+    """Remove all content belonging to the part itself while keeping the groups of its sub-parts"""
+    for name in [name for name, group in part_group.items() if is_part_group(group) is False]:
+        del part_group[name]
+
+    for key in list(part_group.attrs.keys()):
+        del part_group.attrs[key]
+
+
 def add_part_to_cache(part: Part, parent_part_group):
     part_group = parent_part_group.create_group(to_safe_name(part.name))
+    add_part_content_to_cache(part, part_group)
+    return part_group
 
+
+def add_part_content_to_cache(part: Part, part_group):
     part_group.attrs.create("METADATA", json.dumps(part.metadata))
 
     if len(part.nodes) > 0:
@@ -62,24 +141,22 @@ def add_part_to_cache(part: Part, parent_part_group):
         add_beams_to_cache(part, part_group)
 
     if len(part.plates) > 0:
-        add_plates_to_cache()
+        add_plates_to_cache(part, part_group)
 
     if len(part.shapes) > 0:
-        add_shapes_to_cache()
+        add_shapes_to_cache(part, part_group)
 
     if len(part.pipes) > 0:
-        add_pipes_to_cache()
+        add_pipes_to_cache(part, part_group)
 
     if len(part.walls) > 0:
-        add_walls_to_cache()
+        add_walls_to_cache(part, part_group)
 
     # Add FEM object
-    if len(part.fem.nodes) > 0:
+    if is_fem_empty(part.fem) is False:
         print(f'Caching FEM data from "{part.name}"')
         add_fem_to_cache(part.fem, part_group)
 
-    return part_group
-
 
 def add_sections_to_cache(part, parts_group):
     prefix = "SECTIONS"
@@ -108,20 +185,103 @@ def add_materials_to_cache(part, parts_group):
     parts_group.create_dataset(f"{prefix}_STR", data=[add_strings_to_cache(bm) for bm in part.materials])
 
 
-def add_plates_to_cache():
-    logging.error("Plate caching is not yet implemented")
+def add_plates_to_cache(part: Part, parts_group):
+    prefix = "PLATES"
 
+    def add_str_cache(pl: "Plate"):
+        return [pl.guid, pl.name, pl.material.name, json.dumps(pl.metadata)]
 
-def add_shapes_to_cache():
-    logging.error("Shape caching is not yet implemented")
+    def add_float_cache(pl: "Plate"):
+        offset = pl.offset if isinstance(pl.offset, (int, float)) else np.nan
+        return [pl.t, offset, pl.opacity, *colour_to_floats(pl.colour), *placement_to_floats(pl.poly.placement)]
 
+    parts_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(pl) for pl in part.plates])
+    parts_group.create_dataset(f"{prefix}_FLOAT", data=[add_float_cache(pl) for pl in part.plates])
+    add_ragged_to_cache(parts_group, f"{prefix}_POINTS", [points2d_to_floats(pl.poly.points2d) for pl in part.plates])
 
-def add_pipes_to_cache():
-    logging.error("Pipes caching is not yet implemented")
 
+def add_shapes_to_cache(part: Part, parts_group):
+    """Primitives are stored by their defining parameters, while any other shape is stored as a BRep string"""
+    from ada import PrimBox, PrimCyl, PrimExtrude, PrimRevolve, PrimSphere
 
-def add_walls_to_cache():
-    logging.error("Walls caching is not yet implemented")
+    prefix = "SHAPES"
+
+    primitives = (PrimBox, PrimSphere, PrimCyl, PrimExtrude, PrimRevolve)
+
+    def to_brep(shp: "Shape"):
+        if type(shp) in primitives:
+            return ""
+
+        from OCC.Core.BRepTools import BRepTools_ShapeSet
+
+        ss = BRepTools_ShapeSet()
+        ss.Add(shp.geom)
+        return ss.WriteToString()
+
+    def add_str_cache(shp: "Shape"):
+        shp_type = type(shp).__name__ if type(shp) in primitives else "Shape"
+        mat_name = shp.material.name if shp.material is not None else ""
+        return [shp.guid, shp.name, shp_type, mat_name, json.dumps(shp.metadata), to_brep(shp)]
+
+    def add_float_cache(shp: "Shape"):
+        mass = shp.mass if shp.mass is not None else np.nan
+        cog = shp.cog if shp.cog is not None else _NAN3
+        return [shp.opacity, mass, *cog, *colour_to_floats(shp.colour)]
+
+    params, points = zip(*[get_shape_params(shp) for shp in part.shapes])
+    parts_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(shp) for shp in part.shapes])
+    parts_group.create_dataset(f"{prefix}_FLOAT", data=[add_float_cache(shp) for shp in part.shapes])
+    add_ragged_to_cache(parts_group, f"{prefix}_PARAMS", params)
+    add_ragged_to_cache(parts_group, f"{prefix}_POINTS", [points2d_to_floats(pts) for pts in points])
+
+
+def get_shape_params(shp: "Shape"):
+    """The defining parameters and 2d points of primitive shapes. Other shapes have no parameters"""
+    from ada import PrimBox, PrimCyl, PrimExtrude, PrimRevolve, PrimSphere
+
+    if type(shp) is PrimBox:
+        return [*shp.p1, *shp.p2], []
+    elif type(shp) is PrimSphere:
+        return [*shp.cog, shp.radius], []
+    elif type(shp) is PrimCyl:
+        return [*shp.p1, *shp.p2, shp.r], []
+    elif type(shp) is PrimExtrude:
+        return [shp.extrude_depth, *placement_to_floats(shp.poly.placement)], shp.poly.points2d
+    elif type(shp) is PrimRevolve:
+        return [shp.revolve_angle, *placement_to_floats(shp.poly.placement)], shp.poly.points2d
+    return [], []
+
+
+def add_pipes_to_cache(part: Part, parts_group):
+    prefix = "PIPES"
+
+    def add_str_cache(pipe: "Pipe"):
+        return [pipe.guid, pipe.name, pipe.section.name, pipe.material.name, json.dumps(pipe.metadata)]
+
+    parts_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(pipe) for pipe in part.pipes])
+    parts_group.create_dataset(f"{prefix}_FLOAT", data=[colour_to_floats(pipe.colour) for pipe in part.pipes])
+    add_ragged_to_cache(parts_group, f"{prefix}_POINTS", [[n.p for n in pipe.points] for pipe in part.pipes])
+
+
+def add_walls_to_cache(part: Part, parts_group):
+    prefix = "WALLS"
+
+    def add_str_cache(wall: "Wall"):
+        return [wall.guid, wall.name, json.dumps(wall.metadata)]
+
+    def add_float_cache(wall: "Wall"):
+        return [
+            wall.height,
+            wall.thickness,
+            wall.offset,
+            wall.opacity,
+            *colour_to_floats(wall.colour),
+            *placement_to_floats(wall.placement),
+        ]
+
+    parts_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(wall) for wall in part.walls])
+    parts_group.create_dataset(f"{prefix}_FLOAT", data=[add_float_cache(wall) for wall in part.walls])
+    add_ragged_to_cache(parts_group, f"{prefix}_POINTS", [wall.points for wall in part.walls])
 
 
 def add_beams_to_cache(part: Part, parts_group):
@@ -144,21 +304,355 @@ def add_beams_to_cache(part: Part, parts_group):
     parts_group.create_dataset(f"{prefix}_UP", data=[add_int_cache(bm, True) for bm in part.beams])
 
 
+def check_assembly_is_cacheable(assembly: "Assembly") -> None:
+    """Raise a ValueError if the FEM of the assembly or of any of its parts holds data which the cache cannot hold.
+    Such a model is not cached, so that a cache hit never returns a partial model"""
+    for part in [assembly] + assembly.get_all_subparts():
+        uncached = get_uncached_fem_data(part.fem)
+        if len(uncached) > 0:
+            raise ValueError(f'The cache does not support the following FEM data of part "{part.name}": {uncached}')
+
+
+def is_fem_empty(fem: "FEM") -> bool:
+    return len(fem.nodes) == 0 and len(fem.elements) == 0 and len(fem.steps) == 0 and len(fem.bcs) == 0
+
+
+def get_uncached_fem_data(fem: "FEM") -> List[str]:
+    """A description of each part of the FEM which the cache cannot hold"""
+    from ada.fem import Surface
+
+    uncached = [
+        name
+        for name in [
+            "surfaces",
+            "amplitudes",
+            "springs",
+            "intprops",
+            "interactions",
+            "predefined_fields",
+            "lcsys",
+            "ref_points",
+            "ref_sets",
+        ]
+        if len(getattr(fem, name)) > 0
+    ]
+    if fem.initial_state is not None:
+        uncached.append("initial_state")
+    if fem.subroutine is not None:
+        uncached.append("subroutine")
+
+    set_ids = {id(fs) for fs in fem.sets}
+    bcs = list(chain(fem.bcs, *[step.bcs.values() for step in fem.steps]))
+    for bc in bcs:
+        if bc.amplitude is not None or bc._init_condition is not None or id(bc.fem_set) not in set_ids:
+            uncached.append(f'bc "{bc.name}"')
+
+    for con in fem.constraints.values():
+        if isinstance(con.s_set, Surface) or id(con.m_set) not in set_ids or id(con.s_set) not in set_ids:
+            uncached.append(f'constraint "{con.name}"')
+
+    for step in fem.steps:
+        if get_step_params(step) is None:
+            uncached.append(f'step "{step.name}"')
+
+        for load in step.loads:
+            if is_load_cacheable(load, set_ids) is False:
+                uncached.append(f'load "{load.name}"')
+
+    return uncached
+
+
+def get_step_params(step: "Step") -> dict | None:
+    """The parameters needed to recreate the step. Returns None for steps with content that is not cached, such as
+    load cases, step interactions, solver options or outputs other than the default outputs"""
+    from ada.fem.formats.abaqus.solver import AbaqusStepOptions
+    from ada.fem.outputs import defaults
+    from ada.fem.steps import StepEigen, StepEigenComplex, StepExplicit, StepImplicit
+
+    if len(step.load_cases) > 0 or len(step.interactions) > 0:
+        return None
+
+    if step.options._ABAQUS is not None and step.options._ABAQUS != AbaqusStepOptions():
+        return None
+
+    def output_signature(hist_outputs, field_outputs):
+        hist = [(h.name, h.type, h.fem_set, h.variables, h.int_value, h.int_type) for h in hist_outputs]
+        field = [(f.name, f.nodal, f.element, f.contact, f.int_value, f.int_type) for f in field_outputs]
+        return hist, field
+
+    outputs = output_signature(step.hist_outputs, step.field_outputs)
+    if len(step.hist_outputs) == 0 and len(step.field_outputs) == 0:
+        use_default_outputs = False
+    elif outputs == output_signature(*[[x] for x in defaults()]):
+        use_default_outputs = True
+    else:
+        return None
+
+    params = dict(nl_geom=step.nl_geom, use_default_outputs=use_default_outputs)
+    if type(step) is StepImplicit:
+        params.update(
+            implicit_type=step.type,
+            total_time=step.total_time,
+            total_incr=step.total_incr,
+            init_incr=step.init_incr,
+            min_incr=step.min_incr,
+            max_incr=step.max_incr,
+            dyn_type=step.dyn_type,
+        )
+    elif type(step) is StepEigen:
+        params.update(num_eigen_modes=step.num_eigen_modes, total_time=step.total_time)
+    elif type(step) is StepEigenComplex:
+        params.update(
+            num_eigen_modes=step.num_eigen_modes,
+            friction_damping=step.friction_damping,
+            total_time=step.total_time,
+        )
+    elif type(step) is StepExplicit:
+        params.update(total_time=step.total_time)
+    else:
+        return None
+
+    return params
+
+
+def is_load_cacheable(load: "Load", set_ids: set) -> bool:
+    from ada.fem import Load, LoadGravity, LoadPoint
+
+    if type(load) not in (Load, LoadGravity, LoadPoint) or load.type not in (Load.TYPES.GRAVITY, Load.TYPES.FORCE):
+        return False
+
+    if any(
+        x is not None for x in (load.amplitude, load.csys, load._acc_vector, load._accr_origin, load._accr_rot_axis)
+    ):
+        return False
+
+    return load.fem_set is None or id(load.fem_set) in set_ids
+
+
 def add_fem_to_cache(fem: "FEM", part_group):
+    uncached = get_uncached_fem_data(fem)
+    if len(uncached) > 0:
+        raise ValueError(f'The cache does not support the following FEM data of "{fem.name}": {uncached}')
+
     fem_group = part_group.create_group("FEM")
     fem_group.attrs.create("NAME", to_safe_name(fem.name))
+    fem_group.attrs.create("METADATA", json.dumps(fem.metadata))
 
     # Add Nodes
     add_nodes_to_cache(fem.nodes, fem_group)
 
     # Add elements
     elements_group = fem_group.create_group("MESH")
-    for group, elements in groupby(sorted(fem.elements, key=attrgetter("type")), key=attrgetter("type")):
+    stru_elements = filter(lambda el: not isinstance(el, (Mass, Connector)), fem.elements)
+    for group, elements in groupby(sorted(stru_elements, key=attrgetter("type")), key=attrgetter("type")):
         med_cells = elements_group.create_group(group)
         med_cells.create_dataset("ELEMENTS", data=[[int(el.id), *[int(n.id) for n in el.nodes]] for el in elements])
 
+    # Sets are referred to by their row index in the SETS datasets
+    set_index = {id(fs): i for i, fs in enumerate(fem.sets)}
+
+    if len(fem.sets) > 0:
+        add_fem_sets_to_cache(fem, fem_group)
+
+    masses = list(fem.elements.masses)
+    if len(masses) > 0:
+        add_masses_to_cache(masses, fem_group, set_index)
+
+    if len(fem.connector_sections) > 0:
+        add_connector_sections_to_cache(fem, fem_group)
+
+    connectors = list(fem.elements.connectors)
+    if len(connectors) > 0:
+        add_connectors_to_cache(connectors, fem_group)
+
+    if len(fem.sections) > 0:
+        add_fem_sections_to_cache(fem, fem_group, set_index)
+
+    if len(fem.bcs) > 0:
+        add_bcs_to_cache(fem.bcs, fem_group, set_index)
+
+    if len(fem.constraints) > 0:
+        add_constraints_to_cache(fem, fem_group, set_index)
+
+    if len(fem.steps) > 0:
+        add_steps_to_cache(fem, fem_group, set_index)
+
+
+def add_fem_sets_to_cache(fem: "FEM", fem_group):
+    prefix = "SETS"
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[[fs.name, fs.type, json.dumps(fs.metadata)] for fs in fem.sets])
+    add_ragged_to_cache(fem_group, f"{prefix}_MEMBERS", [[m.id for m in fs.members] for fs in fem.sets], np.int64)
+
+
+def add_masses_to_cache(masses: "list[Mass]", fem_group, set_index: dict):
+    prefix = "MASSES"
+
+    def add_str_cache(mass: Mass):
+        units = mass.units if mass.units is not None else ""
+        ptype = mass.point_mass_type if mass.point_mass_type is not None else ""
+        return [mass.name, mass.type, ptype, str(units), json.dumps(mass.metadata)]
+
+    def add_int_cache(mass: Mass):
+        return [mass.id, set_index.get(id(mass.elset), -1)]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(mass) for mass in masses])
+    fem_group.create_dataset(f"{prefix}_INT", data=[add_int_cache(mass) for mass in masses])
+    add_ragged_to_cache(fem_group, f"{prefix}_MEMBERS", [[n.id for n in mass.members] for mass in masses], np.int64)
+    add_ragged_to_cache(fem_group, f"{prefix}_VALUES", [np.atleast_1d(mass.mass).ravel() for mass in masses])
+
+
+def add_connector_sections_to_cache(fem: "FEM", fem_group):
+    prefix = "CONNECTOR_SECTIONS"
+
+    def add_str_cache(con_sec: "ConnectorSection"):
+        components = [
+            con_sec.elastic_comp,
+            con_sec.damping_comp,
+            con_sec.plastic_comp,
+            con_sec.rigid_dofs,
+            con_sec.soft_elastic_dofs,
+        ]
+        return [con_sec.name, json.dumps(components, default=np.ndarray.tolist), json.dumps(con_sec.metadata)]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(cs) for cs in fem.connector_sections.values()])
+
+
+def add_connectors_to_cache(connectors: "list[Connector]", fem_group):
+    prefix = "CONNECTORS"
+
+    def add_str_cache(con: Connector):
+        csys = con.csys
+        csys_data = dict(
+            name=csys.name,
+            definition=csys.definition,
+            system=csys.system,
+            nodes=[n.id for n in csys.nodes] if csys.nodes is not None else None,
+            coords=csys.coords,
+        )
+        return [
+            con.name,
+            con.con_type,
+            con.con_sec.name,
+            json.dumps(con._preload, default=np.ndarray.tolist),
+            json.dumps(csys_data, default=np.ndarray.tolist),
+            json.dumps(con.metadata),
+        ]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(con) for con in connectors])
+    fem_group.create_dataset(f"{prefix}_INT", data=[[con.id, con.n1.id, con.n2.id] for con in connectors])
+
+
+def add_steps_to_cache(fem: "FEM", fem_group, set_index: dict):
+    prefix = "STEPS"
+
+    def add_str_cache(step: "Step"):
+        return [step.name, type(step).__name__, json.dumps(get_step_params(step)), json.dumps(step.metadata)]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(step) for step in fem.steps])
+
+    step_bcs = [(i, bc) for i, step in enumerate(fem.steps) for bc in step.bcs.values()]
+    if len(step_bcs) > 0:
+        add_bcs_to_cache([bc for _, bc in step_bcs], fem_group, set_index, prefix="STEP_BCS")
+        fem_group.create_dataset("STEP_BCS_STEP", data=[i for i, _ in step_bcs])
+
+    loads = [(i, load) for i, step in enumerate(fem.steps) for load in step.loads]
+    if len(loads) > 0:
+        add_loads_to_cache(loads, fem_group, set_index)
+
+
+def add_loads_to_cache(loads: "list[tuple[int, Load]]", fem_group, set_index: dict):
+    prefix = "LOADS"
+
+    def add_str_cache(load: "Load"):
+        return [load.name, type(load).__name__, load.type, json.dumps(load.metadata)]
+
+    def add_int_cache(step_index: int, load: "Load"):
+        set_id = set_index[id(load.fem_set)] if load.fem_set is not None else -1
+        return [step_index, set_id, int(load.follower_force)]
+
+    def dofs(load: "Load"):
+        return [x if x is not None else np.nan for x in load.dof] if load.dof is not None else []
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(load) for _, load in loads])
+    fem_group.create_dataset(f"{prefix}_INT", data=[add_int_cache(i, load) for i, load in loads])
+    fem_group.create_dataset(f"{prefix}_FLOAT", data=[load.magnitude for _, load in loads])
+    add_ragged_to_cache(fem_group, f"{prefix}_DOFS", [dofs(load) for _, load in loads])
+
+
+def add_fem_sections_to_cache(fem: "FEM", fem_group, set_index: dict):
+    prefix = "FEM_SECTIONS"
+
+    def add_str_cache(fs):
+        sec_name = fs.section.name if fs.section is not None else ""
+        return [fs.name, fs.type.value, fs.material.name, sec_name, json.dumps(fs.metadata)]
+
+    def add_int_cache(fs):
+        return [fs.id, set_index[id(fs.elset)], fs.int_points, int(fs.is_rigid)]
+
+    def add_float_cache(fs):
+        thickness = fs.thickness if fs.thickness is not None else np.nan
+        return [thickness, *fs.local_z, *fs.local_y]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(fs) for fs in fem.sections])
+    fem_group.create_dataset(f"{prefix}_INT", data=[add_int_cache(fs) for fs in fem.sections])
+    fem_group.create_dataset(f"{prefix}_FLOAT", data=[add_float_cache(fs) for fs in fem.sections])
+
+
+def add_bcs_to_cache(bcs: "list[Bc]", fem_group, set_index: dict, prefix="BCS"):
+    def magnitudes(bc):
+        return [m if m is not None else np.nan for m in bc.magnitudes]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[[bc.name, bc.type, json.dumps(bc.metadata)] for bc in bcs])
+    fem_group.create_dataset(f"{prefix}_INT", data=[set_index[id(bc.fem_set)] for bc in bcs])
+    add_ragged_to_cache(fem_group, f"{prefix}_DOFS", [bc.dofs for bc in bcs], np.int64)
+    add_ragged_to_cache(fem_group, f"{prefix}_MAGNITUDES", [magnitudes(bc) for bc in bcs])
+
+
+def add_constraints_to_cache(fem: "FEM", fem_group, set_index: dict):
+    from ada.fem import Surface
+
+    prefix = "CONSTRAINTS"
+
+    constraints = []
+    for con in fem.constraints.values():
+        if isinstance(con.s_set, Surface):
+            logging.error(f'Caching of constraint "{con.name}" with a Surface slave is not yet supported')
+            continue
+        constraints.append(con)
+
+    if len(constraints) == 0:
+        return None
+
+    def add_str_cache(con):
+        mpc_type = con.mpc_type if con.mpc_type is not None else ""
+        return [con.name, con.type, mpc_type, json.dumps(con.metadata)]
+
+    def add_float_cache(con):
+        return [x if x is not None else np.nan for x in (con.pos_tol, con.influence_distance)]
+
+    fem_group.create_dataset(f"{prefix}_STR", data=[add_str_cache(con) for con in constraints])
+    fem_group.create_dataset(
+        f"{prefix}_INT", data=[[set_index[id(con.m_set)], set_index[id(con.s_set)]] for con in constraints]
+    )
+    fem_group.create_dataset(f"{prefix}_FLOAT", data=[add_float_cache(con) for con in constraints])
+    add_ragged_to_cache(fem_group, f"{prefix}_DOFS", [con.dofs for con in constraints], np.int64)
+
 
 def add_nodes_to_cache(nodes: Nodes, group):
-    points = np.array([[n.id, *n.p] for n in nodes])
+    points = nodes.to_np_array(include_id=True)
     coo = group.create_dataset("NODES", data=points)
     coo.attrs.create("NBR", len(points))
+
+
+def colour_to_floats(colour) -> list:
+    return list(colour)[:3] if colour is not None else _NAN3
+
+
+def points2d_to_floats(points2d) -> list:
+    """Points without a fillet radius are stored with NaN as radius to keep the columns uniform"""
+    return [[*p[:2], p[2] if len(p) > 2 else np.nan] for p in points2d]
+
+
+def placement_to_floats(placement: "Placement") -> list:
+    return [*placement.origin, *placement.xdir, *placement.zdir]
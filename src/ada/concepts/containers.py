@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import logging
 import reprlib
-from bisect import bisect_left, bisect_right
-from itertools import chain
+from bisect import bisect_left
+from itertools import chain, compress
 from operator import attrgetter
 from typing import TYPE_CHECKING, Dict, Iterable, List, Union
 
@@ -16,7 +16,12 @@ from ada.concepts.stru_beams import Beam
 from ada.concepts.stru_plates import Plate
 from ada.concepts.transforms import Rotation
 from ada.config import Settings
-from ada.core.utils import Counter, roundoff
+from ada.core.spatial_index import (
+    PointHashGrid,
+    get_clusters_from_pairs,
+    get_coincident_pairs,
+)
+from ada.core.utils import Counter, map_ids, roundoff
 from ada.core.vector_utils import (
     is_null_vector,
     is_parallel,
@@ -51,6 +56,11 @@ class BaseCollections:
     def parent(self) -> Part:
         return self._parent
 
+    def _mark_parent_modified(self) -> None:
+        mark_cache_dirty = getattr(self._parent, "mark_cache_dirty", None)
+        if mark_cache_dirty is not None:
+            mark_cache_dirty()
+
 
 class Beams(BaseCollections):
     """A collections of Beam objects"""
@@ -196,6 +206,7 @@ class Beams(BaseCollections):
         self._beams.pop(i)
         self._dmap = {n.guid: n for n in self._beams}
         self._nmap = {n.name: n for n in self._beams}
+        self._mark_parent_modified()
 
     def get_beams_within_volume(self, vol_, margins=Settings.point_tol) -> Iterable[Beam]:
         """
@@ -303,6 +314,7 @@ class Plates(BaseCollections):
         self._plates.pop(i)
         self._idmap = {n.guid: n for n in self._plates}
         self._nmap = {n.name: n for n in self._plates}
+        self._mark_parent_modified()
 
     def from_name(self, name: str) -> Plate:
         return self._nmap.get(name, None)
@@ -583,9 +595,11 @@ class Materials(NumericMapped):
     def add(self, material) -> Material:
         if material in self:
             existing_mat = self._name_map[material.name]
+            existing_refs = set(map(id, existing_mat.refs))
             for elem in material.refs:
-                if elem not in existing_mat.refs:
+                if id(elem) not in existing_refs:
                     existing_mat.refs.append(elem)
+                    existing_refs.add(id(elem))
             return existing_mat
 
         if material.id is None or material.id in self._id_map.keys():
@@ -708,19 +722,23 @@ class Sections(NumericMapped):
         if section in self._sections:
             index = self._sections.index(section)
             existing_section = self._sections[index]
+            existing_refs = set(map(id, existing_section.refs))
             for elem in section.refs:
                 elem.section = existing_section
-                if elem not in existing_section.refs:
+                if id(elem) not in existing_refs:
                     existing_section.refs.append(elem)
+                    existing_refs.add(id(elem))
             return existing_section
 
         if section.name in self._name_map.keys():
             logging.info(f'Section with same name "{section.name}" already exists. Will use that section instead')
             existing_section = self._name_map[section.name]
+            existing_refs = set(map(id, existing_section.refs))
             for elem in section.refs:
                 elem.section = existing_section
-                if elem not in existing_section.refs:
+                if id(elem) not in existing_refs:
                     existing_section.refs.append(elem)
+                    existing_refs.add(id(elem))
             return existing_section
 
         if section.id is None:
@@ -754,45 +772,109 @@ class Sections(NumericMapped):
 
 
 class Nodes:
+    """A collection of Node objects sorted by (x, y, z).
+
+    Node ids and coordinates are kept in contiguous numpy arrays aligned with the sorted node list, which are used for
+    all id, volume and bounding box lookups. Added nodes are appended to an unsorted buffer that is merged into the
+    sorted arrays when it is full or when the sorted order is needed. Point tolerance lookups are served by a hash grid
+    which is built on first use and kept up to date on add and remove."""
+
+    _min_buffer_size = 1024
+
     def __init__(self, nodes=None, parent=None, from_np_array=None):
         self._parent = parent
+        self._idmap = dict()
+        self._bbox = None
+        self._maxid = 0
+        self._grid = None
 
         if from_np_array is not None:
-            self._array = from_np_array
-            nodes = self._np_array_to_nlist(from_np_array)
-        else:
-            nodes = [] if nodes is None else nodes
+            self._nodes = []
+            self._reset_buffer()
+            self._set_from_np_array(from_np_array)
+            return
 
-        self._nodes = list(nodes)
+        self._nodes = list(nodes) if nodes is not None else []
 
         if len(tuple(set(self._nodes))) != len(self._nodes):
             raise DuplicateNodes("Duplicate Nodes not allowed in a Nodes object")
 
-        self._idmap = dict()
-        self._bbox = None
-        self._maxid = 0
-        if len(self._nodes) > 0:
-            self._sort()
-            self._maxid = max(self._idmap.keys())
-            self._bbox = self._get_bbox()
+        self._reset_buffer()
+        self._sort()
 
     def _sort(self):
-        self._nodes = sorted(self._nodes, key=attrgetter("x", "y", "z"))
-        try:
-            self._idmap = {n.id: n for n in sorted(self._nodes, key=attrgetter("id"))}
-        except TypeError as e:
-            raise TypeError(e)
+        """Sort all nodes by (x, y, z) and rebuild the coordinate and id arrays from the Node objects"""
+        nodes = self._nodes + self._buffer
+        coords = np.array([n.p for n in nodes], dtype=np.float64).reshape(-1, 3)
+        ids = np.array([-1 if n.id is None else n.id for n in nodes], dtype=np.int64)
+        order = np.lexsort((coords[:, 2], coords[:, 1], coords[:, 0]))
+
+        self._nodes = [nodes[i] for i in order]
+        self._coords = coords[order]
+        self._ids = ids[order]
+        self._idmap = {n.id: n for n in nodes}
+        self._maxid = int(self._ids.max()) if len(self._ids) > 0 else 0
+        self._bbox = None
+        self._grid = None
+        self._reset_buffer()
+
+    def _reset_buffer(self):
+        size = max(self._min_buffer_size, 4 * int(np.sqrt(len(self._nodes))))
+        self._buffer: List[Node] = []
+        self._buffer_coords = np.empty((size, 3), dtype=np.float64)
+        self._buffer_ids = np.empty(size, dtype=np.int64)
+
+    def _flush(self):
+        """Merge the buffer of added nodes into the sorted node list and arrays"""
+        num_new = len(self._buffer)
+        if num_new == 0:
+            return
+
+        new_coords = self._buffer_coords[:num_new]
+        new_ids = self._buffer_ids[:num_new]
+        order = np.lexsort((new_coords[:, 2], new_coords[:, 1], new_coords[:, 0]))
+        new_coords = new_coords[order]
+        new_ids = new_ids[order]
+        new_nodes = [self._buffer[i] for i in order]
+
+        positions = np.searchsorted(_lexsort_view(self._coords), _lexsort_view(new_coords), side="left")
+
+        merged = []
+        prev = 0
+        for pos, node in zip(positions.tolist(), new_nodes):
+            merged.extend(self._nodes[prev:pos])
+            merged.append(node)
+            prev = pos
+        merged.extend(self._nodes[prev:])
+
+        self._nodes = merged
+        self._coords = np.insert(self._coords, positions, new_coords, axis=0)
+        self._ids = np.insert(self._ids, positions, new_ids)
+        self._reset_buffer()
 
-    def renumber(self, start_id: int = 1, renumber_map: dict = None):
+    @property
+    def grid(self) -> PointHashGrid:
+        """The hash grid used for point tolerance lookups"""
+        if self._grid is None:
+            self._flush()
+            self._grid = PointHashGrid(2 * Settings.point_tol)
+            self._grid.insert_many(self._coords, self._nodes)
+        return self._grid
+
+    def renumber(self, start_id: int = 1, renumber_map: Union[dict, np.ndarray] = None):
         """Ensures that the node numberings starts at 1 and has no holes in its numbering."""
+        from ada.fem.sets import reset_set_indices
+
+        self._flush()
         if renumber_map is not None:
             self._renumber_from_map(renumber_map)
         else:
             self._renumber_linearly(start_id)
 
-        self._sort()
-        self._maxid = max(self._idmap.keys()) if len(self._nodes) > 0 else 0
-        self._bbox = self._get_bbox() if len(self._nodes) > 0 else None
+        self._ids = np.array([n.id for n in self._nodes], dtype=np.int64)
+        self._idmap = {n.id: n for n in self._nodes}
+        self._maxid = int(self._ids.max()) if len(self._nodes) > 0 else 0
+        reset_set_indices(self._nodes)
 
     def _renumber_linearly(self, start_id):
         for i, n in enumerate(sorted(self._nodes, key=attrgetter("id")), start=start_id):
@@ -800,52 +882,79 @@ class Nodes:
                 n.id = i
 
     def _renumber_from_map(self, renumber_map):
-        for n in sorted(self._nodes, key=attrgetter("id")):
-            n.id = renumber_map[n.id]
-
-    def _np_array_to_nlist(self, np_array):
-        from ada import Node
-
-        return [Node(row[1:], int(row[0]), parent=self._parent) for row in np_array]
+        """Renumber from a dict {old_id: new_id} or an (n, 2) array of [old_id, new_id] rows"""
+        new_ids = map_ids(self._ids, renumber_map)
+        for n, new_id in zip(self._nodes, new_ids.tolist()):
+            n.id = new_id
+
+    def _set_from_np_array(self, np_array):
+        """Build the nodes directly from an (n, 4) array of [id, x, y, z] rows. Sorting is skipped if the rows are
+        already in sorted order, e.g. when they were written by to_np_array(include_id=True)."""
+        np_array = np.asarray(np_array, dtype=np.float64).reshape(-1, 4)
+        ids = np_array[:, 0].astype(np.int64)
+        coords = np.ascontiguousarray(np_array[:, 1:])
+        if _is_lexsorted(coords, ids) is False:
+            order = np.lexsort((ids, coords[:, 2], coords[:, 1], coords[:, 0]))
+            coords, ids = coords[order], ids[order]
+
+        unique_ids, counts = np.unique(ids, return_counts=True)
+        if len(unique_ids) != len(ids):
+            raise DuplicateNodes(f"Duplicate node ids not allowed in a Nodes object: {unique_ids[counts > 1].tolist()}")
+
+        parent = self._parent
+        id_list = ids.tolist()
+        self._nodes = [Node(p, nid, parent=parent) for p, nid in zip(coords.copy(), id_list)]
+        self._coords = coords
+        self._ids = ids
+        self._idmap = dict(zip(id_list, self._nodes))
+        self._maxid = int(ids.max()) if len(ids) > 0 else 0
+        self._reset_buffer()
 
     def to_np_array(self, include_id=False):
+        self._flush()
         if include_id:
-            return np.array([(n.id, *n.p) for n in self._nodes])
+            return np.column_stack((self._ids, self._coords))
         else:
-            return np.array([n.p for n in self._nodes])
+            return self._coords.copy()
 
     def __contains__(self, item):
-        return item in self._nodes
+        if not isinstance(item, Node):
+            return False
+        existing_node = self._idmap.get(item.id, None)
+        return existing_node is not None and existing_node == item
 
     def __len__(self):
-        return len(self._nodes)
+        return len(self._nodes) + len(self._buffer)
 
     def __iter__(self) -> Iterable[Node]:
+        self._flush()
         return iter(self._nodes)
 
     def __getitem__(self, index):
+        self._flush()
         result = self._nodes[index]
         return Nodes(result) if isinstance(index, slice) else result
 
     def __eq__(self, other):
         if not isinstance(other, Nodes):
             return NotImplemented
-        return self._nodes == other._nodes
+        return self.nodes == other.nodes
 
     def __ne__(self, other):
         if not isinstance(other, Nodes):
             return NotImplemented
-        return self._nodes != other._nodes
+        return self.nodes != other.nodes
 
     def __add__(self, other: Nodes):
         for n in other.nodes:
             n.parent = self.parent
-        return Nodes(chain(self._nodes, other.nodes))
+        return Nodes(chain(self.nodes, other.nodes))
 
     def __repr__(self):
-        return f"Nodes({len(self._nodes)}, min_id: {self.min_nid}, max_id: {self.max_nid})"
+        return f"Nodes({len(self)}, min_id: {self.min_nid}, max_id: {self.max_nid})"
 
     def index(self, item):
+        self._flush()
         index = bisect_left(self._nodes, item)
         if (index != len(self._nodes)) and (self._nodes[index] == item):
             return index
@@ -856,23 +965,19 @@ class Nodes:
 
     def move(self, move: Iterable[float, float, float] = None, rotate: Rotation = None):
         """A method for translating and/or rotating your model."""
-
-        def moving(no):
-            no.p = no.p + move
-
-        def map_rotations(no, p):
-            no.p = p
+        self._flush()
+        coords = self._coords
 
         if rotate is not None:
             origin = np.array(rotate.origin)
             rot_mat = rotate.to_rot_matrix()
-            vectors = np.array([n.p - origin for n in self._nodes])
-            res = np.matmul(vectors, rot_mat.T)
-            [map_rotations(n, p + origin) for n, p in zip(self._nodes, res)]
+            coords = np.matmul(coords - origin, rot_mat.T) + origin
 
         if move is not None:
-            move = np.array(move)
-            list(map(moving, self._nodes))
+            coords = coords + np.array(move)
+
+        for n, p in zip(self._nodes, coords):
+            n.p = p
 
         self._sort()
 
@@ -882,14 +987,33 @@ class Nodes:
         else:
             return self._idmap[nid]
 
+    def from_ids(self, nids) -> np.ndarray:
+        """Returns an object array of the nodes with the same shape as the input array of node ids"""
+        self._flush()
+        nids = np.asarray(nids, dtype=np.int64)
+        order = np.argsort(self._ids, kind="stable")
+        sorted_ids = self._ids[order]
+        pos = np.searchsorted(sorted_ids, nids)
+        is_found = pos < len(sorted_ids)
+        is_found[is_found] = sorted_ids[pos[is_found]] == nids[is_found]
+        if not np.all(is_found):
+            raise ValueError(f'The node id "{nids[~is_found][0]}" is not found')
+
+        # Slice assignment of a list of Nodes to an object array is slow, as numpy probes each item for a sequence
+        node_array = np.empty(len(self._nodes), dtype=object)
+        for i, node in enumerate(self._nodes):
+            node_array[i] = node
+        return node_array[order[pos]]
+
     def _get_bbox(self):
-        if len(self._nodes) == 0:
+        if len(self) == 0:
             raise ValueError("No Nodes are found")
-        nodes_yids = sorted(self._nodes, key=attrgetter("y"))
-        nodes_zids = sorted(self._nodes, key=attrgetter("z"))
+        self._flush()
+        imin = np.argmin(self._coords, axis=0)
+        imax = np.argmax(self._coords, axis=0)
         xmin, xmax = self._nodes[0], self._nodes[-1]
-        ymin, ymax = nodes_yids[0], nodes_yids[-1]
-        zmin, zmax = nodes_zids[0], nodes_zids[-1]
+        ymin, ymax = self._nodes[imin[1]], self._nodes[imax[1]]
+        zmin, zmax = self._nodes[imin[2]], self._nodes[imax[2]]
         return (xmin, xmax), (ymin, ymax), (zmin, zmax)
 
     @property
@@ -904,18 +1028,26 @@ class Nodes:
 
     @property
     def vol_cog(self):
-        return tuple([(self.bbox[i][0][i] + self.bbox[i][1][i]) / 2 for i in range(3)])
+        self._flush()
+        return tuple((self._coords.min(axis=0) + self._coords.max(axis=0)) / 2)
 
     @property
     def max_nid(self) -> int:
-        return max(self.dmap.keys()) if len(self.dmap.keys()) > 0 else 0
+        if len(self) == 0:
+            return 0
+        self._flush()
+        return int(self._ids.max())
 
     @property
     def min_nid(self) -> int:
-        return min(self.dmap.keys()) if len(self.dmap.keys()) > 0 else 0
+        if len(self) == 0:
+            return 0
+        self._flush()
+        return int(self._ids.min())
 
     @property
     def nodes(self) -> List[Node]:
+        self._flush()
         return self._nodes
 
     def get_by_volume(self, p=None, vol_box=None, vol_cyl=None, tol=Settings.point_tol) -> List[Node]:
@@ -927,7 +1059,7 @@ class Nodes:
         :param tol: Point tolerance
         :return:
         """
-        p = np.array(p) if type(p) is (list, tuple) else p
+        p = np.array(p.p if isinstance(p, Node) else p, dtype=np.float64) if p is not None else None
         if p is not None and vol_cyl is None and vol_box is None:
             vol = [(coord - tol, coord + tol) for coord in p]
         elif vol_box is not None:
@@ -942,21 +1074,11 @@ class Nodes:
         else:
             raise Exception("No valid search input provided. None is returned")
 
-        vol_min, vol_max = zip(*vol)
-        xmin = bisect_left(self._nodes, Node(vol_min))
-        xmax = bisect_right(self._nodes, Node(vol_max))
-
-        xlist = sorted(self._nodes[xmin:xmax], key=attrgetter("y"))
-        ysorted = [n.y for n in xlist]
-        ymin = bisect_left(ysorted, vol_min[1])
-        ymax = bisect_right(ysorted, vol_max[1])
-
-        ylist = sorted(xlist[ymin:ymax], key=attrgetter("z"))
-        zsorted = [n.z for n in ylist]
-        zmin = bisect_left(zsorted, vol_min[2])
-        zmax = bisect_right(zsorted, vol_max[2])
-
-        simplesearch = ylist[zmin:zmax]
+        vol_min, vol_max = np.array(vol, dtype=np.float64).T
+        if vol_box is None and vol_cyl is None and tol <= self.grid.cell_size:
+            simplesearch = self._get_in_grid(vol_min, vol_max)
+        else:
+            simplesearch = self._get_in_box(vol_min, vol_max)
 
         if vol_cyl is not None:
             r, h, t = vol_cyl
@@ -976,23 +1098,37 @@ class Nodes:
 
             return list(filter(None, [eval_p_in_cyl(q) for q in simplesearch]))
         else:
-            return list(simplesearch)
-
-    def add(self, node: Node, point_tol: float = Settings.point_tol, allow_coincident: bool = False) -> Node:
-        """Insert node into sorted list"""
+            return simplesearch
+
+    def _get_in_grid(self, vol_min: np.ndarray, vol_max: np.ndarray) -> List[Node]:
+        """Returns all nodes inside the axis aligned box [vol_min, vol_max] using the hash grid"""
+        candidates = self.grid.query(vol_min, vol_max)
+        if len(candidates) == 0:
+            return []
+
+        coords = np.array([n.p for n in candidates])
+        in_box = np.all((coords >= vol_min) & (coords <= vol_max), axis=1)
+        return sorted([candidates[i] for i in np.flatnonzero(in_box)], key=attrgetter("x", "y", "z"))
+
+    def _get_in_box(self, vol_min: np.ndarray, vol_max: np.ndarray) -> List[Node]:
+        """Returns all nodes inside the axis aligned box [vol_min, vol_max] (both inclusive)"""
+        i0 = np.searchsorted(self._coords[:, 0], vol_min[0], side="left")
+        i1 = np.searchsorted(self._coords[:, 0], vol_max[0], side="right")
+        candidates = self._coords[i0:i1]
+        in_box = np.all((candidates >= vol_min) & (candidates <= vol_max), axis=1)
+        result = [self._nodes[i0 + i] for i in np.flatnonzero(in_box)]
+
+        num_buffered = len(self._buffer)
+        if num_buffered > 0:
+            candidates = self._buffer_coords[:num_buffered]
+            in_box = np.all((candidates >= vol_min) & (candidates <= vol_max), axis=1)
+            result += [self._buffer[i] for i in np.flatnonzero(in_box)]
 
-        def insert_node(n, i):
-            new_id = int(self._maxid + 1) if len(self._nodes) > 0 else 1
-            if n.id in self._idmap.keys() or n.id is None:
-                n.id = new_id
-
-            self._nodes.insert(i, n)
-            self._idmap[n.id] = n
-            self._bbox = None
-            self._maxid = n.id if n.id > self._maxid else self._maxid
+        return result
 
-        index = bisect_left(self._nodes, node)
-        if (len(self._nodes) != 0) and allow_coincident is False:
+    def add(self, node: Node, point_tol: float = Settings.point_tol, allow_coincident: bool = False) -> Node:
+        """Add node to the container. Returns an existing node if one is found within the point tolerance"""
+        if len(self) != 0 and allow_coincident is False:
             res = self.get_by_volume(node.p, tol=point_tol)
             if len(res) == 1:
                 nearest_node = res[0]
@@ -1001,55 +1137,135 @@ class Nodes:
                     logging.debug(f'Replaced new node with node id "{nearest_node.id}" found within point tolerances')
                     return nearest_node
 
-        insert_node(node, index)
+        self._append(node)
 
         if node.parent is None:
             node.parent = self.parent
 
         return node
 
+    def add_many(
+        self, nodes: Iterable[Node], point_tol: float = Settings.point_tol, allow_coincident: bool = False
+    ) -> List[Node]:
+        """Add multiple nodes to the container. Returns the added (or existing coincident) node for each input node"""
+        if allow_coincident is False:
+            return [self.add(node, point_tol) for node in nodes]
+
+        nodes = list(nodes)
+        for node in nodes:
+            self._append(node)
+            if node.parent is None:
+                node.parent = self.parent
+
+        self._flush()
+        return nodes
+
+    def _append(self, node: Node) -> None:
+        if node.id in self._idmap.keys() or node.id is None:
+            node.id = int(self._maxid + 1) if len(self) > 0 else 1
+
+        if len(self._buffer) == len(self._buffer_ids):
+            self._flush()
+
+        i = len(self._buffer)
+        self._buffer.append(node)
+        self._buffer_coords[i] = node.p
+        self._buffer_ids[i] = node.id
+        self._idmap[node.id] = node
+        self._bbox = None
+        self._maxid = node.id if node.id > self._maxid else self._maxid
+        if self._grid is not None:
+            self._grid.insert(node.p, node)
+
     def remove(self, nodes: Union[Node, Iterable[Node]]):
         """Remove node(s) from the nodes container"""
         nodes = list(nodes) if isinstance(nodes, Iterable) else [nodes]
+        self.remove_many(nodes)
+
+    def remove_many(self, nodes: Iterable[Node], renumber: bool = True) -> None:
+        """Remove multiple nodes in a single pass. The remaining nodes are renumbered once on completion"""
+        nodes = list(nodes)
+        self._flush()
+
+        removed_ids = []
         for node in nodes:
-            if node in self._nodes:
+            if node in self:
                 logging.debug(f"Removing {node}")
-                self._nodes.pop(self._nodes.index(node))
-                self.renumber()
+                removed_ids.append(node.id)
+                self._idmap.pop(node.id)
+                if self._grid is not None:
+                    self._grid.remove(node.p, node)
             else:
                 logging.error(f"'{node}' not found in node-container.")
 
+        if len(removed_ids) == 0:
+            return
+
+        keep = ~np.isin(self._ids, removed_ids)
+        self._nodes = list(compress(self._nodes, keep))
+        self._coords = self._coords[keep]
+        self._ids = self._ids[keep]
+        self._bbox = None
+
+        if renumber:
+            self.renumber()
+
     def remove_standalones(self) -> None:
         """Remove nodes that are without any usage references"""
-        self.remove(filter(lambda x: not x.has_refs, self._nodes))
+        self.remove(filter(lambda x: not x.has_refs, self.nodes))
 
-    def merge_coincident(self, tol: float = Settings.point_tol) -> None:
-        """
-        Merge nodes which are within the standard default of Nodes.get_by_volume. Nodes merged into the node connected
-        to most elements.
-        :return:
+    def merge_coincident(
+        self, tol: float = Settings.point_tol, update_refs: bool = True, renumber: bool = True
+    ) -> Dict[int, int]:
         """
+        Merge nodes which are within the point tolerance of each other in a single batched pass. Each group of
+        coincident nodes is merged into the node connected to most objects, and the remaining nodes are removed.
 
-        def replace_duplicate_nodes(duplicates: Iterable[Node], new_node: Node):
-            if duplicates and len(new_node.refs) >= np.max(list(map(lambda x: len(x.refs), duplicates))):
-                for duplicate_node in duplicates:
-                    replace_node(duplicate_node, new_node)
-                    self.remove(duplicate_node)
-
-        for node in filter(lambda x: x.has_refs, self._nodes):
-            duplicate_nodes = list(
-                sorted(
-                    filter(lambda x: x.id != node.id, self.get_by_volume(node.p, tol=tol)), key=lambda x: len(x.refs)
-                )
-            )
-            replace_duplicate_nodes(duplicate_nodes, node)
-
-        self._sort()
+        :param tol: Point tolerance
+        :param update_refs: Move the references of the removed nodes over to the node they are merged into. Set False
+                            when the merge map is applied in bulk, e.g. using FemElements.replace_nodes_by_map
+        :param renumber: Renumber the remaining nodes once the merged nodes are removed. Set False when the merge map
+                         is applied after the merge, as the map holds the node ids from before renumbering
+        :return: A map from the id of each removed node to the id of the node it was merged into
+        """
+        self._flush()
+        if len(self._nodes) < 2:
+            return dict()
+
+        pairs = get_coincident_pairs(self._coords, tol)
+        labels = get_clusters_from_pairs(len(self._nodes), pairs)
+        cluster_sizes = np.bincount(labels, minlength=len(labels))
+        members = np.flatnonzero(cluster_sizes[labels] > 1)
+        if len(members) == 0:
+            return dict()
+
+        num_refs = np.array([len(self._nodes[i].refs) for i in members])
+        order = np.lexsort((members, -num_refs, labels[members]))
+        members, num_refs = members[order], num_refs[order]
+        member_labels = labels[members]
+        is_main = np.ones(len(members), dtype=bool)
+        is_main[1:] = member_labels[1:] != member_labels[:-1]
+        main_of_member = members[is_main][np.cumsum(is_main) - 1]
+        has_refs = (num_refs[is_main] > 0)[np.cumsum(is_main) - 1]
+
+        merge_map = dict()
+        duplicates = []
+        for i, main_i in zip(members[~is_main & has_refs], main_of_member[~is_main & has_refs]):
+            duplicate_node, main_node = self._nodes[i], self._nodes[main_i]
+            if update_refs:
+                replace_node(duplicate_node, main_node)
+            merge_map[duplicate_node.id] = main_node.id
+            duplicates.append(duplicate_node)
+
+        self.remove_many(duplicates, renumber=renumber)
+
+        return merge_map
 
     def rounding_node_points(self, precision: int = Settings.precision) -> None:
         """Rounds all nodes to set precision"""
         for node in self.nodes:
             node.p_roundoff(precision=precision)
+        self._sort()
 
     @property
     def parent(self) -> Union[Part, FEM]:
@@ -1058,3 +1274,21 @@ class Nodes:
     @parent.setter
     def parent(self, value):
         self._parent = value
+
+
+def _is_lexsorted(coords: np.ndarray, ids: np.ndarray) -> bool:
+    """Check if the rows are sorted by (x, y, z, id) without sorting them"""
+    if len(coords) < 2:
+        return True
+
+    a, b = coords[:-1], coords[1:]
+    is_ordered = ids[1:] >= ids[:-1]
+    for i in (2, 1, 0):
+        is_ordered = (b[:, i] > a[:, i]) | ((b[:, i] == a[:, i]) & is_ordered)
+
+    return bool(np.all(is_ordered))
+
+
+def _lexsort_view(coords: np.ndarray) -> np.ndarray:
+    """Returns a structured view of a (n, 3) coordinate array which numpy compares lexicographically by (x, y, z)"""
+    return np.ascontiguousarray(coords, dtype=np.float64).view([("x", "f8"), ("y", "f8"), ("z", "f8")]).ravel()
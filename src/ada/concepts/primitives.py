@@ -79,6 +79,7 @@ class Shape(BackendGeom):
     @mass.setter
     def mass(self, value: float):
         self._mass = value
+        self._mark_modified()
 
     @property
     def cog(self) -> tuple[float, float, float]:
@@ -87,6 +88,7 @@ class Shape(BackendGeom):
     @cog.setter
     def cog(self, value: tuple[float, float, float]):
         self._cog = value
+        self._mark_modified()
 
     @property
     def bbox(self) -> BoundingBox:
@@ -154,6 +156,7 @@ class Shape(BackendGeom):
     @material.setter
     def material(self, value):
         self._material = value
+        self._mark_modified()
 
     @property
     def ifc_class(self) -> ShapeTypes:
@@ -65,6 +65,8 @@ _step_types = Union[StepSteadyState, StepEigen, StepImplicit, StepExplicit]
 
 logger = logging.getLogger(__name__)
 
+_PENDING_CHANGES = (ChangeAction.ADDED, ChangeAction.MODIFIED, ChangeAction.DELETED)
+
 
 @dataclass
 class _ConvertOptions:
@@ -111,6 +113,9 @@ class Part(BackendGeom):
         self._groups: dict[str, Group] = dict()
         self._ifc_class = ifc_class
         self._props = settings
+        self._cache_dirty = True
+        self._change_journal: dict[int, BackendGeom] = dict()
+        self._has_pending_changes = False
         if fem is not None:
             fem.parent = self
 
@@ -211,6 +216,7 @@ class Part(BackendGeom):
         if wall.units != self.units:
             wall.units = self.units
         wall.parent = self
+        wall.change_type = ChangeAction.ADDED
         self._walls.append(wall)
         return wall
 
@@ -480,18 +486,25 @@ class Part(BackendGeom):
         from ada import Beam
         from ada.fem import FemSection
 
+        # Only the parts with sections added since the last consolidation need to be merged into this part
+        parts = [p for p in self.get_all_parts_in_assembly(include_self=include_self) if len(p.sections) > 0]
+        if all(p is self for p in parts):
+            return self.sections.sections
+
         new_sections = Sections(parent=self)
         refs_num = 0
 
-        for sec in self.get_all_sections(include_self=include_self):
+        for sec in chain.from_iterable(p.sections.sections for p in parts):
             res = new_sections.add(sec)
             if res.guid != sec.guid:
                 refs = [r for r in sec.refs]
+                sec.refs.clear()
+                res_refs = set(map(id, res.refs))
                 for elem in refs:
                     refs_num += 1
-                    sec.refs.pop(sec.refs.index(elem))
-                    if elem not in res.refs:
+                    if id(elem) not in res_refs:
                         res.refs.append(elem)
+                        res_refs.add(id(elem))
                     if isinstance(elem, (Beam, FemSection)):
                         if isinstance(elem, Beam) and sec.guid == elem.taper.guid:
                             elem.taper = res
@@ -499,7 +512,7 @@ class Part(BackendGeom):
                     else:
                         raise NotImplementedError(f"Not yet support section {type(elem)=}")
 
-        for part in filter(lambda x: len(x.sections) > 0, self.get_all_parts_in_assembly(include_self=include_self)):
+        for part in parts:
             part.sections = Sections(parent=part)
 
         sec_map = {sec.guid: sec for sec in new_sections.sections}
@@ -522,29 +535,79 @@ class Part(BackendGeom):
         from ada import Beam, Pipe, PipeSegElbow, PipeSegStraight, Plate
         from ada.fem import FemSection
 
+        parts = [p for p in self.get_all_parts_in_assembly(include_self=include_self) if len(p.materials) > 0]
+        if all(p is self for p in parts):
+            return self.materials.materials
+
         num_elem_changed = 0
         new_materials = Materials(parent=self)
-        for mat in self.get_all_materials(include_self=include_self):
+        for mat in chain.from_iterable(p.materials.materials for p in parts):
             res = new_materials.add(mat)
             if res.guid != mat.guid:
                 refs = [r for r in mat.refs]
+                mat.refs.clear()
+                res_refs = set(map(id, res.refs))
                 for elem in refs:
-                    mat.refs.pop(mat.refs.index(elem))
-                    if elem not in res.refs:
+                    if id(elem) not in res_refs:
                         res.refs.append(elem)
+                        res_refs.add(id(elem))
                     if isinstance(elem, (Beam, Plate, FemSection, PipeSegStraight, PipeSegElbow, Pipe)):
                         elem.material = res
                         num_elem_changed += 1
                     else:
                         raise NotImplementedError(f"Not yet support section {type(elem)=}")
 
-        for part in filter(lambda x: len(x.materials) > 0, self.get_all_parts_in_assembly(include_self=include_self)):
+        for part in parts:
             part.materials = Materials(parent=part)
 
         self.materials = new_materials
 
         return self.materials.materials
 
+    def record_change(self, obj: BackendGeom) -> None:
+        """Keep track of the objects and subparts of this part with a pending change. Called when the change_type of
+        an object in this part is set"""
+        if obj.change_type in _PENDING_CHANGES:
+            self._cache_dirty = True
+
+        if isinstance(obj, BackendGeom) is False:
+            return
+
+        if obj.change_type not in _PENDING_CHANGES:
+            self._change_journal.pop(id(obj), None)
+            return
+
+        self._change_journal[id(obj)] = obj
+
+        # Flag the ancestors so that pop_changes only has to visit the subtrees with pending changes
+        part = self
+        while isinstance(part, Part) and part._has_pending_changes is False:
+            part._has_pending_changes = True
+            part = part.parent
+
+    def discard_change(self, obj: BackendGeom) -> None:
+        self._change_journal.pop(id(obj), None)
+
+    def pop_changes(self) -> list[BackendGeom]:
+        """Return the objects and subparts with a pending change in this part and its subparts and clear the change
+        journals. Parts are ordered before their subparts"""
+        changes = dict()
+        parts = [self]
+        while len(parts) > 0:
+            part = parts.pop()
+            if part._has_pending_changes is False:
+                continue
+
+            for obj in part._change_journal.values():
+                if obj.change_type in _PENDING_CHANGES:
+                    changes.setdefault(id(obj), obj)
+
+            part._change_journal = dict()
+            part._has_pending_changes = False
+            parts += reversed(part.parts.values())
+
+        return list(changes.values())
+
     def get_all_parts_in_assembly(self, include_self=False) -> list[Part]:
         parent = self.get_assembly()
         list_of_ps = []
@@ -593,12 +656,24 @@ class Part(BackendGeom):
         :param margins: Add margins to the volume box (equal in all directions). Input is in meters. Can be negative.
         :return: A map generator for the list of beams and resulting intersecting beams
         """
-        from ada.core.clash_check import basic_intersect
+        from ada.core.clash_check import get_beam_clash_candidates
 
         all_parts = self.get_all_subparts() + [self]
         all_beams = [bm for p in all_parts for bm in p.beams]
 
-        return filter(None, [basic_intersect(bm, margins, all_parts) for bm in all_beams])
+        return get_beam_clash_candidates(all_beams, margins)
+
+    def plate_clash_check(self, tol=1e-3) -> list[tuple[Plate, Plate]]:
+        """
+        For all plates in this part and its subparts get all pairs of plates which are touching or intersecting.
+
+        :param tol: Maximum distance between two plates for them to be considered touching
+        :return: A list of pairs of touching plates
+        """
+        from ada import Plate
+        from ada.core.clash_check import get_touching_plates
+
+        return get_touching_plates(self.get_all_physical_objects(by_type=Plate), tol)
 
     def move_all_mats_and_sec_here_from_subparts(self):
         for p in self.get_all_subparts():
@@ -630,9 +705,16 @@ class Part(BackendGeom):
         interactive=False,
         use_quads=False,
         use_hex=False,
+        cpus: int = None,
     ) -> FEM:
+        """Mesh all beams, plates and shapes in the part. Shapes with a mass are added as point masses.
+
+        :param cpus: Mesh groups of connected objects in this number of parallel gmsh processes. The groups are
+            merged by their coincident nodes. Default is to mesh all objects in a single gmsh session.
+        """
         from ada import Beam, Plate, Shape
-        from ada.fem.meshing import GmshOptions, GmshSession
+        from ada.fem.meshing import GmshOptions
+        from ada.fem.meshing.multisession import mesh_objects, mesh_objects_in_parallel
 
         if isinstance(bm_repr, str):
             bm_repr = GeomRepr.from_str(bm_repr)
@@ -643,29 +725,23 @@ class Part(BackendGeom):
 
         options = GmshOptions(Mesh_Algorithm=8) if options is None else options
         masses: list[Shape] = []
-        with GmshSession(silent=silent, options=options) as gs:
-            for obj in self.get_all_physical_objects(sub_elements_only=False):
-                if isinstance(obj, Beam):
-                    gs.add_obj(obj, geom_repr=bm_repr, build_native_lines=False)
-                elif isinstance(obj, Plate):
-                    gs.add_obj(obj, geom_repr=pl_repr)
-                elif issubclass(type(obj), Shape) and obj.mass is not None:
-                    masses.append(obj)
-                elif issubclass(type(obj), Shape):
-                    gs.add_obj(obj, geom_repr=shp_repr)
-                else:
-                    logger.error(f'Unsupported object type "{obj}". Should be either plate or beam objects')
-
-            # if interactive is True:
-            #     gs.open_gui()
-
-            gs.split_plates_by_beams()
-            gs.mesh(mesh_size, use_quads=use_quads, use_hex=use_hex)
-
-            if interactive is True:
-                gs.open_gui()
-
-            fem = gs.get_fem()
+        objects = []
+        for obj in self.get_all_physical_objects(sub_elements_only=False):
+            if isinstance(obj, Beam):
+                objects.append((obj, bm_repr))
+            elif isinstance(obj, Plate):
+                objects.append((obj, pl_repr))
+            elif issubclass(type(obj), Shape) and obj.mass is not None:
+                masses.append(obj)
+            elif issubclass(type(obj), Shape):
+                objects.append((obj, shp_repr))
+            else:
+                logger.error(f'Unsupported object type "{obj}". Should be either plate or beam objects')
+
+        if cpus is not None and cpus > 1 and interactive is False:
+            fem = mesh_objects_in_parallel(objects, mesh_size, options, cpus, use_quads=use_quads, use_hex=use_hex)
+        else:
+            fem = mesh_objects(objects, mesh_size, options, silent, interactive, use_quads=use_quads, use_hex=use_hex)
 
         for mass_shape in masses:
             cog_absolute = mass_shape.placement.absolute_placement() + mass_shape.cog
@@ -683,11 +759,14 @@ class Part(BackendGeom):
         auto_sync_ifc_store=True,
         use_experimental=True,
         cpus: int = None,
+        use_cache=False,
+        cache_file=None,
     ) -> VisMesh:
         from ada.visualize.interface import part_to_vis_mesh, part_to_vis_mesh2
 
         if use_experimental:
-            return part_to_vis_mesh2(self, auto_sync_ifc_store, cpus=cpus)
+            use_cache = use_cache or (export_config is not None and export_config.use_cache)
+            return part_to_vis_mesh2(self, auto_sync_ifc_store, cpus, use_cache, overwrite_cache, cache_file)
         else:
             return part_to_vis_mesh(self, auto_sync_ifc_store, export_config, opt_func, merge_by_color, overwrite_cache)
 
@@ -747,6 +826,22 @@ class Part(BackendGeom):
     def fem(self, value: FEM):
         value.parent = self
         self._fem = value
+        self._cache_dirty = True
+
+    @property
+    def is_cache_dirty(self) -> bool:
+        """True if the part content has changed since it was last written to or read from the cache.
+
+        The flag is set by the methods and property setters which add, remove or modify objects in the part or its FEM.
+        Edits which bypass them, such as moving a node by assigning its coordinates, must be flagged using
+        mark_cache_dirty()"""
+        return self._cache_dirty
+
+    def mark_cache_dirty(self) -> None:
+        self._cache_dirty = True
+
+    def mark_cache_clean(self) -> None:
+        self._cache_dirty = False
 
     @property
     def connections(self) -> Connections:
@@ -828,9 +923,13 @@ class Part(BackendGeom):
             for p in self.get_all_subparts():
                 p.units = value
 
+            # Node coordinates are scaled by their owning objects. Update the sorted coordinate arrays accordingly
+            self.nodes._sort()
+
             self.sections.units = value
             self.materials.units = value
             self._units = value
+            self._cache_dirty = True
 
             if isinstance(self, Assembly):
                 from ada.ifc.utils import assembly_to_ifc_file
@@ -1176,9 +1275,7 @@ class Assembly(Part):
                             ref.nodes.pop(index)
                             ref.nodes.insert(index, replace_node)
                         elif isinstance(ref, FemSet):
-                            index = ref.members.index(n)
-                            ref.members.pop(index)
-                            ref.members.insert(index, replace_node)
+                            ref.replace_member(n, replace_node)
                         else:
                             raise NotImplementedError(f'Unsupported type "{type(ref)}"')
                     break
@@ -364,6 +364,7 @@ class Beam(BackendGeom):
     @section.setter
     def section(self, value: Section):
         self._section = value
+        self._mark_modified()
 
     @property
     def taper(self) -> Section:
@@ -372,6 +373,7 @@ class Beam(BackendGeom):
     @taper.setter
     def taper(self, value: Section):
         self._taper = value
+        self._mark_modified()
 
     @property
     def material(self) -> Material:
@@ -380,6 +382,7 @@ class Beam(BackendGeom):
     @material.setter
     def material(self, value: Material):
         self._material = value
+        self._mark_modified()
 
     @property
     def member_type(self):
@@ -466,6 +469,7 @@ class Beam(BackendGeom):
         self._n1.remove_obj_from_refs(self)
         self._n1 = new_node.get_main_node_at_point()
         self._n1.add_obj_to_refs(self)
+        self._mark_modified()
 
     @property
     def n2(self) -> Node:
@@ -476,6 +480,7 @@ class Beam(BackendGeom):
         self._n2.remove_obj_from_refs(self)
         self._n2 = new_node.get_main_node_at_point()
         self._n2.add_obj_to_refs(self)
+        self._mark_modified()
 
     @property
     def bbox(self) -> BoundingBox:
@@ -492,6 +497,7 @@ class Beam(BackendGeom):
     @e1.setter
     def e1(self, value):
         self._e1 = np.array(value)
+        self._mark_modified()
 
     @property
     def e2(self) -> np.ndarray:
@@ -500,6 +506,7 @@ class Beam(BackendGeom):
     @e2.setter
     def e2(self, value):
         self._e2 = np.array(value)
+        self._mark_modified()
 
     @property
     def hinge_prop(self) -> HingeProp:
@@ -513,6 +520,7 @@ class Beam(BackendGeom):
         if value.end2 is not None:
             value.end2.concept_node = self.n2
         self._hinge_prop = value
+        self._mark_modified()
 
     @property
     def curve(self) -> CurvePoly:
@@ -558,6 +566,7 @@ class Beam(BackendGeom):
     @angle.setter
     def angle(self, value: float):
         self._init_orientation(value)
+        self._mark_modified()
 
     @property
     def vector(self) -> np.ndarray:
@@ -162,6 +162,7 @@ class Wall(BackendGeom):
     @placement.setter
     def placement(self, value: Placement):
         self._placement = value
+        self._mark_modified()
 
     @property
     def points(self):
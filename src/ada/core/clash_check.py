@@ -4,11 +4,13 @@ import logging
 import traceback
 from dataclasses import dataclass
 from itertools import chain
-from typing import Iterable, List
+from typing import Any, Iterable, List, Tuple
 
 import numpy as np
 
 from ada import Assembly, Beam, Node, Part, Pipe, PipeSegStraight, Plate, PrimCyl
+from ada.config import Settings
+from ada.sections.categories import BaseTypes
 
 from .utils import Counter
 from .vector_utils import EquationOfPlane, intersect_calc, is_parallel, vector_length
@@ -30,6 +32,176 @@ def basic_intersect(bm: Beam, margins, all_parts: [Part]):
     return bm, beams
 
 
+class BoundingVolumeHierarchy:
+    """A static axis aligned bounding box hierarchy (BVH) over a list of items.
+
+    The tree is built top-down by splitting the items at the median of the box centres along the longest axis. All
+    queries traverse the tree for many boxes at once using numpy arrays, so that finding all overlapping pairs among n
+    objects is O(n log n + k) where k is the number of overlapping pairs."""
+
+    def __init__(self, boxes_min: np.ndarray, boxes_max: np.ndarray, items: List[Any] = None, leaf_size: int = 8):
+        self.boxes_min = np.asarray(boxes_min, dtype=np.float64).reshape(-1, 3)
+        self.boxes_max = np.asarray(boxes_max, dtype=np.float64).reshape(-1, 3)
+        self.items = list(range(len(self.boxes_min))) if items is None else list(items)
+        if len(self.items) != len(self.boxes_min) or len(self.boxes_min) != len(self.boxes_max):
+            raise ValueError("Unequal number of items, box minimums and box maximums")
+
+        self._leaf_size = leaf_size
+        self._build()
+
+    @staticmethod
+    def from_objects(objects: Iterable[Any], margins: float = 0.0) -> BoundingVolumeHierarchy:
+        """Build the hierarchy from the bounding boxes of physical objects. Objects without a bbox are skipped"""
+        items, boxes_min, boxes_max = [], [], []
+        for obj in objects:
+            res = get_object_bbox(obj)
+            if res is None:
+                continue
+            items.append(obj)
+            boxes_min.append(res[0])
+            boxes_max.append(res[1])
+
+        boxes_min = np.array(boxes_min, dtype=np.float64).reshape(-1, 3) - margins
+        boxes_max = np.array(boxes_max, dtype=np.float64).reshape(-1, 3) + margins
+        return BoundingVolumeHierarchy(boxes_min, boxes_max, items)
+
+    def _build(self):
+        num_items = len(self.items)
+        centres = (self.boxes_min + self.boxes_max) / 2
+        self._order = np.arange(num_items)
+
+        node_min, node_max, left, right, start, count = [], [], [], [], [], []
+
+        def new_node(s, c):
+            idx = self._order[s : s + c]
+            node_min.append(self.boxes_min[idx].min(axis=0) if c > 0 else np.zeros(3))
+            node_max.append(self.boxes_max[idx].max(axis=0) if c > 0 else np.zeros(3))
+            left.append(-1)
+            right.append(-1)
+            start.append(s)
+            count.append(c)
+            return len(left) - 1
+
+        stack = [new_node(0, num_items)]
+        while stack:
+            node = stack.pop()
+            s, c = start[node], count[node]
+            if c <= self._leaf_size:
+                continue
+
+            idx = self._order[s : s + c]
+            axis = int(np.argmax(np.ptp(centres[idx], axis=0)))
+            mid = c // 2
+            split = np.argpartition(centres[idx, axis], mid)
+            self._order[s : s + c] = idx[split]
+
+            left[node] = new_node(s, mid)
+            right[node] = new_node(s + mid, c - mid)
+            stack += [left[node], right[node]]
+
+        self._node_min = np.array(node_min).reshape(-1, 3)
+        self._node_max = np.array(node_max).reshape(-1, 3)
+        self._left = np.array(left, dtype=np.int64)
+        self._right = np.array(right, dtype=np.int64)
+        self._start = np.array(start, dtype=np.int64)
+        self._count = np.array(count, dtype=np.int64)
+
+    def query_boxes(self, boxes_min: np.ndarray, boxes_max: np.ndarray) -> np.ndarray:
+        """Returns all (query index, item index) pairs where the query box overlaps the bounding box of the item"""
+        boxes_min = np.asarray(boxes_min, dtype=np.float64).reshape(-1, 3)
+        boxes_max = np.asarray(boxes_max, dtype=np.float64).reshape(-1, 3)
+        if len(self.items) == 0 or len(boxes_min) == 0:
+            return np.empty((0, 2), dtype=np.int64)
+
+        queries = np.arange(len(boxes_min))
+        nodes = np.zeros(len(boxes_min), dtype=np.int64)
+        result = []
+        while len(queries) > 0:
+            overlaps = np.all(boxes_min[queries] <= self._node_max[nodes], axis=1)
+            overlaps &= np.all(boxes_max[queries] >= self._node_min[nodes], axis=1)
+            queries, nodes = queries[overlaps], nodes[overlaps]
+
+            is_leaf = self._left[nodes] == -1
+            leaf_queries, leaf_nodes = queries[is_leaf], nodes[is_leaf]
+            counts = self._count[leaf_nodes]
+            local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            items = self._order[np.repeat(self._start[leaf_nodes], counts) + local]
+            item_queries = np.repeat(leaf_queries, counts)
+
+            overlaps = np.all(boxes_min[item_queries] <= self.boxes_max[items], axis=1)
+            overlaps &= np.all(boxes_max[item_queries] >= self.boxes_min[items], axis=1)
+            result.append(np.column_stack((item_queries[overlaps], items[overlaps])))
+
+            queries, nodes = queries[~is_leaf], nodes[~is_leaf]
+            queries = np.concatenate((queries, queries))
+            nodes = np.concatenate((self._left[nodes], self._right[nodes]))
+
+        return np.concatenate(result) if len(result) > 0 else np.empty((0, 2), dtype=np.int64)
+
+    def query(self, vol_min: Iterable[float], vol_max: Iterable[float]) -> List[Any]:
+        """Returns all items with a bounding box overlapping the box [vol_min, vol_max]"""
+        pairs = self.query_boxes(np.array([vol_min]), np.array([vol_max]))
+        return [self.items[i] for i in np.sort(pairs[:, 1])]
+
+    def get_overlapping_pairs(self) -> np.ndarray:
+        """Returns all index pairs (i, j) with i < j of items with overlapping bounding boxes"""
+        pairs = self.query_boxes(self.boxes_min, self.boxes_max)
+        pairs = pairs[pairs[:, 0] < pairs[:, 1]]
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def get_overlapping_items(self) -> Iterable[Tuple[Any, Any]]:
+        """Returns all pairs of items with overlapping bounding boxes"""
+        return ((self.items[i], self.items[j]) for i, j in self.get_overlapping_pairs())
+
+    def __len__(self):
+        return len(self.items)
+
+
+def get_object_bbox(obj) -> Tuple[np.ndarray, np.ndarray] | None:
+    """Returns the (min, max) corners of the bounding box of a physical object or None if it cannot be evaluated"""
+    if isinstance(obj, PipeSegStraight):
+        r = obj.section.r
+        points = np.array([obj.p1.p, obj.p2.p], dtype=np.float64)
+        return points.min(axis=0) - r, points.max(axis=0) + r
+
+    if isinstance(obj, Beam) and obj.section.type in (BaseTypes.GENERAL, "gensec"):
+        # The outline of a general section is unknown. The beam axis is used as its bounding box
+        points = np.array([obj.n1.p, obj.n2.p], dtype=np.float64)
+        return points.min(axis=0), points.max(axis=0)
+
+    try:
+        bbox = obj.bbox
+        return np.array(bbox.p1, dtype=np.float64), np.array(bbox.p2, dtype=np.float64)
+    except (AttributeError, NotImplementedError, ValueError) as e:
+        logging.debug(f'Unable to get bounding box of "{obj}". Skipping. Error "{e}"')
+        return None
+
+
+def get_beam_clash_candidates(beams: Iterable[Beam], margins=5e-5) -> List[Tuple[Beam, List[Beam]]]:
+    """For each beam return all beams with an end node within the bounding box of the beam. The candidates are found
+    using a BVH built once over all beams."""
+    bvh = BoundingVolumeHierarchy.from_objects(beams)
+    candidates = [[] for _ in bvh.items]
+    for i, j in bvh.query_boxes(bvh.boxes_min - margins, bvh.boxes_max + margins):
+        if i == j:
+            continue
+        other = bvh.items[j]
+        vmin, vmax = bvh.boxes_min[i] - margins, bvh.boxes_max[i] + margins
+        for n in (other.n1.p, other.n2.p):
+            if np.all(n >= vmin) and np.all(n <= vmax):
+                candidates[i].append(other)
+                break
+
+    return list(zip(bvh.items, candidates))
+
+
+def get_touching_plates(plates: Iterable[Plate], tol=1e-3) -> List[Tuple[Plate, Plate]]:
+    """Return all pairs of plates which are within the tolerance of each other. Only plates with overlapping bounding
+    boxes are checked for their minimal distance"""
+    bvh = BoundingVolumeHierarchy.from_objects(plates, margins=tol)
+    return [(pl1, pl2) for pl1, pl2 in bvh.get_overlapping_items() if are_plates_touching(pl1, pl2, tol) is not None]
+
+
 def beam_cross_check(bm1: Beam, bm2: Beam, outofplane_tol=0.1):
     """Calculate intersection of beams and return point, s, t"""
     p_check = is_parallel
@@ -172,27 +344,31 @@ class PipeClash:
 
     @staticmethod
     def pipe_penetration_check(a: Assembly) -> list[PipeClash]:
-        plates = list(a.get_all_physical_objects(by_type=Plate))
+        plates = BoundingVolumeHierarchy.from_objects(a.get_all_physical_objects(by_type=Plate))
         pipes = list(a.get_all_physical_objects(by_type=Pipe))
         pipe_segments = []
         for pipe in pipes:
             pipe_segments += list(filter(lambda x: isinstance(x, PipeSegStraight), pipe.segments))
 
-        clashes = []
+        seg_boxes = [get_object_bbox(seg) for seg in pipe_segments]
+        seg_min = np.array([b[0] for b in seg_boxes]).reshape(-1, 3)
+        seg_max = np.array([b[1] for b in seg_boxes]).reshape(-1, 3)
 
-        for seg in pipe_segments:
+        clashes = []
+        for seg_i, pl_i in plates.query_boxes(seg_min - Settings.point_tol, seg_max + Settings.point_tol):
+            seg = pipe_segments[seg_i]
+            plate = plates.items[pl_i]
             p1 = seg.p1.p
             p2 = seg.p2.p
-            for plate in plates:
-                origin = plate.placement.origin
-                normal = plate.placement.zdir
-
-                v1 = (p1 - origin) * normal
-                v2 = (p2 - origin) * normal
-                is_clashing = np.dot(v1, v2) < 0
-                if is_clashing:
-                    print(f"{seg.name=} {is_clashing=} with {plate.name=}")
-                    clashes.append(PipeClash(seg, plate))
+            origin = plate.placement.origin
+            normal = plate.placement.zdir
+
+            v1 = (p1 - origin) * normal
+            v2 = (p2 - origin) * normal
+            is_clashing = np.dot(v1, v2) < 0
+            if is_clashing:
+                logging.debug(f"{seg.name=} {is_clashing=} with {plate.name=}")
+                clashes.append(PipeClash(seg, plate))
         return clashes
 
     def reinforce_plate_pipe_pen(self, add_to_layer: str = None):
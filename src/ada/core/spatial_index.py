@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import math
+from itertools import product
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# The 13 neighbouring cell offsets in the positive half of a 3x3x3 neighbourhood. Together with the cell itself they
+# cover every unordered pair of neighbouring cells exactly once.
+_HALF_NEIGHBOURHOOD = [off for off in product((-1, 0, 1), repeat=3) if off > (0, 0, 0)]
+
+
+class PointHashGrid:
+    """A uniform hash grid of points for constant time point tolerance lookups.
+
+    Items are bucketed by the integer cell index of their coordinate. Queries return the items of all cells overlapping
+    the search box, and the caller is responsible for any exact filtering of the candidates."""
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0.0:
+            raise ValueError(f"Cell size must be positive. Got {cell_size}")
+
+        self._cell_size = cell_size
+        self._cells: Dict[Tuple[int, int, int], List[Any]] = dict()
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    def _cell(self, p: Iterable[float]) -> Tuple[int, int, int]:
+        c = self._cell_size
+        x, y, z = p
+        return math.floor(x / c), math.floor(y / c), math.floor(z / c)
+
+    def insert(self, p: Iterable[float], item: Any) -> None:
+        self._cells.setdefault(self._cell(p), []).append(item)
+
+    def insert_many(self, points: np.ndarray, items: Iterable[Any]) -> None:
+        keys = np.floor(np.asarray(points, dtype=np.float64) / self._cell_size).astype(np.int64)
+        cells = self._cells
+        for key, item in zip(map(tuple, keys.tolist()), items):
+            cells.setdefault(key, []).append(item)
+
+    def remove(self, p: Iterable[float], item: Any) -> None:
+        key = self._cell(p)
+        cell = self._cells.get(key, None)
+        if cell is None:
+            return
+
+        for i, existing in enumerate(cell):
+            if existing is item:
+                cell.pop(i)
+                break
+
+        if len(cell) == 0:
+            self._cells.pop(key)
+
+    def query(self, vol_min: Iterable[float], vol_max: Iterable[float]) -> List[Any]:
+        """Returns all items in cells overlapping the axis aligned box [vol_min, vol_max]"""
+        (x0, y0, z0), (x1, y1, z1) = self._cell(vol_min), self._cell(vol_max)
+        result = []
+        cells = self._cells
+        for key in product(range(x0, x1 + 1), range(y0, y1 + 1), range(z0, z1 + 1)):
+            cell = cells.get(key, None)
+            if cell is not None:
+                result += cell
+        return result
+
+    def __len__(self):
+        return sum(len(cell) for cell in self._cells.values())
+
+
+def get_coincident_pairs(coords: np.ndarray, tol: float) -> np.ndarray:
+    """Returns all index pairs (i, j) with i < j of points which are within the tolerance along every axis.
+
+    The points are bucketed in a uniform grid with the tolerance as cell size, so that only points in neighbouring
+    cells have to be compared. All steps are vectorized."""
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    num_points = len(coords)
+    if num_points < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    keys = np.floor(coords / tol).astype(np.int64)
+    order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+    sorted_keys = keys[order]
+
+    is_new_cell = np.ones(num_points, dtype=bool)
+    is_new_cell[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+    starts = np.flatnonzero(is_new_cell)
+    counts = np.diff(np.append(starts, num_points))
+    cell_keys = sorted_keys[starts]
+    cell_view = _int_lexsort_view(cell_keys)
+
+    pairs = []
+    for offset in [(0, 0, 0)] + _HALF_NEIGHBOURHOOD:
+        if offset == (0, 0, 0):
+            src = np.flatnonzero(counts > 1)
+            dst = src
+        else:
+            target = _int_lexsort_view(cell_keys + np.array(offset, dtype=np.int64))
+            pos = np.searchsorted(cell_view, target)
+            pos[pos == len(cell_view)] = 0
+            is_found = cell_view[pos] == target
+            src = np.flatnonzero(is_found)
+            dst = pos[is_found]
+
+        if len(src) == 0:
+            continue
+
+        ia, ib = _cross_product_indices(starts[src], counts[src], starts[dst], counts[dst])
+        if offset == (0, 0, 0):
+            is_upper = ia < ib
+            ia, ib = ia[is_upper], ib[is_upper]
+
+        pairs.append(np.column_stack((order[ia], order[ib])))
+
+    if len(pairs) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    pairs = np.concatenate(pairs)
+    is_within_tol = np.all(np.abs(coords[pairs[:, 0]] - coords[pairs[:, 1]]) <= tol, axis=1)
+    pairs = np.sort(pairs[is_within_tol], axis=1)
+
+    return pairs
+
+
+def get_clusters_from_pairs(num_points: int, pairs: np.ndarray) -> np.ndarray:
+    """Returns a cluster label per point where connected points share the lowest point index in their cluster"""
+    labels = np.arange(num_points)
+    if len(pairs) == 0:
+        return labels
+
+    i, j = pairs[:, 0], pairs[:, 1]
+    while True:
+        lowest = np.minimum(labels[i], labels[j])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, i, lowest)
+        np.minimum.at(new_labels, j, lowest)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+def _cross_product_indices(
+    starts_a: np.ndarray, counts_a: np.ndarray, starts_b: np.ndarray, counts_b: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns index arrays of all combinations of the index ranges a and b for each pair of ranges"""
+    sizes = counts_a * counts_b
+    offsets = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    local = np.arange(sizes.sum()) - offsets
+    counts_b_rep = np.repeat(counts_b, sizes)
+
+    ia = np.repeat(starts_a, sizes) + local // counts_b_rep
+    ib = np.repeat(starts_b, sizes) + local % counts_b_rep
+    return ia, ib
+
+
+def _int_lexsort_view(keys: np.ndarray) -> np.ndarray:
+    """Returns a structured view of a (n, 3) integer array which numpy compares lexicographically"""
+    return np.ascontiguousarray(keys, dtype=np.int64).view([("x", "i8"), ("y", "i8"), ("z", "i8")]).ravel()
@@ -302,6 +302,41 @@ def closest_val_in_dict(val: Union[int, float], dct: Dict[Union[int, float], Any
     return dct[dct_index]
 
 
+def map_ids(ids: np.ndarray, renumber_map: Union[dict, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized lookup of new ids from a renumbering map.
+    :param ids: Array of the ids to look up
+    :param renumber_map: Either a dictionary {old_id: new_id} or an (n, 2) array of [old_id, new_id] rows
+    :return: Array of the new ids in the order of the input ids. Raises a KeyError if an id is not in the map
+    """
+    ids = np.asarray(ids)
+    if ids.dtype.kind not in "iu":
+        # Missing ids (None) become NaN, which would otherwise be cast to an arbitrary integer
+        ids = np.asarray(ids, dtype=np.float64)
+        if not np.all(np.isfinite(ids)):
+            raise ValueError("Unable to map missing or non-finite ids")
+    ids = ids.astype(np.int64)
+    if isinstance(renumber_map, dict):
+        renumber_map = np.array(list(renumber_map.items()), dtype=np.int64)
+
+    renumber_map = np.asarray(renumber_map, dtype=np.int64).reshape(-1, 2)
+    order = np.argsort(renumber_map[:, 0], kind="stable")
+    old_ids = renumber_map[order, 0]
+    new_ids = renumber_map[order, 1]
+
+    if len(old_ids) == 0:
+        if len(ids) > 0:
+            raise KeyError(int(ids[0]))
+        return ids.copy()
+
+    pos = np.minimum(np.searchsorted(old_ids, ids), len(old_ids) - 1)
+    missing = old_ids[pos] != ids
+    if np.any(missing):
+        raise KeyError(int(ids[np.argmax(missing)]))
+
+    return new_ids[pos]
+
+
 def flatten(t):
     return [item for sublist in t for item in sublist]
 
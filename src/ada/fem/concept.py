@@ -86,12 +86,19 @@ class FEM:
 
         self._options = FemOptions()
 
+    def mark_cache_dirty(self) -> None:
+        """Flag a change of the FEM to the part it belongs to"""
+        if self.parent is not None:
+            self.parent.mark_cache_dirty()
+
     def add_elem(self, elem: Elem) -> Elem:
+        self.mark_cache_dirty()
         elem.parent = self
         self.elements.add(elem)
         return elem
 
     def add_section(self, section: FemSection) -> FemSection:
+        self.mark_cache_dirty()
         section.parent = self
         if section.elset.parent is None:
             if section.elset.name in self.elsets.keys():
@@ -107,6 +114,7 @@ class FEM:
         return section
 
     def add_bc(self, bc: Bc) -> Bc:
+        self.mark_cache_dirty()
         if bc.name in [b.name for b in self.bcs]:
             raise ValueError(f'BC with name "{bc.name}" already exists')
 
@@ -119,6 +127,7 @@ class FEM:
         return bc
 
     def add_mass(self, mass: Mass) -> Tuple[Mass, FemSet]:
+        self.mark_cache_dirty()
         mass.parent = self
         self.elements.add(mass)
         elset = self.sets.add(FemSet(mass.name + "_set", [mass], "elset"))
@@ -143,6 +152,7 @@ class FEM:
         :param single_member: Set True if you wish to keep only a single member
         :param tol: Point Tolerances. Default is 1e-4
         """
+        self.mark_cache_dirty()
         fem_set.parent = self
 
         def append_members(nodelist):
@@ -177,6 +187,7 @@ class FEM:
 
     def add_step(self, step: _step_types) -> _step_types:
         """Add an analysis step to the assembly"""
+        self.mark_cache_dirty()
         from ada.fem.steps import Step
 
         if len(self.steps) > 0:
@@ -192,11 +203,13 @@ class FEM:
         return step
 
     def add_interaction_property(self, int_prop: InteractionProperty) -> InteractionProperty:
+        self.mark_cache_dirty()
         int_prop.parent = self
         self.intprops[int_prop.name] = int_prop
         return int_prop
 
     def add_interaction(self, interaction: Interaction) -> Interaction:
+        self.mark_cache_dirty()
         interaction.parent = self
         self.interactions[interaction.name] = interaction
         if interaction.interaction_property.parent is None:
@@ -204,6 +217,7 @@ class FEM:
         return interaction
 
     def add_constraint(self, constraint: Constraint) -> Constraint:
+        self.mark_cache_dirty()
         constraint.parent = self
         if constraint.m_set.parent is None:
             self.add_set(constraint.m_set)
@@ -215,6 +229,7 @@ class FEM:
         return constraint
 
     def add_lcsys(self, lcsys: Csys) -> Csys:
+        self.mark_cache_dirty()
         if lcsys.name in self.lcsys.keys():
             raise ValueError("Local Coordinate system cannot have duplicate name")
         lcsys.parent = self
@@ -222,11 +237,13 @@ class FEM:
         return lcsys
 
     def add_connector_section(self, connector_section: ConnectorSection) -> ConnectorSection:
+        self.mark_cache_dirty()
         connector_section.parent = self
         self.connector_sections[connector_section.name] = connector_section
         return connector_section
 
     def add_connector(self, connector: Connector) -> Connector:
+        self.mark_cache_dirty()
         connector.parent = self
         self.elements.add(connector)
         connector.csys.parent = self
@@ -237,6 +254,7 @@ class FEM:
 
     def add_rp(self, name: str, node: Node):
         """Adds a reference point in assembly with a specific name"""
+        self.mark_cache_dirty()
         node.parent = self
         node_ = self.ref_points.add(node)
         fem_set = self.ref_sets.add(FemSet(name, [node_], "nset", parent=self))
@@ -244,21 +262,25 @@ class FEM:
         return node_, fem_set
 
     def add_surface(self, surface: Surface) -> Surface:
+        self.mark_cache_dirty()
         surface.parent = self
         self.surfaces[surface.name] = surface
         return surface
 
     def add_amplitude(self, amplitude: Amplitude) -> Amplitude:
+        self.mark_cache_dirty()
         amplitude.parent = self
         self.amplitudes[amplitude.name] = amplitude
         return amplitude
 
     def add_predefined_field(self, pre_field: PredefinedField) -> PredefinedField:
+        self.mark_cache_dirty()
         pre_field.parent = self
         self.predefined_fields[pre_field.name] = pre_field
         return pre_field
 
     def add_spring(self, spring: Spring) -> Spring:
+        self.mark_cache_dirty()
         if spring.fem_set.parent is None:
             self.sets.add(spring.fem_set)
         self.springs[spring.name] = spring
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pathlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Tuple, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FieldInfo:
+    """Index entry of a single result field at a single step.
+
+    :param offset: Location of the field data in the result file. A byte offset for flat files or a dataset path for
+        HDF5 based result files."""
+
+    name: str
+    step: int
+    step_value: float
+    components: Tuple[str, ...]
+    shape: Tuple[int, ...]
+    offset: Union[int, str]
+    location: str = "point"
+
+
+class FieldStore:
+    """Base class for lazy, step-indexed access to the result fields of a result file.
+
+    Subclasses build a lightweight index of all fields on first access and read a single field on demand. Fields are
+    returned as arrays aligned with node_ids. Nodes without a value are set to NaN"""
+
+    def __init__(self, file_ref: str | pathlib.Path):
+        self.file_ref = pathlib.Path(file_ref)
+        self._index = None
+
+    def _build_index(self) -> List[FieldInfo]:
+        raise NotImplementedError()
+
+    def read(self, info: FieldInfo) -> np.ndarray:
+        raise NotImplementedError()
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        raise NotImplementedError()
+
+    @property
+    def fem_format(self) -> str | None:
+        """The FEM format of the analysis if it is stored in the result file"""
+        return None
+
+    def get_mesh(self) -> Tuple[np.ndarray, List[Tuple[str, np.ndarray]]]:
+        """Returns the node coordinates aligned with node_ids, and the cells as (meshio cell type, node indices)"""
+        raise NotImplementedError()
+
+    @property
+    def index(self) -> List[FieldInfo]:
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    @property
+    def steps(self) -> List[int]:
+        return sorted({info.step for info in self.index})
+
+    @property
+    def field_names(self) -> List[str]:
+        return list(dict.fromkeys(info.name for info in self.index))
+
+    def get_info(self, name: str, step: int = None) -> FieldInfo:
+        """Returns the index entry of a field. If step is None the last step containing the field is returned"""
+        candidates = [info for info in self.index if info.name == name]
+        if len(candidates) == 0:
+            raise KeyError(f'Field "{name}" not found. Available fields are {self.field_names}')
+
+        if step is None:
+            return max(candidates, key=lambda x: x.step)
+
+        for info in candidates:
+            if info.step == step:
+                return info
+
+        raise KeyError(f'Field "{name}" has no results at step {step}')
+
+    def get_node_indices(self, node_ids) -> np.ndarray:
+        """Returns the row indices of the given node ids in the arrays returned by read()"""
+        all_ids = self.node_ids
+        order = np.argsort(all_ids, kind="stable")
+        sorted_ids = all_ids[order]
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        pos = np.searchsorted(sorted_ids, node_ids).clip(max=max(len(sorted_ids) - 1, 0))
+        if len(sorted_ids) == 0 or np.any(sorted_ids[pos] != node_ids):
+            raise KeyError("One or more node ids are not part of the result mesh")
+        return order[pos]
+
+
+class FieldCache:
+    """A small least recently used cache of loaded result fields"""
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+
+    def get(self, key: Hashable, load_func: Callable[[], np.ndarray]) -> np.ndarray:
+        if key in self._data:
+            self._data.move_to_end(key)
+            return self._data[key]
+
+        value = load_func()
+        if self.maxsize > 0:
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
@@ -12,11 +12,11 @@ import numpy as np
 
 from ada.concepts.containers import Materials
 from ada.concepts.points import Node
-from ada.core.utils import Counter
+from ada.core.utils import Counter, map_ids
 from ada.fem.elements import Connector, Elem, Mass, MassTypes
 from ada.fem.exceptions.model_definition import FemSetNameExists
 from ada.fem.sections import FemSection
-from ada.fem.sets import FemSet, SetTypes
+from ada.fem.sets import FemSet, SetTypes, reset_set_indices
 from ada.fem.shapes import ElemType
 from ada.materials import Material
 from ada.sections import Section
@@ -50,6 +50,27 @@ class COG:
         return self.p[2]
 
 
+_ELEM_CATEGORIES = ("stru_elements", "solids", "shell", "lines", "connectors", "masses")
+
+
+def get_elem_categories(elem: Union[Elem, Connector, Mass]) -> List[str]:
+    """The type filtered views of FemElements the element belongs to"""
+    categories = []
+    if isinstance(elem, Mass):
+        categories.append("masses")
+    if elem.type == ElemType.CONNECTOR_SHAPES.CONNECTOR:
+        categories.append("connectors")
+    if elem.type not in ("MASS", "SPRING1", "CONNECTOR"):
+        categories.append("stru_elements")
+        if elem.type in Elem.EL_TYPES.SOLID_SHAPES.all:
+            categories.append("solids")
+        if elem.type in Elem.EL_TYPES.SHELL_SHAPES.all:
+            categories.append("shell")
+        if elem.type in Elem.EL_TYPES.LINE_SHAPES.all:
+            categories.append("lines")
+    return categories
+
+
 class FemElements:
     """Container class for FEM elements"""
 
@@ -61,15 +82,45 @@ class FemElements:
             elements = self.elements_from_array(from_np_array)
 
         self._elements = list(sorted(elements, key=attrgetter("id"))) if elements is not None else []
-        self._idmap = {e.id: e for e in self._elements} if len(self._elements) > 0 else dict()
 
         if len(self._idmap) != len(self._elements):
             raise ValueError("Unequal length of idmap and elements. Might indicate doubly defined element id's")
 
-        self._by_types = None
-        self._group_by_types()
-
-    def renumber(self, start_id=1, renumber_map: dict = None):
+    @property
+    def _elements(self) -> List[Union[Elem, Connector, Mass]]:
+        if self._element_list is None:
+            self._element_list = list(self._element_map.values())
+        return self._element_list
+
+    @_elements.setter
+    def _elements(self, value: List[Union[Elem, Connector, Mass]]):
+        # The elements are stored in insertion order, keyed on the object identity, so that they can be removed in O(1)
+        self._element_map = {id(el): el for el in value}
+        self._element_list = list(value)
+        self._idmap = {e.id: e for e in value}
+        self._type_index: Dict[str, Dict[int, Elem]] = dict()
+        self._category_index: Dict[str, Dict[int, Elem]] = {category: dict() for category in _ELEM_CATEGORIES}
+        for el in self._element_list:
+            self._add_to_indexes(el)
+
+    def _add_to_indexes(self, elem: Union[Elem, Connector, Mass]):
+        self._type_index.setdefault(elem.type, dict())[id(elem)] = elem
+        for category in get_elem_categories(elem):
+            self._category_index[category][id(elem)] = elem
+
+    def _remove_from_indexes(self, elem: Union[Elem, Connector, Mass]):
+        type_index = self._type_index[elem.type]
+        type_index.pop(id(elem))
+        if len(type_index) == 0:
+            self._type_index.pop(elem.type)
+        for category in get_elem_categories(elem):
+            self._category_index[category].pop(id(elem))
+
+    def _iter_category(self, category: str) -> Iterable[Elem]:
+        # Iterate over a copy so that elements can be added while iterating
+        return iter(list(self._category_index[category].values()))
+
+    def renumber(self, start_id=1, renumber_map: Union[dict, np.ndarray] = None):
         """Ensures that the node numberings starts at 1 and has no holes in its numbering."""
         if renumber_map is not None:
             self._renumber_from_map(renumber_map)
@@ -77,14 +128,17 @@ class FemElements:
             self._renumber_linearly(start_id)
 
         self._idmap = {e.id: e for e in self._elements} if len(self._elements) > 0 else dict()
-        self._group_by_types()
+        reset_set_indices(self._elements)
 
     def _renumber_from_map(self, renumber_map):
-        for el in sorted(self._elements, key=attrgetter("id")):
-            if isinstance(el, Mass) or el.type == Elem.EL_TYPES.MASS_SHAPES.MASS:
-                # Mass elements are points and have been renumbered during node-renumbering
-                continue
-            el.id = renumber_map[el.id]
+        """Renumber from a dict {old_id: new_id} or an (n, 2) array of [old_id, new_id] rows"""
+        # Mass elements are points and have been renumbered during node-renumbering
+        elements = [
+            el for el in self._elements if not isinstance(el, Mass) and el.type != Elem.EL_TYPES.MASS_SHAPES.MASS
+        ]
+        old_ids = np.fromiter((el.id for el in elements), dtype=np.int64, count=len(elements))
+        for el, new_id in zip(elements, map_ids(old_ids, renumber_map).tolist()):
+            el.id = new_id
 
     def _renumber_linearly(self, start_id):
         elid = Counter(start_id)
@@ -148,10 +202,10 @@ class FemElements:
         self._sort()
 
     def __contains__(self, item: Elem):
-        return item in self._elements
+        return id(item) in self._element_map
 
     def __len__(self):
-        return len(self._elements)
+        return len(self._element_map)
 
     def __iter__(self):
         return iter(self._elements)
@@ -177,68 +231,81 @@ class FemElements:
         data_str = ", ".join([f'"{key}": {val}' for key, val in data.items()])
         return f"FemElementsCollection(Elements: {len(self._elements)}, By Type: {data_str})"
 
-    def by_types(self):
-        return self._by_types
+    def by_types(self) -> Dict[Tuple[str, FemSet], List[Elem]]:
+        """The elements grouped by element type and element set"""
+        by_types = dict()
+        for el_type, elements in self._type_index.items():
+            for el in elements.values():
+                by_types.setdefault((el_type, el.elset), []).append(el)
+        return by_types
 
     def calc_cog(self) -> COG:
         """Calculate COG of your FEM model based on element mass distributed to element and nodes"""
-        from itertools import chain
-
-        from ada.core.vector_utils import global_2_local_nodes, poly_area, vector_length
-
-        def calc_sh_elem(el: Elem):
-            locx = el.fem_sec.local_x
-            locy = el.fem_sec.local_y
-            locz = el.fem_sec.local_z
-            origin = el.nodes[0]
-            t = el.fem_sec.thickness
-
-            ln = global_2_local_nodes([locx, locy, locz], origin, el.nodes)
-
-            x, y, z = list(zip(*ln))
-            area = poly_area(x, y)
-            vol_ = t * area
-            mass = vol_ * el.fem_sec.material.model.rho
-            center = sum([e.p for e in el.nodes]) / len(el.nodes)
-
-            return mass, center, vol_
-
-        def calc_bm_elem(el: Elem):
-            nodes_ = el.get_offset_coords()
-            elem_len = vector_length(nodes_[-1] - nodes_[0])
-            vol_ = el.fem_sec.section.properties.Ax * elem_len
-            mass = vol_ * el.fem_sec.material.model.rho
-            center = sum([e.p for e in el.nodes]) / len(el.nodes)
-
-            return mass, center, vol_
-
-        def calc_mass_elem(el: Mass):
-            if el.type != MassTypes.MASS:
-                raise NotImplementedError(f'Mass type "{el.mass_props.type}" is not yet implemented')
-            mass = el.mass
-            vol_ = 0.0
-            return mass, el.nodes[0].p, vol_
-
-        sh = list(chain(map(calc_sh_elem, self.shell)))
-        bm = list(chain(map(calc_bm_elem, self.lines)))
-        ma = list(chain(map(calc_mass_elem, self.masses)))
-
-        tot_mass = 0.0
-        tot_vol = 0.0
-        mcog_ = np.array([0, 0, 0]).astype(float)
-
-        sh_mass = sum([r[0] for r in sh])
-        bm_mass = sum([r[0] for r in bm])
-        no_mass = sum([r[0] for r in ma])
-
-        for m, c, vol in sh + bm + ma:
-            tot_vol += vol
-            tot_mass += m
-            mcog_ += m * np.array(c).astype(float)
+        from ada.core.vector_utils import rotation_matrix_csys_rotate
+
+        def group_by_section(elements):
+            groups = dict()
+            for el in elements:
+                groups.setdefault((id(el.fem_sec), len(el.nodes)), []).append(el)
+            return groups.values()
+
+        def node_coords(elements) -> np.ndarray:
+            return np.array([[n.p for n in el.nodes] for el in elements], dtype=float).reshape(len(elements), -1, 3)
+
+        def calc_sh_elems(elements):
+            fem_sec = elements[0].fem_sec
+            csys = [fem_sec.local_x, fem_sec.local_y, fem_sec.local_z]
+            rmat = rotation_matrix_csys_rotate([(1, 0, 0), (0, 1, 0)], csys)
+
+            coords = node_coords(elements)
+            local = np.einsum("ij,mkj->mki", rmat, coords - coords[:, :1])
+            x, y = local[:, :, 0], local[:, :, 1]
+            area = 0.5 * np.abs(np.sum(x * np.roll(y, 1, axis=1), axis=1) - np.sum(y * np.roll(x, 1, axis=1), axis=1))
+            vol_ = fem_sec.thickness * area
+
+            return vol_ * fem_sec.material.model.rho, coords.mean(axis=1), vol_
+
+        def calc_bm_elems(elements):
+            fem_sec = elements[0].fem_sec
+            coords = node_coords(elements)
+            ends = coords[:, [0, -1]]
+            for i, el in enumerate(elements):
+                if el.eccentricity is not None:
+                    offset_coords = el.get_offset_coords()
+                    ends[i] = [offset_coords[0], offset_coords[-1]]
+
+            elem_len = np.linalg.norm(ends[:, 1] - ends[:, 0], axis=1)
+            vol_ = fem_sec.section.properties.Ax * elem_len
+
+            return vol_ * fem_sec.material.model.rho, coords.mean(axis=1), vol_
+
+        def calc_mass_elems(elements):
+            for el in elements:
+                if el.type != MassTypes.MASS:
+                    raise NotImplementedError(f'Mass type "{el.mass_props.type}" is not yet implemented')
+
+            mass = np.array([el.mass for el in elements], dtype=float)
+            centers = np.array([el.nodes[0].p for el in elements], dtype=float).reshape(-1, 3)
+            return mass, centers, np.zeros(len(elements))
+
+        results = dict(sh=[], bm=[], no=[])
+        for elements in group_by_section(self.shell):
+            results["sh"].append(calc_sh_elems(elements))
+        for elements in group_by_section(self.lines):
+            results["bm"].append(calc_bm_elems(elements))
+        masses = list(self.masses)
+        if len(masses) > 0:
+            results["no"].append(calc_mass_elems(masses))
+
+        group_mass = {key: sum(float(r[0].sum()) for r in res) for key, res in results.items()}
+        all_results = [r for res in results.values() for r in res]
+        tot_mass = sum(group_mass.values())
+        tot_vol = sum(float(r[2].sum()) for r in all_results)
+        mcog_ = sum((r[0][:, None] * r[1]).sum(axis=0) for r in all_results) if len(all_results) > 0 else np.zeros(3)
 
         cog_ = mcog_ / tot_mass
 
-        return COG(cog_, tot_mass, tot_vol, sh_mass, bm_mass, no_mass)
+        return COG(cog_, tot_mass, tot_vol, group_mass["sh"], group_mass["bm"], group_mass["no"])
 
     @property
     def parent(self) -> FEM:
@@ -268,16 +335,15 @@ class FemElements:
 
     @property
     def solids(self) -> Iterable[Elem]:
-        return filter(lambda x: x.type in Elem.EL_TYPES.SOLID_SHAPES.all, self.stru_elements)
+        return self._iter_category("solids")
 
     @property
     def shell(self) -> Iterable[Elem]:
-
-        return filter(lambda x: x.type in Elem.EL_TYPES.SHELL_SHAPES.all, self.stru_elements)
+        return self._iter_category("shell")
 
     @property
     def lines(self) -> Iterable[Elem]:
-        return filter(lambda x: x.type in Elem.EL_TYPES.LINE_SHAPES.all, self.stru_elements)
+        return self._iter_category("lines")
 
     @property
     def lines_hinged(self) -> Iterable[Elem]:
@@ -289,15 +355,15 @@ class FemElements:
 
     @property
     def connectors(self) -> Iterable[Connector]:
-        return filter(lambda x: x.type == ElemType.CONNECTOR_SHAPES.CONNECTOR, self.elements)
+        return self._iter_category("connectors")
 
     @property
     def masses(self) -> Iterable[Mass]:
-        return filter(lambda x: isinstance(x, Mass), self.elements)
+        return self._iter_category("masses")
 
     @property
     def stru_elements(self) -> Iterable[Elem]:
-        return filter(lambda x: x.type not in ["MASS", "SPRING1", "CONNECTOR"], self._elements)
+        return self._iter_category("stru_elements")
 
     def connector_by_name(self, name: str):
         """Get Connector by name"""
@@ -333,8 +399,6 @@ class FemElements:
                 return False if el.type.lower() in delete_elem else True
 
         self._elements = list(filter(eval_elem, self._elements))
-        self._by_types = dict(self.group_by_type())
-        self._idmap = {e.id: e for e in self._elements}
 
     @property
     def idmap(self):
@@ -342,8 +406,8 @@ class FemElements:
 
     def add(self, elem: Elem) -> Elem:
         if elem.id is None:
-            if len(self._elements) > 0:
-                elem._el_id = self._elements[-1].id + 1
+            if len(self._element_map) > 0:
+                elem._el_id = next(reversed(self._element_map.values())).id + 1
             else:
                 elem._el_id = 1
         if elem.id in self.idmap.keys():
@@ -352,37 +416,54 @@ class FemElements:
         if elem.parent is None:
             elem.parent = self._fem_obj
 
-        self._elements.append(elem)
+        self._element_map[id(elem)] = elem
+        if self._element_list is not None:
+            self._element_list.append(elem)
         self._idmap[elem.id] = elem
+        self._add_to_indexes(elem)
 
-        self._group_by_types()
         return elem
 
     def remove(self, elems: Union[Elem, List[Elem]]):
         """Remove elem or list of elements from container"""
         elems = list(elems) if isinstance(elems, Iterable) else [elems]
         for elem in elems:
-            if elem in self._elements:
+            if id(elem) in self._element_map:
                 logging.warning(f"Element removal is WIP. Removing element: {elem}")
-                self._elements.pop(self._elements.index(elem))
+                self._element_map.pop(id(elem))
+                self._element_list = None
+                self._remove_from_indexes(elem)
+                if self._idmap.get(elem.id, None) is elem:
+                    self._idmap.pop(elem.id)
             else:
                 logging.error(f"'{elem}' not found in {self.__class__.__name__}-container.")
         # self._sort()
 
     def group_by_type(self):
-        return groupby(sorted(self._elements, key=attrgetter("type")), key=attrgetter("type"))
-
-    def _group_by_types(self):
-        if len(self._elements) > 0:
-            self._by_types = groupby(self._elements, key=attrgetter("type", SetTypes.ELSET))
-        else:
-            self._by_types = dict()
+        return ((el_type, iter(list(elements.values()))) for el_type, elements in sorted(self._type_index.items()))
 
     def _sort(self):
         self._elements = sorted(self._elements, key=attrgetter("id"))
-        self._group_by_types()
         self.renumber()
 
+    def replace_nodes_by_map(self, node_map: Dict[int, int]) -> None:
+        """Replace element nodes in a single pass using a map of old to new node ids, e.g. the merge map returned by
+        Nodes.merge_coincident(update_refs=False). The node order of each element is kept."""
+        nodes = self._fem_obj.nodes
+        for elem in self._elements:
+            if not any(n.id in node_map for n in elem.nodes):
+                continue
+
+            new_nodes = [nodes.from_id(node_map[n.id]) if n.id in node_map else n for n in elem.nodes]
+            for old_node, new_node in zip(elem.nodes, new_nodes):
+                if old_node is new_node:
+                    continue
+                old_node.remove_obj_from_refs(elem)
+                new_node.add_obj_to_refs(elem)
+
+            elem._nodes = new_nodes
+            elem._shape = None
+
     def merge_with_coincident_nodes(self):
         def remove_duplicate_nodes():
             new_nodes = [n for n in elem.nodes if n.has_refs]
@@ -622,17 +703,20 @@ class FemSets:
     def _instantiate_all_members(self, fem_set: FemSet):
         from ada.fem import Connector, Mass, Spring
 
-        def get_nset(nref):
-            if type(nref) is Node:
-                return nref
-            else:
-                return fem_set.parent.nodes.from_id(nref)
+        def get_nset(members):
+            lazy = [i for i, nref in enumerate(members) if type(nref) is not Node]
+            nodes = list(members)
+            for i, node in zip(lazy, fem_set.parent.nodes.from_ids([members[i] for i in lazy]).tolist()):
+                nodes[i] = node
+            return nodes
 
         def get_elset(elref):
-            if type(elref) in (int, np.int32):
+            if isinstance(elref, (int, np.integer)):
                 return fem_set.parent.elements.from_id(elref)
             elif type(elref) is Elem:
-                if elref not in elref.parent.elements and len(elref.parent.elements) != 0:
+                elements = elref.parent.elements
+                # Check the id map first to avoid scanning the list of elements
+                if elements.idmap.get(elref.id, None) is not elref and elref not in elements and len(elements) != 0:
                     raise ValueError("Element might be doubly defined")
                 else:
                     return elref
@@ -642,26 +726,24 @@ class FemSets:
                 raise ValueError(f"Elref type '{type(elref)}' is not recognized")
 
         def eval_set(fset):
+            el_type = Elem if fset.type == SetTypes.ELSET else Node
+            if all(type(x) is el_type for x in fset.members):
+                return
+
             if fset.type == SetTypes.ELSET:
-                el_type = Elem
-                get_func = get_elset
+                fset.members = [get_elset(m) for m in fset.members]
             else:
-                el_type = Node
-                get_func = get_nset
-
-            res = list(filter(lambda x: type(x) != el_type, fset.members))
-            if len(res) > 0:
-                fset._members = [get_func(m) for m in fset.members]
+                fset.members = get_nset(fset.members)
 
         if "generate" in fem_set.metadata.keys():
             if fem_set.metadata["generate"] is True and len(fem_set.members) == 0:
                 gen_mem = fem_set.metadata["gen_mem"]
-                fem_set._members = [i for i in range(gen_mem[0], gen_mem[1] + 1, gen_mem[2])]
+                fem_set.members = [i for i in range(gen_mem[0], gen_mem[1] + 1, gen_mem[2])]
                 fem_set.metadata["generate"] = False
 
         if fem_set.type == SetTypes.NSET:
             if len(fem_set.members) == 1 and type(fem_set.members[0]) is str and type(fem_set.members[0]) is not Node:
-                fem_set._members = self.nodes[fem_set.members[0]]
+                fem_set.members = self.nodes[fem_set.members[0]]
                 fem_set.parent = self._fem_obj
                 return fem_set
 
@@ -761,8 +843,7 @@ class FemSets:
         if fe_set.type == SetTypes.NSET:
             if fe_set.name in self._nomap.keys():
                 fem_set = self._nomap[fe_set.name]
-                new_mem = [m for m in fe_set.members if m.id not in fem_set.members]
-                fem_set.add_members(new_mem)
+                fem_set.add_members(fe_set.difference(fem_set))
         else:
             if fe_set.name in self._elmap.keys():
                 if append_suffix_on_exist is False and merge_sets_if_duplicate is False:
@@ -770,9 +851,7 @@ class FemSets:
 
                 if merge_sets_if_duplicate is True:
                     o_set = self._elmap[fe_set.name]
-                    for mem in fe_set.members:
-                        if mem not in o_set.members:
-                            o_set.members.append(mem)
+                    o_set.add_members(fe_set.difference(o_set))
 
                 if fe_set.name not in self._same_names.keys():
                     self._same_names[fe_set.name] = 1
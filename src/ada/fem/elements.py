@@ -88,8 +88,6 @@ class Elem(FemBase):
 
     @type.setter
     def type(self, value):
-        from .shapes import ElemShape
-
         if ElemShape.is_valid_elem(value) is False:
             raise ValueError(f'Currently unsupported element type "{value}".')
         self._el_type = value.upper()
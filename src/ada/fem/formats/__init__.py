@@ -1,3 +1,4 @@
 from .general import FEATypes
+from .job_queue import FemJob, SolverJobQueue
 
-__all__ = [FEATypes]
+__all__ = [FEATypes, FemJob, SolverJobQueue]
@@ -29,13 +29,16 @@ def run_abaqus(
 
 
 class AbaqusExecute(LocalExecute):
-    def run(self, exit_on_complete=True, run_cmd=None, bat_start_str=None):
+    def get_run_command(self) -> str:
         from ada.fem.formats.general import FEATypes
 
         exe_path = self.get_exe(FEATypes.ABAQUS)
         gpus = "" if self._gpus is None else f"GPUS={self._gpus}"
+        return f"{exe_path} job={self.analysis_name} CPUS={self._cpus}{gpus} interactive"
+
+    def run(self, exit_on_complete=True, run_cmd=None, bat_start_str=None):
         if run_cmd is None:
-            run_cmd = f"{exe_path} job={self.analysis_name} CPUS={self._cpus}{gpus} interactive"
+            run_cmd = self.get_run_command()
         stop_cmd = f"abaqus terminate job={self.analysis_name}"
         out = self._run_local(run_cmd, stop_cmd, exit_on_complete, bat_start_str)
         return out
@@ -23,7 +23,7 @@ re_bcs = re.compile(
 
 # Parts
 parts_matches = re.compile(r"\*Part, name=(?P<name>.*?)\n(?P<bulk_str>.*?)\*End Part", _re_in)
-part_names = re.compile(r"\*\*\s*PART INSTANCE:\s*(.*?)\n(.*)", _re_in)
+part_names = re.compile(r"\*\*\s*PART INSTANCE:\s*(.*?)\s*$", re.IGNORECASE)
 
 # Instances
 inst_matches = re.compile(
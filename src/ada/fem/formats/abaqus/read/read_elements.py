@@ -6,8 +6,6 @@ from dataclasses import dataclass
 from itertools import chain
 from typing import TYPE_CHECKING, List
 
-import numpy as np
-
 from ada.concepts.points import Node
 from ada.core.utils import Counter
 from ada.fem import Connector, Elem
@@ -16,6 +14,7 @@ from ada.fem.formats.utils import str_to_int
 from ada.fem.shapes import ElemShape
 
 from . import cards
+from .tokenizer import InpBlock, InpDeck
 
 _re_in = re.IGNORECASE | re.MULTILINE | re.DOTALL
 
@@ -57,9 +56,14 @@ def abaqus_el_type_to_ada(el_type):
 
 def get_elem_from_bulk_str(bulk_str, fem: "FEM") -> FemElements:
     """Read and import all *Element flags"""
+    return get_elem_from_inp_deck(InpDeck.from_str(bulk_str), fem)
+
+
+def get_elem_from_inp_deck(deck: InpDeck, fem: "FEM") -> FemElements:
+    """Read and import the elements of all *Element blocks"""
     elements = FemElements(
         chain.from_iterable(
-            filter(lambda x: x is not None, (grab_elements(m, fem) for m in cards.re_el.finditer(bulk_str)))
+            filter(lambda x: x is not None, (grab_elements(block, fem) for block in deck.iter_keyword("element")))
         ),
         fem_obj=fem,
     )
@@ -67,9 +71,9 @@ def get_elem_from_bulk_str(bulk_str, fem: "FEM") -> FemElements:
     return elements
 
 
-def grab_elements(match, fem: "FEM"):
-    d = match.groupdict()
-    eltype = d["eltype"]
+def grab_elements(block: InpBlock, fem: "FEM"):
+    params = block.params
+    eltype = params["type"]
 
     if eltype in ("CONN3D2",):
         logging.info(f'Importing Connector type "{eltype}"')
@@ -78,21 +82,12 @@ def grab_elements(match, fem: "FEM"):
         logging.info(f'Importing Mass type "{eltype}"')
 
     ada_el_type = abaqus_el_type_to_ada(eltype)
-    elset = d["elset"]
-    el_type_members_str = d["members"]
+    elset = params.get("elset", None)
+    el_type_members_str = block.data
     res = re.search("[a-zA-Z]", el_type_members_str)
-    is_cubic = ada_el_type in [so.HEX20, so.HEX27]
-    if is_cubic or res is None:
-        if is_cubic is True:
-            elem_nodes_str = el_type_members_str.splitlines()
-            ntext = "".join(
-                [l1.strip() + "    " + l2.strip() + "\n" for l1, l2 in zip(elem_nodes_str[:-1:2], elem_nodes_str[1::2])]
-            )
-        else:
-            ntext = d["members"]
-        res = np.fromstring(ntext.replace("\n", ","), sep=",", dtype=int)
+    if res is None:
         n = ElemShape.num_nodes(ada_el_type) + 1
-        return numpy_array_to_list_of_elements(res.reshape(int(res.size / n), n), eltype, elset, ada_el_type, fem)
+        return numpy_array_to_list_of_elements(block.to_array(int, n), eltype, elset, ada_el_type, fem)
     else:
         elems = []
         for li in el_type_members_str.splitlines():
@@ -147,16 +142,17 @@ def numpy_array_to_list_of_elements(res_, eltype, elset, ada_el_type, fem: "FEM"
             connectors.append(con)
         return connectors
     else:
+        el_nodes = fem.nodes.from_ids(res_[:, 1:])
         return [
             Elem(
-                e[0],
-                [fem.nodes.from_id(n) for n in e[1:]],
+                el_id,
+                list(nodes),
                 ada_el_type,
                 elset,
                 el_formulation_override=eltype,
                 parent=fem,
             )
-            for e in res_
+            for el_id, nodes in zip(res_[:, 0].tolist(), el_nodes)
         ]
 
 
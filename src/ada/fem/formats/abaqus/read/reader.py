@@ -1,18 +1,16 @@
 from __future__ import annotations
 
 import logging
-import mmap
 import os
 import pathlib
 import re
 from dataclasses import dataclass
 from itertools import chain
-from typing import TYPE_CHECKING, Dict, List, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Union
 
 import numpy as np
 
 from ada.concepts.containers import Nodes
-from ada.concepts.points import Node
 from ada.concepts.transforms import Rotation, Transform
 from ada.core.utils import Counter
 from ada.fem import (
@@ -31,11 +29,12 @@ from ada.fem.shapes import ElemType
 
 from . import cards
 from .helper_utils import _re_in, get_set_from_assembly, list_cleanup
-from .read_elements import get_elem_from_bulk_str, update_connector_data
+from .read_elements import get_elem_from_inp_deck, update_connector_data
 from .read_masses import get_mass_from_bulk
 from .read_materials import get_materials_from_bulk
 from .read_orientations import get_lcsys_from_bulk
 from .read_sections import get_connector_sections_from_bulk, get_sections_from_inp
+from .tokenizer import BULK_DATA_KEYWORDS, COMMENT, InpBlock, InpDeck
 
 part_name_counter = Counter(1, "Part")
 
@@ -49,12 +48,15 @@ if TYPE_CHECKING:
 class InstanceData:
     part_ref: str
     instance_name: str
-    instance_bulk: str
+    instance_bulk: InpDeck
     transform: Transform = Transform()
 
 
 def read_fem(fem_file, fem_name=None) -> Assembly:
-    """This will create and add an AbaqusPart object based on a path reference to a Abaqus input file."""
+    """This will create and add an AbaqusPart object based on a path reference to a Abaqus input file.
+
+    The input file is tokenized into keyword blocks in a single pass. Node, element and set blocks are parsed directly
+    from their blocks, while the remaining keywords are parsed from the text of the other blocks in each scope."""
     from ada import Assembly
 
     print("Starting import of Abaqus input file")
@@ -65,54 +67,55 @@ def read_fem(fem_file, fem_name=None) -> Assembly:
 
     assembly = Assembly("TempAssembly")
 
-    bulk_str = read_bulk_w_includes(fem_file)
-    lbulk = bulk_str.lower()
-    ass_start = lbulk.find("\n*assembly")
-    ass_end = lbulk.rfind("\n*end assembly")
-    step_start = lbulk.rfind("\n*step")
-
-    ass_start = ass_start + 1 if ass_start != -1 else ass_start
-    ass_end = ass_end + 1 if ass_end != -1 else ass_end
-    step_start = step_start + 1 if step_start != -1 else step_start
+    deck = InpDeck.from_file(fem_file)
+    ass_start = deck.find("assembly")
+    ass_end = deck.rfind("end assembly")
+    step_start = deck.rfind("step")
 
     if ass_start == -1 and ass_end == -1:
         uses_assembly_parts = False
-        assembly_str = bulk_str
-        props_str = bulk_str
+        parts_deck = deck
+        assembly_deck = deck
+        props_deck = deck
     else:
         uses_assembly_parts = True
-        assembly_str = bulk_str[ass_start : ass_end + 2]
-        props_str = bulk_str[ass_end + 2 : step_start]
+        ass_end = len(deck) if ass_end == -1 else ass_end
+        step_start = len(deck) if step_start < ass_end else step_start
+        parts_deck = deck[:ass_start]
+        assembly_deck = deck[ass_start:ass_end]
+        props_deck = deck[ass_end + 1 : step_start]
 
-    inst_end = assembly_str.lower().rfind("\n*end instance")
-    inst_end = inst_end + 15 if inst_end != -1 else inst_end
+    inst_end = assembly_deck.rfind("end instance")
+    instances_deck = assembly_deck[: inst_end + 1] if inst_end != -1 else assembly_deck
+    ass_sets = assembly_deck[inst_end + 1 :] if inst_end != -1 else InpDeck()
 
+    props_str = props_deck.to_str(exclude=BULK_DATA_KEYWORDS)
     get_materials_from_bulk(assembly, props_str)
     get_intprop_from_lines(assembly, props_str)
 
-    ass_data = extract_instance_data(assembly_str[:inst_end])
+    ass_data = extract_instance_data(instances_deck)
 
-    part_list = import_parts(bulk_str[:ass_start], ass_data, assembly)
+    part_list = import_parts(parts_deck, ass_data, assembly)
     if len(part_list) == 0:
-        add_fem_without_assembly(bulk_str, assembly)
+        add_fem_without_assembly(deck, assembly)
 
     if uses_assembly_parts is True:
-        ass_sets = assembly_str[inst_end:]
+        ass_sets_str = ass_sets.to_str(exclude=BULK_DATA_KEYWORDS)
         assembly.fem.nodes += get_nodes_from_inp(ass_sets, assembly.fem)
-        assembly.fem.lcsys.update(get_lcsys_from_bulk(ass_sets, assembly.fem))
+        assembly.fem.lcsys.update(get_lcsys_from_bulk(ass_sets_str, assembly.fem))
         assembly.fem.connector_sections.update(get_connector_sections_from_bulk(props_str, assembly.fem))
-        assembly.fem.elements += get_elem_from_bulk_str(ass_sets, assembly.fem)
+        assembly.fem.elements += get_elem_from_inp_deck(ass_sets, assembly.fem)
         assembly.fem.elements.build_sets()
-        assembly.fem.sets += get_sets_from_bulk(ass_sets, assembly.fem)
+        assembly.fem.sets += get_sets_from_inp(ass_sets, assembly.fem)
         assembly.fem.sets.link_data()
 
-        update_connector_data(ass_sets, assembly.fem)
+        update_connector_data(ass_sets_str, assembly.fem)
 
-        assembly.fem.surfaces.update(get_surfaces_from_bulk(ass_sets, assembly.fem))
-        assembly.fem.constraints.update(get_constraints_from_inp(ass_sets, assembly.fem))
+        assembly.fem.surfaces.update(get_surfaces_from_bulk(ass_sets_str, assembly.fem))
+        assembly.fem.constraints.update(get_constraints_from_inp(ass_sets_str, assembly.fem))
 
         assembly.fem.bcs += get_bcs_from_bulk(props_str, assembly.fem)
-        assembly.fem.elements += get_mass_from_bulk(ass_sets, assembly.fem)
+        assembly.fem.elements += get_mass_from_bulk(ass_sets_str, assembly.fem)
 
     add_interactions_from_bulk_str(props_str, assembly)
     get_initial_conditions_from_lines(assembly, props_str)
@@ -120,37 +123,14 @@ def read_fem(fem_file, fem_name=None) -> Assembly:
 
 
 def read_bulk_w_includes(inp_path) -> str:
-    re_bulk_include = re.compile(r"\*Include,\s*input=(.*?)$", _re_in)
-    bulk_repl = dict()
-    with open(inp_path, "r") as inpDeck:
-        bulk_str = inpDeck.read()
-        for m in re_bulk_include.finditer(bulk_str):
-            search_key = m.group(0)
-            with open(os.path.join(os.path.dirname(inp_path), m.group(1)), "r") as d:
-                bulk_repl[search_key] = d.read()
-
-    for key, val in bulk_repl.items():
-        bulk_str = bulk_str.replace(key, val)
-    return bulk_str
-
-
-def import_bulk(file_path, buffer_function):
-    with open(file_path, "r") as f:
-        return buffer_function(f.read())
-
-
-def import_bulk2(file_path, buffer_function):
-    with open(file_path, "r") as f:
-        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
-            return buffer_function(m)
+    return InpDeck.from_file(inp_path).to_str()
 
 
-def extract_instance_data(assembly_bulk) -> dict[str, List[InstanceData]]:
+def extract_instance_data(assembly_deck: InpDeck) -> dict[str, List[InstanceData]]:
     ass_data = {}
-    for m in cards.inst_matches.finditer(assembly_bulk):
-        d = m.groupdict()
-        inst_name, part_name, bulk_str = d["inst_name"], d["part_name"], d["bulk_str"]
-        inst_data = get_instance_data(inst_name, part_name, bulk_str)
+    for inst_start, inst_end in iter_keyword_ranges(assembly_deck, "instance", "end instance"):
+        params = assembly_deck[inst_start].params
+        inst_data = get_instance_data(params["name"], params["part"], assembly_deck[inst_start:inst_end])
         if inst_data.part_ref not in ass_data.keys():
             ass_data[inst_data.part_ref] = []
         ass_data[inst_data.part_ref].append(inst_data)
@@ -158,49 +138,63 @@ def extract_instance_data(assembly_bulk) -> dict[str, List[InstanceData]]:
     return ass_data
 
 
-def import_parts(bulk_str, instance_data: dict[str, List[InstanceData]], assembly: Assembly) -> List[Part]:
+def iter_keyword_ranges(deck: InpDeck, start_keyword: str, end_keyword: str) -> Iterator[tuple[int, int]]:
+    """Yield the (start, end) block indices of all ranges from a start keyword up to its end keyword"""
+    start = deck.find(start_keyword)
+    while start != -1:
+        end = deck.find(end_keyword, start + 1)
+        if end == -1:
+            break
+        yield start, end
+        start = deck.find(start_keyword, end + 1)
+
+
+def import_parts(deck: InpDeck, instance_data: dict[str, List[InstanceData]], assembly: Assembly) -> List[Part]:
     part_list = []
 
-    for m in cards.parts_matches.finditer(bulk_str):
-        d = m.groupdict()
-        name = d.get("name")
-        part_bulk_str = d.get("bulk_str")
+    for part_start, part_end in iter_keyword_ranges(deck, "part", "end part"):
+        name = deck[part_start].params["name"]
+        part_deck = deck[part_start + 1 : part_end]
 
         for i in instance_data[name]:
-            p_bulk_str = i.instance_bulk if part_bulk_str == "" and i.instance_bulk != "" else part_bulk_str
-            part = get_fem_from_bulk_str(name, p_bulk_str, assembly, i)
+            p_deck = i.instance_bulk if len(part_deck) == 0 and len(i.instance_bulk) > 1 else part_deck
+            part = get_fem_from_inp_deck(name, p_deck, assembly, i)
             part_list.append(part)
     return part_list
 
 
-def add_fem_without_assembly(bulk_str, assembly: Assembly) -> Part:
-    part_name_matches = list(cards.part_names.finditer(bulk_str))
-    p_nmatch = tuple(part_name_matches)
+def add_fem_without_assembly(deck: InpDeck, assembly: Assembly) -> Part:
+    part_name_matches = [
+        (i, cards.part_names.match(b.header)) for i, b in enumerate(deck.blocks) if b.keyword == COMMENT
+    ]
+    part_name_matches = [(i, m) for i, m in part_name_matches if m is not None]
 
-    if len(p_nmatch) != 1:
-        p_bulk = bulk_str
+    if len(part_name_matches) != 1:
+        p_deck = deck
         p_name = None
     else:
-        p_name = p_nmatch[0].group(1)
-        p_bulk = p_nmatch[0].group(2)
+        i, m = part_name_matches[0]
+        p_name = m.group(1)
+        p_deck = deck[i + 1 :]
 
     p_name = next(part_name_counter) if p_name is None else p_name
-    inst = InstanceData("", p_name, "")
+    inst = InstanceData("", p_name, InpDeck())
 
-    return get_fem_from_bulk_str(p_name, p_bulk, assembly, inst)
+    return get_fem_from_inp_deck(p_name, p_deck, assembly, inst)
 
 
-def get_fem_from_bulk_str(name, bulk_str, assembly: Assembly, instance_data: InstanceData) -> "Part":
+def get_fem_from_inp_deck(name, deck: InpDeck, assembly: Assembly, instance_data: InstanceData) -> "Part":
     from ada import FEM, Part
 
     instance_name = name if instance_data.instance_name is None else instance_data.instance_name
     part = assembly.add_part(Part(name, fem=FEM(name=instance_name)))
     fem = part.fem
-    fem.nodes = get_nodes_from_inp(bulk_str, fem)
+    bulk_str = deck.to_str(exclude=BULK_DATA_KEYWORDS)
+    fem.nodes = get_nodes_from_inp(deck, fem)
     fem.nodes.move(move=instance_data.transform.translation, rotate=instance_data.transform.rotation)
-    fem.elements = get_elem_from_bulk_str(bulk_str, fem)
+    fem.elements = get_elem_from_inp_deck(deck, fem)
     fem.elements.build_sets()
-    fem.sets += get_sets_from_bulk(bulk_str, fem)
+    fem.sets += get_sets_from_inp(deck, fem)
     fem.sections = get_sections_from_inp(bulk_str, fem)
     fem.bcs += get_bcs_from_bulk(bulk_str, fem)
     fem.elements += get_mass_from_bulk(bulk_str, fem)
@@ -310,15 +304,15 @@ def get_intprop_from_lines(assembly: Assembly, bulk_str):
         assembly.fem.add_interaction_property(InteractionProperty(**props))
 
 
-def get_instance_data(inst_name, p_ref, inst_bulk) -> InstanceData:
-    """Move/rotate data lines are specified here:
+def get_instance_data(inst_name, p_ref, inst_bulk: InpDeck) -> InstanceData:
+    """Move/rotate data lines are the data lines of the *Instance keyword. They are specified here:
 
     https://abaqus-docs.mit.edu/2017/English/SIMACAEKEYRefMap/simakey-r-instance.htm
     """
 
     move_rot = re.compile(r"(?:^\s*(.*?),\s*(.*?),\s*(.*?)$)", _re_in)
     transform: Union[Transform, None] = Transform()
-    mr = move_rot.finditer(inst_bulk)
+    mr = move_rot.finditer(inst_bulk[0].data if len(inst_bulk) > 0 else "")
     if mr is not None:
         for j, mo in enumerate(mr):
             content = mo.group(0)
@@ -353,25 +347,25 @@ def import_multiple_inps(input_files_dir):
     return "".join([x for x in map(read_inp, os.listdir(input_files_dir)) if x is not None])
 
 
-def get_nodes_from_inp(bulk_str, parent: FEM) -> Nodes:
-    """Extract node information from abaqus input file string"""
-    re_no = re.compile(
-        r"^\*Node\s*(?:,\s*nset=(?P<nset>.*?)\n|\n)(?P<members>(?:.*?)(?=\*|\Z))",
-        _re_in,
-    )
+def get_nodes_from_inp(deck: InpDeck, parent: FEM) -> Nodes:
+    """Extract node information from the *Node blocks of an abaqus input file"""
+    node_arrays = []
+    node_sets = []
+    for block in deck.iter_keyword("node"):
+        res_ = block.to_array(np.float64, 4)
+        node_arrays.append(res_)
+        nset = block.params.get("nset", None)
+        if nset is not None:
+            node_sets.append((nset, res_[:, 0].astype(np.int64)))
 
-    def getnodes(m):
-        d = m.groupdict()
-        res = np.fromstring(list_cleanup(d["members"]), sep=",", dtype=np.float64)
-        res_ = res.reshape(int(res.size / 4), 4)
-        members = [Node(n[1:4], int(n[0]), parent=parent) for n in res_]
-        if d["nset"] is not None:
-            parent.sets.add(FemSet(d["nset"], members, "nset", parent=parent))
-        return members
+    if len(node_arrays) == 0:
+        return Nodes(parent=parent)
 
-    nodes = list(chain.from_iterable(map(getnodes, re_no.finditer(bulk_str))))
+    nodes = Nodes(parent=parent, from_np_array=np.concatenate(node_arrays))
+    for nset, nids in node_sets:
+        parent.sets.add(FemSet(nset, list(nodes.from_ids(nids)), "nset", parent=parent))
 
-    return Nodes(nodes, parent=parent)
+    return nodes
 
 
 def str_to_ints(instr):
@@ -382,6 +376,10 @@ def str_to_ints(instr):
 
 
 def get_sets_from_bulk(bulk_str, fem: FEM) -> FemSets:
+    return get_sets_from_inp(InpDeck.from_str(bulk_str), fem)
+
+
+def get_sets_from_inp(deck: InpDeck, fem: FEM) -> FemSets:
     from ada import Assembly
 
     if fem.parent is not None:
@@ -398,19 +396,24 @@ def get_sets_from_bulk(bulk_str, fem: FEM) -> FemSets:
         else:
             raise ValueError(f'Unable to find instance "{instance}" amongst assembly parts')
 
-    def get_set(match):
-        name = match.group(2)
-        set_type = match.group(1)
-        internal = True if match.group(3) is not None else False
-        instance = match.group(4)
-        generate = True if match.group(5) is not None else False
-        members_str = match.group(6)
-        gen_mem = str_to_ints(members_str) if generate is True else []
-        members = [] if generate is True else str_to_ints(members_str)
+    def get_set_members(block: InpBlock):
+        if re.search("[a-zA-Z]", block.data) is None:
+            return block.to_array(np.int64).tolist()
+        return str_to_ints(block.data)
+
+    def get_set(block: InpBlock):
+        params = block.params
+        set_type = block.keyword
+        name = params[set_type]
+        internal = "internal" in params
+        instance = params.get("instance", None)
+        generate = "generate" in params
+        gen_mem = get_set_members(block) if generate is True else []
+        members = [] if generate is True else get_set_members(block)
         metadata = dict(instance=instance, internal=internal, generate=generate, gen_mem=gen_mem)
         parent_instance = get_parent_instance(instance)
 
-        if set_type.lower() == "elset":
+        if set_type == "elset":
             members = [parent_instance.elements.from_id(el_id) for el_id in members]
         else:
             members = [parent_instance.nodes.from_id(el_id) for el_id in members]
@@ -425,7 +428,7 @@ def get_sets_from_bulk(bulk_str, fem: FEM) -> FemSets:
 
         return fem_set
 
-    return FemSets([get_set(x) for x in cards.re_sets.finditer(bulk_str)], parent=fem)
+    return FemSets([get_set(x) for x in deck.iter_keyword("nset", "elset")], parent=fem)
 
     # import concurrent.futures
     # with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
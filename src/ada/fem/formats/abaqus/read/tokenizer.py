@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pathlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+COMMENT = "**"
+
+# Keywords whose data lines make up the bulk of a deck
+BULK_DATA_KEYWORDS = ("node", "element", "nset", "elset")
+
+
+@dataclass
+class InpBlock:
+    """A single keyword line and the data lines following it up to the next keyword or comment line.
+
+    :param keyword: Lower case keyword name without the leading asterisk, e.g. "element" or "shell section". Comment
+        lines are given the keyword "**".
+    :param header: The keyword line including parameters, without the line break.
+    :param data: The data lines following the keyword line."""
+
+    keyword: str
+    header: str
+    data: str
+    source: pathlib.Path = None
+
+    @property
+    def text(self) -> str:
+        return self.header + "\n" + self.data
+
+    @property
+    def params(self) -> Dict[str, str]:
+        """Keyword parameters with lower case names. Parameters without a value are given an empty string"""
+        params = dict()
+        for param in self.header.split(",")[1:]:
+            key, _, value = param.partition("=")
+            if key.strip() == "":
+                continue
+            params[key.strip().lower()] = value.strip()
+        return params
+
+    def to_array(self, dtype=float, num_cols: int = None) -> np.ndarray:
+        """Parse the comma separated data lines of a numeric block (e.g. *Node or *Element) in a single pass. Rows
+        which are continued over multiple lines are supported."""
+        # With a whitespace separator numpy skips any run of whitespace, so line breaks and trailing commas of
+        # continued rows need no special treatment once the commas are replaced
+        res = np.fromstring(self.data.replace(",", " "), sep=" ", dtype=dtype)
+        if num_cols is None:
+            return res
+
+        if res.size % num_cols != 0:
+            raise ValueError(f'Unable to split {res.size} values into rows of {num_cols} in "{self.header}"')
+
+        return res.reshape(-1, num_cols)
+
+
+def iter_inp_blocks(inp_path: str | os.PathLike) -> Iterator[InpBlock]:
+    """Tokenize an Abaqus input file into keyword blocks in a single pass over a memory map of the file.
+
+    *Include keywords are replaced by the blocks of the included file. Included files are only opened when the
+    tokenizer reaches them."""
+    inp_path = pathlib.Path(inp_path)
+    with open(inp_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for start, end in _iter_block_spans(m, b"\n*"):
+                block = _make_block(m[start:end].decode(), inp_path)
+                if block.keyword == "include":
+                    include_path = block.params["input"].strip("\"'").replace("\\", "/")
+                    yield from iter_inp_blocks(inp_path.parent / include_path)
+                    continue
+                yield block
+
+
+def _iter_block_spans(buffer, sep) -> Iterator[tuple[int, int]]:
+    """Yield (start, end) offsets of every line starting with an asterisk through to the next such line"""
+    size = len(buffer)
+    start = 0 if buffer[:1] == sep[1:] else buffer.find(sep)
+    if start == -1:
+        return None
+
+    if start != 0:
+        start += 1
+
+    while start < size:
+        end = buffer.find(sep, start)
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def _make_block(block_str: str, source: pathlib.Path) -> InpBlock:
+    header, _, data = block_str.partition("\n")
+    header = header.rstrip()
+    if data != "" and data[-1] != "\n":
+        data += "\n"
+
+    if header.startswith(COMMENT):
+        keyword = COMMENT
+    else:
+        keyword = " ".join(header[1:].split(",")[0].split()).lower()
+
+    return InpBlock(keyword, header, data, source)
+
+
+class InpDeck:
+    """An ordered sequence of keyword blocks, e.g. a full input file or the blocks between *Part and *End Part"""
+
+    def __init__(self, blocks: Iterable[InpBlock] = None):
+        self.blocks: List[InpBlock] = list(blocks) if blocks is not None else []
+
+    @staticmethod
+    def from_file(inp_path: str | os.PathLike) -> InpDeck:
+        return InpDeck(iter_inp_blocks(inp_path))
+
+    @staticmethod
+    def from_str(bulk_str: str) -> InpDeck:
+        """Tokenize a string of Abaqus keywords. *Include keywords are kept as is"""
+        return InpDeck(_make_block(bulk_str[s:e], None) for s, e in _iter_block_spans(bulk_str, "\n*"))
+
+    def find(self, keyword: str, start: int = 0, end: int = None) -> int:
+        """Index of the first block with the given keyword in blocks[start:end]. Returns -1 if it is not found"""
+        end = len(self.blocks) if end is None else end
+        for i in range(start, end):
+            if self.blocks[i].keyword == keyword:
+                return i
+        return -1
+
+    def rfind(self, keyword: str) -> int:
+        """Index of the last block with the given keyword. Returns -1 if it is not found"""
+        for i in range(len(self.blocks) - 1, -1, -1):
+            if self.blocks[i].keyword == keyword:
+                return i
+        return -1
+
+    def iter_keyword(self, *keywords: str) -> Iterator[InpBlock]:
+        """Iterate over all blocks with any of the given keywords in the order they appear"""
+        return (block for block in self.blocks if block.keyword in keywords)
+
+    def to_str(self, exclude: Iterable[str] = None) -> str:
+        """Returns the text of all blocks, leaving out the blocks with keywords in exclude"""
+        exclude = set(exclude) if exclude is not None else set()
+        return "".join(block.text for block in self.blocks if block.keyword not in exclude)
+
+    def __getitem__(self, index) -> InpDeck | InpBlock:
+        if isinstance(index, slice):
+            return InpDeck(self.blocks[index])
+        return self.blocks[index]
+
+    def __iter__(self) -> Iterator[InpBlock]:
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
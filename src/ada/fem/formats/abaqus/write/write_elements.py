@@ -1,6 +1,10 @@
-from itertools import groupby
+from functools import lru_cache
+from io import StringIO
+from itertools import groupby, islice
 from operator import attrgetter
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, Callable, Iterable, TextIO
+
+import numpy as np
 
 from ada.core.utils import NewLine
 from ada.fem.elements import ElemType
@@ -9,31 +13,86 @@ from .helper_utils import get_instance_name
 from .write_masses import write_mass_elem
 
 if TYPE_CHECKING:
-    from ada import FEM
-    from ada.fem import Elem, FemSet
+    from ada import FEM, Node
+    from ada.fem import Elem
+
+ELEMENTS_CHUNK_SIZE = 50_000
 
 
 def elements_str(fem: "FEM", written_on_assembly_level: bool) -> str:
-    part_el = fem.elements
-    grouping = groupby(part_el, key=attrgetter("type", "elset"))
     if len(fem.elements) == 0:
         return "** No elements"
 
-    return "".join(
-        list(
-            filter(
-                lambda x: x is not None,
-                [elwriter(x, elements, fem, written_on_assembly_level) for x, elements in grouping],
-            )
-        )
-    ).rstrip()
+    stream = StringIO()
+    write_elements(fem, stream, written_on_assembly_level)
+    return stream.getvalue().rstrip()
+
+
+def write_elements(fem: "FEM", stream: TextIO, written_on_assembly_level: bool) -> None:
+    """Stream all *ELEMENT blocks grouped by (type, elset) to a file handle"""
+    if len(fem.elements) == 0:
+        stream.write("** No elements\n")
+        return None
+
+    node_ref = None if written_on_assembly_level is False else _instance_ref(written_on_assembly_level)
+    num_blocks = 0
+    for (eltype, elset), elements in groupby(fem.elements, key=attrgetter("type", "elset")):
+        if eltype in ElemType.CONNECTOR_SHAPES.all:
+            continue
+
+        if eltype in ElemType.MASS_SHAPES.all:
+            stream.write(write_mass_elem(eltype, elset, fem, elements, written_on_assembly_level))
+        else:
+            el_type = fem.options.ABAQUS.default_elements.get_element_type(eltype)
+            el_set_str = f", ELSET={elset.name}" if elset is not None else ""
+            write_element_block(stream, f"*ELEMENT, type={el_type}{el_set_str}", elements, node_ref)
+        num_blocks += 1
+
+    if num_blocks == 0:
+        stream.write("\n")
+
 
+def write_element_block(
+    stream: TextIO,
+    header: str,
+    elements: Iterable["Elem"],
+    node_ref: Callable[["Node"], str] = None,
+    chunk_size: int = ELEMENTS_CHUNK_SIZE,
+) -> None:
+    """Stream a single *ELEMENT block in chunks. Shared by the Abaqus and Calculix writers.
 
-def write_elements(eltype: str, elset: "FemSet", fem: "FEM", elements: Iterable["Elem"], alevel: bool):
-    el_type = fem.options.ABAQUS.default_elements.get_element_type(eltype)
-    el_set_str = f", ELSET={elset.name}" if elset is not None else ""
-    el_str = "\n".join((write_elem(el, alevel) for el in elements))
-    return f"""*ELEMENT, type={el_type}{el_set_str}\n{el_str}\n"""
+    The connectivity of each chunk is collected in a numpy array and formatted with a single row template per number
+    of element nodes. If node_ref is None the node ids are written, otherwise the string returned by node_ref."""
+    stream.write(header + "\n")
+    elements = iter(elements)
+    while True:
+        chunk = list(islice(elements, chunk_size))
+        if len(chunk) == 0:
+            break
+
+        num_nodes = len(chunk[0].nodes)
+        if any(len(el.nodes) != num_nodes for el in chunk):
+            for el in chunk:
+                refs = [no.id if node_ref is None else node_ref(no) for no in el.nodes]
+                stream.write(get_elem_line_template(len(el.nodes)) % (el.id, *refs))
+            continue
+
+        if node_ref is None:
+            refs = np.fromiter((no.id for el in chunk for no in el.nodes), dtype=np.int64, count=len(chunk) * num_nodes)
+            ids = np.fromiter((el.id for el in chunk), dtype=np.int64, count=len(chunk))
+            values = np.column_stack((ids, refs.reshape(len(chunk), num_nodes))).ravel().tolist()
+        else:
+            values = [x for el in chunk for x in (el.id, *(node_ref(no) for no in el.nodes))]
+
+        stream.write((get_elem_line_template(num_nodes) * len(chunk)) % tuple(values))
+
+
+@lru_cache(maxsize=None)
+def get_elem_line_template(num_nodes: int) -> str:
+    """Returns the %-format template of a single element line, see write_elem()"""
+    nl = NewLine(10, suffix=7 * " ")
+    di = " %s" if num_nodes > 6 else "%13s"
+    return "%7s, " + " ".join([f"{di}," + next(nl) for _ in range(num_nodes)])[:-1] + "\n"
 
 
 def write_elem(el: "Elem", alevel: bool) -> str:
@@ -48,11 +107,8 @@ def write_elem(el: "Elem", alevel: bool) -> str:
     return el_str
 
 
-def elwriter(eltype_set, elements, fem: "FEM", written_on_assembly_level: bool):
-    eltype, elset = eltype_set
-    if eltype in ElemType.CONNECTOR_SHAPES.all:
-        return None
-    elif eltype in ElemType.MASS_SHAPES.all:
-        return write_mass_elem(eltype, elset, fem, elements, written_on_assembly_level)
-    else:
-        return write_elements(eltype, elset, fem, elements, written_on_assembly_level)
+def _instance_ref(written_on_assembly_level: bool) -> Callable[["Node"], str]:
+    def node_ref(no: "Node") -> str:
+        return get_instance_name(no, written_on_assembly_level)
+
+    return node_ref
@@ -1,20 +1,40 @@
+from io import StringIO
 from operator import attrgetter
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TextIO
+
+import numpy as np
 
 if TYPE_CHECKING:
     from ada import FEM
+    from ada.concepts.containers import Nodes
+
+NODES_CHUNK_SIZE = 100_000
+_NODE_LINE = "%7d, %13.6f, %13.6f, %13.6f\n"
 
 
 def nodes_str(fem: "FEM"):
-    f = "{nid:>7}, {x:>13.6f}, {y:>13.6f}, {z:>13.6f}"
     if len(fem.nodes) == 0:
         return "** No Nodes"
-    return (
-        "*NODE\n"
-        + "\n".join(
-            [f.format(nid=no.id, x=no[0], y=no[1], z=no[2]) for no in sorted(fem.nodes, key=attrgetter("id"))]
-        ).rstrip()
-    )
+
+    stream = StringIO()
+    write_nodes(fem.nodes, stream)
+    return stream.getvalue().rstrip()
+
+
+def write_nodes(nodes: "Nodes", stream: TextIO, chunk_size: int = NODES_CHUNK_SIZE) -> None:
+    """Stream a *NODE block sorted by node id to a file handle. The coordinates are formatted in chunks directly
+    from the numpy array of the nodes, so that memory use is bounded by the chunk size"""
+    if len(nodes) == 0:
+        stream.write("** No Nodes\n")
+        return None
+
+    data = nodes.to_np_array(include_id=True)
+    data = data[np.argsort(data[:, 0], kind="stable")]
+
+    stream.write("*NODE\n")
+    for i in range(0, len(data), chunk_size):
+        chunk = data[i : i + chunk_size]
+        stream.write((_NODE_LINE * len(chunk)) % tuple(chunk.ravel().tolist()))
 
 
 def rp_str(fem: "FEM") -> str:
@@ -1,12 +1,13 @@
 import os
-from typing import TYPE_CHECKING
+from io import StringIO
+from typing import TYPE_CHECKING, TextIO
 
 from ada.fem.conversion_utils import convert_ecc_to_mpc, convert_hinges_2_couplings
 
 from .write_constraints import constraints_str
-from .write_elements import elements_str
+from .write_elements import write_elements
 from .write_masses import masses_str
-from .write_nodes import nodes_str, rp_str
+from .write_nodes import rp_str, write_nodes
 from .write_sections import sections_str
 from .write_sets import elsets_str, nsets_str
 from .write_springs import springs_str
@@ -41,16 +42,27 @@ def write_part_bulk(part_in: "Part", analysis_dir):
         return None
 
     with open(bulk_file, "w") as d:
-        d.write(write_abaqus_part_str(part_in))
+        write_abaqus_part(part_in, d)
+
+
+def write_abaqus_part(part: "Part", stream: TextIO) -> None:
+    """Stream the part bulk data. Nodes and elements are written directly to the file handle in chunks"""
+    fem = part.fem
+    stream.write(f"** Abaqus Part {part.name}\n** Exported using ADA OpenSim\n")
+    write_nodes(fem.nodes, stream)
+    write_elements(fem, stream, False)
+    stream.write(part_data_str(part))
 
 
 def write_abaqus_part_str(part: "Part") -> str:
+    stream = StringIO()
+    write_abaqus_part(part, stream)
+    return stream.getvalue()
+
+
+def part_data_str(part: "Part") -> str:
     fem = part.fem
-    return f"""** Abaqus Part {part.name}
-** Exported using ADA OpenSim
-{nodes_str(fem)}
-{elements_str(fem, False)}
-{rp_str(fem)}
+    return f"""{rp_str(fem)}
 {elsets_str(fem, False)}
 {nsets_str(fem, False)}
 {sections_str(fem)}
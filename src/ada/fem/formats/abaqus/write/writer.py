@@ -6,12 +6,12 @@ from .write_amplitudes import amplitudes_str
 from .write_bc import boundary_conditions_str
 from .write_connectors import connector_sections_str, connectors_str
 from .write_constraints import constraints_str
-from .write_elements import elements_str
+from .write_elements import write_elements
 from .write_interactions import eval_interactions, int_prop_str
 from .write_main_inp import write_main_inp_str
 from .write_masses import masses_str
 from .write_materials import materials_str
-from .write_nodes import nodes_str
+from .write_nodes import write_nodes
 from .write_orientations import orientations_str
 from .write_parts import write_all_parts
 from .write_predefined_state import predefined_fields_str
@@ -55,15 +55,12 @@ def to_fem(assembly: "Assembly", name, analysis_dir=None, metadata=None, writabl
 
     # Assembly data
     with open(core_dir / "assembly_data.inp", "w") as d:
-        assembly_nodes_str = "** No Nodes"
-        if len(afem.nodes) > 0:
-            assembly_nodes_str = nodes_str(afem)
-        d.write(f"{assembly_nodes_str}\n")
+        write_nodes(afem.nodes, d)
         d.write(f"{nsets_str(afem, True)}\n")
         d.write(f"{elsets_str(afem, True)}\n")
         d.write(f"{surfaces_str(afem, True)}\n")
         d.write(orientations_str(afem, True) + "\n")
-        d.write(elements_str(afem, True) + "\n")
+        write_elements(afem, d, True)
         d.write(masses_str(afem, True))
 
     # Amplitude data
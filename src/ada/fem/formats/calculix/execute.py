@@ -21,9 +21,12 @@ def run_calculix(
 
 
 class CalculixExecute(LocalExecute):
-    def run(self, exit_on_complete=True):
+    def get_run_command(self) -> str:
         from ada.fem.formats import FEATypes
 
         exe_path = self.get_exe(FEATypes.CALCULIX)
-        out = self._run_local(f"{exe_path} -i {self.analysis_name}", exit_on_complete=exit_on_complete)
+        return f"{exe_path} -i {self.analysis_name}"
+
+    def run(self, exit_on_complete=True):
+        out = self._run_local(self.get_run_command(), exit_on_complete=exit_on_complete)
         return out
@@ -1,4 +1,5 @@
 from .read_eigen_data import get_eigen_data
-from .read_results import read_calculix_results
+from .read_frd_file import FrdFieldStore, FrdReader
+from .read_results import read_calculix_eigen_data, read_calculix_results
 
-__all__ = [read_calculix_results, get_eigen_data]
+__all__ = [read_calculix_results, read_calculix_eigen_data, get_eigen_data, FrdReader, FrdFieldStore]
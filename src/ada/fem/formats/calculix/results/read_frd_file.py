@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import os
+import pathlib
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from ada.fem.concepts.fields import FieldInfo, FieldStore
+
+# Element type number in the frd file -> (meshio cell type, number of nodes)
+FRD_ELEM_TYPES = {
+    1: ("hexahedron", 8),
+    2: ("wedge", 6),
+    3: ("tetra", 4),
+    4: ("hexahedron20", 20),
+    5: ("wedge15", 15),
+    6: ("tetra10", 10),
+    7: ("triangle", 3),
+    8: ("triangle6", 6),
+    9: ("quad", 4),
+    10: ("quad8", 8),
+    11: ("line", 2),
+    12: ("line3", 3),
+}
+
+# The frd file uses the cgx node order for quadratic hexahedrons and wedges, where the midside nodes of the vertical
+# edges come before the ones on the top face.
+FRD_NODE_ORDER = {
+    4: list(range(12)) + list(range(16, 20)) + list(range(12, 16)),
+    5: list(range(9)) + list(range(12, 15)) + list(range(9, 12)),
+}
+
+_FLOAT_WIDTH = 12
+_VALUES_PER_LINE = 6
+
+
+class FrdFormat:
+    ASCII_SHORT = 0
+    ASCII_LONG = 1
+    BINARY_FLOAT = 2
+    BINARY_DOUBLE = 3
+
+
+@dataclass
+class FrdField:
+    """A nodal result block. The values are aligned with the node ids of the block"""
+
+    name: str
+    components: List[str]
+    node_ids: np.ndarray
+    values: np.ndarray
+
+
+@dataclass
+class FrdStep:
+    """All result blocks belonging to a single step (or increment, eigenmode) of the analysis"""
+
+    step: int
+    value: float
+    fields: Dict[str, FrdField] = field(default_factory=dict)
+
+
+class FrdReader:
+    """Streaming reader of CalculiX .frd result files in ASCII (short or long) and binary format.
+
+    The mesh blocks are located on initialization by skipping them by length, and are only parsed when the nodes or
+    elements are first requested. The result blocks are read by iter_steps() one step at a time, so that only a single
+    step has to be held in memory. All data is parsed in chunks directly into numpy arrays.
+
+    :param frd_file: Path to the .frd file
+    :param chunk_size: Maximum number of records parsed at a time"""
+
+    def __init__(self, frd_file: str | os.PathLike, chunk_size: int = 100_000):
+        self.frd_file = pathlib.Path(frd_file)
+        self.chunk_size = chunk_size
+        self.num_nodes = 0
+        self._node_ids = None
+        self._coords = None
+        self._elements = None
+        self._nodes_offset = None
+        self._elements_offset = None
+        self._results_offset = None
+        self._scan_mesh()
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        if self._node_ids is None:
+            self._read_mesh()
+        return self._node_ids
+
+    @property
+    def coords(self) -> np.ndarray:
+        if self._coords is None:
+            self._read_mesh()
+        return self._coords
+
+    @property
+    def elements(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        if self._elements is None:
+            self._read_mesh()
+        return self._elements
+
+    def _scan_mesh(self) -> None:
+        """Find the byte offsets of the node, element and first result blocks. The node and element blocks are skipped
+        by their length without being parsed"""
+        with open(self.frd_file, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if line == b"" or line.startswith(b" 9999"):
+                    break
+
+                key = line[:6].strip()
+                if key == b"2C":
+                    self._nodes_offset = offset
+                    self.num_nodes = int(line.split()[1])
+                    _skip_nodes(f, line)
+                elif key == b"3C":
+                    self._elements_offset = offset
+                    _skip_elements(f, line)
+                elif key.startswith(b"100C") or key.startswith(b"1PSTEP"):
+                    self._results_offset = offset
+                    break
+
+    def _read_mesh(self) -> None:
+        self._node_ids = np.empty(0, dtype=np.int64)
+        self._coords = np.empty((0, 3), dtype=np.float64)
+        self._elements = dict()
+        with open(self.frd_file, "rb") as f:
+            if self._nodes_offset is not None:
+                f.seek(self._nodes_offset)
+                self._node_ids, self._coords = _read_nodes(f, f.readline(), self.chunk_size)
+            if self._elements_offset is not None:
+                f.seek(self._elements_offset)
+                self._elements = _read_elements(f, f.readline())
+
+    def iter_fields(self) -> Iterator[Tuple[int, float, FrdField]]:
+        """Yield (step number, step value, field) for each result block in the file"""
+        if self._results_offset is None:
+            return
+
+        with open(self.frd_file, "rb") as f:
+            f.seek(self._results_offset)
+            while True:
+                line = f.readline()
+                if line == b"" or line.startswith(b" 9999"):
+                    break
+
+                if line[:6].strip().startswith(b"100C"):
+                    yield _read_result_block(f, line, self.chunk_size)
+
+    def iter_steps(self) -> Iterator[FrdStep]:
+        """Yield the results one step at a time"""
+        curr_step = None
+        for step, value, frd_field in self.iter_fields():
+            if curr_step is not None and (curr_step.step, curr_step.value) != (step, value):
+                yield curr_step
+                curr_step = None
+
+            if curr_step is None:
+                curr_step = FrdStep(step, value)
+
+            curr_step.fields[frd_field.name] = frd_field
+
+        if curr_step is not None:
+            yield curr_step
+
+    def get_field_index(self) -> List[FieldInfo]:
+        """Returns the step, name, components and byte offset of each result block without parsing the values"""
+        if self._results_offset is None:
+            return []
+
+        index = []
+        with open(self.frd_file, "rb") as f:
+            f.seek(self._results_offset)
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if line == b"" or line.startswith(b" 9999"):
+                    break
+
+                if line[:6].strip().startswith(b"100C") is False:
+                    continue
+
+                step, value, num_nodes, frd_format, name, components = _read_result_header(f, line)
+                shape = (self.num_nodes, len(components))
+                index.append(FieldInfo(name, step, value, tuple(components), shape, offset))
+                _skip_result_values(f, frd_format, num_nodes, len(components))
+
+        return index
+
+    def read_field(self, info: FieldInfo) -> FrdField:
+        """Read a single result block from its byte offset in the file"""
+        with open(self.frd_file, "rb") as f:
+            f.seek(info.offset)
+            _, _, frd_field = _read_result_block(f, f.readline(), self.chunk_size)
+        return frd_field
+
+    def get_cells(self) -> List[Tuple[str, np.ndarray]]:
+        """Returns the element connectivity as indices into the coordinate array"""
+        order = np.argsort(self.node_ids, kind="stable")
+        sorted_ids = self.node_ids[order]
+        return [(el_type, order[np.searchsorted(sorted_ids, conn)]) for el_type, (_, conn) in self.elements.items()]
+
+    def align_to_nodes(self, frd_field: FrdField) -> np.ndarray:
+        """Returns the field values aligned with the coordinate array. Nodes without results are set to NaN"""
+        order = np.argsort(self.node_ids, kind="stable")
+        sorted_ids = self.node_ids[order]
+
+        values = np.full((len(self.node_ids), frd_field.values.shape[1]), np.nan, dtype=frd_field.values.dtype)
+        pos = np.searchsorted(sorted_ids, frd_field.node_ids).clip(max=max(len(sorted_ids) - 1, 0))
+        is_found = sorted_ids[pos] == frd_field.node_ids
+        values[order[pos[is_found]]] = frd_field.values[is_found]
+        return values
+
+    def get_point_data(self, frd_step: FrdStep) -> Dict[str, np.ndarray]:
+        return {name: self.align_to_nodes(frd_field) for name, frd_field in frd_step.fields.items()}
+
+    def to_meshio(self, frd_step: FrdStep = None):
+        import meshio
+
+        point_data = self.get_point_data(frd_step) if frd_step is not None else dict()
+        return meshio.Mesh(self.coords, self.get_cells(), point_data=point_data)
+
+
+class FrdFieldStore(FieldStore):
+    """Lazy, step-indexed access to the nodal result fields of a CalculiX .frd file"""
+
+    def __init__(self, file_ref: str | os.PathLike):
+        super().__init__(file_ref)
+        self._reader = None
+
+    @property
+    def reader(self) -> FrdReader:
+        if self._reader is None:
+            self._reader = FrdReader(self.file_ref)
+        return self._reader
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        return self.reader.node_ids
+
+    def get_mesh(self) -> Tuple[np.ndarray, List[Tuple[str, np.ndarray]]]:
+        return self.reader.coords, self.reader.get_cells()
+
+    def _build_index(self) -> List[FieldInfo]:
+        return self.reader.get_field_index()
+
+    def read(self, info: FieldInfo) -> np.ndarray:
+        return self.reader.align_to_nodes(self.reader.read_field(info))
+
+
+def read_frd_last_step(frd_file: str | os.PathLike):
+    """Returns a meshio Mesh with the results of the last step in the frd file. Only the last step is parsed"""
+    reader = FrdReader(frd_file)
+    index = reader.get_field_index()
+    if len(index) == 0:
+        return reader.to_meshio()
+
+    last = max(index, key=lambda x: x.step)
+    last_step = FrdStep(last.step, last.step_value)
+    for info in index:
+        if (info.step, info.step_value) == (last.step, last.step_value):
+            last_step.fields[info.name] = reader.read_field(info)
+
+    return reader.to_meshio(last_step)
+
+
+def _get_format(header: bytes) -> int:
+    return int(header.split()[-1])
+
+
+def _read_nodes(f: BinaryIO, header: bytes, chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    num_nodes = int(header.split()[1])
+    frd_format = _get_format(header)
+
+    if frd_format >= FrdFormat.BINARY_FLOAT:
+        data = _read_binary_records(f, _get_binary_result_record(frd_format, 3), num_nodes, chunk_size)
+        return data["id"].astype(np.int64), data["values"].astype(np.float64)
+
+    node_ids, coords = _read_ascii_records(f, frd_format, 3, chunk_size)
+    return node_ids, coords
+
+
+def _skip_nodes(f: BinaryIO, header: bytes) -> None:
+    _skip_result_values(f, _get_format(header), int(header.split()[1]), 3)
+
+
+def _skip_elements(f: BinaryIO, header: bytes) -> None:
+    num_elem = int(header.split()[1])
+    frd_format = _get_format(header)
+    if frd_format < FrdFormat.BINARY_FLOAT:
+        _skip_result_values(f, frd_format, num_elem, 0)
+        return
+
+    # The binary element records vary in length with the element type, so only the record headers are read
+    for _ in range(num_elem):
+        el_type = np.frombuffer(f.read(16), dtype="<i4")[1]
+        f.seek(4 * FRD_ELEM_TYPES[int(el_type)][1], os.SEEK_CUR)
+
+
+def _read_elements(f: BinaryIO, header: bytes) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    num_elem = int(header.split()[1])
+    frd_format = _get_format(header)
+
+    elements: Dict[int, Tuple[List[int], List[List[int]]]] = dict()
+    if frd_format >= FrdFormat.BINARY_FLOAT:
+        for _ in range(num_elem):
+            el_id, el_type, _, _ = np.frombuffer(f.read(16), dtype="<i4").tolist()
+            num_nodes = FRD_ELEM_TYPES[el_type][1]
+            nodes = np.frombuffer(f.read(4 * num_nodes), dtype="<i4").tolist()
+            el_ids, conn = elements.setdefault(el_type, ([], []))
+            el_ids.append(el_id)
+            conn.append(nodes)
+    else:
+        width = 5 if frd_format == FrdFormat.ASCII_SHORT else 10
+        while True:
+            line = f.readline()
+            if line.startswith(b" -3") or line == b"":
+                break
+            el_id = int(line[3 : 3 + width])
+            el_type = int(line[3 + width : 8 + width])
+            num_nodes = FRD_ELEM_TYPES[el_type][1]
+            nodes = []
+            while len(nodes) < num_nodes:
+                node_line = f.readline().rstrip(b"\r\n")
+                nodes += [int(node_line[i : i + width]) for i in range(3, len(node_line), width)]
+            el_ids, conn = elements.setdefault(el_type, ([], []))
+            el_ids.append(el_id)
+            conn.append(nodes[:num_nodes])
+
+    result = dict()
+    for el_type, (el_ids, conn) in elements.items():
+        conn = np.array(conn, dtype=np.int64)
+        if el_type in FRD_NODE_ORDER:
+            conn = conn[:, FRD_NODE_ORDER[el_type]]
+        result[FRD_ELEM_TYPES[el_type][0]] = (np.array(el_ids, dtype=np.int64), conn)
+
+    return result
+
+
+def _read_result_header(f: BinaryIO, header: bytes) -> Tuple[int, float, int, int, str, List[str]]:
+    value = float(header[12:24])
+    num_nodes = int(header[24:36])
+    step = int(header[58:63])
+    frd_format = int(header[73:75])
+
+    name_line = f.readline()
+    name = name_line[5:13].decode().strip()
+    num_comp_lines = int(name_line[13:18])
+
+    components = []
+    for _ in range(num_comp_lines):
+        comp_line = f.readline()
+        is_derived = comp_line[33:38].strip() == b"1"
+        if is_derived is False:
+            components.append(comp_line[5:13].decode().strip())
+
+    return step, value, num_nodes, frd_format, name, components
+
+
+def _read_result_block(f: BinaryIO, header: bytes, chunk_size: int) -> Tuple[int, float, FrdField]:
+    step, value, num_nodes, frd_format, name, components = _read_result_header(f, header)
+
+    num_values = len(components)
+    if frd_format >= FrdFormat.BINARY_FLOAT:
+        record = _get_binary_result_record(frd_format, num_values)
+        data = _read_binary_records(f, record, num_nodes, chunk_size)
+        node_ids, values = data["id"].astype(np.int64), data["values"]
+    else:
+        node_ids, values = _read_ascii_records(f, frd_format, num_values, chunk_size)
+
+    return step, value, FrdField(name, components, node_ids, values)
+
+
+def _skip_result_values(f: BinaryIO, frd_format: int, num_nodes: int, num_values: int) -> None:
+    if frd_format >= FrdFormat.BINARY_FLOAT:
+        f.seek(num_nodes * _get_binary_result_record(frd_format, num_values).itemsize, os.SEEK_CUR)
+        return
+
+    while True:
+        line = f.readline()
+        if line.startswith(b" -3") or line == b"":
+            break
+
+
+def _get_binary_result_record(frd_format: int, num_values: int) -> np.dtype:
+    float_type = "<f4" if frd_format == FrdFormat.BINARY_FLOAT else "<f8"
+    return np.dtype([("id", "<i4"), ("values", float_type, (num_values,))])
+
+
+def _read_binary_records(f: BinaryIO, record: np.dtype, num_records: int, chunk_size: int) -> np.ndarray:
+    chunks = []
+    remaining = num_records
+    while remaining > 0:
+        num_chunk = min(chunk_size, remaining)
+        chunks.append(np.frombuffer(f.read(record.itemsize * num_chunk), dtype=record))
+        remaining -= num_chunk
+
+    return np.concatenate(chunks) if len(chunks) > 0 else np.empty(0, dtype=record)
+
+
+def _read_ascii_records(f: BinaryIO, frd_format: int, num_values: int, chunk_size: int):
+    """Read " -1" records (with " -2" continuation lines) until the end of block marker " -3" in chunks"""
+    id_width = 5 if frd_format == FrdFormat.ASCII_SHORT else 10
+    lines_per_record = max(1, -(-num_values // _VALUES_PER_LINE))
+
+    id_chunks, value_chunks = [], []
+    lines = []
+    while True:
+        line = f.readline()
+        is_end = line.startswith(b" -3") or line == b""
+        if is_end is False:
+            lines.append(line.rstrip(b"\r\n"))
+
+        if len(lines) >= chunk_size * lines_per_record or is_end:
+            if len(lines) > 0:
+                ids, values = _parse_ascii_records(lines, id_width, num_values, lines_per_record)
+                id_chunks.append(ids)
+                value_chunks.append(values)
+            lines = []
+
+        if is_end:
+            break
+
+    if len(id_chunks) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, num_values), dtype=np.float64)
+
+    return np.concatenate(id_chunks), np.concatenate(value_chunks)
+
+
+def _parse_ascii_records(lines: List[bytes], id_width: int, num_values: int, lines_per_record: int):
+    values_start = 3 + id_width
+    if lines_per_record > 1:
+        records = [lines[i : i + lines_per_record] for i in range(0, len(lines), lines_per_record)]
+        lines = [rec[0][:values_start] + b"".join(x[values_start:] for x in rec) for rec in records]
+
+    # Fixed width columns are used as values are not guaranteed to be separated by whitespace
+    record_width = values_start + num_values * _FLOAT_WIDTH
+    buffer = np.array(lines, dtype=f"S{record_width}").view(np.uint8).reshape(len(lines), record_width)
+
+    ids = _fixed_width_column(buffer, 3, values_start).astype(np.int64)
+    values = np.empty((len(lines), num_values), dtype=np.float64)
+    for i in range(num_values):
+        start = values_start + i * _FLOAT_WIDTH
+        values[:, i] = _fixed_width_column(buffer, start, start + _FLOAT_WIDTH).astype(np.float64)
+
+    return ids, values
+
+
+def _fixed_width_column(buffer: np.ndarray, start: int, end: int) -> np.ndarray:
+    return np.ascontiguousarray(buffer[:, start:end]).view(f"S{end - start}").ravel()
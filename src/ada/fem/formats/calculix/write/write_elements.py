@@ -1,10 +1,12 @@
+from io import StringIO
 from itertools import groupby
 from operator import attrgetter
-from typing import Iterable
+from typing import TextIO
 
 from ada.core.utils import NewLine
 from ada.fem import Elem, FemSection
 from ada.fem.containers import FemElements
+from ada.fem.formats.abaqus.write.write_elements import write_element_block
 from ada.fem.shapes import ElemShape
 
 
@@ -12,23 +14,24 @@ def elements_str(fem_elements: FemElements) -> str:
     if len(fem_elements) == 0:
         return "** No elements"
 
-    el_str = ""
-    for (el_type, fem_sec), elements in groupby(fem_elements, key=attrgetter("type", "fem_sec")):
-        el_str += elwriter(el_type, fem_sec, elements)
-
-    return el_str
+    stream = StringIO()
+    write_elements(fem_elements, stream)
+    return stream.getvalue()
 
 
-def elwriter(eltype, fem_sec: FemSection, elements: Iterable[Elem]):
-
-    if "connector" in eltype:
+def write_elements(fem_elements: FemElements, stream: TextIO) -> None:
+    """Stream all *ELEMENT blocks grouped by (type, section) to a file handle using the Abaqus element writer"""
+    if len(fem_elements) == 0:
+        stream.write("** No elements\n")
         return None
 
-    sub_eltype = el_type_sub(eltype, fem_sec)
-    el_set_str = f", ELSET={fem_sec.elset.name}" if fem_sec.elset is not None else ""
-    el_str = "\n".join((write_elem(el) for el in elements))
+    for (el_type, fem_sec), elements in groupby(fem_elements, key=attrgetter("type", "fem_sec")):
+        if "connector" in el_type:
+            continue
 
-    return f"""*ELEMENT, type={sub_eltype}{el_set_str}\n{el_str}\n"""
+        sub_eltype = el_type_sub(el_type, fem_sec)
+        el_set_str = f", ELSET={fem_sec.elset.name}" if fem_sec.elset is not None else ""
+        write_element_block(stream, f"*ELEMENT, type={sub_eltype}{el_set_str}", elements)
 
 
 def el_type_sub(el_type, fem_sec: FemSection) -> str:
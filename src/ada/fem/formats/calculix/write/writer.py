@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import traceback
+from io import StringIO
 from itertools import groupby
 from operator import attrgetter
 from typing import TYPE_CHECKING
@@ -9,6 +10,7 @@ from ada.concepts.containers import Nodes
 from ada.core.utils import NewLine, get_current_user
 from ada.fem import Bc, FemSection, FemSet
 from ada.fem.formats.abaqus.write.write_bc import aba_bc_map, valid_aba_bcs
+from ada.fem.formats.abaqus.write.write_nodes import write_nodes
 from ada.fem.formats.abaqus.write.write_sections import (
     eval_general_properties,
     shell_section_str,
@@ -20,7 +22,7 @@ from ada.sections import SectionCat as Sc
 
 from ..compatibility import check_compatibility
 from .templates import main_header_str
-from .write_elements import elements_str
+from .write_elements import write_elements
 from .write_loads import get_all_grav_loads
 from .write_steps import step_str
 
@@ -50,8 +52,8 @@ def to_fem(assembly: Assembly, name, analysis_dir, metadata=None):
         f.write(main_header_str.format(username=get_current_user()))
 
         # Part level information
-        f.write(nodes_str(p.fem.nodes) + "\n")
-        f.write(elements_str(p.fem.elements).strip() + "\n")
+        write_nodes(p.fem.nodes, f)
+        write_elements(p.fem.elements, f)
         f.write("*USER ELEMENT,TYPE=U1,NODES=2,INTEGRATION POINTS=2,MAXDOF=6\n")
         f.write(elsets_str(p.fem.elsets) + "\n")
         f.write(elsets_str(assembly.fem.elsets) + "\n")
@@ -130,10 +132,9 @@ def nodes_str(fem_nodes: Nodes) -> str:
     if len(fem_nodes) == 0:
         return "** No Nodes"
 
-    f = "{nid:>7}, {x:>13.6f}, {y:>13.6f}, {z:>13.6f}"
-    n_ = (f.format(nid=no.id, x=no[0], y=no[1], z=no[2]) for no in sorted(fem_nodes, key=attrgetter("id")))
-
-    return "*NODE\n" + "\n".join(n_).rstrip()
+    stream = StringIO()
+    write_nodes(fem_nodes, stream)
+    return stream.getvalue().rstrip()
 
 
 def gen_set_str(fem_set: FemSet):
@@ -1,5 +1,3 @@
-import pathlib
-
 from ..utils import LocalExecute
 
 
@@ -35,7 +33,6 @@ def run_code_aster(
     :param run_in_shell:
     """
 
-    name = pathlib.Path(inp_path).stem
     ca = CodeAsterExecute(
         inp_path,
         cpus=cpus,
@@ -43,18 +40,23 @@ def run_code_aster(
         metadata=metadata,
         auto_execute=execute,
     )
-    with open(inp_path, "w") as f:
-        f.write(write_export_file(name, cpus))
-
     return ca.run(exit_on_complete=exit_on_complete)
 
 
 class CodeAsterExecute(LocalExecute):
-    def run(self, exit_on_complete=True):
+    def prepare(self):
+        super().prepare()
+        with open(self.inp_path, "w") as f:
+            f.write(write_export_file(self.analysis_name, self.cpus))
+
+    def get_run_command(self) -> str:
         from ada.fem.formats import FEATypes
 
         exe_path = self.get_exe(FEATypes.CODE_ASTER)
-        out = self._run_local(f'"{exe_path}" {self.analysis_name}.export', exit_on_complete=exit_on_complete)
+        return f'"{exe_path}" {self.analysis_name}.export'
+
+    def run(self, exit_on_complete=True):
+        out = self._run_local(self.get_run_command(), exit_on_complete=exit_on_complete)
         return out
 
 
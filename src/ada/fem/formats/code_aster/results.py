@@ -1,13 +1,13 @@
 import logging
 import pathlib
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Tuple
 
 import h5py
-import meshio
 import numpy as np
 
 from ada.fem import StepEigen
 from ada.fem.concepts.eigenvalue import EigenDataSummary, EigenMode
+from ada.fem.concepts.fields import FieldInfo, FieldStore
 from ada.fem.elements import ElemShape
 
 from .read.reader import med_to_fem
@@ -49,9 +49,86 @@ def get_eigen_frequency_deformed_meshes(rmed_file):
     return fem, eig_deformed_meshes
 
 
+class MedFieldStore(FieldStore):
+    """Lazy, step-indexed access to the nodal result fields of a Code Aster .rmed (HDF5) file"""
+
+    def __init__(self, file_ref):
+        super().__init__(file_ref)
+        self._num_nodes = None
+
+    @property
+    def num_nodes(self) -> int:
+        if self._num_nodes is None:
+            with h5py.File(self.file_ref, "r") as f:
+                self._num_nodes = int(_get_med_mesh(f)["NOE"]["COO"].attrs["NBR"])
+        return self._num_nodes
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        return np.arange(1, self.num_nodes + 1)
+
+    def get_mesh(self) -> Tuple[np.ndarray, List[Tuple[str, np.ndarray]]]:
+        from meshio.med._med import med_to_meshio_type
+
+        with h5py.File(self.file_ref, "r") as f:
+            mesh = _get_med_mesh(f)
+            coo = mesh["NOE"]["COO"]
+            points = coo[()].reshape((int(coo.attrs["NBR"]), -1), order="F")
+            cells = []
+            for med_type, med_cells in mesh["MAI"].items():
+                nod = med_cells["NOD"]
+                conn = nod[()].reshape((int(nod.attrs["NBR"]), -1), order="F") - 1
+                cells.append((med_to_meshio_type[med_type], conn.astype(np.int64)))
+
+        return points, cells
+
+    def _build_index(self) -> List[FieldInfo]:
+        index = []
+        with h5py.File(self.file_ref, "r") as f:
+            if "CHA" not in f:
+                return index
+
+            for name, med_field in f["CHA"].items():
+                components = tuple(med_field.attrs["NOM"].decode().split()) if "NOM" in med_field.attrs else tuple()
+                num_comps = int(med_field.attrs.get("NCO", len(components)))
+                for key in sorted(med_field.keys()):
+                    med_step = med_field[key]
+                    if "NOE" not in med_step:
+                        continue
+                    step = int(med_step.attrs["NDT"])
+                    step_value = float(med_step.attrs["PDT"])
+                    shape = (self.num_nodes, num_comps)
+                    index.append(FieldInfo(name, step, step_value, components, shape, med_step.name))
+
+        return index
+
+    def read(self, info: FieldInfo) -> np.ndarray:
+        with h5py.File(self.file_ref, "r") as f:
+            med_nodal = f[info.offset]["NOE"]
+            profile = med_nodal.attrs["PFL"]
+            data = med_nodal[profile]
+            num_data = data.attrs["NBR"]
+            values = data["CO"][()].reshape(num_data, -1, order="F")
+            if profile.decode() == "MED_NO_PROFILE_INTERNAL":
+                return values
+
+            index_profile = f["PROFILS"][profile]["PFL"][()] - 1
+            result = np.full((self.num_nodes, values.shape[1]), np.nan)
+            result[index_profile] = values
+            return result
+
+
+def _get_med_mesh(f: h5py.File) -> h5py.Group:
+    mesh = list(f["ENS_MAA"].values())[0]
+    if "NOE" not in mesh:
+        mesh = list(mesh.values())[0]
+    return mesh
+
+
 def read_code_aster_results(results: "Results", file_ref: pathlib.Path, overwrite):
-    if results.assembly is not None and isinstance(results.assembly.fem.steps[0], StepEigen):
-        results.eigen_mode_data = get_eigen_data(file_ref)
+    import meshio
+
+    read_code_aster_eigen_data(results, file_ref)
 
     fem = med_to_fem(file_ref, "temp")
     if any([x.type == ElemShape.TYPES.shell.TRI7 for x in fem.elements.shell]):
@@ -63,3 +140,8 @@ def read_code_aster_results(results: "Results", file_ref: pathlib.Path, overwrit
         return None
 
     return meshio.read(file_ref, "med")
+
+
+def read_code_aster_eigen_data(results: "Results", file_ref: pathlib.Path):
+    if results.assembly is not None and isinstance(results.assembly.fem.steps[0], StepEigen):
+        results.eigen_mode_data = get_eigen_data(file_ref)
@@ -47,8 +47,6 @@ class FemConverters:
 
 
 def get_fem_converters(fem_file, fem_format, fem_converter):
-    from ada.fem.formats.mesh_io import meshio_read_fem, meshio_to_fem
-
     if fem_format is None:
         fem_format = interpret_fem(fem_file)
 
@@ -57,6 +55,8 @@ def get_fem_converters(fem_file, fem_format, fem_converter):
         fem_importer = fem_imports.get(fem_format, None)
         fem_exporter = fem_exports.get(fem_format, None)
     elif fem_converter.lower() == FemConverters.MESHIO:
+        from ada.fem.formats.mesh_io import meshio_read_fem, meshio_to_fem
+
         fem_importer = meshio_read_fem
         fem_exporter = meshio_to_fem
     else:
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+import queue
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Type
+
+from .abaqus.execute import AbaqusExecute
+from .calculix.execute import CalculixExecute
+from .code_aster.execute import CodeAsterExecute
+from .general import FEATypes
+from .sesam.execute import SesamExecute
+from .utils import (
+    LocalExecute,
+    default_fem_inp_path,
+    default_fem_res_path,
+    should_convert,
+)
+
+if TYPE_CHECKING:
+    from ada import Assembly
+    from ada.fem.results import Results
+
+logger = logging.getLogger(__name__)
+
+fem_execute_classes: Dict[str, Type[LocalExecute]] = {
+    FEATypes.ABAQUS: AbaqusExecute,
+    FEATypes.CALCULIX: CalculixExecute,
+    FEATypes.CODE_ASTER: CodeAsterExecute,
+    FEATypes.SESAM: SesamExecute,
+}
+
+
+class JobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+
+@dataclass
+class FemJob:
+    """An analysis in the SolverJobQueue. The results are available once the job has finished"""
+
+    assembly: Assembly
+    name: str
+    fem_format: str
+    scratch_dir: os.PathLike = None
+    cpus: int = 1
+    gpus: int = None
+    metadata: dict = None
+    overwrite: bool = False
+    fem_converter: str = "default"
+    import_result_mesh: bool = False
+    status: str = JobStatus.PENDING
+    returncode: int = None
+    error: Exception = field(default=None, repr=False)
+    elapsed: float = None
+    results: Results = field(default=None, repr=False)
+    res_path: pathlib.Path = None
+    _executor: LocalExecute = field(default=None, repr=False)
+
+    @property
+    def log_file(self):
+        if self._executor is None:
+            return None
+        return self._executor.analysis_dir / f"{self.name}.log"
+
+    def get_output(self) -> subprocess.CompletedProcess | None:
+        """The solver output read from the log file, in the same form as the output of a solver run outside the queue.
+        The stderr of the solver is merged into stdout"""
+        log_file = self.log_file
+        if log_file is None or log_file.exists() is False:
+            return None
+
+        return subprocess.CompletedProcess(
+            self._executor.get_run_command(), self.returncode, stdout=log_file.read_text(), stderr=None
+        )
+
+
+class SolverJobQueue:
+    """Run many FEM analyses concurrently. Input decks are written one at a time in the calling thread, while the
+    solvers run as separate processes whose output is streamed to the log and to a log file in the analysis folder.
+
+    :param max_cpus: Total number of cpus shared by all running jobs. Defaults to the number of cpus of the machine
+    :param licenses: Maximum number of concurrently running jobs per fem format, e.g. dict(abaqus=2)
+    """
+
+    def __init__(self, max_cpus: int = None, licenses: Dict[str, int] = None):
+        self.max_cpus = (os.cpu_count() or 1) if max_cpus is None else max_cpus
+        self.licenses = dict() if licenses is None else licenses
+        self._jobs: List[FemJob] = []
+
+    def add(
+        self,
+        assembly: Assembly,
+        name: str,
+        fem_format: str,
+        scratch_dir=None,
+        cpus=1,
+        gpus=None,
+        metadata=None,
+        overwrite=False,
+        fem_converter="default",
+        import_result_mesh=False,
+    ) -> FemJob:
+        if fem_format not in fem_execute_classes:
+            raise NotImplementedError(f'The FEM format "{fem_format}" has no execute function')
+
+        if fem_format == FEATypes.SESAM and cpus != 1:
+            logger.info("sestra runs on single core only. changing cpus=1")
+            cpus = 1
+
+        if cpus > self.max_cpus:
+            raise ValueError(f'Job "{name}" requires {cpus} cpus, but the queue is limited to {self.max_cpus} cpus')
+
+        if self.licenses.get(fem_format, 1) < 1:
+            raise ValueError(f'No licenses are available for the FEM format "{fem_format}"')
+
+        job = FemJob(
+            assembly,
+            name,
+            fem_format,
+            scratch_dir=scratch_dir,
+            cpus=cpus,
+            gpus=gpus,
+            metadata=metadata,
+            overwrite=overwrite,
+            fem_converter=fem_converter,
+            import_result_mesh=import_result_mesh,
+        )
+        self._jobs.append(job)
+        return job
+
+    @property
+    def jobs(self) -> List[FemJob]:
+        return list(self._jobs)
+
+    def as_completed(self) -> Iterator[FemJob]:
+        """Start the pending jobs in the order they were added as soon as enough cpus and licenses are free, and yield
+        each job when it has finished. A job which does not fit in the free resources does not block the jobs after
+        it"""
+        pending = [job for job in self._jobs if job.status == JobStatus.PENDING]
+        done = queue.Queue()
+        free_cpus = self.max_cpus
+        free_licenses = dict(self.licenses)
+        num_running = 0
+
+        while len(pending) > 0 or num_running > 0:
+            for job in list(pending):
+                licenses = free_licenses.get(job.fem_format, None)
+                if job.cpus > free_cpus or licenses == 0:
+                    continue
+
+                pending.remove(job)
+                if self._write_input(job) is False:
+                    if job.status == JobStatus.FINISHED:
+                        job.results = self._get_results(job)
+                    yield job
+                    continue
+
+                free_cpus -= job.cpus
+                if licenses is not None:
+                    free_licenses[job.fem_format] = licenses - 1
+                num_running += 1
+                job.status = JobStatus.RUNNING
+                threading.Thread(target=self._run_job, args=(job, done), daemon=True).start()
+
+            if num_running == 0:
+                if len(pending) > 0:
+                    raise ValueError("The pending jobs require more cpus or licenses than the queue has available")
+                continue
+
+            job = done.get()
+            num_running -= 1
+            free_cpus += job.cpus
+            if job.fem_format in free_licenses:
+                free_licenses[job.fem_format] += 1
+
+            job.results = self._get_results(job)
+            yield job
+
+    def run(self) -> List[Results]:
+        """Run all pending jobs and return their results in the order the jobs were added"""
+        for job in self.as_completed():
+            if job.status == JobStatus.FAILED:
+                logger.error(f'Analysis "{job.name}" failed: {job.error or f"return code {job.returncode}"}')
+
+        return [job.results for job in self._jobs]
+
+    def _write_input(self, job: FemJob) -> bool:
+        """Write the input deck of the job. Returns False if the job should not be run, either because writing the
+        input failed or because the result file exists and overwrite is False"""
+        from ada.config import Settings
+
+        scratch_dir = Settings.scratch_dir if job.scratch_dir is None else pathlib.Path(job.scratch_dir)
+        job.res_path = default_fem_res_path(job.name, scratch_dir=scratch_dir, fem_format=job.fem_format)
+        if should_convert(job.res_path, job.overwrite) is False:
+            logger.info(f'Result file "{job.res_path}" already exists. Use "overwrite=True" to rerun the analysis')
+            job.status = JobStatus.FINISHED
+            return False
+
+        try:
+            job.assembly.to_fem(
+                job.name,
+                job.fem_format,
+                scratch_dir=scratch_dir,
+                metadata=job.metadata,
+                overwrite=job.overwrite,
+                fem_converter=job.fem_converter,
+            )
+            inp_path = default_fem_inp_path(job.name, scratch_dir)[job.fem_format]
+            exe_cls = fem_execute_classes[job.fem_format]
+            job._executor = exe_cls(inp_path, cpus=job.cpus, gpus=job.gpus, metadata=job.metadata)
+            job._executor.prepare()
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = e
+            return False
+
+        return True
+
+    @staticmethod
+    def _run_job(job: FemJob, done: queue.Queue):
+        exe = job._executor
+        start = time.perf_counter()
+        try:
+            run_cmd = exe.get_run_command()
+            os.makedirs(exe.execute_dir, exist_ok=True)
+            logger.info(f'Starting {job.fem_format} analysis "{job.name}" using {job.cpus} cpus')
+            with open(job.log_file, "w") as log_file:
+                proc = subprocess.Popen(
+                    run_cmd,
+                    shell=True,
+                    cwd=exe.execute_dir,
+                    env=os.environ,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                )
+                for line in proc.stdout:
+                    log_file.write(line)
+                    logger.info(f"[{job.name}] {line.rstrip()}")
+                job.returncode = proc.wait()
+
+            job.status = JobStatus.FINISHED if job.returncode == 0 else JobStatus.FAILED
+            logger.info(f'Finished {job.fem_format} analysis "{job.name}" with return code {job.returncode}')
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = e
+        finally:
+            job.elapsed = time.perf_counter() - start
+            done.put(job)
+
+    @staticmethod
+    def _get_results(job: FemJob) -> Results:
+        from ada.fem.results import Results
+
+        return Results(
+            job.res_path,
+            job.name,
+            fem_format=job.fem_format,
+            assembly=job.assembly,
+            output=job.get_output(),
+            overwrite=job.overwrite,
+            import_mesh=job.import_result_mesh,
+        )
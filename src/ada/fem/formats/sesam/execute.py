@@ -22,12 +22,15 @@ def run_sesam(
 
 
 class SesamExecute(LocalExecute):
-    def run(self, exit_on_complete=True, run_cmd=None, bat_start_str=None):
+    def get_run_command(self) -> str:
         from ada.fem.formats import FEATypes
 
         exe_path = self.get_exe(FEATypes.SESAM)
+        return f"{exe_path} /dsf {self.analysis_name}T100"
+
+    def run(self, exit_on_complete=True, run_cmd=None, bat_start_str=None):
         if run_cmd is None:
-            run_cmd = f"{exe_path} /dsf {self.analysis_name}T100"
+            run_cmd = self.get_run_command()
         stop_cmd = None
         out = self._run_local(run_cmd, stop_cmd, exit_on_complete, bat_start_str)
         return out
@@ -85,9 +85,6 @@ re_gbarm = get_ff_regex("GBARM", "geono", "hz", "bt", "bb", "sfy", "sfz")
 # Coordinate System
 re_lcsys = get_ff_regex("GUNIVEC", "transno", "unix", "uniy", "uniz")
 
-# Shell section
-re_thick = get_ff_regex("GELTH", "geono", "th")
-
 # Other
 re_bnbcd = get_ff_regex("BNBCD", "nodeno", "ndof", "content")
 re_belfix = get_ff_regex(
@@ -1,3 +1,9 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
 from ..common import sesam_el_map
 
 
@@ -7,3 +13,51 @@ def sesam_eltype_2_general(eltyp: int) -> str:
     if res is None:
         raise Exception("Currently unsupported eltype", eltyp)
     return res
+
+
+@lru_cache(maxsize=None)
+def _get_ff_record_regex(flags: Tuple[str, ...]) -> re.Pattern:
+    # A record is the line starting with the flag followed by any continuation lines, which start with whitespace
+    return re.compile(rf"^({'|'.join(flags)})[ \t]+(.*(?:\r?\n[ \t]+\S.*)*)", re.IGNORECASE | re.MULTILINE)
+
+
+def get_ff_records(bulk_str: str, *flags: str) -> Dict[str, List[str]]:
+    """Collect the field text of every record of the given Fortran formatted cards (ie. GCOORD and GELMNT1) in a
+    single scan of the bulk string. Returns a dictionary of the list of records per card name"""
+    records = {flag.upper(): [] for flag in flags}
+    for flag, record in _get_ff_record_regex(tuple(flags)).findall(bulk_str):
+        records[flag.upper()].append(record)
+    return records
+
+
+def ff_records_to_array(records: List[str], num_fields: int) -> np.ndarray:
+    """Parse records with a fixed number of fields into an (n, num_fields) array"""
+    res = np.fromstring(" ".join(records), sep=" ")
+    if res.size % num_fields != 0:
+        raise ValueError(f"Unable to split {res.size} values into records of {num_fields} fields")
+
+    _check_finite(res)
+    return res.reshape(-1, num_fields)
+
+
+def _check_finite(values: np.ndarray) -> None:
+    """np.fromstring parses "nan" and "inf" without complaint. Sesam records never contain them"""
+    if not np.all(np.isfinite(values)):
+        raise ValueError(f"Records contain a missing or non-finite value at position {np.argmax(~np.isfinite(values))}")
+
+
+def ff_records_to_varying_array(records: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse records with a varying number of fields (ie. GELMNT1) into a flat array.
+
+    :return: The flat array of all values, the index of the first value of each record and the number of values in
+        each record"""
+    counts = np.fromiter(map(len, map(str.split, records)), dtype=np.int64, count=len(records))
+    values = np.fromstring(" ".join(records), sep=" ")
+    if values.size != counts.sum():
+        raise ValueError("Unable to parse all values of the records")
+
+    _check_finite(values)
+
+    starts = np.zeros_like(counts)
+    np.cumsum(counts[:-1], out=starts[1:])
+    return values, starts, counts
@@ -1,6 +1,6 @@
 import logging
 from itertools import chain
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy as np
 
@@ -10,49 +10,65 @@ from ada.fem.containers import FemElements
 from ada.fem.formats.utils import str_to_int
 
 from . import cards
-from .helper_utils import sesam_eltype_2_general
+from .helper_utils import ff_records_to_varying_array, sesam_eltype_2_general
 
 
-def get_elements(bulk_str: str, fem: FEM) -> Tuple[FemElements, dict, dict, dict]:
-    """Import elements from Sesam Bulk str"""
+def get_elements(gelmnt_records: List[str], fem: FEM) -> Tuple[FemElements, dict, dict, np.ndarray]:
+    """Import elements from the GELMNT1 records. The records are parsed into a single array and the node references of
+    all elements are resolved in one lookup.
+
+    :return: Elements, mass elements, spring elements and an (n, 2) array of [elno, elnox] rows"""
 
     mass_elem = dict()
     spring_elem = dict()
-    internal_external_element_map = dict()
-
-    def grab_elements(match):
-        d = match.groupdict()
-        el_no = str_to_int(d["elno"])
-        el_nox = str_to_int(d["elnox"])
-        internal_external_element_map[el_no] = el_nox
-        nodes = [
-            fem.nodes.from_id(x)
-            for x in filter(
-                lambda x: x != 0,
-                map(str_to_int, d["nids"].replace("\n", "").split()),
-            )
-        ]
-        eltyp = d["eltyp"]
-        el_type = sesam_eltype_2_general(str_to_int(eltyp))
 
+    values, starts, counts = ff_records_to_varying_array(gelmnt_records)
+    header = values[starts[:, None] + np.arange(4)].astype(np.int64)
+    el_nox_list, el_no_list, eltyp_list, eltyad_list = header.T.tolist()
+    el_types = {x: sesam_eltype_2_general(x) for x in np.unique(header[:, 2]).tolist()}
+
+    # Resolve the node references of all records in one lookup. Zero padded node references are skipped
+    is_nid = np.ones(values.size, dtype=bool)
+    is_nid[starts[:, None] + np.arange(4)] = False
+    nids = values[is_nid].astype(np.int64)
+    is_used = nids != 0
+    rows = np.repeat(np.arange(len(counts)), counts - 4)
+    num_nodes = np.bincount(rows[is_used], minlength=len(counts)).tolist()
+    all_nodes = fem.nodes.from_ids(nids[is_used]).tolist()
+    ends = np.cumsum(num_nodes, dtype=np.int64).tolist()
+    el_nodes = [all_nodes[end - num : end] for end, num in zip(ends, num_nodes)]
+
+    def grab_elements(row: int):
+        el_no = el_no_list[row]
+        el_type = el_types[eltyp_list[row]]
         if el_type in ("SPRING1", "SPRING2"):
-            spring_elem[el_no] = dict(gelmnt=d)
+            spring_elem[el_no] = dict(gelmnt=get_gelmnt_dict(row))
             return None
 
-        metadata = dict(eltyad=str_to_int(d["eltyad"]), eltyp=eltyp)
-        elem = Elem(el_no, nodes, el_type, None, parent=fem, metadata=metadata)
+        metadata = dict(eltyad=eltyad_list[row], eltyp=eltyp_list[row])
+        elem = Elem(el_no, el_nodes[row], el_type, None, parent=fem, metadata=metadata)
 
         if el_type == Elem.EL_TYPES.MASS_SHAPES.MASS:
             logging.warning("Mass element interpretation in sesam is undergoing changes. Results should be checked")
-            mass_elem[el_no] = dict(gelmnt=d)
+            mass_elem[el_no] = dict(gelmnt=get_gelmnt_dict(row))
             fem.sets.add(FemSet(f"m{el_no}", [elem], FemSet.TYPES.ELSET, parent=fem))
 
         return elem
 
+    def get_gelmnt_dict(row: int) -> dict:
+        return dict(
+            elnox=str(el_nox_list[row]),
+            elno=str(el_no_list[row]),
+            eltyp=str(eltyp_list[row]),
+            eltyad=str(eltyad_list[row]),
+            nids=" ".join(str(n.id) for n in el_nodes[row]),
+        )
+
     elements = FemElements(
-        filter(lambda x: x is not None, map(grab_elements, cards.re_gelmnt.finditer(bulk_str))), fem_obj=fem
+        filter(lambda x: x is not None, map(grab_elements, range(len(counts)))),
+        fem_obj=fem,
     )
-    return elements, mass_elem, spring_elem, internal_external_element_map
+    return elements, mass_elem, spring_elem, header[:, [1, 0]]
 
 
 def get_mass(bulk_str: str, fem: FEM, mass_elem: dict) -> FemElements:
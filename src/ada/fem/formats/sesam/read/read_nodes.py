@@ -1,30 +1,19 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
 from ada.concepts.containers import Nodes
-from ada.concepts.points import Node
-from ada.fem.formats.utils import str_to_int
 
-from . import cards
+from .helper_utils import ff_records_to_array
 
 if TYPE_CHECKING:
     from ada.fem import FEM
 
 
-def get_nodes(bulk_str: str, parent: "FEM") -> Nodes:
-    nodes = [get_node(m, parent) for m in cards.re_gcoord_in.finditer(bulk_str)]
-    return Nodes(nodes, parent=parent)
+def get_nodes(gcoord_records: List[str], parent: "FEM") -> Nodes:
+    """Build the nodes from the GCOORD records [nodeno, x, y, z]"""
+    return Nodes(parent=parent, from_np_array=ff_records_to_array(gcoord_records, 4))
 
 
-def renumber_nodes(bulk_str: str, fem: "FEM") -> None:
-    node_map = {nodeno: nodex for nodex, nodeno in map(get_nodeno, cards.re_gnode_in.finditer(bulk_str))}
-    fem.nodes.renumber(renumber_map=node_map)
-
-
-def get_nodeno(m_gnod):
-    d = m_gnod.groupdict()
-    return str_to_int(d["nodex"]), str_to_int(d["nodeno"])
-
-
-def get_node(m, parent):
-    d = m.groupdict()
-    return Node([float(d["x"]), float(d["y"]), float(d["z"])], str_to_int(d["id"]), parent=parent)
+def renumber_nodes(gnode_records: List[str], fem: "FEM") -> None:
+    """Renumber the nodes from internal to external node numbers using the GNODE records [nodex, nodeno, ndof, odof]"""
+    gnode = ff_records_to_array(gnode_records, 4)
+    fem.nodes.renumber(renumber_map=gnode[:, [1, 0]])
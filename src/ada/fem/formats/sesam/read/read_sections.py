@@ -16,6 +16,7 @@ from ada.materials import Material
 from ada.sections import GeneralProperties
 
 from . import cards
+from .helper_utils import get_ff_records
 
 
 def get_sections(bulk_str, fem: FEM, mass_elem, spring_elem) -> FemSections:
@@ -25,8 +26,8 @@ def get_sections(bulk_str, fem: FEM, mass_elem, spring_elem) -> FemSections:
     lcsysd = {transno: vec for transno, vec in map(get_lcsys, cards.re_lcsys.finditer(bulk_str))}
     # Hinges
     hinges = {fixno: values for fixno, values in map(get_hinges, cards.re_belfix.finditer(bulk_str))}
-    # Thickness'
-    thick = {geono: t for geono, t in map(get_thicknesses, cards.re_thick.finditer(bulk_str))}
+    # Thickness'. The number of integration points is optional and not used
+    thick = {str_to_int(f[0]): float(f[1]) for f in map(str.split, get_ff_records(bulk_str, "GELTH")["GELTH"])}
     # Eccentricities
     ecc = {eccno: values for eccno, values in map(get_eccentricities, cards.re_geccen.finditer(bulk_str))}
 
@@ -239,13 +240,6 @@ def get_femsecs(match, total_geo, curr_geom_num, lcsysd, hinges_global, ecc, thi
         raise ValueError("Section not added to conversion")
 
 
-def get_thicknesses(match):
-    d = match.groupdict()
-    sec_id = str_to_int(d["geono"])
-    t = d["th"]
-    return sec_id, t
-
-
 def get_hinges(match):
     d = match.groupdict()
     fixno = str_to_int(d["fixno"])
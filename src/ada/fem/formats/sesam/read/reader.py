@@ -3,6 +3,7 @@ import os
 from ada.concepts.spatial import Assembly, Part
 from ada.core.utils import Counter
 
+from .helper_utils import get_ff_records
 from .read_constraints import get_bcs, get_constraints
 from .read_elements import get_elements, get_mass, get_springs
 from .read_materials import get_materials
@@ -30,8 +31,11 @@ def read_sesam_fem(bulk_str, part_name) -> Part:
     part = Part(part_name)
     fem = part.fem
 
-    fem.nodes = get_nodes(bulk_str, fem)
-    elements, mass_elem, spring_elem, el_id_map = get_elements(bulk_str, fem)
+    # The bulk node and element cards are collected in a single scan
+    ff_records = get_ff_records(bulk_str, "GCOORD", "GNODE", "GELMNT1")
+
+    fem.nodes = get_nodes(ff_records["GCOORD"], fem)
+    elements, mass_elem, spring_elem, el_id_map = get_elements(ff_records["GELMNT1"], fem)
     fem.elements = elements
     fem.elements.build_sets()
     part._materials = get_materials(bulk_str, part)
@@ -41,7 +45,7 @@ def read_sesam_fem(bulk_str, part_name) -> Part:
     fem.sets = part.fem.sets + get_sets(bulk_str, fem)
     fem.constraints.update(get_constraints(bulk_str, fem))
     fem.bcs += get_bcs(bulk_str, fem)
-    renumber_nodes(bulk_str, fem)
+    renumber_nodes(ff_records["GNODE"], fem)
     fem.elements.renumber(renumber_map=el_id_map)
 
     print(8 * "-" + f'Imported "{fem.instance_name}"')
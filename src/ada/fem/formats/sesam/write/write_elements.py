@@ -1,10 +1,14 @@
-from typing import List, Tuple
+from io import StringIO
+from itertools import groupby, islice
+from typing import Iterable, List, TextIO, Tuple
+
+import numpy as np
 
 from ada import FEM
 from ada.fem import Elem
 
 from ..common import sesam_el_map
-from .write_utils import write_ff
+from .write_utils import FF_CHUNK_SIZE, write_ff, write_ff_bulk
 
 
 def eltype_2_sesam(eltyp) -> int:
@@ -16,27 +20,54 @@ def eltype_2_sesam(eltyp) -> int:
 
 
 def elem_str(fem: FEM, thick_map) -> str:
+    stream = StringIO()
+    write_elements(fem, thick_map, stream)
+    return stream.getvalue()
+
+
+def write_elements(fem: FEM, thick_map, stream: TextIO, chunk_size: int = FF_CHUNK_SIZE) -> None:
     """
+    Stream the GELMNT1 cards followed by the GELREF1 cards of all structural elements. Consecutive elements of
+    equal layout are collected in arrays and written in chunks.
+
     'GELREF1',  ('elno', 'matno', 'addno', 'intno'), ('mintno', 'strano', 'streno', 'strepono'), ('geono', 'fixno',
             'eccno', 'transno'), 'members|'
 
     'GELMNT1', 'elnox', 'elno', 'eltyp', 'eltyad', 'nids'
     """
+    for (el_type, num_nodes), elements in groupby(fem.elements.stru_elements, key=lambda x: (x.type, len(x.nodes))):
+        eltyp = eltype_2_sesam(el_type)
+        row_sizes = (4, *nodal_row_sizes(num_nodes))
+        for chunk in _iter_chunks(elements, chunk_size):
+            data = np.zeros((len(chunk), 4 + num_nodes), dtype=int)
+            data[:, 0] = data[:, 1] = [el.id for el in chunk]
+            data[:, 2] = eltyp
+            data[:, 4:] = np.fromiter(
+                (n.id for el in chunk for n in el.nodes), dtype=int, count=len(chunk) * num_nodes
+            ).reshape(len(chunk), num_nodes)
+            write_ff_bulk("GELMNT1", data, stream, row_sizes)
+
+    for has_fixno, elements in groupby(fem.elements.stru_elements, key=lambda x: x.metadata.get("fixno") is not None):
+        row_sizes = (4, 4, 4, 2) if has_fixno else (4, 4, 4)
+        for chunk in _iter_chunks(elements, chunk_size):
+            write_ff_bulk("GELREF1", [gelref1_data(el, thick_map) for el in chunk], stream, row_sizes)
+
+
+def _iter_chunks(iterable: Iterable, chunk_size: int) -> Iterable[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            break
+        yield chunk
 
-    out_str = "".join(
-        [
-            write_ff(
-                "GELMNT1",
-                [(el.id, el.id, eltype_2_sesam(el.type), 0)] + write_nodal_data(el),
-            )
-            for el in fem.elements.stru_elements
-        ]
-    )
 
-    for el in fem.elements.stru_elements:
-        out_str += write_elem(el, thick_map)
+def nodal_row_sizes(num_nodes: int) -> Tuple[int, ...]:
+    """Returns the number of node ids per line of a GELMNT1 card, see write_nodal_data()"""
+    if num_nodes <= 4:
+        return (num_nodes,)
 
-    return out_str
+    return (*[4] * (num_nodes // 4), num_nodes % 4)
 
 
 def write_nodal_data(el: Elem) -> List[Tuple[int]]:
@@ -57,7 +88,8 @@ def write_nodal_data(el: Elem) -> List[Tuple[int]]:
     return nodes + [tuple(curr_tup)]
 
 
-def write_elem(el: Elem, thick_map) -> str:
+def gelref1_data(el: Elem, thick_map) -> List[int]:
+    """Returns the values of the GELREF1 card of an element as a flat list"""
     from ada.fem.elements import ElemType
 
     fem_sec = el.fem_sec
@@ -69,18 +101,19 @@ def write_elem(el: Elem, thick_map) -> str:
         raise ValueError(f'Unsupported elem type "{fem_sec.type}"')
 
     fixno = el.metadata.get("fixno", None)
-    transno = el.metadata.get("transno")
+    transno = el.metadata.get("transno", None)
+    if transno is None:
+        raise ValueError(f'Element "{el.id}" has no transformation number (transno). See univec_str()')
+
+    data = [el.id, el.fem_sec.material.id, 0, 0, 0, 0, 0, 0]
     if fixno is None:
-        last_tuples = [(sec_id, 0, 0, transno)]
-    else:
-        h1_fix, h2_fix = fixno
-        last_tuples = [(sec_id, -1, 0, transno), (h1_fix, h2_fix)]
-
-    return write_ff(
-        "GELREF1",
-        [
-            (el.id, el.fem_sec.material.id, 0, 0),
-            (0, 0, 0, 0),
-        ]
-        + last_tuples,
-    )
+        return data + [sec_id, 0, 0, transno]
+
+    h1_fix, h2_fix = fixno
+    return data + [sec_id, -1, 0, transno, h1_fix, h2_fix]
+
+
+def write_elem(el: Elem, thick_map) -> str:
+    data = gelref1_data(el, thick_map)
+    rows = [tuple(data[i : i + 4]) for i in range(0, len(data), 4)]
+    return write_ff("GELREF1", rows)
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import TextIO, Tuple
+
 import numpy as np
 
 
@@ -39,3 +42,50 @@ def format_data(d):
 
 def make_zero(d):
     return d if abs(d) != 0.0 else 0.0
+
+
+FF_CHUNK_SIZE = 50_000
+_FF_FIELD = " % -15.8E"
+
+
+def write_ff_bulk(
+    flag: str, data: np.ndarray, stream: TextIO, row_sizes: Tuple[int, ...] = None, chunk_size: int = FF_CHUNK_SIZE
+) -> None:
+    """Stream one fixed format card per row of a 2d array. Produces the same output as write_ff().
+
+    :param flag: Card name, e.g. GNODE or GCOORD
+    :param data: Array of shape (num_cards, num_values)
+    :param stream: File handle to write to
+    :param row_sizes: Number of values per line of each card. Defaults to lines of 4 values
+    :param chunk_size: Number of cards formatted per write
+    """
+    data = np.asarray(data, dtype=float)
+    if data.ndim != 2:
+        raise ValueError(f"Expected a 2d array of card values. Got array of shape {data.shape}")
+
+    # Missing values (None) are converted to NaN by numpy. Reject them like write_ff() does
+    is_missing = ~np.isfinite(data)
+    if np.any(is_missing):
+        row, col = np.argwhere(is_missing)[0]
+        raise ValueError(f'Card "{flag}" number {row + 1} has a missing or non-finite value at position {col + 1}')
+
+    if row_sizes is None:
+        num_values = data.shape[1]
+        row_sizes = tuple(min(4, num_values - i) for i in range(0, num_values, 4))
+
+    if sum(row_sizes) != data.shape[1]:
+        raise ValueError(f"Row sizes {row_sizes} does not match the number of card values {data.shape[1]}")
+
+    template = get_ff_template(flag, tuple(row_sizes))
+    for i in range(0, len(data), chunk_size):
+        chunk = data[i : i + chunk_size]
+        # Equivalent of make_zero(). Removes negative zeros
+        chunk = np.where(chunk == 0.0, 0.0, chunk)
+        stream.write((template * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+@lru_cache(maxsize=None)
+def get_ff_template(flag: str, row_sizes: Tuple[int, ...]) -> str:
+    """Returns the %-format template of a single card with the given number of values per line, see write_ff()"""
+    lines = ["".join([_FF_FIELD] * size) for size in row_sizes]
+    return f"{flag:<8}" + ("\n" + 8 * " ").join(lines) + "\n"
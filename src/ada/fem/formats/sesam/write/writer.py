@@ -1,18 +1,21 @@
 import datetime
 import logging
-from operator import attrgetter
+from io import StringIO
+from typing import TextIO
+
+import numpy as np
 
 from ada.concepts.spatial import Part
 from ada.core.utils import Counter, get_current_user
 from ada.fem import FEM
 
 from .templates import top_level_fem_str
-from .write_utils import write_ff
+from .write_utils import write_ff, write_ff_bulk
 
 
 def to_fem(assembly, name, analysis_dir=None, metadata=None):
     from .write_constraints import constraint_str
-    from .write_elements import elem_str
+    from .write_elements import write_elements
     from .write_loads import loads_str
     from .write_masses import mass_str
     from .write_sections import sections_str
@@ -54,12 +57,12 @@ def to_fem(assembly, name, analysis_dir=None, metadata=None):
         d.write(materials_str(part))
         d.write(sections_str(part.fem, thick_map))
         d.write(univec_str(part.fem))
-        d.write(nodes_str(part.fem))
+        write_nodes(part.fem, d)
         d.write(mass_str(part.fem))
         d.write(bc_str(part.fem) + bc_str(assembly.fem))
         d.write(constraint_str(part.fem) + constraint_str(assembly.fem))
         d.write(hinges_str(part.fem))
-        d.write(elem_str(part.fem, thick_map))
+        write_elements(part.fem, thick_map, d)
         d.write(loads_str(assembly.fem) + loads_str(part.fem))
         d.write("IEND                0.00            0.00            0.00            0.00\n")
 
@@ -87,21 +90,30 @@ def materials_str(part: Part):
 
 
 def nodes_str(fem: FEM) -> str:
-    nodes = sorted(fem.nodes, key=attrgetter("id"))
-
-    nids = []
-    for n in nodes:
-        if n.id not in nids:
-            nids.append(n.id)
-        else:
-            raise Exception('Doubly defined node id "{}". TODO: Make necessary code updates'.format(n[0]))
-    if len(nodes) == 0:
-        return "** No Nodes"
-    else:
-
-        out_str = "".join([write_ff("GNODE", [(no.id, no.id, 6, 123456)]) for no in nodes])
-        out_str += "".join([write_ff("GCOORD", [(no.id, no[0], no[1], no[2])]) for no in nodes])
-        return out_str
+    stream = StringIO()
+    write_nodes(fem, stream)
+    return stream.getvalue()
+
+
+def write_nodes(fem: FEM, stream: TextIO) -> None:
+    """Stream the GNODE and GCOORD cards of all nodes sorted by node id"""
+    if len(fem.nodes) == 0:
+        stream.write("** No Nodes")
+        return None
+
+    data = fem.nodes.to_np_array(include_id=True)
+    data = data[np.argsort(data[:, 0], kind="stable")]
+    nids = data[:, 0].astype(int)
+
+    unique_ids = set()
+    for nid in nids.tolist():
+        if nid in unique_ids:
+            raise Exception('Doubly defined node id "{}". TODO: Make necessary code updates'.format(nid))
+        unique_ids.add(nid)
+
+    gnode = np.column_stack((nids, nids, np.full_like(nids, 6), np.full_like(nids, 123456)))
+    write_ff_bulk("GNODE", gnode, stream)
+    write_ff_bulk("GCOORD", data, stream)
 
 
 def bc_str(fem: FEM) -> str:
@@ -93,9 +93,7 @@ class LocalExecute:
         self.run_in_shell = run_in_shell
 
     def _run_local(self, run_command, stop_command=None, exit_on_complete=True, bat_start_str=None):
-        if self._metadata is not None:
-            with open(self.inp_path.parent / "analysis_manifest.json", "w") as fp:
-                json.dump(self._metadata, fp, indent=4)
+        self.prepare()
 
         if sys.platform == "linux" or sys.platform == "linux2":
             out = run_linux(self, run_command)
@@ -137,6 +135,15 @@ class LocalExecute:
 
         return exe_path
 
+    def prepare(self):
+        """Write the files the solver needs besides the input deck"""
+        if self._metadata is not None:
+            with open(self.inp_path.parent / "analysis_manifest.json", "w") as fp:
+                json.dump(self._metadata, fp, indent=4)
+
+    def get_run_command(self) -> str:
+        raise NotImplementedError("The get_run_command function is not implemented")
+
     def run(self):
         raise NotImplementedError("The run function is not implemented")
 
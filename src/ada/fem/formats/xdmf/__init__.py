@@ -1,4 +0,0 @@
-from .reader import XdmfReader
-from .writer import XdmfWriter
-
-__all__ = ["XdmfWriter", "XdmfReader"]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import os
+import pathlib
+from typing import TYPE_CHECKING, List, Tuple
+from xml.etree import ElementTree as ET
+
+import h5py
+import numpy as np
+
+from ada.fem.concepts.fields import FieldInfo, FieldStore
+
+from .common import attribute_type, numpy_to_xdmf_dtype
+
+if TYPE_CHECKING:
+    from ada.fem.results import Results
+
+
+class XdmfFieldStore(FieldStore):
+    """Lazy, step-indexed access to the nodal result fields of a time series written by write_results_to_xdmf. The
+    fields are read from the HDF5 file next to the .xdmf file"""
+
+    @property
+    def h5_file(self) -> pathlib.Path:
+        return self.file_ref.with_suffix(".h5")
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        with h5py.File(self.h5_file, "r") as f:
+            return f["mesh/node_ids"][()]
+
+    @property
+    def fem_format(self) -> str | None:
+        with h5py.File(self.h5_file, "r") as f:
+            return f.attrs.get("fem_format", None)
+
+    def get_mesh(self) -> Tuple[np.ndarray, List[Tuple[str, np.ndarray]]]:
+        with h5py.File(self.h5_file, "r") as f:
+            points = f["mesh/points"][()]
+            cell_types = f["mesh"].attrs["cell_types"].split()
+            cells = [(cell_type, f[f"mesh/cells/{i}"][()]) for i, cell_type in enumerate(cell_types)]
+        return points, cells
+
+    def _build_index(self) -> List[FieldInfo]:
+        index = []
+        with h5py.File(self.h5_file, "r") as f:
+            if "fields" not in f:
+                return index
+
+            for name, field_group in f["fields"].items():
+                components = tuple(field_group.attrs["components"].split())
+                for dataset in field_group.values():
+                    step, step_value = int(dataset.attrs["step"]), float(dataset.attrs["step_value"])
+                    index.append(FieldInfo(name, step, step_value, components, dataset.shape, dataset.name))
+
+        return sorted(index, key=lambda x: x.step)
+
+    def read(self, info: FieldInfo) -> np.ndarray:
+        with h5py.File(self.h5_file, "r") as f:
+            return f[info.offset][()]
+
+
+def write_results_to_xdmf(
+    field_store: FieldStore,
+    dest_file: str | os.PathLike,
+    name: str = None,
+    fem_format: str = None,
+    fields: List[str] = None,
+    steps: List[int] = None,
+    compression="gzip",
+    compression_opts=4,
+    chunk_size=65536,
+) -> pathlib.Path:
+    """Write the nodal result fields of all steps as an XDMF temporal collection backed by a single HDF5 file.
+
+    The mesh is written once and referenced by the grid of every step. The fields are read and written one at a time,
+    and are stored in chunks of chunk_size nodes so that they can be read progressively.
+
+    :param fields: Only write these fields. Default is all fields
+    :param steps: Only write these steps. Default is all steps
+    :return: Path to the .xdmf file
+    """
+    from meshio.xdmf.common import meshio_to_xdmf_type, meshio_type_to_xdmf_index
+
+    xdmf_file = pathlib.Path(dest_file).with_suffix(".xdmf")
+    h5_file = xdmf_file.with_suffix(".h5")
+    os.makedirs(xdmf_file.parent, exist_ok=True)
+
+    index = [info for info in field_store.index if fields is None or info.name in fields]
+    index = [info for info in index if steps is None or info.step in steps]
+    step_fields = dict()
+    for info in index:
+        step_fields.setdefault(info.step, dict())[info.name] = info
+    step_numbers = sorted(step_fields.keys())
+    times = [next(iter(step_fields[step].values())).step_value for step in step_numbers]
+    if np.any(np.diff(times) <= 0):
+        # Eigenvalue results and similar use the step value for something other than time
+        times = step_numbers
+
+    def create_dataset(f: h5py.File, path: str, data: np.ndarray) -> str:
+        data = np.ascontiguousarray(data)
+        props = dict()
+        if compression is not None and data.size > 0:
+            chunks = (min(len(data), chunk_size),) + data.shape[1:]
+            props = dict(chunks=chunks, compression=compression, compression_opts=compression_opts, shuffle=True)
+        f.create_dataset(path, data=data, **props)
+        return f"{h5_file.name}:{path}"
+
+    def data_item(parent: ET.Element, data_path: str, data: np.ndarray | h5py.Dataset) -> ET.Element:
+        dt, prec = numpy_to_xdmf_dtype[data.dtype.name]
+        dims = " ".join(str(s) for s in data.shape)
+        item = ET.SubElement(parent, "DataItem", DataType=dt, Dimensions=dims, Format="HDF", Precision=prec)
+        item.text = data_path
+        return item
+
+    points, cells = field_store.get_mesh()
+    points = np.asarray(points, dtype=np.float64)
+    with h5py.File(h5_file, "w") as f:
+        f.attrs["name"] = name if name is not None else xdmf_file.stem
+        if fem_format is not None:
+            f.attrs["fem_format"] = fem_format
+
+        points_path = create_dataset(f, "/mesh/points", points)
+        create_dataset(f, "/mesh/node_ids", np.asarray(field_store.node_ids, dtype=np.int64))
+        f["mesh"].attrs["cell_types"] = " ".join(cell_type for cell_type, _ in cells)
+        for i, (_, conn) in enumerate(cells):
+            create_dataset(f, f"/mesh/cells/{i}", np.asarray(conn, dtype=np.int64))
+
+        num_cells = sum(len(conn) for _, conn in cells)
+        if len(cells) == 1:
+            cell_type, topology = cells[0][0], np.asarray(cells[0][1], dtype=np.int64)
+            topology_props = dict(
+                TopologyType=meshio_to_xdmf_type[cell_type][0], NodesPerElement=str(topology.shape[1])
+            )
+        else:
+            mixed = []
+            for cell_type, conn in cells:
+                prefix = np.full((len(conn), 2 if cell_type in {"vertex", "line"} else 1), conn.shape[1])
+                prefix[:, 0] = meshio_type_to_xdmf_index[cell_type]
+                mixed.append(np.hstack([prefix, conn]).ravel())
+            topology = np.concatenate(mixed).astype(np.int64) if len(mixed) > 0 else np.empty(0, dtype=np.int64)
+            topology_props = dict(TopologyType="Mixed")
+        topology_path = create_dataset(f, "/mesh/topology", topology)
+
+        xdmf = ET.Element("Xdmf", Version="3.0")
+        domain = ET.SubElement(xdmf, "Domain")
+        collection = ET.SubElement(domain, "Grid", Name="TimeSeries", GridType="Collection", CollectionType="Temporal")
+        for step, time in zip(step_numbers, times):
+            grid = ET.SubElement(collection, "Grid", Name=f"step_{step}", GridType="Uniform")
+            ET.SubElement(grid, "Time", Value=str(time))
+            topo = ET.SubElement(grid, "Topology", NumberOfElements=str(num_cells), **topology_props)
+            data_item(topo, topology_path, topology)
+            geo = ET.SubElement(grid, "Geometry", GeometryType="XYZ" if points.shape[1] == 3 else "XY")
+            data_item(geo, points_path, points)
+
+            for info in step_fields[step].values():
+                values = field_store.read(info)
+                field_group = f.require_group(f"/fields/{info.name}")
+                field_group.attrs["components"] = " ".join(info.components)
+                data_path = create_dataset(f, f"/fields/{info.name}/{step}", values)
+                dataset = f[f"/fields/{info.name}/{step}"]
+                dataset.attrs["step"] = step
+                dataset.attrs["step_value"] = info.step_value
+                att = ET.SubElement(
+                    grid, "Attribute", Name=info.name, AttributeType=attribute_type(values), Center="Node"
+                )
+                data_item(att, data_path, values)
+
+    ET.ElementTree(xdmf).write(xdmf_file)
+    return xdmf_file
+
+
+def read_xdmf_results(results: Results, file_ref: pathlib.Path, overwrite):
+    """Returns a meshio Mesh with the results of the last step in the time series"""
+    import meshio
+
+    from ada.fem.formats import FEATypes
+
+    field_store = XdmfFieldStore(file_ref)
+    if field_store.fem_format in FEATypes.all:
+        results.fem_format = field_store.fem_format
+
+    points, cells = field_store.get_mesh()
+    point_data = dict()
+    if len(field_store.steps) > 0:
+        last_step = field_store.steps[-1]
+        point_data = {info.name: field_store.read(info) for info in field_store.index if info.step == last_step}
+
+    return meshio.Mesh(points, cells, point_data=point_data)
@@ -12,7 +12,6 @@ import numpy as np
 from ada import FEM, Beam, Pipe, Plate, Shape
 from ada.base.physical_objects import BackendGeom
 from ada.base.types import GeomRepr
-from ada.concepts.containers import Nodes
 from ada.config import Settings
 from ada.fem import Elem
 from ada.fem.containers import FemElements
@@ -271,8 +270,7 @@ class GmshSession:
         )
 
         fem = FEM(name)
-        gmsh_nodes = get_nodes_from_gmsh(self.model, fem)
-        fem.nodes = Nodes(gmsh_nodes, parent=fem)
+        fem.nodes = get_nodes_from_gmsh(self.model, fem)
 
         def add_obj_to_elem_ref(el: Elem, obj: Union[Shape, Beam, Plate, Pipe]):
             el.refs.append(obj)
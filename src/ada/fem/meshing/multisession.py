@@ -1,9 +1,23 @@
-from typing import List
+from __future__ import annotations
 
-from ada import FEM
-from ada.core.utils import Counter
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Tuple, Union
 
-from .concepts import GmshSession, GmshTask
+import numpy as np
+
+from ada import FEM, Beam, Plate, Shape
+from ada.base.types import GeomRepr
+from ada.concepts.containers import Nodes
+from ada.config import Settings
+from ada.core.spatial_index import get_clusters_from_pairs, get_coincident_pairs
+from ada.core.utils import Counter, map_ids
+from ada.fem import Elem, FemSection, FemSet
+from ada.fem.containers import FemElements
+
+from .concepts import GmshOptions, GmshSession, GmshTask
 
 
 def multisession_gmsh_tasker(fem: FEM, gmsh_tasks: List[GmshTask]):
@@ -24,3 +38,280 @@ def multisession_gmsh_tasker(fem: FEM, gmsh_tasks: List[GmshTask]):
             fem += tmp_fem
             gs.model_map = dict()
     return fem
+
+
+def mesh_objects(
+    objects: List[Tuple[Union[Beam, Plate, Shape], GeomRepr]],
+    mesh_size: float,
+    options: GmshOptions,
+    silent=True,
+    interactive=False,
+    use_quads=False,
+    use_hex=False,
+) -> FEM:
+    """Mesh all objects in a single GmshSession"""
+    with GmshSession(silent=silent, options=options) as gs:
+        for obj, geom_repr in objects:
+            gs.add_obj(obj, geom_repr=geom_repr)
+
+        gs.split_plates_by_beams()
+        gs.mesh(mesh_size, use_quads=use_quads, use_hex=use_hex)
+
+        if interactive is True:
+            gs.open_gui()
+
+        return gs.get_fem()
+
+
+def partition_connected_objects(objects: List[Union[Beam, Plate, Shape]]) -> List[List[int]]:
+    """Group the objects which have to be meshed in the same gmsh model. These are the plates and the beams that
+    GmshSession.split_plates_by_beams fragments them by. All other objects are only connected through coincident
+    nodes and are put in groups of their own.
+
+    :return: Lists of object indices, ordered by the index of the first object in each group
+    """
+    from ada.core.clash_check import (
+        filter_away_beams_along_plate_edges,
+        find_beams_connected_to_plate,
+    )
+
+    index_map = {id(obj): i for i, obj in enumerate(objects)}
+    beams = [obj for obj in objects if type(obj) is Beam]
+    pairs = []
+    if len(beams) > 0:
+        for pl in (obj for obj in objects if type(obj) is Plate):
+            inside_beams = filter_away_beams_along_plate_edges(pl, find_beams_connected_to_plate(pl, beams))
+            pairs += [(index_map[id(pl)], index_map[id(bm)]) for bm in inside_beams]
+
+    labels = get_clusters_from_pairs(len(objects), np.array(pairs, dtype=np.int64).reshape(-1, 2))
+    groups = dict()
+    for i, label in enumerate(labels.tolist()):
+        groups.setdefault(label, []).append(i)
+
+    return list(groups.values())
+
+
+def mesh_objects_in_parallel(
+    objects: List[Tuple[Union[Beam, Plate, Shape], GeomRepr]],
+    mesh_size: float,
+    options: GmshOptions,
+    cpus: int,
+    use_quads=False,
+    use_hex=False,
+) -> FEM:
+    """Mesh groups of connected objects in separate gmsh processes and merge the resulting FEMs. Nodes which are
+    coincident at the interfaces between the groups are merged.
+
+    The worker processes are forked and receive the objects through the pool initializer, so that only object
+    indices are sent with each batch. Where fork is not available, the objects are meshed in a single GmshSession."""
+    groups = partition_connected_objects([obj for obj, _ in objects])
+    batches = _balance_groups(groups, cpus)
+
+    if len(batches) < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        if len(batches) > 1:
+            logging.warning("Parallel meshing requires the fork start method. Meshing in a single gmsh session")
+        return mesh_objects(objects, mesh_size, options, use_quads=use_quads, use_hex=use_hex)
+
+    mp_context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(
+        max_workers=len(batches), mp_context=mp_context, initializer=_init_worker, initargs=(objects,)
+    ) as executor:
+        args = [(batch, mesh_size, options, use_quads, use_hex) for batch in batches]
+        results = list(executor.map(_mesh_batch, *zip(*args)))
+
+    fem = MeshData.merge(results, batches).merge_coincident_nodes().to_fem([obj for obj, _ in objects])
+    fem.nodes.renumber()
+    fem.elements.renumber()
+
+    _add_refs_to_objects(fem, [obj for obj, _ in objects])
+    return fem
+
+
+def _balance_groups(groups: List[List[int]], cpus: int) -> List[List[int]]:
+    """Distribute the groups over at most cpus batches, largest groups first"""
+    num_batches = min(cpus, len(groups))
+    batches = [[] for _ in range(num_batches)]
+    for group in sorted(groups, key=len, reverse=True):
+        min(batches, key=len).extend(group)
+
+    return [sorted(batch) for batch in batches if len(batch) > 0]
+
+
+# The objects to mesh in a worker process. Only set in the forked workers, by the pool initializer
+_worker_objects: List[Tuple[Union[Beam, Plate, Shape], GeomRepr]] = None
+
+
+def _init_worker(objects: List[Tuple[Union[Beam, Plate, Shape], GeomRepr]]):
+    # With the fork start method the initializer arguments are inherited by the worker rather than pickled
+    global _worker_objects
+    _worker_objects = objects
+
+
+def _mesh_batch(batch: List[int], mesh_size, options, use_quads, use_hex) -> MeshData:
+    objects = [_worker_objects[i] for i in batch]
+    fem = mesh_objects(objects, mesh_size, options, use_quads=use_quads, use_hex=use_hex)
+    return MeshData.from_fem(fem, [obj for obj, _ in objects])
+
+
+def _add_refs_to_objects(fem: FEM, objects: List[Union[Beam, Plate, Shape]]):
+    """Link the objects to their elements, which GmshSession.get_fem does in the serial path"""
+    from .utils import add_hinges_to_elements
+
+    elem_refs = {id(obj): [] for obj in objects}
+    for el in fem.elements:
+        for obj in el.refs:
+            if id(obj) in elem_refs:
+                elem_refs[id(obj)].append(el)
+
+    for obj in objects:
+        obj.elem_refs = elem_refs[id(obj)]
+        if isinstance(obj, Beam) and obj.hinge_prop is not None:
+            add_hinges_to_elements(obj, [el for el in obj.elem_refs if el.type in Elem.EL_TYPES.LINE_SHAPES.all])
+
+
+@dataclass
+class MeshData:
+    """The mesh of a FEM created by GmshSession.get_fem as plain arrays, which can be returned from a worker process.
+    Model objects are referred to by their index in the list of meshed objects."""
+
+    nodes: np.ndarray
+    el_ids: np.ndarray
+    el_types: List[str]
+    el_nodes: np.ndarray
+    el_num_nodes: np.ndarray
+    el_objects: np.ndarray
+    sets: List[Tuple[str, str, np.ndarray]]
+    sections: List[dict]
+
+    @staticmethod
+    def from_fem(fem: FEM, objects: List[Union[Beam, Plate, Shape]]) -> MeshData:
+        index_map = {id(obj): i for i, obj in enumerate(objects)}
+        elements = list(fem.elements)
+
+        def get_obj_index(el: Elem) -> int:
+            # Besides the model object, the element refs include the sets it is a member of
+            return next(index_map[id(ref)] for ref in el.refs if id(ref) in index_map)
+
+        sections = []
+        for fem_sec in fem.sections:
+            sections.append(
+                dict(
+                    name=fem_sec.name,
+                    sec_type=fem_sec.type,
+                    elset=fem_sec.elset.name,
+                    obj=get_obj_index(fem_sec.elset.members[0]),
+                    has_section=fem_sec.section is not None,
+                    has_refs=fem_sec.refs is not None,
+                    local_z=fem_sec.local_z if fem_sec.type != GeomRepr.SOLID else None,
+                    thickness=fem_sec.thickness,
+                    int_points=fem_sec.int_points,
+                    is_rigid=fem_sec.is_rigid,
+                )
+            )
+
+        return MeshData(
+            nodes=fem.nodes.to_np_array(include_id=True),
+            el_ids=np.array([el.id for el in elements], dtype=np.int64),
+            el_types=[el.type for el in elements],
+            el_nodes=np.array([n.id for el in elements for n in el.nodes], dtype=np.int64),
+            el_num_nodes=np.array([len(el.nodes) for el in elements], dtype=np.int64),
+            el_objects=np.array([get_obj_index(el) for el in elements], dtype=np.int64),
+            sets=[(fs.name, fs.type, np.array([m.id for m in fs.members], dtype=np.int64)) for fs in fem.sets],
+            sections=sections,
+        )
+
+    @staticmethod
+    def merge(mesh_data: List[MeshData], object_indices: List[List[int]]) -> MeshData:
+        """Merge the meshes of separate sessions into one. Node and element ids are offset so that they are unique,
+        and the object indices of each mesh are mapped to the indices in object_indices."""
+        node_offsets, el_offsets = [0], [0]
+        for md in mesh_data[:-1]:
+            node_offsets.append(node_offsets[-1] + (int(md.nodes[:, 0].max()) if len(md.nodes) > 0 else 0))
+            el_offsets.append(el_offsets[-1] + (int(md.el_ids.max()) if len(md.el_ids) > 0 else 0))
+
+        sets = []
+        sections = []
+        for md, indices, node_offset, el_offset in zip(mesh_data, object_indices, node_offsets, el_offsets):
+            for set_name, set_type, member_ids in md.sets:
+                offset = node_offset if set_type == FemSet.TYPES.NSET else el_offset
+                sets.append((set_name, set_type, member_ids + offset))
+            sections += [dict(sec, obj=indices[sec["obj"]]) for sec in md.sections]
+
+        nodes = [md.nodes + np.array([offset, 0.0, 0.0, 0.0]) for md, offset in zip(mesh_data, node_offsets)]
+        return MeshData(
+            nodes=np.concatenate(nodes).reshape(-1, 4),
+            el_ids=np.concatenate([md.el_ids + offset for md, offset in zip(mesh_data, el_offsets)]),
+            el_types=[el_type for md in mesh_data for el_type in md.el_types],
+            el_nodes=np.concatenate([md.el_nodes + offset for md, offset in zip(mesh_data, node_offsets)]),
+            el_num_nodes=np.concatenate([md.el_num_nodes for md in mesh_data]),
+            el_objects=np.concatenate(
+                [np.array(idx, dtype=np.int64)[md.el_objects] for md, idx in zip(mesh_data, object_indices)]
+            ),
+            sets=sets,
+            sections=sections,
+        )
+
+    def merge_coincident_nodes(self, tol: float = Settings.point_tol) -> MeshData:
+        """Merge nodes which are within the point tolerance of each other into the first node of each group. Element
+        nodes and node set members of the merged nodes are relinked to the remaining node"""
+        pairs = get_coincident_pairs(self.nodes[:, 1:], tol)
+        main_rows = get_clusters_from_pairs(len(self.nodes), pairs)
+        node_ids = self.nodes[:, 0].astype(np.int64)
+        id_map = np.column_stack([node_ids, node_ids[main_rows]])
+
+        sets = []
+        for set_name, set_type, member_ids in self.sets:
+            if set_type == FemSet.TYPES.NSET:
+                member_ids = map_ids(member_ids, id_map)
+                _, first = np.unique(member_ids, return_index=True)
+                member_ids = member_ids[np.sort(first)]
+            sets.append((set_name, set_type, member_ids))
+
+        return replace(
+            self,
+            nodes=self.nodes[main_rows == np.arange(len(self.nodes))],
+            el_nodes=map_ids(self.el_nodes, id_map),
+            sets=sets,
+        )
+
+    def to_fem(self, objects: List[Union[Beam, Plate, Shape]], name="AdaFEM") -> FEM:
+        fem = FEM(name)
+        fem.nodes = Nodes(parent=fem, from_np_array=self.nodes)
+
+        all_nodes = fem.nodes.from_ids(self.el_nodes).tolist()
+        ends = np.cumsum(self.el_num_nodes).tolist()
+        elements = []
+        for el_id, el_type, end, num_nodes, obj_index in zip(
+            self.el_ids.tolist(), self.el_types, ends, self.el_num_nodes.tolist(), self.el_objects.tolist()
+        ):
+            el = Elem(el_id, all_nodes[end - num_nodes : end], el_type, parent=fem)
+            el.refs.append(objects[obj_index])
+            elements.append(el)
+
+        fem.elements = FemElements(elements, fem_obj=fem)
+
+        set_map = dict()
+        for set_name, set_type, member_ids in self.sets:
+            if set_type == FemSet.TYPES.NSET:
+                members = list(fem.nodes.from_ids(member_ids))
+            else:
+                members = [fem.elements.from_id(el_id) for el_id in member_ids.tolist()]
+            set_map[set_name] = fem.sets.add(FemSet(set_name, members, set_type, parent=fem))
+
+        for sec in self.sections:
+            obj = objects[sec["obj"]]
+            fem_sec = FemSection(
+                sec["name"],
+                sec["sec_type"],
+                set_map[sec["elset"]],
+                obj.material,
+                obj.section if sec["has_section"] else None,
+                sec["local_z"],
+                thickness=sec["thickness"],
+                int_points=sec["int_points"],
+                refs=[obj] if sec["has_refs"] else None,
+                is_rigid=sec["is_rigid"],
+            )
+            fem.add_section(fem_sec)
+
+        return fem
@@ -6,8 +6,9 @@ from typing import List, Union
 import gmsh
 import numpy as np
 
-from ada import FEM, Beam, Node, Pipe, Plate, Shape
+from ada import FEM, Beam, Pipe, Plate, Shape
 from ada.base.types import GeomRepr
+from ada.concepts.containers import Nodes
 from ada.concepts.transforms import Placement
 from ada.core.utils import make_name_fem_ready
 from ada.fem import Elem, FemSection, FemSet
@@ -135,8 +136,6 @@ def add_shell_section(
 
 
 def get_bm_sections(model: gmsh.model, beam: Beam, gmsh_data, fem: FEM):
-    from ada.core.vector_utils import vector_length
-
     tags = []
     for dim, ent in gmsh_data.entities:
         _, tag, _ = model.mesh.getElements(1, ent)
@@ -150,20 +149,26 @@ def get_bm_sections(model: gmsh.model, beam: Beam, gmsh_data, fem: FEM):
     fem_sec = FemSection(fem_sec_name, ElemType.LINE, fem_set, beam.material, beam.section, beam.ori[2], refs=[beam])
 
     add_sec_to_fem(fem, fem_sec, fem_set)
+    add_hinges_to_elements(beam, elements)
+
+
+def add_hinges_to_elements(beam: Beam, elements: List[Elem]):
+    """Attach the beam hinge to its line elements and point each hinge end to the FEM node at the beam end"""
+    from ada.core.vector_utils import vector_length
+
     if beam.hinge_prop is None:
         return
     end1_p = beam.hinge_prop.end1.concept_node.p if beam.hinge_prop.end1 is not None else None
     end2_p = beam.hinge_prop.end2.concept_node.p if beam.hinge_prop.end2 is not None else None
-    if beam.hinge_prop is not None:
-        for el in elements:
-            n1 = el.nodes[0]
-            n2 = el.nodes[-1]
-            el.hinge_prop = beam.hinge_prop
-            if beam.hinge_prop.end1 is not None and vector_length(end1_p - n1.p) == 0.0:
-                el.hinge_prop.end1.fem_node = n1
+    for el in elements:
+        n1 = el.nodes[0]
+        n2 = el.nodes[-1]
+        el.hinge_prop = beam.hinge_prop
+        if beam.hinge_prop.end1 is not None and vector_length(end1_p - n1.p) == 0.0:
+            el.hinge_prop.end1.fem_node = n1
 
-            if beam.hinge_prop.end2 is not None and vector_length(end2_p - n2.p) == 0.0:
-                el.hinge_prop.end2.fem_node = n2
+        if beam.hinge_prop.end2 is not None and vector_length(end2_p - n2.p) == 0.0:
+            el.hinge_prop.end2.fem_node = n2
 
 
 def get_so_sections(model: gmsh.model, solid_object: Beam, gmsh_data: GmshData, fem: FEM):
@@ -196,38 +201,43 @@ def get_point(model: gmsh.model, p, tol):
     return model.getEntitiesInBoundingBox(*lower.tolist(), *upper.tolist(), 0)
 
 
-def get_nodes_from_gmsh(model: gmsh.model, fem: FEM) -> List[Node]:
-    nodes = list(model.mesh.getNodes(-1, -1))
-    node_ids = nodes[0]
-    node_coords = nodes[1].reshape(len(node_ids), 3)
-    return [Node(coord, nid, parent=fem) for nid, coord in zip(node_ids, node_coords)]
+def get_nodes_from_gmsh(model: gmsh.model, fem: FEM) -> Nodes:
+    node_ids, node_coords, _ = model.mesh.getNodes(-1, -1)
+    node_ids, index = np.unique(np.asarray(node_ids, dtype=np.int64), return_index=True)
+    node_coords = np.asarray(node_coords, dtype=np.float64).reshape(-1, 3)[index]
+    return Nodes(parent=fem, from_np_array=np.column_stack((node_ids, node_coords)))
 
 
 def get_elements_from_entity(model: gmsh.model, ent, fem: FEM, dim) -> List[Elem]:
+    """Create the elements of a single gmsh entity. The connectivity of each element type is deduplicated, reordered
+    and resolved to nodes as one array. An element tag is only used once across all element types of the entity."""
     elem_types, elem_tags, elem_node_tags = model.mesh.getElements(dim, ent)
     elements = []
-    el_tags = []
-    for k, element_list in enumerate(elem_tags):
-        el_name, _, _, numv, _, _ = model.mesh.getElementProperties(elem_types[k])
+    used_tags = np.empty(0, dtype=np.int64)
+    for gmsh_type, el_tags, node_tags in zip(elem_types, elem_tags, elem_node_tags):
+        el_name, _, _, numv, _, _ = model.mesh.getElementProperties(gmsh_type)
         if el_name == "Point":
             continue
         elem_type = gmsh_map[el_name]
-        for j, eltag in enumerate(element_list):
-            if eltag in el_tags:
-                continue
-            el_tags.append(eltag)
-            nodes = []
-            for i in range(numv):
-                idtag = numv * j + i
-                p1 = elem_node_tags[k][idtag]
-                nodes.append(fem.nodes.from_id(p1))
-
-            new_nodes = node_reordering(elem_type, nodes)
-            if new_nodes is not None:
-                nodes = new_nodes
-
-            el = Elem(eltag, nodes, elem_type, parent=fem)
-            elements.append(el)
+
+        el_tags = np.asarray(el_tags, dtype=np.int64)
+        node_tags = np.asarray(node_tags, dtype=np.int64).reshape(len(el_tags), numv)
+
+        # Keep the first occurrence of each element tag in its original order, skipping tags of previous types
+        _, index = np.unique(el_tags, return_index=True)
+        index.sort()
+        index = index[~np.isin(el_tags[index], used_tags)]
+        if len(index) != len(el_tags):
+            el_tags, node_tags = el_tags[index], node_tags[index]
+        used_tags = np.concatenate([used_tags, el_tags])
+
+        order = gmsh_to_meshio_ordering.get(elem_type, None)
+        if order is not None:
+            node_tags = node_tags[:, order]
+
+        el_nodes = fem.nodes.from_ids(node_tags).tolist()
+        elements += [Elem(eltag, nodes, elem_type, parent=fem) for eltag, nodes in zip(el_tags.tolist(), el_nodes)]
+
     return elements
 
 
@@ -246,15 +256,6 @@ def is_reorder_necessary(elem_type):
         return False
 
 
-def node_reordering(elem_type, nodes):
-    """Based on work in meshio"""
-    order = gmsh_to_meshio_ordering.get(elem_type, None)
-    if order is None:
-        return None
-
-    return [nodes[i] for i in order]
-
-
 def build_bm_lines(model: gmsh.model, bm: Beam, point_tol):
     p1, p2 = bm.n1.p, bm.n2.p
 
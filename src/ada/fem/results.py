@@ -8,26 +8,47 @@ import subprocess
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Dict, List
 
-import meshio
 import numpy as np
-import pythreejs
-from IPython.display import display
-from ipywidgets import Dropdown, HBox, VBox
 
 from ada.fem.formats import FEATypes
-from ada.visualize.femviz import get_edges_and_faces_from_meshio, magnitude
-from ada.visualize.renderer_pythreejs import MyRenderer
-from ada.visualize.threejs_utils import edges_to_mesh, faces_to_mesh, vertices_to_mesh
 
 from .concepts.eigenvalue import EigenDataSummary
+from .concepts.fields import FieldCache, FieldInfo, FieldStore
 from .formats.abaqus.results import read_abaqus_results
-from .formats.calculix.results import read_calculix_results
-from .formats.code_aster.results import read_code_aster_results
+from .formats.calculix.results import (
+    FrdFieldStore,
+    read_calculix_eigen_data,
+    read_calculix_results,
+)
+from .formats.code_aster.results import (
+    MedFieldStore,
+    read_code_aster_eigen_data,
+    read_code_aster_results,
+)
 from .formats.sesam.results import read_sesam_results
 
 if TYPE_CHECKING:
+    import meshio
+    import pythreejs
+    from ipywidgets import Dropdown
+
     from ada import Assembly
+    from ada.fem import FemSet
     from ada.visualize.concept import PartMesh, VisMesh
+    from ada.visualize.renderer_pythreejs import MyRenderer
+
+
+# The XDMF results module is imported when it is first used, since the XDMF format package depends on meshio
+def _read_xdmf_results(results: Results, file_ref: pathlib.Path, overwrite):
+    from .formats.xdmf.results import read_xdmf_results
+
+    return read_xdmf_results(results, file_ref, overwrite)
+
+
+def _open_xdmf_field_store(file_ref: pathlib.Path) -> FieldStore:
+    from .formats.xdmf.results import XdmfFieldStore
+
+    return XdmfFieldStore(file_ref)
 
 
 class Results:
@@ -36,6 +57,16 @@ class Results:
         ".frd": (read_calculix_results, FEATypes.CALCULIX),
         ".odb": (read_abaqus_results, FEATypes.ABAQUS),
         ".sin": (read_sesam_results, FEATypes.SESAM),
+        ".xdmf": (_read_xdmf_results, None),
+    }
+    field_store_map = {
+        ".rmed": MedFieldStore,
+        ".frd": FrdFieldStore,
+        ".xdmf": _open_xdmf_field_store,
+    }
+    eigen_data_map = {
+        ".rmed": read_code_aster_eigen_data,
+        ".frd": read_calculix_eigen_data,
     }
 
     def __init__(
@@ -49,6 +80,7 @@ class Results:
         overwrite=True,
         metadata=None,
         import_mesh=False,
+        field_cache_size=8,
     ):
         self._name = name
         self._visualizer = ResultsMesh(palette, fem_format=fem_format, parent=self)
@@ -62,6 +94,9 @@ class Results:
         self._user_data = dict()
         self._history_output = None
         self._import_mesh = import_mesh
+        self._field_store = None
+        self._field_cache = FieldCache(field_cache_size)
+        self._mesh_file_ref = None
         if res_path is not None:
             self.load_data_from_result_file(self.results_file_path)
             if self.results_file_path.exists():
@@ -70,6 +105,9 @@ class Results:
                 self._last_modified = None
 
     def load_data_from_result_file(self, file_ref=None, overwrite=False):
+        """Open a result file. For result files with lazy field access, only the eigenvalue summary and the field
+        index are read. The result mesh is then read when result_mesh is first requested, and the fields when they
+        are first requested using get_field."""
         file_ref = self.results_file_path if file_ref is None else file_ref
 
         if file_ref is None:
@@ -78,6 +116,13 @@ class Results:
         if file_ref.exists() is False:
             return None
 
+        self._field_store = None
+        self._field_cache.clear()
+        self._mesh_file_ref = None
+        if self._open_field_index(file_ref) is True and self._import_mesh is False:
+            self._mesh_file_ref = file_ref
+            return None
+
         mesh = self._get_results_from_result_file(file_ref)
 
         if mesh is None:
@@ -86,7 +131,25 @@ class Results:
         if self._import_mesh is False:
             return None
         print(f'Importing meshio.Mesh from result file "{file_ref}"')
-        self.result_mesh.add_results(mesh)
+        self._visualizer.add_results(mesh)
+
+    def _open_field_index(self, file_ref: pathlib.Path) -> bool:
+        """Build the field index of a result file with lazy field access. Returns False for other result files"""
+        suffix = file_ref.suffix.lower()
+        if suffix not in Results.field_store_map:
+            return False
+
+        self.results_file_path = file_ref
+        fem_format = self.field_store.fem_format or Results.res_map[suffix][1]
+        if fem_format is not None:
+            self.fem_format = fem_format
+
+        read_eigen_data = Results.eigen_data_map.get(suffix, None)
+        if read_eigen_data is not None:
+            read_eigen_data(self, file_ref)
+
+        _ = self.field_store.index
+        return True
 
     def _get_results_from_result_file(self, file_ref, overwrite=False):
         file_ref = pathlib.Path(file_ref)
@@ -98,10 +161,68 @@ class Results:
             logging.error(f'Results class currently does not support filetype "{suffix}"')
             return None
 
-        self.fem_format = fem_format
+        if fem_format is not None:
+            self.fem_format = fem_format
 
         return res_reader(self, file_ref, overwrite)
 
+    def get_field(self, name: str, step: int = None, fem_set: FemSet = None, node_ids=None) -> np.ndarray:
+        """Returns the nodal values of a single result field at a single step. Only the requested field is read from
+        the result file, and the most recently used fields are cached.
+
+        :param name: Name of field, e.g. "DISP" or "STRESS"
+        :param step: Step number. If None the last step is used.
+        :param fem_set: Only return the values at the nodes of this node or element set
+        :param node_ids: Only return the values at these node ids
+        """
+        from ada.fem import FemSet
+
+        if self.field_store is None:
+            raise ValueError(f'Lazy field access is not supported for result file "{self.results_file_path}"')
+
+        info = self.field_store.get_info(name, step)
+        values = self._field_cache.get(info, lambda: self.field_store.read(info))
+
+        if fem_set is not None:
+            if fem_set.type == FemSet.TYPES.NSET:
+                node_ids = [n.id for n in fem_set.members]
+            else:
+                node_ids = sorted({n.id for el in fem_set.members for n in el.nodes})
+
+        if node_ids is None:
+            return values
+
+        return values[self.field_store.get_node_indices(node_ids)]
+
+    def to_xdmf(
+        self, dest_file, fields: List[str] = None, steps: List[int] = None, compression="gzip", chunk_size=65536
+    ):
+        """Export the nodal result fields of all steps to an XDMF temporal collection with a chunked and compressed HDF5
+        file. The mesh is written once and referenced by every step. The exported file can be opened in ParaView, or
+        be read lazily again using Results.
+
+        :param fields: Only export these fields. Default is all fields
+        :param steps: Only export these steps. Default is all steps
+        :param compression: HDF5 compression filter. Use None for no compression
+        :param chunk_size: Number of nodes per HDF5 chunk
+        :return: Path to the .xdmf file
+        """
+        from .formats.xdmf.results import write_results_to_xdmf
+
+        if self.field_store is None:
+            raise ValueError(f'Time series export is not supported for result file "{self.results_file_path}"')
+
+        return write_results_to_xdmf(
+            self.field_store,
+            dest_file,
+            name=self.name,
+            fem_format=self.fem_format,
+            fields=fields,
+            steps=steps,
+            compression=compression,
+            chunk_size=chunk_size,
+        )
+
     def save_output(self, dest_file) -> None:
         if self.output is None or self.output.stdout is None:
             print("No output is found")
@@ -189,6 +310,7 @@ class Results:
         if value not in FEATypes.all:
             raise ValueError(f'Unsupported FEA Type "{value}"')
         self._fem_format = value
+        self._visualizer.fem_format = value
 
     @property
     def last_modified(self):
@@ -208,10 +330,40 @@ class Results:
 
     @results_file_path.setter
     def results_file_path(self, value):
+        if value == self._results_file_path and self._field_store is not None:
+            return None
         self._results_file_path = value
+        self._field_store = None
+        self._field_cache.clear()
+
+    @property
+    def field_store(self) -> FieldStore | None:
+        if self._field_store is None and self.results_file_path is not None and self.results_file_path.exists():
+            store_type = Results.field_store_map.get(self.results_file_path.suffix.lower(), None)
+            if store_type is not None:
+                self._field_store = store_type(self.results_file_path)
+        return self._field_store
+
+    @property
+    def field_index(self) -> List[FieldInfo]:
+        return self.field_store.index if self.field_store is not None else []
+
+    @property
+    def steps(self) -> List[int]:
+        return self.field_store.steps if self.field_store is not None else []
+
+    @property
+    def field_names(self) -> List[str]:
+        return self.field_store.field_names if self.field_store is not None else []
 
     @property
     def result_mesh(self) -> ResultsMesh:
+        """The result mesh with the point data of the last step. It is read from the result file on first access"""
+        if self._mesh_file_ref is not None:
+            file_ref, self._mesh_file_ref = self._mesh_file_ref, None
+            mesh = self._get_results_from_result_file(file_ref)
+            if mesh is not None:
+                self._visualizer.add_results(mesh)
         return self._visualizer
 
     @property
@@ -243,6 +395,8 @@ class Results:
         return self._user_data
 
     def _repr_html_(self):
+        from IPython.display import display
+        from ipywidgets import HBox, VBox
 
         if self.result_mesh.renderer is None:
             res = self.result_mesh.build_renderer()
@@ -326,12 +480,14 @@ class ResultsMesh:
         self.palette = [(0, 149 / 255, 239 / 255), (1, 0, 0)] if self.palette is None else self.palette
 
     def add_results(self, mesh: meshio.Mesh):
+        from ada.visualize.fem_skin import get_meshio_cells, get_skin
+
         self.mesh = mesh
         self.vertices = np.asarray(mesh.points, dtype="float32")
 
-        edges, faces = get_edges_and_faces_from_meshio(mesh)
-        self.edges = np.asarray(edges, dtype="uint16").ravel()
-        self.faces = np.asarray(faces, dtype="uint16").ravel()
+        faces, edges = get_skin(get_meshio_cells(mesh))
+        self.edges = np.asarray(edges, dtype="uint32").ravel()
+        self.faces = np.asarray(faces, dtype="uint32").ravel()
 
         for n in mesh.point_data.keys():
             self.point_data.append(n)
@@ -340,15 +496,15 @@ class ResultsMesh:
             self.cell_data.append(n)
 
     def build_renderer(self) -> bool:
+        from ipywidgets import Dropdown
+
+        from ada.visualize.renderer_pythreejs import MyRenderer
+
         self.renderer = MyRenderer()
         if len(self.point_data) == 0:
             return False
-        if self.fem_format == FEATypes.CODE_ASTER:
-            data = [x for x in self.point_data if "DISP" in x][-1]
-        elif self.fem_format == FEATypes.CALCULIX:
-            data = [x for x in self.point_data if "U" in x][-1]
-        else:
-            raise NotImplementedError(f'Support for analysis_type "{self.fem_format}"')
+
+        data = self.get_displacement_data_type()
 
         self.create_viz_geom(data, displ_data=True, renderer=self.renderer)
         i = self.point_data.index(data)
@@ -360,7 +516,24 @@ class ResultsMesh:
         self.renderer.controls.append(self.render_sets)
         return True
 
-    def colorize_data(self, data, func=magnitude):
+    def get_displacement_data_type(self) -> str:
+        """The name of the last displacement field of the point data. Both the Code Aster and the Calculix result
+        readers name the displacement fields DISP"""
+        if self.fem_format not in (FEATypes.CODE_ASTER, FEATypes.CALCULIX):
+            raise NotImplementedError(f'Support for analysis_type "{self.fem_format}"')
+
+        displ_data = [x for x in self.point_data if "DISP" in x]
+        if len(displ_data) == 0:
+            raise ValueError(f"No displacement field found in the point data {self.point_data}")
+
+        return displ_data[-1]
+
+    def colorize_data(self, data, func=None):
+        if func is None:
+            from ada.visualize.femviz import magnitude
+
+            func = magnitude
+
         res = [func(d) for d in data]
         sorte = sorted(res)
         min_r = sorte[0]
@@ -376,6 +549,13 @@ class ResultsMesh:
         return colors
 
     def create_viz_geom(self, data_type, displ_data=False, renderer: MyRenderer = None) -> None:
+        from ada.visualize.renderer_pythreejs import MyRenderer
+        from ada.visualize.threejs_utils import (
+            edges_to_mesh,
+            faces_to_mesh,
+            vertices_to_mesh,
+        )
+
         default_vertex_color = (8, 8, 8)
 
         data = np.asarray(self.mesh.point_data[data_type], dtype="float32")
@@ -434,7 +614,7 @@ class ResultsMesh:
                 print("\r" + "Point Tags are not a valid display value" + 10 * " ", end="")
                 return None
         elif self.fem_format == FEATypes.CALCULIX:
-            is_displ = True if "U" in data else False
+            is_displ = True if "DISP" in data else False
         else:
             return None
 
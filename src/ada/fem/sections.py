@@ -200,6 +200,10 @@ class FemSection(FemBase):
     def int_points(self):
         return self._int_points
 
+    @property
+    def is_rigid(self) -> bool:
+        return self._is_rigid
+
     @property
     def refs(self) -> List[Union[Beam, Plate]]:
         return self._refs
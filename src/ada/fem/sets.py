@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, Iterable, List, Union
+
+import numpy as np
 
 from ada.concepts.points import Node
 
@@ -43,13 +45,14 @@ class FemSet(FemBase):
         self._set_type = set_type
         if self.type not in SetTypes.all:
             raise ValueError(f'set type "{set_type}" is not valid')
-        self._members = members
+        self._members = FemSetMembers(members, self)
+        self._reset_index()
 
     def __len__(self):
         return len(self._members)
 
     def __contains__(self, item):
-        return item.id in self._members
+        return getattr(item, "id", item) in self._get_index()
 
     def __getitem__(self, index):
         return self._members[index]
@@ -59,7 +62,67 @@ class FemSet(FemBase):
         return self
 
     def add_members(self, members: List[Union[Elem, Node]]):
-        self._members += members
+        self._members.extend(members)
+
+    def replace_member(self, old_member: Union[Elem, Node], new_member: Union[Elem, Node]):
+        """Replace the member while keeping its position in the list of members"""
+        index = self._members.index(old_member)
+        self._members[index] = new_member
+
+    def union(self, other: FemSet) -> list[Elem | Node]:
+        """The members of this set followed by the members of the other set with ids that are not in this set"""
+        return self._members + other.difference(self)
+
+    def intersection(self, other: FemSet) -> list[Elem | Node]:
+        """The members of this set with ids that are also in the other set. Members with duplicate ids are only
+        included once"""
+        return self._filter_members(other, keep_common=True)
+
+    def difference(self, other: FemSet) -> list[Elem | Node]:
+        """The members of this set with ids that are not in the other set. Members with duplicate ids are only
+        included once"""
+        return self._filter_members(other, keep_common=False)
+
+    @property
+    def member_ids(self) -> np.ndarray:
+        """The sorted unique ids of the members"""
+        ids = self._get_ids()
+        if self._sorted_ids is None:
+            self._sorted_ids = np.unique(ids)
+        return self._sorted_ids
+
+    def _filter_members(self, other: FemSet, keep_common: bool) -> list[Elem | Node]:
+        ids = self._get_ids()
+        _, first = np.unique(ids, return_index=True)
+        is_first = np.zeros(len(ids), dtype=bool)
+        is_first[first] = True
+
+        keep = is_first & (np.isin(ids, other.member_ids) == keep_common)
+        return [self._members[i] for i in np.flatnonzero(keep).tolist()]
+
+    def _get_ids(self) -> np.ndarray:
+        """The member ids in the order of the members"""
+        if self._ids is None:
+            self._ids = get_member_ids(self._members)
+            self._sorted_ids = None
+        return self._ids
+
+    def _get_index(self) -> set:
+        if self._index is None:
+            self._index = set(getattr(m, "id", m) for m in self._members)
+        return self._index
+
+    def _add_to_index(self, members: List[Union[Elem, Node]]):
+        """Update the cached member ids with members appended to the list of members"""
+        if self._index is not None:
+            self._index.update(getattr(m, "id", m) for m in members)
+        self._ids = None
+        self._sorted_ids = None
+
+    def _reset_index(self):
+        self._index = None
+        self._ids = None
+        self._sorted_ids = None
 
     @property
     def type(self):
@@ -69,10 +132,78 @@ class FemSet(FemBase):
     def members(self) -> list[Elem | Node]:
         return self._members
 
+    @members.setter
+    def members(self, value: list[Elem | Node]):
+        self._members = FemSetMembers(value, self)
+        self._reset_index()
+
     def __repr__(self):
         return f'FemSet({self.name}, type: "{self.type}", members: "{len(self.members)}")'
 
 
+class FemSetMembers(list):
+    """The list of members of a FemSet. Every change of the list updates or resets the cached member ids of the set"""
+
+    def __init__(self, members: Iterable[Elem | Node], fem_set: FemSet):
+        super().__init__(members)
+        self._fem_set = fem_set
+
+    def __reduce__(self):
+        # The default reduce of list subclasses appends the members before the set is restored
+        return FemSetMembers, (list(self), self._fem_set)
+
+    def append(self, member: Elem | Node):
+        super().append(member)
+        self._fem_set._add_to_index([member])
+
+    def extend(self, members: Iterable[Elem | Node]):
+        members = list(members)
+        super().extend(members)
+        self._fem_set._add_to_index(members)
+
+    def __iadd__(self, members: Iterable[Elem | Node]):
+        self.extend(members)
+        return self
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._fem_set._reset_index()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._fem_set._reset_index()
+
+    def __imul__(self, value):
+        super().__imul__(value)
+        self._fem_set._reset_index()
+        return self
+
+    def insert(self, index, member: Elem | Node):
+        super().insert(index, member)
+        self._fem_set._reset_index()
+
+    def pop(self, index=-1):
+        member = super().pop(index)
+        self._fem_set._reset_index()
+        return member
+
+    def remove(self, member: Elem | Node):
+        super().remove(member)
+        self._fem_set._reset_index()
+
+    def clear(self):
+        super().clear()
+        self._fem_set._reset_index()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._fem_set._reset_index()
+
+    def reverse(self):
+        super().reverse()
+        self._fem_set._reset_index()
+
+
 def eval_set_type_from_members(members: list[Elem | Node]) -> str:
     from ada.fem import Elem
 
@@ -88,6 +219,19 @@ def eval_set_type_from_members(members: list[Elem | Node]) -> str:
         # return "mixed"
 
 
+def get_member_ids(members: list[Elem | Node | int]) -> np.ndarray:
+    """Get the ids of the members. Members which are not yet instantiated are given by their id"""
+    return np.fromiter((getattr(m, "id", m) for m in members), dtype=np.int64, count=len(members))
+
+
+def reset_set_indices(members: Iterable[Elem | Node]) -> None:
+    """Reset the cached member ids of the sets referring to the members. Must be called when the ids of the members
+    are changed, e.g. by renumbering"""
+    fem_sets = {id(ref): ref for m in members for ref in m.refs if isinstance(ref, FemSet)}
+    for fem_set in fem_sets.values():
+        fem_set._reset_index()
+
+
 def is_lazy(members: list[Elem | Node]) -> bool:
     res = set([type(mem) for mem in members])
     if len(res) == 1 and type(members[0]) is tuple:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import Union
 
 import numpy as np
@@ -197,19 +198,7 @@ class ElemShape:
 
     @staticmethod
     def is_valid_elem(elem_type):
-        valid_element_types = (
-            ElemType.LINE_SHAPES.all
-            + ElemType.SHELL_SHAPES.all
-            + ElemType.SOLID_SHAPES.all
-            + ElemType.POINT_SHAPES.all
-            + ElemType.CONNECTOR_SHAPES.all
-        )
-        valid_element_types_upper = [x.upper() for x in valid_element_types]
-        value = elem_type.upper()
-        if value in valid_element_types_upper:
-            return True
-        else:
-            return False
+        return elem_type.upper() in _get_valid_element_types()
 
     @staticmethod
     def num_nodes(el_name):
@@ -236,6 +225,18 @@ class ElemShape:
         return f'{self.__class__.__name__}(Type: {self.type}, NodeIds: "{self.nodes}")'
 
 
+@lru_cache(maxsize=1)
+def _get_valid_element_types() -> frozenset:
+    valid_element_types = (
+        ElemType.LINE_SHAPES.all
+        + ElemType.SHELL_SHAPES.all
+        + ElemType.SOLID_SHAPES.all
+        + ElemType.POINT_SHAPES.all
+        + ElemType.CONNECTOR_SHAPES.all
+    )
+    return frozenset(x.upper() for x in valid_element_types)
+
+
 def get_elem_type_group(el_type):
     el_type = el_type.upper()
 
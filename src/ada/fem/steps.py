@@ -103,7 +103,12 @@ class Step(FemBase):
 
         return defaults()
 
+    def _mark_modified(self) -> None:
+        if self.parent is not None:
+            self.parent.mark_cache_dirty()
+
     def add_load(self, load: Union[Load, LoadPressure, LoadGravity]):
+        self._mark_modified()
         if isinstance(load, LoadPressure):
             if load.surface.parent is None:
                 self.parent.add_surface(load.surface)
@@ -111,6 +116,7 @@ class Step(FemBase):
         self._loads.append(load)
 
     def add_loadcase(self, load_case: LoadCase):
+        self._mark_modified()
         for load in load_case.loads:
             if load not in self.loads:
                 self.loads.append(load)
@@ -119,6 +125,7 @@ class Step(FemBase):
         self._load_cases[load_case.name] = load_case
 
     def add_bc(self, bc: Bc):
+        self._mark_modified()
         bc.parent = self
         self._bcs[bc.name] = bc
         if bc.fem_set.parent is None and bc.fem_set not in self.parent.sets:
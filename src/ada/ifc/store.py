@@ -30,6 +30,10 @@ class IfcStore:
     writer: IfcWriter = None
     reader: IfcReader = None
 
+    # Lookup tables of the entities in f. They are built on first use and kept up to date by the IfcWriter
+    _indexes: dict[str, dict] = field(default_factory=dict, init=False, repr=False)
+    _indexed_file: ifcopenshell.file = field(default=None, init=False, repr=False)
+
     def __post_init__(self):
         if self.f is None:
             if self.ifc_file_path is not None:
@@ -43,6 +47,7 @@ class IfcStore:
         self.owner_history = create_owner_history_from_user(user, self.f)
 
     def sync(self, include_fem=False):
+        from ada import Part
         from ada.ifc.write.write_ifc import IfcWriter
 
         self.writer = IfcWriter(self)
@@ -54,20 +59,31 @@ class IfcStore:
 
         self.update_owner(a.user)
 
-        num_new_spatial_objects = self.writer.sync_spatial_hierarchy(include_fem=include_fem)
+        # Only the objects and parts recorded in the change journals of the parts are visited
+        changes = a.pop_changes()
+        parts = [x for x in changes if isinstance(x, Part)]
+        physical_objects = [x for x in changes if not isinstance(x, Part)]
+
+        try:
+            num_new_spatial_objects = self.writer.sync_spatial_hierarchy(include_fem=include_fem, parts=parts)
 
-        self.writer.sync_sections()
-        self.writer.sync_materials()
+            self.writer.sync_sections()
+            self.writer.sync_materials()
 
-        num_new_objects = self.writer.sync_added_physical_objects()
+            num_new_objects = self.writer.sync_added_physical_objects(physical_objects)
 
-        self.writer.sync_mapped_instances()
+            self.writer.sync_mapped_instances()
 
-        num_mod = self.writer.sync_modified_physical_objects()
+            num_mod = self.writer.sync_modified_physical_objects(physical_objects)
 
-        self.writer.sync_presentation_layers()
+            self.writer.sync_presentation_layers()
 
-        num_del = self.writer.sync_deleted_physical_objects()
+            num_del = self.writer.sync_deleted_physical_objects(physical_objects)
+        except BaseException:
+            # Put the changes back in the change journals so that they are not lost to the next sync
+            for obj in changes:
+                obj.parent.record_change(obj)
+            raise
 
         add_str = f"Added {num_new_objects} objects and {num_new_spatial_objects} spatial elements"
         mod_str = f"Modified {num_mod} objects"
@@ -138,32 +154,97 @@ class IfcStore:
     def get_ifc_geom(self, ifc_elem, settings: ifcopenshell.geom.settings):
         return ifcopenshell.geom.create_shape(settings, inst=ifc_elem)
 
-    def get_ifc_geom_iterator(self, settings: ifcopenshell.geom.settings, cpus: int = None):
+    def get_ifc_geom_iterator(self, settings: ifcopenshell.geom.settings, cpus: int = None, products=None):
         import multiprocessing
 
-        products = []
-        for x in self.assembly.get_all_physical_objects(pipe_to_segments=True):
-            try:
-                product = self.f.by_guid(x.guid)
-            except RuntimeError as e:
-                raise RuntimeError(e)
-            products.append(product)
+        if products is None:
+            products = [self.get_by_guid(x.guid) for x in self.assembly.get_all_physical_objects(pipe_to_segments=True)]
         cpus = multiprocessing.cpu_count() if cpus is None else cpus
         return ifcopenshell.geom.iterator(settings, self.f, cpus, include=products)
 
     def get_by_guid(self, guid: str) -> ifcopenshell.entity_instance:
-        return self.f.by_guid(guid)
+        guid_map = self._get_index("guid")
+        ifc_elem = guid_map.get(guid)
+        if ifc_elem is None:
+            ifc_elem = self.f.by_guid(guid)
+            guid_map[guid] = ifc_elem
+        return ifc_elem
 
     def get_beam_type(self, section: Section, match_description=False) -> ifcopenshell.entity_instance:
-        for beam_type in self.f.by_type("IfcBeamType"):
-            if section.name == beam_type.Name:
-                return beam_type
+        beam_type = self._get_index("beam_types").get(section.name)
+        if beam_type is None:
+            beam_type = self._rebuild_index("beam_types").get(section.name)
+        return beam_type
 
     def get_profile_def(self, section: Section) -> ifcopenshell.entity_instance:
-        profile_class = get_profile_class(section)
-        for profile_def in self.f.by_type(profile_class.get_ifc_type()):
-            if profile_def.ProfileName == section.name:
-                return profile_def
+        ifc_type = get_profile_class(section).get_ifc_type()
+
+        def find_profile_def(index: dict) -> ifcopenshell.entity_instance | None:
+            return next(filter(lambda x: x.is_a(ifc_type), index.get(section.name, [])), None)
+
+        profile_def = find_profile_def(self._get_index("profile_defs"))
+        if profile_def is None:
+            profile_def = find_profile_def(self._rebuild_index("profile_defs"))
+        return profile_def
+
+    def get_rel_defines_by_type(self, relating_type: ifcopenshell.entity_instance) -> ifcopenshell.entity_instance:
+        return self._get_index("rel_defines_by_type").get(relating_type.id())
+
+    def get_material_rel(self, guid: str) -> ifcopenshell.entity_instance:
+        """Returns the IfcRelAssociatesMaterial of the material with the given guid"""
+        return self._get_index("material_rels").get(guid)
+
+    def add_to_indexes(self, ifc_elem: ifcopenshell.entity_instance) -> None:
+        """Add an entity created in f to the lookup tables which are already built"""
+        if self._indexed_file is not self.f:
+            return
+
+        indexes = self._indexes
+        guid = ifc_elem.GlobalId if ifc_elem.is_a("IfcRoot") else None
+        if guid is not None and "guid" in indexes:
+            indexes["guid"][guid] = ifc_elem
+
+        if ifc_elem.is_a("IfcBeamType") and "beam_types" in indexes:
+            indexes["beam_types"].setdefault(ifc_elem.Name, ifc_elem)
+        elif ifc_elem.is_a("IfcProfileDef") and "profile_defs" in indexes:
+            indexes["profile_defs"].setdefault(ifc_elem.ProfileName, []).append(ifc_elem)
+        elif ifc_elem.is_a("IfcRelDefinesByType") and "rel_defines_by_type" in indexes:
+            indexes["rel_defines_by_type"].setdefault(ifc_elem.RelatingType.id(), ifc_elem)
+        elif ifc_elem.is_a("IfcRelAssociatesMaterial") and "material_rels" in indexes:
+            if ifc_elem.RelatingMaterial.is_a("IfcMaterial"):
+                indexes["material_rels"][guid] = ifc_elem
+
+    def _get_index(self, name: str) -> dict:
+        if self._indexed_file is not self.f:
+            self._indexes = dict()
+            self._indexed_file = self.f
+
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._rebuild_index(name)
+        return index
+
+    def _rebuild_index(self, name: str) -> dict:
+        f = self.f
+        index = dict()
+        if name == "beam_types":
+            for beam_type in f.by_type("IfcBeamType"):
+                index.setdefault(beam_type.Name, beam_type)
+        elif name == "profile_defs":
+            for profile_def in f.by_type("IfcProfileDef"):
+                index.setdefault(profile_def.ProfileName, []).append(profile_def)
+        elif name == "rel_defines_by_type":
+            for rel in f.by_type("IfcRelDefinesByType"):
+                index.setdefault(rel.RelatingType.id(), rel)
+        elif name == "material_rels":
+            for rel in f.by_type("IfcRelAssociatesMaterial"):
+                if rel.RelatingMaterial.is_a("IfcMaterial"):
+                    index[rel.GlobalId] = rel
+        elif name != "guid":
+            raise ValueError(f'Unknown index "{name}"')
+
+        self._indexes[name] = index
+        return index
 
     @staticmethod
     def from_ifc(ifc_file: str | os.PathLike | ifcopenshell.file, make_a_copy=True) -> IfcStore:
@@ -4,10 +4,7 @@ import logging
 from typing import TYPE_CHECKING, List, Tuple, Union
 
 import ifcopenshell
-import ifcopenshell.geom
-import ifcopenshell.util.element
 import numpy as np
-from ifcopenshell.util.unit import get_prefix_multiplier
 
 import ada.core.constants as ifco
 from ada.concepts.transforms import Transform
@@ -497,6 +494,8 @@ def add_colour(
 
 
 def calculate_unit_scale(file):
+    from ifcopenshell.util.unit import get_prefix_multiplier
+
     units = file.by_type("IfcUnitAssignment")[0]
     unit_scale = 1
     for unit in units.Units:
@@ -602,6 +601,8 @@ def scale_ifc_file_object(ifc_file, scale_factor):
 
 
 def merge_existing(original_file, source_file, new_file):
+    import ifcopenshell.util.element
+
     source = ifcopenshell.open(source_file)
     f = ifcopenshell.open(original_file)
     original_project = f.by_type("IfcProject")[0]
@@ -621,6 +622,8 @@ def patch(f, source_file):
     :param source_file:
     :return:
     """
+    import ifcopenshell.util.element
+
     source = ifcopenshell.open(source_file)
     original_project = f.by_type("IfcProject")[0]
     merged_project = f.add(source.by_type("IfcProject")[0])
@@ -718,6 +721,8 @@ def scale_ifc_file(current_ifc, new_ifc):
 
 
 def tesselate_shape(shape, schema, tol):
+    import ifcopenshell.geom
+
     occ_string = ifcopenshell.geom.occ_utils.serialize_shape(shape)
     serialized_geom = ifcopenshell.geom.serialise(schema, occ_string)
 
@@ -729,6 +734,8 @@ def tesselate_shape(shape, schema, tol):
 
 
 def default_settings():
+    import ifcopenshell.geom
+
     ifc_settings = ifcopenshell.geom.settings()
     ifc_settings.set(ifc_settings.USE_PYTHON_OPENCASCADE, True)
     ifc_settings.set(ifc_settings.SEW_SHELLS, True)
@@ -776,3 +783,40 @@ def get_representation_items(f: ifcopenshell.file, ifc_elem: ifcopenshell.entity
             f.traverse(ifc_elem),
         )
     )
+
+
+def get_geometry_hash(f: ifcopenshell.file, ifc_elem: ifcopenshell.entity_instance) -> str:
+    """Returns a hash of the placement, representation and presentation styles of an IFC product.
+
+    Entity references are replaced by their position in the traversal, so the hash is independent of the entity ids
+    in the file and only changes when the geometry (or colour) of the product changes."""
+    import hashlib
+
+    roots = [x for x in (ifc_elem.ObjectPlacement, ifc_elem.Representation) if x is not None]
+    entities = dict()
+    for root in roots:
+        for entity in f.traverse(root):
+            entities.setdefault(entity.id(), entity)
+
+    styles = [s for e in list(entities.values()) for s in (getattr(e, "StyledByItem", None) or [])]
+    for style in styles:
+        for entity in f.traverse(style):
+            entities.setdefault(entity.id(), entity)
+
+    local_ids = {entity_id: i for i, entity_id in enumerate(entities.keys())}
+
+    def normalize(value):
+        if isinstance(value, ifcopenshell.entity_instance):
+            if value.id() == 0:
+                return value.is_a(), normalize(value.wrappedValue)
+            return "#", local_ids.get(value.id(), None)
+        if isinstance(value, (tuple, list)):
+            return tuple(normalize(x) for x in value)
+        return value
+
+    geom_hash = hashlib.sha1()
+    for entity in entities.values():
+        geom_hash.update(entity.is_a().encode())
+        geom_hash.update(repr(normalize(tuple(entity))).encode())
+
+    return geom_hash.hexdigest()
@@ -66,20 +66,15 @@ class IfcBeamWriter:
             Representation=prod_def_shp,
         )
 
-        found_existing_relationship = False
-
         beam_type = self.ifc_store.get_beam_type(beam.section)
         if beam_type is None:
             raise ValueError()
 
-        for ifcrel in f.by_type("IfcRelDefinesByType"):
-            if ifcrel.RelatingType == beam_type:
-                ifcrel.RelatedObjects = tuple([*ifcrel.RelatedObjects, ifc_beam])
-                found_existing_relationship = True
-                break
-
-        if found_existing_relationship is False:
-            f.create_entity(
+        ifc_rel = self.ifc_store.get_rel_defines_by_type(beam_type)
+        if ifc_rel is not None:
+            self.ifc_store.writer.add_related_objects(ifc_rel, [ifc_beam])
+        else:
+            ifc_rel = f.create_entity(
                 "IfcRelDefinesByType",
                 GlobalId=create_guid(),
                 OwnerHistory=owner_history,
@@ -88,6 +83,7 @@ class IfcBeamWriter:
                 RelatedObjects=[ifc_beam],
                 RelatingType=beam_type,
             )
+            self.ifc_store.add_to_indexes(ifc_rel)
 
         self.add_material_assignment(beam, ifc_beam)
 
@@ -99,7 +95,7 @@ class IfcBeamWriter:
         ifc_store = self.ifc_store
         f = ifc_store.f
 
-        ifc_mat_rel = ifc_store.f.by_guid(mat.guid)
+        ifc_mat_rel = ifc_store.get_by_guid(mat.guid)
         ifc_mat = ifc_mat_rel.RelatingMaterial
 
         ifc_profile = ifc_store.get_profile_def(beam.section)
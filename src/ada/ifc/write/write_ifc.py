@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 import ifcopenshell
@@ -44,59 +44,73 @@ def is_deleted(x):
 class IfcWriter:
     ifc_store: IfcStore
 
-    def sync_spatial_hierarchy(self, include_fem=False) -> int:
+    # Objects to be added to the RelatedObjects of relationship entities. They are written in one go by
+    # flush_related_objects, as rewriting the aggregate for every object is quadratic in the number of objects.
+    _related_objects: dict[int, tuple[ifcopenshell.entity_instance, list]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def sync_spatial_hierarchy(self, include_fem=False, parts: list[Part] = None) -> int:
+        """Add the parts with change type ADDED. Default is to evaluate all parts in the assembly"""
         if len(list(self.ifc_store.f.by_type("IfcSite"))) == 0:
             write_ifc_spatial_hierarchy(self.ifc_store)
 
+        if parts is None:
+            parts = self.ifc_store.assembly.get_all_parts_in_assembly()
+
         num_new_spatial_objects = 0
-        for part in filter(is_added, self.ifc_store.assembly.get_all_parts_in_assembly()):
+        for part in filter(is_added, parts):
             self.add_part(part, include_fem=include_fem)
             part.change_type = ChangeAction.NOCHANGE
             num_new_spatial_objects += 1
         return num_new_spatial_objects
 
-    def sync_added_physical_objects(self) -> int:
+    def sync_added_physical_objects(self, physical_objects: list[Beam | Plate | Pipe | Shape | Wall] = None) -> int:
+        """Add the physical objects with change type ADDED. Default is to evaluate all objects in the assembly"""
         a = self.ifc_store.assembly
         mat_map = {mat.guid: mat for mat in a.get_all_materials()}
-        rel_mats_map = {
-            m.GlobalId: m
-            for m in filter(
-                lambda x: x.RelatingMaterial.is_a("IfcMaterial"), self.ifc_store.f.by_type("IfcRelAssociatesMaterial")
-            )
-        }
+
+        if physical_objects is None:
+            physical_objects = a.get_all_physical_objects()
 
         num_new_objects = 0
-        contained_in_spatial = {x.guid: [] for x in a.get_all_parts_in_assembly(include_self=True)}
+        contained_in_spatial = dict()
 
-        for to_be_added in filter(is_added, a.get_all_physical_objects()):
-            self.eval_validity(to_be_added, mat_map, rel_mats_map)
+        for to_be_added in filter(is_added, physical_objects):
+            self.eval_validity(to_be_added, mat_map)
 
             ifc_elem = self.add(to_be_added)
             self.create_ifc_openings(to_be_added, ifc_elem)
             write_elem_property_sets(to_be_added.metadata, ifc_elem, self.ifc_store.f, self.ifc_store.owner_history)
 
-            contained_in_spatial[to_be_added.parent.guid].append(ifc_elem)
+            contained_in_spatial.setdefault(to_be_added.parent.guid, []).append(ifc_elem)
             to_be_added.change_type = ChangeAction.NOCHANGE
             num_new_objects += 1
 
+        self.flush_related_objects()
+
         for spatial_elem_guid, relating_elements in contained_in_spatial.items():
-            if len(relating_elements) == 0:
-                continue
             self.add_related_elements_to_spatial_container(relating_elements, spatial_elem_guid)
 
         return num_new_objects
 
-    def sync_modified_physical_objects(self) -> int:
+    def sync_modified_physical_objects(self, physical_objects: list[Beam | Plate | Pipe | Shape | Wall] = None) -> int:
+        if physical_objects is None:
+            physical_objects = self.ifc_store.assembly.get_all_physical_objects()
+
         num_mod = 0
-        for to_be_modified in filter(is_modified, self.ifc_store.assembly.get_all_physical_objects()):
+        for to_be_modified in filter(is_modified, physical_objects):
             self.create_ifc_openings(to_be_modified)
             to_be_modified.change_type = ChangeAction.NOCHANGE
             num_mod += 1
         return num_mod
 
-    def sync_deleted_physical_objects(self) -> int:
+    def sync_deleted_physical_objects(self, physical_objects: list[Beam | Plate | Pipe | Shape | Wall] = None) -> int:
+        if physical_objects is None:
+            physical_objects = self.ifc_store.assembly.get_all_physical_objects()
+
         num_mod = 0
-        for to_be_modified in filter(is_deleted, self.ifc_store.assembly.get_all_physical_objects()):
+        for to_be_modified in filter(is_deleted, physical_objects):
             self.create_ifc_openings(to_be_modified)
             to_be_modified.change_type = ChangeAction.NOCHANGE
             num_mod += 1
@@ -195,15 +209,9 @@ class IfcWriter:
             mat.change_type = ChangeAction.NOCHANGE
 
         skip_mats = set([m.guid for m in skipped_mats])
-        mat_map = {mat.guid for mat in self.ifc_store.assembly.get_all_materials()} - skip_mats
+        mat_map = {mat.guid for mat in all_mats} - skip_mats
 
-        rel_mats_map = {
-            m.GlobalId
-            for m in filter(
-                lambda x: x.RelatingMaterial.is_a("IfcMaterial"), self.ifc_store.f.by_type("IfcRelAssociatesMaterial")
-            )
-        }
-        if len(mat_map - rel_mats_map) != 0:
+        if any(self.ifc_store.get_material_rel(guid) is None for guid in mat_map):
             raise ValueError("Syncing of Materials failed")
 
     def create_ifc_openings(self, obj: Beam | Plate | Pipe | Shape | Wall, ifc_obj=None):
@@ -211,10 +219,7 @@ class IfcWriter:
         from ada.core.constants import O, X, Z
 
         if ifc_obj is None:
-            try:
-                ifc_obj = self.ifc_store.f.by_guid(obj.guid)
-            except RuntimeError as e:
-                raise RuntimeError(e)
+            ifc_obj = self.ifc_store.get_by_guid(obj.guid)
 
         if isinstance(obj, Wall):
             if len(obj.inserts) > 0:
@@ -239,21 +244,23 @@ class IfcWriter:
                         RelatedOpeningElement=ifc_opening,
                     )
 
-    def eval_validity(self, to_be_added, mat_map, rel_mats_map):
+    def eval_validity(self, to_be_added, mat_map):
         from ada import Pipe, Shape, Wall
 
+        get_material_rel = self.ifc_store.get_material_rel
+
         if isinstance(to_be_added, Wall) is False and issubclass(type(to_be_added), Shape) is False:
             if to_be_added.material.guid not in mat_map.keys():
                 raise ValueError(f"Object {to_be_added.material} is not among synced materials {mat_map}")
-            if to_be_added.material.guid not in rel_mats_map.keys():
-                raise ValueError(f"Object {to_be_added.material} is not among synced materials {rel_mats_map}")
+            if get_material_rel(to_be_added.material.guid) is None:
+                raise ValueError(f"Object {to_be_added.material} is not among the materials synced to IFC")
 
         elif isinstance(to_be_added, Pipe):
             for seg in to_be_added.segments:
                 if seg.material.guid not in mat_map.keys():
                     raise ValueError(f"Object {to_be_added.material} is not among synced materials {mat_map}")
-                if seg.material.guid not in rel_mats_map.keys():
-                    raise ValueError(f"Object {to_be_added.material} is not among synced materials {rel_mats_map}")
+                if get_material_rel(seg.material.guid) is None:
+                    raise ValueError(f"Object {to_be_added.material} is not among the materials synced to IFC")
 
     def add_related_elements_to_spatial_container(self, elements: list[ifcopenshell.entity_instance], guid: str):
         parent_ifc_elem = self.ifc_store.get_by_guid(guid)
@@ -279,21 +286,29 @@ class IfcWriter:
             )
 
     def associate_elem_with_material(self, material: Material, ifc_elem: ifcopenshell.entity_instance):
-        try:
-            rel_mat = self.ifc_store.f.by_guid(material.guid)
-        except RuntimeError as e:
-            raise RuntimeError(e)
-        related_objects = [*rel_mat.RelatedObjects, ifc_elem]
-        rel_mat.RelatedObjects = related_objects
+        rel_mat = self.ifc_store.get_by_guid(material.guid)
+        self.add_related_objects(rel_mat, [ifc_elem])
         return rel_mat
 
     def associate_elem_with_profiledef(self, section: Section, ifc_elem: ifcopenshell.entity_instance):
         """This is only for IFC 4.3++"""
-        rel_profile_def = self.ifc_store.f.by_guid(section.guid)
-        related_objects = [*rel_profile_def.RelatedObjects, ifc_elem]
-        rel_profile_def.RelatedObjects = related_objects
+        rel_profile_def = self.ifc_store.get_by_guid(section.guid)
+        self.add_related_objects(rel_profile_def, [ifc_elem])
         return rel_profile_def
 
+    def add_related_objects(self, ifc_rel: ifcopenshell.entity_instance, elements: list[ifcopenshell.entity_instance]):
+        """Queue elements to be added to the RelatedObjects of a relationship entity on the next flush"""
+        related = self._related_objects.get(ifc_rel.id())
+        if related is None:
+            related = (ifc_rel, list(ifc_rel.RelatedObjects))
+            self._related_objects[ifc_rel.id()] = related
+        related[1].extend(elements)
+
+    def flush_related_objects(self):
+        for ifc_rel, related_objects in self._related_objects.values():
+            ifc_rel.RelatedObjects = related_objects
+        self._related_objects = dict()
+
     def add(self, obj: Beam | Plate | Pipe | Shape | Wall) -> ifcopenshell.entity_instance:
         from ada import Beam, Pipe, Plate, Shape, Wall
 
@@ -314,10 +329,12 @@ class IfcWriter:
         return write_ifc_part(self.ifc_store, part, include_fem=include_fem)
 
     def create_ifc_profile_def(self, section: Section):
-        export_beam_section_profile_def(section)
+        profile_def = export_beam_section_profile_def(section)
+        self.ifc_store.add_to_indexes(profile_def)
+        return profile_def
 
     def create_ifc_beam_type(self, section: Section):
-        self.ifc_store.f.create_entity(
+        beam_type = self.ifc_store.f.create_entity(
             "IfcBeamType",
             GlobalId=section.guid,
             OwnerHistory=self.ifc_store.owner_history,
@@ -325,6 +342,8 @@ class IfcWriter:
             Description=section.sec_str,
             PredefinedType="BEAM",
         )
+        self.ifc_store.add_to_indexes(beam_type)
+        return beam_type
 
     def create_ifc_material(self, material: Material):
         ifc_mat = write_ifc_mat(material)
@@ -332,7 +351,7 @@ class IfcWriter:
         return ifc_mat
 
     def create_rel_associates_material(self, guid: str, relating_mat: ifcopenshell.entity_instance, related_objs=None):
-        return self.ifc_store.f.create_entity(
+        rel_mat = self.ifc_store.f.create_entity(
             "IfcRelAssociatesMaterial",
             GlobalId=guid,
             OwnerHistory=self.ifc_store.owner_history,
@@ -341,3 +360,5 @@ class IfcWriter:
             RelatedObjects=[] if related_objs is None else related_objs,
             RelatingMaterial=relating_mat,
         )
+        self.ifc_store.add_to_indexes(rel_mat)
+        return rel_mat
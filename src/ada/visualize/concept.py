@@ -7,16 +7,18 @@ import os
 import pathlib
 import shutil
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
 import h5py
 import numpy as np
-import trimesh
 
 from ada.core.file_system import get_list_of_files
 
 from .colors import VisColor
 
+if TYPE_CHECKING:
+    import trimesh
+
 
 @dataclass
 class VisMesh:
@@ -88,59 +90,9 @@ class VisMesh:
     def num_polygons(self):
         return sum([x.num_polygons for x in self.world])
 
-    def _get_mesh_obj_from_cache(self, guid, h5) -> ObjectMesh:
-        obj_group = h5[guid]
-        index = obj_group["INDEX"][()]
-        position = obj_group["POSITION"][()]
-        # normals = obj_group["NORMAL"][()]
-        color_obj = self.colors[obj_group.attrs["COLOR"]]
-        base_color = color_obj.pbrMetallicRoughness.baseColorFactor
-        faces = index.reshape(int(len(index) / 3), 3)
-        return ObjectMesh(guid, faces, position, None, base_color)
-
-    def _convert_to_trimesh2(self, only_these_guids: List[str] = None) -> trimesh.Scene:
-        scene = trimesh.Scene()
-        from trimesh.visual.material import PBRMaterial
-
-        h5_file = None
-        if self._h5cache is None and self.cache_file.exists():
-            h5_file = h5py.File(self.cache_file)
-            h5 = h5_file["VISMESH"]
-        else:
-            h5 = self._h5cache_group
-
-        totnum = len(self.meshes.keys())
-        for i, vn in enumerate(self.meshes.values()):
-            if only_these_guids is not None and vn.guid not in only_these_guids:
-                continue
-            obj_group = h5[vn.guid]
-            index = obj_group["INDEX"][()]
-            position = obj_group["POSITION"][()] * 1e-3
-            normals = obj_group["NORMAL"][()]
-            color = self.colors[obj_group.attrs["COLOR"]]
-
-            # matrix = obj_group.attrs.get("MATRIX")
-            if index.shape[1] != 3:
-                index = index.reshape(int(len(index) / 3), 3)
-
-            new_mesh = trimesh.Trimesh(
-                vertices=position,
-                faces=index,
-                vertex_normals=normals,
-                # face_colors=obj.color,
-                metadata=dict(guid=vn.guid),
-            )
-            print(f"Exporting ({i} of {totnum})")
-            base_color = [int(x * 255) for x in color.pbrMetallicRoughness.baseColorFactor]
-            new_mesh.visual.material = PBRMaterial(baseColorFactor=base_color)
-            scene.add_geometry(new_mesh, node_name=vn.guid, geom_name=vn.guid)
-
-        if h5_file is not None:
-            h5_file.close()
-
-        return scene
-
     def _convert_to_trimesh(self) -> trimesh.Scene:
+        import trimesh
+
         scene = trimesh.Scene()
 
         for world in self.world:
@@ -167,6 +119,8 @@ class VisMesh:
     def merge_meshes_by_color(self) -> List[str]:
         from ada.ifc.utils import create_guid
 
+        from .formats.gltf.write_gltf import merge_cached_meshes
+
         h5_file = None
         if self._h5cache is None and self.cache_file.exists():
             h5_file = h5py.File(self.cache_file)
@@ -176,14 +130,7 @@ class VisMesh:
 
         listofobj = []
         for color in self.colors.values():
-            obj0 = self._get_mesh_obj_from_cache(color.used_by[0], h5)
-            tot_num = len(color.used_by[1:])
-            for i, obj_guid in enumerate(color.used_by[1:]):
-                print(f"Merging ({i} of {tot_num}) into color {color.name}")
-                # TODO: Optimize this by unwrapping everything before concatenating
-                obj1 = self._get_mesh_obj_from_cache(obj_guid, h5)
-                obj0 += obj1
-
+            obj0 = merge_cached_meshes(h5, color.used_by, color.pbrMetallicRoughness.baseColorFactor)
             new_guid = create_guid()
 
             self.add_mesh(new_guid, create_guid(), obj0.position, obj0.faces, obj0.normal, color_ref=color.name)
@@ -194,22 +141,26 @@ class VisMesh:
 
         return listofobj
 
-    def to_gltf(self, dest_file, only_these_guids: list[str] = None):
-        from ada.core.vector_utils import rot_matrix
+    def to_gltf(self, dest_file, only_these_guids: list[str] = None, merge_by_color=False):
+        """Write the visual mesh to a binary glTF (.glb) file. If the visual mesh has an HDF5 mesh cache, the meshes
+        are read from the cache.
 
-        dest_file = pathlib.Path(dest_file).with_suffix(".glb")
-        if hasattr(self, "_h5cache"):
-            mesh: trimesh.Trimesh = self._convert_to_trimesh2(only_these_guids)
-        else:
-            mesh: trimesh.Trimesh = self._convert_to_trimesh()
+        :param only_these_guids: Only export the objects with these guids
+        :param merge_by_color: Merge all objects of the same colour into a single mesh
+        """
+        from .formats.gltf.write_gltf import h5_cache_to_glb, vis_mesh_to_glb
 
-        # Trimesh automatically transforms by setting up = Y. This will counteract that transform
-        m3x3 = rot_matrix((0, -1, 0))
-        m3x3_with_col = np.append(m3x3, np.array([[0], [0], [0]]), axis=1)
-        m4x4 = np.r_[m3x3_with_col, [np.array([0, 0, 0, 1])]]
-        mesh.apply_transform(m4x4)
+        dest_file = pathlib.Path(dest_file).with_suffix(".glb")
+        print(f'Writing Visual Mesh to "{dest_file}"')
+        if getattr(self, "_h5cache", None) is None and len(self.meshes) == 0:
+            vis_mesh_to_glb(self, dest_file, merge_by_color, only_these_guids)
+            return
 
-        self._export_using_trimesh(mesh, dest_file)
+        if getattr(self, "_h5cache", None) is None:
+            with h5py.File(self.cache_file, "r") as h5_file:
+                h5_cache_to_glb(self, h5_file["VISMESH"], dest_file, merge_by_color, only_these_guids)
+        else:
+            h5_cache_to_glb(self, self._h5cache_group, dest_file, merge_by_color, only_these_guids)
 
     def to_cache(self, overwrite=False):
         import h5py
@@ -295,6 +246,15 @@ class VisMesh:
             with zipfile.ZipFile(zfile, "w") as zip_archive:
                 zip_archive.write(json_file, json_file.name, compress_type=zipfile.ZIP_DEFLATED)
 
+    def to_tiles(
+        self, dest_dir, cell_sizes: list[float] = None, max_objects_per_tile=500, max_depth=8, slender_ratio=5.0
+    ):
+        """Write the objects as an octree of spatial tiles with decimated levels of detail, so that clients can stream
+        only the visible tiles at the required detail level. See ada.visualize.tiling.write_tiles"""
+        from .tiling import write_tiles
+
+        return write_tiles(self, dest_dir, cell_sizes, max_objects_per_tile, max_depth, slender_ratio)
+
     def to_custom_json(self, dest_path=None, auto_zip=False):
         output = {
             "name": self.name,
@@ -477,6 +437,7 @@ class ObjectMesh:
         )
 
     def to_trimesh(self) -> list[trimesh.Trimesh]:
+        import trimesh
         from trimesh.visual.material import PBRMaterial
 
         indices_shape = get_shape(self.faces)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+import numpy as np
+
+from ada.fem.shapes.definitions import ShellShapes, SolidShapes
+from ada.fem.shapes.lines import line_edges
+
+if TYPE_CHECKING:
+    import meshio
+
+    from ada import FEM
+
+# The corner nodes of each face of the element, ordered counter-clockwise when seen from outside the element.
+# Quadratic elements are represented by the faces of their corner nodes.
+_HEX_FACES = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (0, 4, 7, 3)]
+_TETRA_FACES = [(0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3)]
+_WEDGE_FACES = [(0, 2, 1), (3, 4, 5), (0, 1, 4, 3), (1, 2, 5, 4), (0, 3, 5, 2)]
+_PYRAMID_FACES = [(0, 3, 2, 1), (0, 1, 4), (1, 2, 4), (2, 3, 4), (3, 0, 4)]
+
+solid_skin_faces = {
+    SolidShapes.HEX8: _HEX_FACES,
+    SolidShapes.HEX20: _HEX_FACES,
+    SolidShapes.HEX27: _HEX_FACES,
+    SolidShapes.TETRA: _TETRA_FACES,
+    SolidShapes.TETRA10: _TETRA_FACES,
+    SolidShapes.WEDGE: _WEDGE_FACES,
+    SolidShapes.WEDGE15: _WEDGE_FACES,
+    SolidShapes.PYRAMID5: _PYRAMID_FACES,
+    SolidShapes.PYRAMID13: _PYRAMID_FACES,
+}
+
+shell_skin_faces = {
+    ShellShapes.TRI: [(0, 1, 2)],
+    ShellShapes.TRI6: [(0, 1, 2)],
+    ShellShapes.TRI7: [(0, 1, 2)],
+    ShellShapes.QUAD: [(0, 1, 2, 3)],
+    ShellShapes.QUAD8: [(0, 1, 2, 3)],
+    ShellShapes.QUAD9: [(0, 1, 2, 3)],
+}
+
+
+def get_skin(cells: Iterable[Tuple[str, np.ndarray]], remove_interior=True) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the triangles and edges of the visible skin of a mesh.
+
+    Faces shared by two solid elements are interior and are removed. Shell faces are always kept. The edges are the
+    edges of the remaining faces and the line elements, without the diagonals of triangulated quads.
+
+    :param cells: (element type, node indices) for each element type. The node indices are of shape (num_elem, nodes)
+    :param remove_interior: Remove the faces shared by two solid elements
+    :return: Triangles of shape (n, 3) and edges of shape (m, 2) as node indices
+    """
+    polygons = {3: [], 4: []}
+    is_solid = {3: [], 4: []}
+    edges = []
+    for el_type, conn in cells:
+        el_type = el_type.upper()
+        conn = np.asarray(conn, dtype=np.int64)
+        if len(conn) == 0:
+            continue
+        conn = conn.reshape(len(conn), -1)
+
+        if el_type in line_edges:
+            edges += [conn[:, edge] for edge in line_edges[el_type]]
+            continue
+
+        solid_faces = solid_skin_faces.get(el_type, None)
+        face_table = solid_faces if solid_faces is not None else shell_skin_faces.get(el_type, [])
+        for face in face_table:
+            polygons[len(face)].append(conn[:, face])
+            is_solid[len(face)].append(np.full(len(conn), solid_faces is not None))
+
+    tris = np.concatenate(polygons[3]) if len(polygons[3]) > 0 else np.empty((0, 3), dtype=np.int64)
+    quads = np.concatenate(polygons[4]) if len(polygons[4]) > 0 else np.empty((0, 4), dtype=np.int64)
+    if remove_interior:
+        tris_solid = np.concatenate(is_solid[3]) if len(is_solid[3]) > 0 else np.empty(0, dtype=bool)
+        quads_solid = np.concatenate(is_solid[4]) if len(is_solid[4]) > 0 else np.empty(0, dtype=bool)
+        tris_keep, quads_keep = _get_exterior_faces(tris, quads, tris_solid, quads_solid)
+        tris, quads = tris[tris_keep], quads[quads_keep]
+
+    faces = np.concatenate([tris, quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+    edges += [tris[:, edge] for edge in [(0, 1), (1, 2), (2, 0)]]
+    edges += [quads[:, edge] for edge in [(0, 1), (1, 2), (2, 3), (3, 0)]]
+    edges = np.sort(np.concatenate(edges), axis=1) if len(edges) > 0 else np.empty((0, 2), dtype=np.int64)
+
+    return faces, _unique_pairs(edges)
+
+
+def _get_exterior_faces(tris, quads, tris_solid, quads_solid) -> Tuple[np.ndarray, np.ndarray]:
+    """Mark the solid faces whose sorted node indices occur only once.
+
+    Each face key of four sorted node indices (triangles padded with -1) is packed into two uint64 words, so that
+    equal faces end up next to each other after a single lexsort."""
+    keys = np.full((len(tris) + len(quads), 4), -1, dtype=np.int64)
+    keys[: len(tris), 1:] = np.sort(tris, axis=1)
+    keys[len(tris) :] = np.sort(quads, axis=1)
+    is_solid = np.concatenate([tris_solid, quads_solid])
+
+    keep = np.ones(len(keys), dtype=bool)
+    solid_keys = keys[is_solid]
+    if len(solid_keys) > 0:
+        hi, lo = _pack_pairs(solid_keys[:, :2] + 1), _pack_pairs(solid_keys[:, 2:] + 1)
+        order = np.lexsort((lo, hi))
+        hi, lo = hi[order], lo[order]
+        same_as_next = (hi[1:] == hi[:-1]) & (lo[1:] == lo[:-1])
+        is_shared = np.zeros(len(order), dtype=bool)
+        is_shared[:-1] |= same_as_next
+        is_shared[1:] |= same_as_next
+        solid_keep = np.empty(len(order), dtype=bool)
+        solid_keep[order] = ~is_shared
+        keep[is_solid] = solid_keep
+
+    return keep[: len(tris)], keep[len(tris) :]
+
+
+def _pack_pairs(pairs: np.ndarray) -> np.ndarray:
+    """Pack pairs of non-negative integers below 2**32 into single uint64 values"""
+    pairs = pairs.astype(np.uint64)
+    return (pairs[:, 0] << np.uint64(32)) | pairs[:, 1]
+
+
+def _unique_pairs(pairs: np.ndarray) -> np.ndarray:
+    if len(pairs) == 0:
+        return pairs
+    _, index = np.unique(_pack_pairs(pairs), return_index=True)
+    return pairs[np.sort(index)]
+
+
+def get_node_indices(all_node_ids: np.ndarray, node_ids: np.ndarray) -> np.ndarray:
+    """Map node ids to their positions in all_node_ids. Works for any numbering, including gaps and unsorted ids"""
+    all_node_ids = np.asarray(all_node_ids, dtype=np.int64)
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    order = np.argsort(all_node_ids, kind="stable")
+    sorted_ids = all_node_ids[order]
+    pos = np.searchsorted(sorted_ids, node_ids).clip(max=max(len(sorted_ids) - 1, 0))
+    if len(sorted_ids) == 0 or np.any(sorted_ids[pos] != node_ids):
+        raise KeyError("One or more element nodes are not part of the node container")
+    return order[pos]
+
+
+def get_fem_cells(fem: FEM) -> Tuple[np.ndarray, List[Tuple[str, np.ndarray]]]:
+    """Get the node coordinates and the connectivity of each element type as indices into the coordinates"""
+    nodes = fem.nodes.to_np_array(include_id=True)
+    node_ids, coords = nodes[:, 0].astype(np.int64), nodes[:, 1:]
+
+    cells = []
+    for el_type, elements in fem.elements.group_by_type():
+        el_node_ids = [[n.id for n in el.nodes] for el in elements]
+        if len(el_node_ids) == 0:
+            continue
+        cells.append((el_type, get_node_indices(node_ids, np.array(el_node_ids, dtype=np.int64))))
+
+    return coords, cells
+
+
+def get_meshio_cells(mesh: meshio.Mesh) -> List[Tuple[str, np.ndarray]]:
+    """Get the connectivity of each cell block of a meshio mesh using the ada element types"""
+    from ada.fem.formats.mesh_io.common import meshio_to_ada
+
+    return [(meshio_to_ada[block.type], block.data) for block in mesh.cells if block.type in meshio_to_ada]
+
+
+def get_fem_skin(fem: FEM, remove_interior=True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the vertices, triangles and edges of the visible skin of the FEM mesh"""
+    coords, cells = get_fem_cells(fem)
+    faces, edges = get_skin(cells, remove_interior)
+    return coords, faces, edges
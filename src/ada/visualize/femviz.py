@@ -8,10 +8,9 @@ import numpy as np
 from pythreejs import Group
 
 from ada.fem import FEM
-from ada.fem.shapes import ElemShape
 
+from .fem_skin import get_fem_skin, get_meshio_cells, get_skin
 from .threejs_utils import edges_to_mesh, faces_to_mesh, vertices_to_mesh
-from .utils import get_edges_from_fem, get_faces_from_fem, get_vertices_from_fem
 
 
 @dataclass
@@ -31,7 +30,8 @@ class BBox:
 def fem_to_mesh(
     fem: FEM, face_colors=None, vertex_colors=(8, 8, 8), edge_color=(8, 8, 8), edge_width=1, vertex_width=1
 ):
-    vertices, faces, edges = get_vertices_from_fem(fem), get_faces_from_fem(fem), get_edges_from_fem(fem)
+    vertices, faces, edges = get_fem_skin(fem)
+    vertices, faces, edges = vertices.astype("float32"), faces.astype("uint32"), edges.astype("uint32")
 
     name = fem.name
 
@@ -51,7 +51,8 @@ class FemRenderer:
         self._displayed_pickable_objects = Group()
 
     def add_fem(self, fem: FEM):
-        vertices, faces, edges = get_vertices_from_fem(fem), get_faces_from_fem(fem), get_edges_from_fem(fem)
+        vertices, faces, edges = get_fem_skin(fem)
+        vertices, faces, edges = vertices.astype("float32"), faces.astype("uint32"), edges.astype("uint32")
         self._view_items.append(ViewItem(fem, vertices, edges, faces))
 
     def to_mesh(self):
@@ -86,18 +87,7 @@ class FemRenderer:
 
 
 def get_edges_and_faces_from_meshio(mesh: meshio.Mesh):
-    from ada.fem.formats.mesh_io.common import meshio_to_ada
-
-    edges = []
-    faces = []
-    for cell_block in mesh.cells:
-        el_type = meshio_to_ada[cell_block.type]
-        for elem in cell_block.data:
-            elem_shape = ElemShape(el_type, elem)
-            edges += elem_shape.edges
-            if elem_shape.type in elem_shape.TYPES.lines.all:
-                continue
-            faces += elem_shape.faces
+    faces, edges = get_skin(get_meshio_cells(mesh))
     return edges, faces
 
 
@@ -15,7 +15,6 @@ from ada.occ.exceptions.geom_creation import (
 )
 from ada.visualize.concept import ObjectMesh
 from ada.visualize.config import ExportConfig
-from ada.visualize.renderer_occ import occ_shape_to_faces
 
 if TYPE_CHECKING:
     from ada import Beam, PipeSegElbow, PipeSegStraight, Plate, Shape, Wall
@@ -129,6 +128,8 @@ def occ_geom_to_poly_mesh(
     opt_func: Callable = None,
     geom_repr: GeomRepr = GeomRepr.SOLID,
 ) -> ObjectMesh:
+    from ada.visualize.renderer_occ import occ_shape_to_faces
+
     if geom_repr == GeomRepr.SOLID:
         geom = obj.solid
     elif geom_repr == GeomRepr.SHELL:
@@ -1,36 +1,389 @@
-from typing import TYPE_CHECKING
+from __future__ import annotations
 
-import numpy as np
+import json
+import os
+import pathlib
+import struct
+from typing import TYPE_CHECKING, Iterable, List
 
-from ada.visualize.renderer_occ import occ_shape_to_faces
+import numpy as np
 
 if TYPE_CHECKING:
-    from ada import Assembly
-
-
-def to_gltf(assembly: "Assembly", output_file_path):
-    quality = 1.0
-    render_edges = False
-    parallel = True
-
-    for p in assembly.parts.values():
-        vertices = None
-        normals = None
-        indices = None
-        id_map = dict()
-        for obj in p.get_all_physical_objects():
-            geom = obj.solid
-            np_vertices, np_faces, np_normals, _ = occ_shape_to_faces(geom, quality, render_edges, parallel)
-            if vertices is None:
-                vertices = np_vertices
-                normals = np_normals
-                indices = np_faces
-                id_map[obj.guid] = (int(indices[0]), int(indices[-1]))
-            else:
-                vertices = np.concatenate([vertices, np_vertices])
-                normals = np.concatenate([normals, np_normals])
-                adjusted_indices = np_faces + len(indices)
-                indices = np.concatenate([indices, adjusted_indices])
-                id_map[obj.guid] = (int(adjusted_indices[0]), int(adjusted_indices[-1]))
-
-    raise NotImplementedError("Export to GLTF is not yet supported")
+    from ada import Part
+    from ada.visualize.concept import ObjectMesh, VisMesh
+
+GLB_MAGIC = 0x46546C67
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+FLOAT = 5126
+UNSIGNED_INT = 5125
+
+EXT_INSTANCING = "EXT_mesh_gpu_instancing"
+
+# Rotates the Z-up model coordinates into the Y-up coordinate system of glTF
+Z_UP_TO_Y_UP = [-0.70710678, 0.0, 0.0, 0.70710678]
+
+# The coordinates in the HDF5 mesh cache are in millimetres
+CACHE_SCALE = 1e-3
+
+
+def to_gltf(part: Part, output_file_path, merge_by_color=False, **kwargs):
+    """Tessellate the part and write it to a binary glTF (.glb) file. Keyword arguments are passed on to
+    Part.to_vis_mesh"""
+    vis_mesh = part.to_vis_mesh(merge_by_color=False, **kwargs)
+    vis_mesh.to_gltf(output_file_path, merge_by_color=merge_by_color)
+
+
+class GlbWriter:
+    """Writes meshes to a binary glTF (.glb) file.
+
+    The arrays of each buffer view are collected and concatenated once when the file is written. Vertex positions and
+    normals are interleaved in a single vertex buffer view. Nodes with more than one transformation matrix are written
+    with the EXT_mesh_gpu_instancing extension, so that the mesh is only stored once."""
+
+    def __init__(self, generator="ada-py"):
+        self.generator = generator
+        self.accessors: List[dict] = []
+        self.meshes: List[dict] = []
+        self.materials: List[dict] = []
+        self.nodes: List[dict] = [dict(name="root", rotation=Z_UP_TO_Y_UP, children=[])]
+        self.extensions_used = set()
+        self._views = dict(
+            vertex=dict(arrays=[], size=0, stride=24, target=ARRAY_BUFFER),
+            position=dict(arrays=[], size=0, stride=12, target=ARRAY_BUFFER),
+            index=dict(arrays=[], size=0, stride=None, target=ELEMENT_ARRAY_BUFFER),
+            instance=dict(arrays=[], size=0, stride=None, target=None),
+        )
+        self._material_map = dict()
+
+    def add_material(self, color) -> int | None:
+        """Add a material from an RGBA colour and return its index. Colours with values above 1 are assumed to be in
+        the range 0-255. Identical colours share the same material"""
+        if color is None:
+            return None
+
+        rgba = [float(x) for x in color]
+        if len(rgba) == 3:
+            rgba.append(1.0)
+        if max(rgba[:3]) > 1.0:
+            rgba[:3] = [x / 255 for x in rgba[:3]]
+
+        key = tuple(rgba)
+        index = self._material_map.get(key, None)
+        if index is not None:
+            return index
+
+        material = dict(
+            pbrMetallicRoughness=dict(baseColorFactor=rgba, metallicFactor=0.0, roughnessFactor=1.0),
+            doubleSided=True,
+        )
+        if rgba[3] < 1.0:
+            material["alphaMode"] = "BLEND"
+
+        index = len(self.materials)
+        self.materials.append(material)
+        self._material_map[key] = index
+        return index
+
+    def add_mesh(self, name: str, position: np.ndarray, indices: np.ndarray, normal=None, color=None) -> int | None:
+        """Add a triangle mesh and return its index. Returns None if the mesh has no triangles"""
+        position = np.ascontiguousarray(position, dtype=np.float32).reshape(-1, 3)
+        indices = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+        if len(indices) < 3 or len(position) == 0:
+            return None
+
+        if normal is not None:
+            normal = np.asarray(normal, dtype=np.float32).reshape(-1, 3)
+            if normal.shape != position.shape:
+                normal = None
+
+        attributes = dict()
+        if normal is None:
+            attributes["POSITION"] = self._add_accessor("position", position, "VEC3", FLOAT, with_bounds=True)
+        else:
+            vertices = np.hstack([position, normal])
+            offset = self._add_view_data("vertex", vertices)
+            attributes["POSITION"] = self._add_accessor_at("vertex", offset, position, "VEC3", FLOAT, True)
+            attributes["NORMAL"] = self._add_accessor_at("vertex", offset + 12, normal, "VEC3", FLOAT)
+
+        primitive = dict(attributes=attributes, indices=self._add_accessor("index", indices, "SCALAR", UNSIGNED_INT))
+        material = self.add_material(color)
+        if material is not None:
+            primitive["material"] = material
+
+        self.meshes.append(dict(name=name, primitives=[primitive]))
+        return len(self.meshes) - 1
+
+    def add_node(self, name: str, mesh: int = None, matrices: np.ndarray = None, parent: int = 0) -> int:
+        """Add a node and return its index. If more than one (4, 4) transformation matrix is given the mesh is drawn
+        once per matrix using the EXT_mesh_gpu_instancing extension"""
+        node = dict(name=name)
+        if mesh is not None:
+            node["mesh"] = mesh
+
+        if matrices is not None:
+            matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+            if len(matrices) == 1:
+                node["matrix"] = matrices[0].T.flatten().tolist()
+            elif len(matrices) > 1:
+                translation, rotation, scale = matrices_to_trs(matrices)
+                attributes = dict(
+                    TRANSLATION=self._add_accessor("instance", translation, "VEC3", FLOAT),
+                    ROTATION=self._add_accessor("instance", rotation, "VEC4", FLOAT),
+                    SCALE=self._add_accessor("instance", scale, "VEC3", FLOAT),
+                )
+                node["extensions"] = {EXT_INSTANCING: dict(attributes=attributes)}
+                self.extensions_used.add(EXT_INSTANCING)
+
+        index = len(self.nodes)
+        self.nodes.append(node)
+        self.nodes[parent].setdefault("children", []).append(index)
+        return index
+
+    def add_object_mesh(self, obj_mesh: ObjectMesh, parent: int = 0) -> int | None:
+        mesh = self.add_mesh(obj_mesh.guid, obj_mesh.position, obj_mesh.faces, obj_mesh.normal, obj_mesh.color)
+        if mesh is None:
+            return None
+
+        matrices = instances_to_matrices(obj_mesh.instances) if obj_mesh.instances else None
+        return self.add_node(obj_mesh.guid, mesh, matrices, parent)
+
+    def to_json(self) -> dict:
+        buffer_views = []
+        view_map = dict()
+        offset = 0
+        for name, view in self._views.items():
+            if view["size"] == 0:
+                continue
+            buffer_view = dict(buffer=0, byteOffset=offset, byteLength=view["size"])
+            if view["stride"] is not None:
+                buffer_view["byteStride"] = view["stride"]
+            if view["target"] is not None:
+                buffer_view["target"] = view["target"]
+            view_map[name] = len(buffer_views)
+            buffer_views.append(buffer_view)
+            offset += view["size"]
+
+        accessors = [dict(acc, bufferView=view_map[acc["bufferView"]]) for acc in self.accessors]
+        gltf = dict(
+            asset=dict(version="2.0", generator=self.generator),
+            scene=0,
+            scenes=[dict(nodes=[0])],
+            nodes=self.nodes,
+            meshes=self.meshes,
+            accessors=accessors,
+            bufferViews=buffer_views,
+            buffers=[dict(byteLength=offset)],
+        )
+        if len(self.materials) > 0:
+            gltf["materials"] = self.materials
+        if len(self.extensions_used) > 0:
+            gltf["extensionsUsed"] = sorted(self.extensions_used)
+
+        return gltf
+
+    def write(self, dest_file):
+        dest_file = pathlib.Path(dest_file)
+        os.makedirs(dest_file.parent, exist_ok=True)
+
+        json_chunk = json.dumps(self.to_json(), separators=(",", ":")).encode("utf-8")
+        json_chunk += b" " * (-len(json_chunk) % 4)
+        bin_size = sum(view["size"] for view in self._views.values())
+        total_size = 12 + 8 + len(json_chunk) + 8 + bin_size
+
+        with open(dest_file, "wb") as f:
+            f.write(struct.pack("<III", GLB_MAGIC, GLB_VERSION, total_size))
+            f.write(struct.pack("<II", len(json_chunk), CHUNK_JSON))
+            f.write(json_chunk)
+            f.write(struct.pack("<II", bin_size, CHUNK_BIN))
+            for view in self._views.values():
+                for arr in view["arrays"]:
+                    f.write(arr.tobytes())
+
+    def _add_view_data(self, view_name: str, data: np.ndarray) -> int:
+        """Append the data to the buffer view, padded to 4 bytes, and return its byte offset within the view"""
+        view = self._views[view_name]
+        offset = view["size"]
+        data = np.ascontiguousarray(data)
+        view["arrays"].append(data)
+        view["size"] += data.nbytes
+        padding = -data.nbytes % 4
+        if padding > 0:
+            view["arrays"].append(np.zeros(padding, dtype=np.uint8))
+            view["size"] += padding
+        return offset
+
+    def _add_accessor(self, view_name, data: np.ndarray, acc_type, component_type, with_bounds=False) -> int:
+        dtype = np.float32 if component_type == FLOAT else np.uint32
+        data = np.asarray(data, dtype=dtype)
+        offset = self._add_view_data(view_name, data)
+        return self._add_accessor_at(view_name, offset, data, acc_type, component_type, with_bounds)
+
+    def _add_accessor_at(self, view_name, offset, data: np.ndarray, acc_type, component_type, with_bounds=False):
+        accessor = dict(
+            bufferView=view_name,
+            byteOffset=int(offset),
+            componentType=component_type,
+            count=len(data),
+            type=acc_type,
+        )
+        if with_bounds:
+            accessor["min"] = data.min(axis=0).astype(float).tolist()
+            accessor["max"] = data.max(axis=0).astype(float).tolist()
+
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+
+def vis_mesh_to_glb(vis_mesh: VisMesh, dest_file, merge_by_color=False, only_these_guids: Iterable[str] = None):
+    """Write the part meshes of the visual mesh to a binary glTF file.
+
+    If merge_by_color is True all objects of the same colour within a part are merged into a single mesh, giving one
+    draw call per colour. Objects with instances are not merged so that they can be drawn using GPU instancing."""
+    from ada.visualize.utils import merge_mesh_objects, organize_by_colour
+
+    only_these_guids = set(only_these_guids) if only_these_guids is not None else None
+
+    writer = GlbWriter()
+    for part_mesh in vis_mesh.world:
+        part_node = writer.add_node(part_mesh.name)
+        objects = [
+            obj
+            for key, obj in part_mesh.id_map.items()
+            if only_these_guids is None or key in only_these_guids or obj.guid in only_these_guids
+        ]
+        if merge_by_color:
+            instanced = [obj for obj in objects if obj.instances]
+            for elements in organize_by_colour(obj for obj in objects if not obj.instances).values():
+                writer.add_object_mesh(merge_mesh_objects(elements), part_node)
+            objects = instanced
+
+        for obj in objects:
+            writer.add_object_mesh(obj, part_node)
+
+    writer.write(dest_file)
+
+
+def h5_cache_to_glb(vis_mesh: VisMesh, h5, dest_file, merge_by_color=False, only_these_guids: Iterable[str] = None):
+    """Write the meshes stored in the HDF5 mesh cache of the visual mesh to a binary glTF file. The arrays are read
+    from the cache directly into the buffers of the writer and scaled from millimetres to metres.
+
+    Cached meshes with a MATRIX attribute are placed by their transformation matrices, using GPU instancing when there
+    is more than one. These meshes are not merged when merge_by_color is True."""
+    only_these_guids = set(only_these_guids) if only_these_guids is not None else None
+    guids = [vn.guid for vn in vis_mesh.meshes.values() if only_these_guids is None or vn.guid in only_these_guids]
+
+    writer = GlbWriter()
+    if merge_by_color:
+        for color in vis_mesh.colors.values():
+            merged = [
+                guid
+                for guid in color.used_by
+                if (only_these_guids is None or guid in only_these_guids) and "MATRIX" not in h5[guid].attrs
+            ]
+            if len(merged) == 0:
+                continue
+            obj_mesh = merge_cached_meshes(h5, merged, color.pbrMetallicRoughness.baseColorFactor)
+            mesh = writer.add_mesh(color.name, obj_mesh.position * CACHE_SCALE, obj_mesh.faces, color=obj_mesh.color)
+            if mesh is not None:
+                writer.add_node(color.name, mesh)
+        guids = [guid for guid in guids if "MATRIX" in h5[guid].attrs]
+
+    for guid in guids:
+        obj_group = h5[guid]
+        color = vis_mesh.colors[obj_group.attrs["COLOR"]]
+        normal = obj_group["NORMAL"][()] if obj_group["NORMAL"].shape is not None else None
+        mesh = writer.add_mesh(
+            guid,
+            obj_group["POSITION"][()] * CACHE_SCALE,
+            obj_group["INDEX"][()],
+            normal,
+            color.pbrMetallicRoughness.baseColorFactor,
+        )
+        if mesh is None:
+            continue
+
+        matrix = obj_group.attrs.get("MATRIX", None)
+        writer.add_node(guid, mesh, cached_matrices(matrix) if matrix is not None else None)
+
+    writer.write(dest_file)
+
+
+def merge_cached_meshes(h5, guids: List[str], color) -> ObjectMesh:
+    """Read the cached meshes of the guids and merge them into a single mesh"""
+    from ada.visualize.concept import ObjectMesh
+    from ada.visualize.utils import merge_mesh_objects
+
+    objects = []
+    for guid in guids:
+        obj_group = h5[guid]
+        index = obj_group["INDEX"][()].reshape(-1)
+        objects.append(ObjectMesh(guid, index, obj_group["POSITION"][()].reshape(-1, 3), None, color))
+
+    return merge_mesh_objects(objects)
+
+
+def instances_to_matrices(instances) -> np.ndarray:
+    """Convert the instance rows [guid, x, y, z, r11, r12, ..., r33] of an object mesh to (k, 4, 4) transformation
+    matrices. The rows of each rotation matrix are the local axes of the instance. Arrays of (k, 4, 4) matrices are
+    returned unchanged"""
+    if isinstance(instances, np.ndarray) and instances.ndim == 3:
+        return instances
+
+    rows = np.array([row[1:] for row in instances], dtype=np.float64).reshape(-1, 12)
+    matrices = np.zeros((len(rows), 4, 4))
+    matrices[:, :3, :3] = rows[:, 3:].reshape(-1, 3, 3).transpose(0, 2, 1)
+    matrices[:, :3, 3] = rows[:, :3]
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def cached_matrices(matrix) -> np.ndarray:
+    """Convert the MATRIX attribute of a cached mesh, one (4, 4) or (k, 4, 4) transformation matrices with
+    translations in millimetres, to (k, 4, 4) matrices with translations in metres"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.size % 16 != 0:
+        raise ValueError(f"Cached MATRIX of shape {matrix.shape} is not made up of (4, 4) transformation matrices")
+
+    matrices = matrix.reshape(-1, 4, 4).copy()
+    matrices[:, :3, 3] *= CACHE_SCALE
+    return matrices
+
+
+def matrices_to_trs(matrices: np.ndarray):
+    """Decompose (k, 4, 4) transformation matrices into translations, rotation quaternions [x, y, z, w] and scales"""
+    translation = matrices[:, :3, 3]
+    scale = np.linalg.norm(matrices[:, :3, :3], axis=1)
+    rot = matrices[:, :3, :3] / np.where(scale == 0.0, 1.0, scale)[:, None, :]
+
+    m00, m01, m02 = rot[:, 0, 0], rot[:, 0, 1], rot[:, 0, 2]
+    m10, m11, m12 = rot[:, 1, 0], rot[:, 1, 1], rot[:, 1, 2]
+    m20, m21, m22 = rot[:, 2, 0], rot[:, 2, 1], rot[:, 2, 2]
+    trace = m00 + m11 + m22
+
+    # Pick the numerically most stable of the four branches of the conversion for each matrix
+    cases = np.argmax(np.stack([trace, m00, m11, m22], axis=1), axis=1)
+    quat = np.zeros((len(matrices), 4))
+
+    i = cases == 0
+    s = np.sqrt(np.maximum(trace[i] + 1.0, 0.0)) * 2
+    quat[i] = np.stack([(m21[i] - m12[i]) / s, (m02[i] - m20[i]) / s, (m10[i] - m01[i]) / s, 0.25 * s], axis=1)
+
+    i = cases == 1
+    s = np.sqrt(np.maximum(1.0 + m00[i] - m11[i] - m22[i], 0.0)) * 2
+    quat[i] = np.stack([0.25 * s, (m01[i] + m10[i]) / s, (m02[i] + m20[i]) / s, (m21[i] - m12[i]) / s], axis=1)
+
+    i = cases == 2
+    s = np.sqrt(np.maximum(1.0 + m11[i] - m00[i] - m22[i], 0.0)) * 2
+    quat[i] = np.stack([(m01[i] + m10[i]) / s, 0.25 * s, (m12[i] + m21[i]) / s, (m02[i] - m20[i]) / s], axis=1)
+
+    i = cases == 3
+    s = np.sqrt(np.maximum(1.0 + m22[i] - m00[i] - m11[i], 0.0)) * 2
+    quat[i] = np.stack([(m02[i] + m20[i]) / s, (m12[i] + m21[i]) / s, 0.25 * s, (m10[i] - m01[i]) / s], axis=1)
+
+    quat /= np.linalg.norm(quat, axis=1)[:, None]
+    return translation, quat, scale
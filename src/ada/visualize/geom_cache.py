@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import pathlib
+from typing import Iterable
+
+import h5py
+import numpy as np
+
+from .concept import ObjectMesh
+
+
+class GeometryCache:
+    """Persistent HDF5 cache of tessellated object meshes keyed on the object guid and a hash of its geometry.
+
+    The layout follows VisMesh.to_cache(), with the geometry hash stored as an attribute on each object group. An
+    entry is only returned if the stored hash matches, so modified objects are re-tessellated automatically."""
+
+    def __init__(self, cache_file: str | os.PathLike):
+        self.cache_file = pathlib.Path(cache_file)
+        self._h5 = None
+        self._group = None
+
+    def __enter__(self):
+        os.makedirs(self.cache_file.parent, exist_ok=True)
+        self._h5 = h5py.File(self.cache_file, "a")
+        self._group = self._h5.require_group("VISMESH")
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._h5.close()
+        self._h5 = None
+        self._group = None
+
+    def get(self, guid: str, geom_hash: str) -> ObjectMesh | None:
+        obj_group = self._group.get(guid, None)
+        if obj_group is None or obj_group.attrs.get("GEOM_HASH", None) != geom_hash:
+            return None
+
+        normal = obj_group["NORMAL"][()] if "NORMAL" in obj_group else None
+        return ObjectMesh(
+            guid,
+            obj_group["INDEX"][()],
+            obj_group["POSITION"][()],
+            normal,
+            list(obj_group.attrs["COLOR"]),
+            translation=obj_group.attrs["TRANSLATION"],
+        )
+
+    def add(self, obj_mesh: ObjectMesh, geom_hash: str) -> None:
+        if obj_mesh.guid in self._group:
+            del self._group[obj_mesh.guid]
+
+        obj_group = self._group.create_group(obj_mesh.guid)
+        obj_group.attrs.create("GEOM_HASH", geom_hash)
+        obj_group.attrs.create("COLOR", obj_mesh.color)
+        transl = obj_mesh.translation if obj_mesh.translation is not None else np.array([0, 0, 0])
+        obj_group.attrs.create("TRANSLATION", transl)
+        obj_group.create_dataset("POSITION", data=obj_mesh.position)
+        obj_group.create_dataset("INDEX", data=obj_mesh.faces)
+        if obj_mesh.normal is not None:
+            obj_group.create_dataset("NORMAL", data=obj_mesh.normal)
+
+    def remove_unused(self, used_guids: Iterable[str]) -> None:
+        """Delete all entries not in the used guids, e.g. objects which are removed from the model"""
+        used_guids = set(used_guids)
+        for guid in [x for x in self._group.keys() if x not in used_guids]:
+            del self._group[guid]
+
+    def __contains__(self, guid):
+        return guid in self._group
+
+    def __len__(self):
+        return len(self._group)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import logging
+import os
 import pathlib
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Iterator
 
-import ifcopenshell.geom
 import numpy as np
 
-from ada.ifc.utils import create_guid
+from ada.ifc.utils import create_guid, get_geometry_hash
 from ada.visualize.concept import ObjectMesh, PartMesh, VisMesh
 from ada.visualize.config import ExportConfig
 from ada.visualize.formats.assembly_mesh.write_objects_to_mesh import (
@@ -14,9 +15,12 @@ from ada.visualize.formats.assembly_mesh.write_objects_to_mesh import (
     obj_to_mesh,
 )
 from ada.visualize.formats.assembly_mesh.write_part_to_mesh import generate_meta
+from ada.visualize.geom_cache import GeometryCache
 from ada.visualize.utils import from_cache
 
 if TYPE_CHECKING:
+    import ifcopenshell.geom
+
     from ada import Part
 
 
@@ -48,7 +52,7 @@ def part_to_vis_mesh(
             continue
         id_map = dict()
         for obj in obj_list:
-            print(f'Exporting "{obj.name}" [{obj.get_assembly().name}] ({obj_num} of {all_obj_num})')
+            logging.debug(f'Exporting "{obj.name}" [{obj.get_assembly().name}] ({obj_num} of {all_obj_num})')
             cache_file = pathlib.Path(f".cache/{part.name}.h5")
             if export_config.use_cache is True and cache_file.exists():
                 res = from_cache(cache_file, obj.guid)
@@ -97,35 +101,91 @@ def part_to_vis_mesh(
     return amesh
 
 
-def part_to_vis_mesh2(part: Part, auto_sync_ifc_store=True, cpus: int = None):
+def part_to_vis_mesh2(
+    part: Part, auto_sync_ifc_store=True, cpus: int = None, use_cache=False, overwrite_cache=False, cache_file=None
+) -> VisMesh:
+    """Tessellate all physical objects of the part through the IFC geometry iterator.
+
+    If use_cache is True the object meshes are stored in a persistent geometry cache keyed on the object guid and a
+    hash of its IFC geometry, and only new or modified objects are tessellated on subsequent exports."""
     ifc_store = part.get_assembly().ifc_store
     if auto_sync_ifc_store:
         ifc_store.sync()
 
-    settings = ifcopenshell.geom.settings()
-    settings.set(settings.USE_PYTHON_OPENCASCADE, False)
-    settings.set(settings.SEW_SHELLS, False)
-    settings.set(settings.WELD_VERTICES, True)
-    settings.set(settings.INCLUDE_CURVES, False)
-    settings.set(settings.USE_WORLD_COORDS, True)
-    settings.set(settings.VALIDATE_QUANTITIES, False)
-
-    iterator = ifc_store.get_ifc_geom_iterator(settings, cpus=cpus)
-    iterator.initialize()
     id_map = dict()
+    if use_cache:
+        cache_file = pathlib.Path(f".cache/{part.name}_geom.h5") if cache_file is None else pathlib.Path(cache_file)
+        if overwrite_cache and cache_file.exists():
+            os.remove(cache_file)
+
+        with GeometryCache(cache_file) as geom_cache:
+            for obj_mesh in iter_part_obj_meshes(part, cpus, geom_cache):
+                id_map[obj_mesh.guid] = obj_mesh
+    else:
+        for obj_mesh in iter_part_obj_meshes(part, cpus):
+            id_map[obj_mesh.guid] = obj_mesh
+
+    part_mesh = PartMesh(name=part.name, id_map=id_map)
+
+    return VisMesh(part.name, world=[part_mesh])
+
+
+def iter_part_obj_meshes(part: Part, cpus: int = None, geom_cache: GeometryCache = None) -> Iterator[ObjectMesh]:
+    """Yield the object meshes of all physical objects in the part as they are finished.
+
+    Cached meshes with a matching geometry hash are yielded first. The remaining objects are tessellated by the
+    multithreaded IFC geometry iterator and added to the cache as they are finished."""
+    ifc_store = part.get_assembly().ifc_store
+    f = ifc_store.f
+
+    products = [f.by_guid(obj.guid) for obj in part.get_all_physical_objects(pipe_to_segments=True)]
+    geom_hashes = dict()
+    if geom_cache is None:
+        products_to_tessellate = products
+    else:
+        products_to_tessellate = []
+        for product in products:
+            geom_hash = get_geometry_hash(f, product)
+            obj_mesh = geom_cache.get(product.GlobalId, geom_hash)
+            if obj_mesh is None:
+                geom_hashes[product.GlobalId] = geom_hash
+                products_to_tessellate.append(product)
+            else:
+                yield obj_mesh
+
+        geom_cache.remove_unused(product.GlobalId for product in products)
+        logging.debug(f"Reusing {len(products) - len(products_to_tessellate)} cached object meshes")
+
+    if len(products_to_tessellate) == 0:
+        return
+
+    iterator = ifc_store.get_ifc_geom_iterator(get_vis_mesh_settings(), cpus=cpus, products=products_to_tessellate)
+    if iterator.initialize() is False:
+        return
 
     while True:
         shape = iterator.get()
         if shape:
             obj_mesh = product_to_obj_mesh(shape)
-            id_map[shape.guid] = obj_mesh
+            if geom_cache is not None:
+                geom_cache.add(obj_mesh, geom_hashes[shape.guid])
+            yield obj_mesh
 
         if not iterator.next():
             break
 
-    part = PartMesh(name=part.name, id_map=id_map)
 
-    return VisMesh(part.name, world=[part])
+def get_vis_mesh_settings() -> ifcopenshell.geom.settings:
+    import ifcopenshell.geom
+
+    settings = ifcopenshell.geom.settings()
+    settings.set(settings.USE_PYTHON_OPENCASCADE, False)
+    settings.set(settings.SEW_SHELLS, False)
+    settings.set(settings.WELD_VERTICES, True)
+    settings.set(settings.INCLUDE_CURVES, False)
+    settings.set(settings.USE_WORLD_COORDS, True)
+    settings.set(settings.VALIDATE_QUANTITIES, False)
+    return settings
 
 
 def product_to_obj_mesh(shape: ifcopenshell.ifcopenshell_wrapper.TriangulationElement) -> ObjectMesh:
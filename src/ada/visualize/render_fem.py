@@ -2,9 +2,10 @@ import numpy as np
 from IPython.display import display
 from ipywidgets import HBox, VBox
 
-from .femviz import get_faces_from_fem, magnitude
+from .femviz import magnitude
 from .renderer_pythreejs import MyRenderer
 from .threejs_utils import faces_to_mesh
+from .utils import get_faces_from_fem
 
 
 def render_mesh(vertices, faces, colors):
@@ -39,7 +40,7 @@ def viz_meshio_mesh(fem, mesh, data_type):
     """
     u = np.asarray(mesh.point_data[data_type], dtype="float32")
     vertices = np.asarray(mesh.points, dtype="float32")
-    faces = np.asarray(get_faces_from_fem(fem), dtype="uint16").ravel()
+    faces = np.asarray(get_faces_from_fem(fem), dtype="uint32").ravel()
 
     res = [magnitude(u_) for u_ in u]
     max_r = max(res)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import shutil
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .concept import ObjectMesh, VisMesh
+
+# Triangles of a box with corners numbered by the bits (x, y, z) of the corner index
+_BOX_FACES = np.array(
+    [
+        [0, 3, 2], [0, 1, 3], [4, 7, 5], [4, 6, 7], [0, 5, 1], [0, 4, 5],
+        [2, 7, 6], [2, 3, 7], [0, 6, 4], [0, 2, 6], [1, 7, 3], [1, 5, 7],
+    ],
+    dtype=np.int64,
+)  # fmt: skip
+_BOX_CORNERS = np.array([[(i >> 2) & 1, (i >> 1) & 1, i & 1] for i in range(8)], dtype=np.float64)
+
+
+@dataclass
+class Tile:
+    """A node in the octree of spatial tiles. Only the leaf tiles hold objects"""
+
+    tile_id: str
+    bbox: tuple[np.ndarray, np.ndarray]
+    objects: List[ObjectMesh] = field(default_factory=list, repr=False)
+    children: List[Tile] = field(default_factory=list, repr=False)
+
+    def iter_tiles(self):
+        yield self
+        for child in self.children:
+            yield from child.iter_tiles()
+
+
+def decimate_mesh(obj_mesh: ObjectMesh, cell_size: float) -> ObjectMesh | None:
+    """Simplify the mesh by vertex clustering. All vertices within the same cell of a grid with the given cell size
+    are merged into their mean position, and triangles which collapse are removed.
+
+    :return: The decimated mesh without normals, or None if all triangles collapsed
+    """
+    from .concept import ObjectMesh
+
+    position = np.asarray(obj_mesh.position, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(obj_mesh.faces, dtype=np.int64).reshape(-1, 3)
+
+    cells = np.floor((position - position.min(axis=0)) / cell_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    new_position = np.zeros((len(counts), 3))
+    for i in range(3):
+        new_position[:, i] = np.bincount(inverse, weights=position[:, i], minlength=len(counts))
+    new_position /= counts[:, None]
+
+    new_faces = inverse[faces]
+    keep = (
+        (new_faces[:, 0] != new_faces[:, 1])
+        & (new_faces[:, 1] != new_faces[:, 2])
+        & (new_faces[:, 0] != new_faces[:, 2])
+    )
+    new_faces = new_faces[keep]
+    if len(new_faces) == 0:
+        return None
+
+    # Remove duplicate triangles while keeping the winding of the first occurrence
+    sorted_faces = np.sort(new_faces, axis=1)
+    num_vertices = len(counts)
+    face_keys = (sorted_faces[:, 0] * num_vertices + sorted_faces[:, 1]) * num_vertices + sorted_faces[:, 2]
+    _, first = np.unique(face_keys, return_index=True)
+    new_faces = new_faces[np.sort(first)]
+
+    return ObjectMesh(
+        obj_mesh.guid,
+        new_faces.reshape(-1),
+        new_position.astype(np.float32),
+        None,
+        obj_mesh.color,
+        translation=obj_mesh.translation,
+    )
+
+
+def get_oriented_bbox(position: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the bounding box aligned with the principal axes of the vertices.
+
+    :return: The origin (minimum corner), the (3, 3) axes as rows and the extents along the axes
+    """
+    position = np.asarray(position, dtype=np.float64).reshape(-1, 3)
+    centre = position.mean(axis=0)
+    _, _, axes = np.linalg.svd(position - centre, full_matrices=False)
+    if len(axes) < 3:
+        axes = np.eye(3)
+
+    local = (position - centre) @ axes.T
+    local_min = local.min(axis=0)
+    extents = local.max(axis=0) - local_min
+    return centre + local_min @ axes, axes, extents
+
+
+def bbox_proxy(obj_mesh: ObjectMesh) -> ObjectMesh:
+    """Replace the mesh by its oriented bounding box. Used as the coarsest detail level of beams and pipes"""
+    from .concept import ObjectMesh
+
+    origin, axes, extents = get_oriented_bbox(obj_mesh.position)
+    corners = origin + (_BOX_CORNERS * extents) @ axes
+    if np.linalg.det(axes) < 0:
+        faces = _BOX_FACES[:, ::-1]
+    else:
+        faces = _BOX_FACES
+
+    return ObjectMesh(
+        obj_mesh.guid,
+        faces.reshape(-1).copy(),
+        corners.astype(np.float32),
+        None,
+        obj_mesh.color,
+        translation=obj_mesh.translation,
+    )
+
+
+def is_slender(obj_mesh: ObjectMesh, slender_ratio: float) -> bool:
+    _, _, extents = get_oriented_bbox(obj_mesh.position)
+    extents = np.sort(extents)
+    return extents[2] >= slender_ratio * max(extents[1], 1e-12)
+
+
+def expand_instances(obj_mesh: ObjectMesh) -> List[ObjectMesh]:
+    """Get one mesh per instance of the object with the instance transformation applied to its vertices. The first
+    instance is the object itself. Objects without instances are returned as is"""
+    from .concept import ObjectMesh
+    from .formats.gltf.write_gltf import instances_to_matrices
+
+    if obj_mesh.instances is None or len(obj_mesh.instances) == 0:
+        return [obj_mesh]
+
+    matrices = instances_to_matrices(obj_mesh.instances)
+    if isinstance(obj_mesh.instances, np.ndarray) and obj_mesh.instances.ndim == 3:
+        guids = [obj_mesh.guid] + [f"{obj_mesh.guid}_{i}" for i in range(1, len(matrices))]
+    else:
+        guids = [row[0] for row in obj_mesh.instances]
+
+    position = np.asarray(obj_mesh.position, dtype=np.float64).reshape(-1, 3)
+    instances = []
+    for guid, matrix in zip(guids, matrices):
+        instance_position = position @ matrix[:3, :3].T + matrix[:3, 3]
+        instances.append(
+            ObjectMesh(
+                guid,
+                obj_mesh.faces,
+                instance_position.astype(np.float32),
+                None,
+                obj_mesh.color,
+                translation=obj_mesh.translation,
+            )
+        )
+
+    return instances
+
+
+def build_octree(objects: List[ObjectMesh], max_objects_per_tile=500, max_depth=8) -> Tile:
+    """Split the objects into an octree of spatial tiles. Each object is put in the leaf tile containing the centre
+    of its bounding box. Tiles with more than max_objects_per_tile objects are split into eight children until
+    max_depth is reached"""
+    bbox_min = np.array([obj.position.reshape(-1, 3).min(axis=0) for obj in objects]).reshape(-1, 3)
+    bbox_max = np.array([obj.position.reshape(-1, 3).max(axis=0) for obj in objects]).reshape(-1, 3)
+    centres = (bbox_min + bbox_max) / 2
+
+    def split(tile_id, indices: np.ndarray, depth: int) -> Tile:
+        tile = Tile(tile_id, (bbox_min[indices].min(axis=0), bbox_max[indices].max(axis=0)))
+        if len(indices) <= max_objects_per_tile or depth >= max_depth:
+            tile.objects = [objects[i] for i in indices.tolist()]
+            return tile
+
+        tile_centres = centres[indices]
+        mid = (tile_centres.min(axis=0) + tile_centres.max(axis=0)) / 2
+        octants = (tile_centres >= mid).astype(np.int64) @ np.array([4, 2, 1])
+        if np.all(octants == octants[0]):
+            # The object centres coincide, so the tile cannot be split any further
+            tile.objects = [objects[i] for i in indices.tolist()]
+            return tile
+
+        for octant in np.unique(octants).tolist():
+            tile.children.append(split(f"{tile_id}{octant}", indices[octants == octant], depth + 1))
+
+        return tile
+
+    if len(objects) == 0:
+        return Tile("0", (np.zeros(3), np.zeros(3)))
+
+    return split("0", np.arange(len(objects)), 0)
+
+
+def get_lod_meshes(obj_mesh: ObjectMesh, cell_sizes: List[float], slender_ratio: float = None) -> List[ObjectMesh]:
+    """Get the meshes of each detail level of the object. Level 0 is the full mesh and the following levels are
+    decimated with increasing cell sizes. Slender objects (beams and pipes) are represented by their oriented bounding
+    box on the coarsest level, as are objects whose triangles all collapse when decimated"""
+    lod_meshes = [obj_mesh]
+    num_levels = len(cell_sizes)
+    for level, cell_size in enumerate(cell_sizes, start=1):
+        if level == num_levels and slender_ratio is not None and is_slender(obj_mesh, slender_ratio):
+            lod_meshes.append(bbox_proxy(obj_mesh))
+            continue
+
+        decimated = decimate_mesh(obj_mesh, cell_size)
+        lod_meshes.append(decimated if decimated is not None else bbox_proxy(obj_mesh))
+
+    return lod_meshes
+
+
+def write_tiles(
+    vis_mesh: VisMesh,
+    dest_dir,
+    cell_sizes: List[float] = None,
+    max_objects_per_tile=500,
+    max_depth=8,
+    slender_ratio=5.0,
+) -> dict:
+    """Write the visual mesh as an octree of spatial tiles with a binary buffer per tile and detail level, and a
+    manifest.json describing the tiles. Instanced objects are expanded so that each instance is placed in its own
+    tile.
+
+    The buffer of a tile holds one merged mesh per colour as float32 positions followed by uint32 indices. The
+    manifest lists the bounding box and children of each tile, and the byte offsets of the buffers of each mesh.
+
+    :param cell_sizes: The cell sizes used to decimate each detail level after the full resolution level 0. Defaults to
+        1/2000 and 1/250 of the diagonal of the world bounding box
+    :param slender_ratio: Objects whose longest extent is this many times larger than the second longest are
+        represented by their bounding box on the coarsest level. Pass None to always decimate
+    """
+    from .utils import merge_mesh_objects, organize_by_colour
+
+    dest_dir = pathlib.Path(dest_dir)
+    if dest_dir.exists():
+        shutil.rmtree(dest_dir)
+    os.makedirs(dest_dir / "tiles")
+
+    objects = [
+        instance
+        for part_mesh in vis_mesh.world
+        for obj in part_mesh.id_map.values()
+        if len(obj.faces) > 0
+        for instance in expand_instances(obj)
+    ]
+    root = build_octree(objects, max_objects_per_tile, max_depth)
+    if cell_sizes is None:
+        diagonal = float(np.linalg.norm(root.bbox[1] - root.bbox[0]))
+        cell_sizes = [diagonal / 2000, diagonal / 250] if diagonal > 0 else []
+
+    tiles = []
+    for tile in root.iter_tiles():
+        tile_data = dict(
+            id=tile.tile_id,
+            bbox=[tile.bbox[0].tolist(), tile.bbox[1].tolist()],
+            children=[child.tile_id for child in tile.children],
+            lods=[],
+        )
+        tiles.append(tile_data)
+        if len(tile.objects) == 0:
+            continue
+
+        lod_levels = list(zip(*[get_lod_meshes(obj, cell_sizes, slender_ratio) for obj in tile.objects]))
+        for level, lod_meshes in enumerate(lod_levels):
+            file_name = f"tiles/{tile.tile_id}_lod{level}.bin"
+            meshes = []
+            offset = 0
+            with open(dest_dir / file_name, "wb") as f:
+                for colour, elements in organize_by_colour(lod_meshes).items():
+                    merged = merge_mesh_objects(elements)
+                    position = np.ascontiguousarray(merged.position, dtype=np.float32).reshape(-1)
+                    index = np.ascontiguousarray(merged.faces, dtype=np.uint32).reshape(-1)
+                    f.write(position.tobytes())
+                    f.write(index.tobytes())
+                    meshes.append(
+                        dict(
+                            color=list(colour) if colour is not None else None,
+                            position=[offset, int(position.size)],
+                            index=[offset + position.nbytes, int(index.size)],
+                            id_sequence=merged.id_sequence,
+                        )
+                    )
+                    offset += position.nbytes + index.nbytes
+
+            num_polygons = sum(mesh["index"][1] for mesh in meshes) // 3
+            tile_data["lods"].append(dict(level=level, file=file_name, num_polygons=num_polygons, meshes=meshes))
+
+    manifest = dict(
+        name=vis_mesh.name,
+        created=vis_mesh.created,
+        project=vis_mesh.project,
+        meta=vis_mesh.meta,
+        translation=vis_mesh.translation.tolist() if vis_mesh.translation is not None else None,
+        cell_sizes=list(cell_sizes),
+        root=root.tile_id,
+        tiles=tiles,
+    )
+    with open(dest_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f)
+
+    return manifest
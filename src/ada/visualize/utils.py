@@ -1,13 +1,11 @@
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING, Dict, Iterable, List
 
 import numpy as np
 
 from ada import FEM
-from ada.fem.utils import is_line_elem
-
-from .renderer_occ import occ_shape_to_faces
 
 if TYPE_CHECKING:
     from ada.visualize.concept import ObjectMesh
@@ -35,6 +33,8 @@ def from_cache(hdf_file, guid):
 
 
 def convert_obj_to_poly(obj, quality=1.0, render_edges=False, parallel=False):
+    from .renderer_occ import occ_shape_to_faces
+
     geom = obj.solid
     np_vertices, poly_indices, np_normals, _ = occ_shape_to_faces(geom, quality, render_edges, parallel)
     obj_buffer_arrays = np.concatenate([np_vertices, np_normals], 1)
@@ -49,27 +49,23 @@ def convert_obj_to_poly(obj, quality=1.0, render_edges=False, parallel=False):
 
 
 def get_vertices_from_fem(fem: FEM) -> np.ndarray:
-    return np.asarray([n.p for n in fem.nodes.nodes], dtype="float32")
+    return np.asarray(fem.nodes.to_np_array(), dtype="float32")
+
 
+def get_faces_from_fem(fem: FEM) -> np.ndarray:
+    """Triangles of the visible skin of the FEM as indices into get_vertices_from_fem"""
+    from .fem_skin import get_fem_skin
 
-def get_faces_from_fem(fem: FEM):
-    ids = []
-    for el in fem.elements.elements:
-        if is_line_elem(el):
-            continue
-        for f in el.shape.faces:
-            # Convert to indices, not id
-            ids += [[int(e.id - 1) for e in f]]
-    return ids
+    _, faces, _ = get_fem_skin(fem)
+    return faces
 
 
-def get_edges_from_fem(fem: FEM):
-    ids = []
-    for el in fem.elements.elements:
-        for f in el.shape.edges_seq:
-            # Convert to indices, not id
-            ids += [[int(el.nodes[e].id - 1) for e in f]]
-    return ids
+def get_edges_from_fem(fem: FEM) -> np.ndarray:
+    """Edges of the visible skin and line elements of the FEM as indices into get_vertices_from_fem"""
+    from .fem_skin import get_fem_skin
+
+    _, _, edges = get_fem_skin(fem)
+    return edges
 
 
 def organize_by_colour(objects: Iterable[ObjectMesh]) -> Dict[tuple, List[ObjectMesh]]:
@@ -83,18 +79,54 @@ def organize_by_colour(objects: Iterable[ObjectMesh]) -> Dict[tuple, List[Object
 
 
 def merge_mesh_objects(list_of_objects: Iterable[ObjectMesh]) -> ObjectMesh:
+    """Merge the object meshes into a single mesh by concatenating all arrays at once. The id_sequence of the merged
+    mesh maps the guid of each object to the first and last position of its faces in the merged faces array."""
     from ada.ifc.utils import create_guid
 
     from .concept import ObjectMesh
 
+    objects = list(list_of_objects)
     obj_mesh = ObjectMesh(
         create_guid(),
         np.array([], dtype=int),
         np.array([], dtype=float),
         np.array([], dtype=float),
     )
-
-    for obj in list_of_objects:
-        obj_mesh += obj
+    if len(objects) == 0:
+        return obj_mesh
+
+    num_vertices = np.array([obj.position.size // 3 for obj in objects], dtype=np.int64)
+    vertex_offsets = np.zeros_like(num_vertices)
+    np.cumsum(num_vertices[:-1], out=vertex_offsets[1:])
+
+    num_faces = np.array([len(obj.faces) for obj in objects], dtype=np.int64)
+    face_ends = np.cumsum(num_faces)
+
+    faces = [np.asarray(obj.faces) for obj in objects]
+    if any(f.ndim > 1 for f in faces):
+        faces = [f.reshape(-1, 3) for f in faces]
+    obj_mesh.faces = np.concatenate([f + offset for f, offset in zip(faces, vertex_offsets.tolist())])
+
+    positions = [np.asarray(obj.position) for obj in objects]
+    if any(pos.ndim > 1 for pos in positions):
+        positions = [pos.reshape(-1, 3) for pos in positions]
+    obj_mesh.position = np.concatenate(positions)
+
+    if all(obj.normal is not None for obj in objects):
+        obj_mesh.normal = np.concatenate([obj.normal for obj in objects])
+    else:
+        obj_mesh.normal = None
+
+    colours = [obj.color for obj in objects if obj.color is not None]
+    if len(colours) > 0:
+        obj_mesh.color = list(colours[0])
+        if obj_mesh.color[-1] != 1.0 and any(colour[-1] == 1.0 for colour in colours[1:]):
+            logging.warning("Will merge colors with different opacity.")
+            obj_mesh.color[-1] = 1.0
+
+    obj_mesh.translation = next((obj.translation for obj in objects if obj.translation is not None), None)
+    obj_mesh.id_sequence = {
+        obj.guid: (int(end - num), int(end) - 1) for obj, num, end in zip(objects, num_faces, face_ends)
+    }
 
     return obj_mesh
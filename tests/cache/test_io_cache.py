@@ -1,6 +1,33 @@
+import os
 import time
 
-from ada import Assembly, Part
+import h5py
+import numpy as np
+import pytest
+
+from ada import Assembly, Beam, Node, Part, Placement, Wall
+from ada.cache.reader import get_part_from_cache
+from ada.cache.store import CacheStore
+from ada.cache.writer import (
+    add_part_to_cache,
+    get_uncached_fem_data,
+    update_assembly_in_cache,
+)
+from ada.fem import (
+    Amplitude,
+    Bc,
+    Connector,
+    ConnectorSection,
+    Constraint,
+    Elem,
+    FemSection,
+    FemSet,
+    LoadGravity,
+    LoadPoint,
+    Mass,
+    StepEigen,
+    StepImplicit,
+)
 
 
 def cache_validation(a, b):
@@ -12,9 +39,10 @@ def cache_validation(a, b):
     asecs = [sec for p in a.get_all_parts_in_assembly(True) for sec in p.sections]
     assert len(asecs) == len(bsecs)
 
-    bbeams = [bm for p in b.get_all_parts_in_assembly(True) for bm in p.beams]
-    abeams = [bm for p in a.get_all_parts_in_assembly(True) for bm in p.beams]
-    assert len(abeams) == len(bbeams)
+    for attr in ["beams", "plates", "shapes", "pipes", "walls"]:
+        aobjs = [obj for p in a.get_all_parts_in_assembly(True) for obj in getattr(p, attr)]
+        bobjs = [obj for p in b.get_all_parts_in_assembly(True) for obj in getattr(p, attr)]
+        assert len(aobjs) == len(bobjs)
 
     for nA, nB in zip(a.fem.nodes, b.fem.nodes):
         assert nA == nB
@@ -44,3 +72,202 @@ def test_simplestru_fem_cache(bm_ipe300):
     cache_validation(a, b)
 
     print(f"Model generation time reduced from {time1:.2f}s to {time2:.2f}s -> {time1 / time2:.2f} x Improvement")
+
+
+def test_part_fem_cache_roundtrip(test_dir):
+    p = Part("MyPart")
+    bm = p.add_beam(Beam("bm1", (0, 0, 0), (1, 0, 0), "IPE300"))
+    p.add_wall(Wall("wall1", [(0, 0), (5, 0), (5, 5)], 3, 0.15, offset="LEFT"))
+
+    fem = p.fem
+    n1, n2, n3, n4 = [fem.nodes.add(Node(c, i + 1)) for i, c in enumerate([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)])]
+    shell = fem.add_set(FemSet("shell", [fem.add_elem(Elem(1, [n1, n2, n3, n4], "QUAD"))], "elset"))
+    line = fem.add_set(FemSet("line", [fem.add_elem(Elem(2, [n1, n2], "LINE"))], "elset"))
+    fix = fem.add_set(FemSet("fix", [n1, n2], "nset"))
+    rp = fem.add_set(FemSet("rp", [n3], "nset"))
+    fem.add_section(FemSection("sh", "shell", shell, bm.material, thickness=0.01))
+    fem.add_section(FemSection("ln", "line", line, bm.material, section=bm.section, local_y=(0, 1, 0)))
+    fem.add_bc(Bc("bc1", fix, [1, 2, 3], magnitudes=[None, 0.1, None]))
+    fem.add_constraint(Constraint("c1", "coupling", rp, fix, dofs=[1, 2], influence_distance=0.5))
+    fem.add_mass(Mass("m1", [n4], [1.0, 2.0, 3.0], ptype="ANISOTROPIC"))
+
+    cache_file = test_dir / "cache" / "part_fem_cache.h5"
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(cache_file, "w") as f:
+        add_part_to_cache(p, f)
+
+    with h5py.File(cache_file, "r") as f:
+        q = get_part_from_cache(p.name, f[p.name])
+
+    wall = q.walls[0]
+    assert wall.points == p.walls[0].points
+    assert wall.offset == p.walls[0].offset
+
+    qfem = q.fem
+    assert qfem.parent is q
+    assert sorted((s.name, len(s.members)) for s in qfem.sets) == sorted((s.name, len(s.members)) for s in fem.sets)
+    assert {s.name: s.elset.name for s in qfem.sections} == {"sh": "shell", "ln": "line"}
+    assert qfem.sections.name_map["ln"].section.name == "IPE300"
+    assert [el.fem_sec.name for el in qfem.elements.stru_elements] == ["sh", "ln"]
+
+    bc = qfem.bcs[0]
+    assert bc.fem_set.name == "fix"
+    assert bc.dofs == [1, 2, 3]
+    assert bc.magnitudes == [None, 0.1, None]
+
+    con = qfem.constraints["c1"]
+    assert (con.m_set.name, con.s_set.name, con.dofs, con.influence_distance) == ("rp", "fix", [1, 2], 0.5)
+
+    mass = list(qfem.elements.masses)[0]
+    assert mass.mass == [1.0, 2.0, 3.0]
+    assert mass.elset.name == "m1_set"
+
+
+def test_part_fem_steps_cache_roundtrip(test_dir):
+    p = Part("MyPart")
+    fem = p.fem
+    n1, n2, n3 = [fem.nodes.add(Node(c, i + 1)) for i, c in enumerate([(0, 0, 0), (1, 0, 0), (2, 0, 0)])]
+    fem.add_elem(Elem(1, [n1, n2], "LINE"))
+    fix = fem.add_set(FemSet("fix", [n1], "nset"))
+    tip = fem.add_set(FemSet("tip", [n3], "nset"))
+
+    con_sec = ConnectorSection("hinge", elastic_comp=[1e5, 1e5, 1e5], rigid_dofs=[0, 1, 2])
+    fem.add_connector(Connector("con1", 10, n2, n3, "bushing", con_sec))
+
+    step = fem.add_step(StepImplicit("static", nl_geom=True, total_time=1.0, init_incr=0.1, max_incr=0.5))
+    step.add_bc(Bc("step_fix", fix, [1, 2, 3]))
+    step.add_load(LoadGravity("grav", -9.81))
+    step.add_load(LoadPoint("point", 1e3, tip, 3))
+    fem.add_step(StepEigen("eig", 10, use_default_outputs=False))
+
+    assert get_uncached_fem_data(fem) == []
+
+    cache_file = test_dir / "cache" / "part_fem_steps_cache.h5"
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(cache_file, "w") as f:
+        add_part_to_cache(p, f)
+
+    with h5py.File(cache_file, "r") as f:
+        qfem = get_part_from_cache(p.name, f[p.name]).fem
+
+    con = qfem.elements.from_id(10)
+    assert isinstance(con, Connector)
+    assert (con.n1.id, con.n2.id, con.con_type) == (2, 3, "bushing")
+    assert con.con_sec is qfem.connector_sections["hinge"]
+    assert con.con_sec.elastic_comp == [1e5, 1e5, 1e5]
+    assert con.con_sec.rigid_dofs == [0, 1, 2]
+    assert qfem.sets.get_elset_from_name("con1").members == [con]
+
+    assert [(type(s), s.name) for s in qfem.steps] == [(StepImplicit, "static"), (StepEigen, "eig")]
+    qstep, qeig = qfem.steps
+    assert (qstep.nl_geom, qstep.total_time, qstep.init_incr, qstep.max_incr) == (True, 1.0, 0.1, 0.5)
+    assert len(qstep.field_outputs) == len(step.field_outputs)
+    assert qeig.num_eigen_modes == 10
+    assert len(qeig.field_outputs) == 0
+
+    bc = qstep.bcs["step_fix"]
+    assert (bc.parent, bc.fem_set.name, bc.dofs) == (qstep, "fix", [1, 2, 3])
+
+    grav, point = qstep.loads
+    assert isinstance(grav, LoadGravity) and grav.magnitude == -9.81
+    assert isinstance(point, LoadPoint)
+    assert (point.parent, point.fem_set.name, point.magnitude, point.dof) == (qstep, "tip", 1e3, step.loads[1].dof)
+
+
+def test_uncached_fem_data_is_refused(test_dir):
+    p = Part("MyPart")
+    fem = p.fem
+    fix = fem.add_set(FemSet("fix", [fem.nodes.add(Node((0, 0, 0), 1))], "nset"))
+    fem.add_bc(Bc("bc1", fix, [1, 2, 3], amplitude=fem.add_amplitude(Amplitude("amp", [0, 1], [0, 1]))))
+
+    assert get_uncached_fem_data(fem) == ["amplitudes", 'bc "bc1"']
+
+    cache_file = test_dir / "cache" / "part_uncached.h5"
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(cache_file, "w") as f:
+        with pytest.raises(ValueError):
+            add_part_to_cache(p, f)
+
+
+def test_incremental_part_update(test_dir):
+    root = Part("Root")
+    p1 = root.add_part(Part("P1"))
+    p2 = root.add_part(Part("P2"))
+    p1.add_beam(Beam("bm1", (0, 0, 0), (1, 0, 0), "IPE300"))
+    p2.add_beam(Beam("bm2", (0, 0, 1), (1, 0, 1), "IPE300"))
+
+    cache_file = test_dir / "cache" / "incremental_cache.h5"
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    if cache_file.exists():
+        cache_file.unlink()
+
+    assert update_assembly_in_cache(root, cache_file) == [p1, p2]
+    [p.mark_cache_clean() for p in (p1, p2)]
+    assert update_assembly_in_cache(root, cache_file) == []
+
+    p2.add_beam(Beam("bm3", (0, 0, 2), (1, 0, 2), "IPE300"))
+    assert update_assembly_in_cache(root, cache_file) == [p2]
+
+    with h5py.File(cache_file, "r") as f:
+        assert len(f["PARTS/P2/BEAMS_STR"]) == 2
+        assert len(f["PARTS/P1/BEAMS_STR"]) == 1
+
+
+def test_cache_dirty_on_modified_objects():
+    p = Part("MyPart")
+    bm = p.add_beam(Beam("bm1", (0, 0, 0), (1, 0, 0), "IPE300"))
+    wall = p.add_wall(Wall("wall1", [(0, 0), (5, 0), (5, 5)], 3, 0.15, offset="LEFT"))
+    p.mark_cache_clean()
+    assert p.is_cache_dirty is False
+
+    bm.n2 = p.nodes.add(Node((2, 0, 0)))
+    assert p.is_cache_dirty is True
+    p.mark_cache_clean()
+
+    bm.n2.p = np.array([3.0, 0, 0])
+    assert p.is_cache_dirty is False
+    p.mark_cache_dirty()
+    assert p.is_cache_dirty is True
+    p.mark_cache_clean()
+
+    p.beams.remove(bm)
+    p.add_beam(Beam("bm2", (0, 0, 0), (2, 0, 0), "IPE300"))
+    assert p.is_cache_dirty is True
+    p.mark_cache_clean()
+
+    wall.placement = Placement(origin=(0, 0, 1))
+    assert p.is_cache_dirty is True
+    p.mark_cache_clean()
+
+    fix = p.fem.add_set(FemSet("fix", [p.fem.nodes.add(Node((0, 0, 0)))], "nset"))
+    assert p.is_cache_dirty is True
+    p.mark_cache_clean()
+
+    step = p.fem.add_step(StepImplicit("static"))
+    p.mark_cache_clean()
+    step.add_bc(Bc("fix", fix, [1, 2, 3]))
+    assert p.is_cache_dirty is True
+    p.mark_cache_clean()
+    assert p.is_cache_dirty is False
+
+
+def test_cache_store_content_hash(test_dir):
+    cache_dir = test_dir / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    source_file = cache_dir / "my_source.txt"
+    source_file.write_text("Some content")
+
+    store = CacheStore("HashStore")
+    store.state_file = cache_dir / "HashStore.json"
+    store.cache_file = cache_dir / "HashStore.h5"
+    store.cache_file.touch()
+    store._write_file_state(dict(files=dict()))
+    store.to_cache(None, source_file, write_to_cache=False)
+    assert store.is_cache_outdated(source_file) is False
+
+    # Touching the file without changing its content keeps the cache valid
+    os.utime(source_file, (0, 0))
+    assert store.is_cache_outdated(source_file) is False
+
+    source_file.write_text("Other content")
+    assert store.is_cache_outdated(source_file) is True
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from ada.concepts.containers import Nodes
@@ -33,3 +34,35 @@ def test_from_iterables(nodes):
     n = Nodes(g)
 
     assert len(n) == 3
+
+
+def test_from_np_array():
+    n = Nodes(from_np_array=np.array([[3, 1.0, 0.0, 0.0], [1, 0.0, 0.0, 0.0], [2, 0.0, 1.0, 0.0]]))
+
+    assert [node.id for node in n] == [1, 2, 3]
+    assert n.from_ids([[3, 1], [2, 2]]).tolist() == [[n.from_id(3), n.from_id(1)], [n.from_id(2), n.from_id(2)]]
+    with pytest.raises(ValueError):
+        n.from_ids([4])
+
+
+def test_from_np_array_with_duplicates():
+    with pytest.raises(DuplicateNodes):
+        Nodes(from_np_array=np.array([[1, 0.0, 0.0, 0.0], [1, 0.0, 0.0, 0.0]]))
+
+    with pytest.raises(DuplicateNodes):
+        Nodes(from_np_array=np.array([[1, 0.0, 0.0, 0.0], [2, 1.0, 0.0, 0.0], [1, 0.0, 1.0, 0.0]]))
+
+
+def test_renumber_from_map(nodes):
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = nodes
+    n = Nodes([n1, n2, n3])
+
+    n.renumber(renumber_map=np.array([[1, 11], [2, 12], [3, 13]]))
+    assert (n1.id, n2.id, n3.id) == (11, 12, 13)
+    assert n.from_id(12) is n2
+
+    n.renumber(renumber_map={11: 1, 12: 2, 13: 3})
+    assert (n1.id, n2.id, n3.id) == (1, 2, 3)
+
+    with pytest.raises(KeyError):
+        n.renumber(renumber_map={1: 2})
@@ -0,0 +1,48 @@
+from ada import FEM, Node
+from ada.concepts.containers import Nodes
+from ada.fem import Elem
+
+
+def test_merge_coincident_nodes():
+    fem = FEM("MyFEM")
+    n1 = Node((0.0, 0.0, 0.0), 1)
+    n2 = Node((1.0, 0.0, 0.0), 2)
+    n3 = Node((1.0 + 1e-6, 0.0, 0.0), 3)
+    n4 = Node((2.0, 0.0, 0.0), 4)
+    fem.nodes = Nodes([n1, n2, n3, n4], parent=fem)
+    el1 = fem.add_elem(Elem(1, [n1, n2], "LINE"))
+    el2 = fem.add_elem(Elem(2, [n3, n4], "LINE"))
+
+    merge_map = fem.nodes.merge_coincident(update_refs=False, renumber=False)
+    fem.elements.replace_nodes_by_map(merge_map)
+
+    assert merge_map == {3: 2}
+    assert len(fem.nodes) == 3
+    assert el2.nodes == [n2, n4]
+    assert el1 in n2.refs and el2 in n2.refs
+
+
+def test_merge_coincident_nodes_renumbers():
+    fem = FEM("MyFEM")
+    n1 = Node((0.0, 0.0, 0.0), 1)
+    n2 = Node((1.0, 0.0, 0.0), 2)
+    n3 = Node((1.0 + 1e-6, 0.0, 0.0), 3)
+    n4 = Node((2.0, 0.0, 0.0), 4)
+    fem.nodes = Nodes([n1, n2, n3, n4], parent=fem)
+    el1 = fem.add_elem(Elem(1, [n1, n2], "LINE"))
+    el2 = fem.add_elem(Elem(2, [n3, n4], "LINE"))
+
+    assert fem.nodes.merge_coincident() == {3: 2}
+    assert [n.id for n in fem.nodes] == [1, 2, 3]
+    assert fem.nodes.from_id(3) is n4
+    assert sorted(n.id for n in el2.nodes) == [2, 3]
+    assert el1 in n2.refs and el2 in n2.refs
+
+
+def test_get_by_volume_point_after_add(nodes):
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = nodes
+    s = Nodes([n1, n2, n3])
+    s.add(n7)
+
+    assert s.get_by_volume(p=(4.0, 5.0, 1.0)) == [n7]
+    assert s.add(Node((4.0, 5.0, 1.0 + 1e-5))) == n7
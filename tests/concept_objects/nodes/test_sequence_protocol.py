@@ -106,3 +106,26 @@ def test_remove_from_list(nodes):
     s.remove(n7)
 
     assert s == Nodes([n1, n2])
+
+
+def test_add_many_to_list(nodes):
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = nodes
+    s = Nodes([n1, n2, n3])
+
+    n20 = Node((1, 1, 8), 20)
+    n21 = Node((1, 2, 4), 21)
+    n22 = Node((2, 1, 6), 22)
+    s.add_many([n20, n21, n22])
+
+    assert s == Nodes([n2, n20, n1, n21, n22, n3])
+    assert s.from_id(21) == n21
+
+
+def test_remove_many_from_list(nodes):
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = nodes
+    s = Nodes(nodes)
+    s.remove_many([n3, n7, n8])
+
+    assert len(s) == 7
+    assert n7 not in s
+    assert s.max_nid == 7
@@ -0,0 +1,44 @@
+import numpy as np
+
+from ada import Beam, Part, Plate, Section
+from ada.core.clash_check import BoundingVolumeHierarchy, get_beam_clash_candidates
+
+
+def test_bvh_overlapping_pairs():
+    boxes_min = np.array([(0, 0, 0), (0.5, 0.5, 0.5), (2, 2, 2), (2.5, 0, 0), (0.9, 0.9, 0.9)], dtype=float)
+    boxes_max = boxes_min + 1.0
+    bvh = BoundingVolumeHierarchy(boxes_min, boxes_max, leaf_size=1)
+
+    pairs = [tuple(p) for p in bvh.get_overlapping_pairs().tolist()]
+
+    assert pairs == [(0, 1), (0, 4), (1, 4)]
+
+
+def test_bvh_query_volume():
+    boxes_min = np.array([(0, 0, 0), (5, 5, 5), (10, 0, 0)], dtype=float)
+    bvh = BoundingVolumeHierarchy(boxes_min, boxes_min + 1.0, items=["a", "b", "c"])
+
+    assert bvh.query((4, 0, 0), (11, 11, 11)) == ["b", "c"]
+    assert bvh.query((20, 20, 20), (21, 21, 21)) == []
+
+
+def test_beam_clash_candidates_general_section():
+    gensec = Section("gensec", Section.TYPES.GENERAL)
+    bm1 = Beam("bm1", (0, 0, 0), (2, 0, 0), "IPE300")
+    bm2 = Beam("bm2", (1, -1, 0), (1, 0, 0), gensec)
+    bm3 = Beam("bm3", (5, 5, 5), (6, 5, 5), gensec)
+
+    candidates = dict(get_beam_clash_candidates([bm1, bm2, bm3]))
+
+    assert candidates[bm1] == [bm2]
+    assert candidates[bm2] == []
+    assert candidates[bm3] == []
+
+
+def test_plate_clash_check():
+    p = Part("MyPart")
+    pl1 = p.add_plate(Plate("pl1", [(0, 0), (1, 0), (1, 1), (0, 1)], 10e-3))
+    pl2 = p.add_plate(Plate("pl2", [(1, 0), (2, 0), (2, 1), (1, 1)], 10e-3))
+    p.add_plate(Plate("pl3", [(5, 0), (6, 0), (6, 1), (5, 1)], 10e-3))
+
+    assert p.plate_clash_check() == [(pl1, pl2)]
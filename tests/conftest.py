@@ -9,6 +9,24 @@ from ada.visualize.renderer_pythreejs import MyRenderer, SectionRenderer
 is_printed = False
 
 
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmarks", action="store_true", default=False, help="Run the wall-clock benchmarks")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock benchmark which only runs with --run-benchmarks")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="Benchmarks only run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 def dummy_display_func(ada_obj):
     if type(ada_obj) is ada.Section:
         sec_render = SectionRenderer()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from ada.fem.formats.abaqus.read.tokenizer import COMMENT, InpDeck
+
+
+@pytest.fixture
+def inp_with_include(tmp_path):
+    (tmp_path / "bulk").mkdir()
+    (tmp_path / "bulk" / "nodes.inp").write_text("*Node, nset=top\n3, 1., 1., 0.\n4, 0., 1., 0.")
+    (tmp_path / "main.inp").write_text(
+        """*Heading
+** Generated for testing
+*Node
+1, 0., 0., 0.
+2, 1., 0., 0.
+*INCLUDE,INPUT=bulk\\nodes.inp
+*Element, type=S4R, elset=plate
+1, 1, 2,
+3, 4
+"""
+    )
+    return tmp_path / "main.inp"
+
+
+def test_tokenize_with_include(inp_with_include):
+    deck = InpDeck.from_file(inp_with_include)
+
+    assert [b.keyword for b in deck] == ["heading", COMMENT, "node", "node", "element"]
+    assert deck[3].params == dict(nset="top")
+    assert deck[3].data == "3, 1., 1., 0.\n4, 0., 1., 0.\n"
+    assert deck[4].params == dict(type="S4R", elset="plate")
+
+
+def test_numeric_blocks(inp_with_include):
+    deck = InpDeck.from_file(inp_with_include)
+
+    nodes = np.concatenate([b.to_array(float, 4) for b in deck.iter_keyword("node")])
+    assert nodes.shape == (4, 4)
+    assert nodes[:, 0].tolist() == [1, 2, 3, 4]
+
+    elements = deck[4].to_array(int, 5)
+    assert elements.tolist() == [[1, 1, 2, 3, 4]]
+
+    with pytest.raises(ValueError):
+        deck[4].to_array(int, 4)
+
+
+def test_deck_slicing_and_text():
+    bulk_str = """*Part, name=P1
+*Node
+1, 0., 0., 0.
+*End Part
+*Assembly, name=Assembly
+*End Assembly"""
+    deck = InpDeck.from_str(bulk_str)
+
+    assert deck.find("part") == 0
+    assert deck.rfind("end assembly") == 4
+    assert deck.find("step") == -1
+    assert deck.to_str() == bulk_str + "\n"
+
+    part_deck = deck[deck.find("part") + 1 : deck.find("end part")]
+    assert len(part_deck) == 1
+    assert part_deck.to_str(exclude=("node",)) == ""
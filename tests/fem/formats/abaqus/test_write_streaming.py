@@ -0,0 +1,42 @@
+from io import StringIO
+
+import numpy as np
+
+from ada import Node
+from ada.fem import FEM, Elem
+from ada.fem.formats.abaqus.write.write_elements import write_elem, write_element_block
+from ada.fem.formats.abaqus.write.write_nodes import write_nodes
+
+
+def _fem_with_elements() -> FEM:
+    fem = FEM("MyFem")
+    rng = np.random.default_rng(0)
+    nodes = [fem.nodes.add(Node(rng.random(3) * 10 - 5, 40 - i)) for i in range(40)]
+    for i in range(5):
+        fem.elements.add(Elem(i + 1, nodes[i : i + 4], "QUAD"))
+    for i in range(3):
+        fem.elements.add(Elem(10 + i, nodes[i : i + 20], "HEXAHEDRON20"))
+    return fem
+
+
+def test_write_nodes_chunked():
+    fem = _fem_with_elements()
+    full, chunked = StringIO(), StringIO()
+    write_nodes(fem.nodes, full)
+    write_nodes(fem.nodes, chunked, chunk_size=7)
+
+    lines = full.getvalue().splitlines()
+    assert chunked.getvalue() == full.getvalue()
+    assert lines[0] == "*NODE"
+    assert len(lines) == 41
+    assert [int(x.split(",")[0]) for x in lines[1:]] == list(range(1, 41))
+
+
+def test_write_element_block_matches_write_elem():
+    fem = _fem_with_elements()
+    elements = list(fem.elements)
+
+    stream = StringIO()
+    write_element_block(stream, "*ELEMENT, type=MIXED", elements, chunk_size=2)
+    expected = "*ELEMENT, type=MIXED\n" + "".join(write_elem(el, False) + "\n" for el in elements)
+    assert stream.getvalue() == expected
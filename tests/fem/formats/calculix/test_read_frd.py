@@ -0,0 +1,223 @@
+import numpy as np
+import pytest
+
+from ada.fem.formats.calculix.results.read_frd_file import (
+    FrdFieldStore,
+    FrdReader,
+    read_frd_last_step,
+)
+
+NODES = {1: (0.0, 0.0, 0.0), 2: (1.0, 0.0, 0.0), 3: (1.0, 1.0, 0.0), 4: (0.0, 1.0, 0.0), 5: (0.5, 0.5, 1.0)}
+ELEMENTS = [(1, 3, [1, 2, 3, 5]), (2, 9, [1, 2, 3, 4])]
+STEPS = [(1, 0.5), (2, 1.0)]
+
+
+def _disp(step):
+    return {nid: (step * nid * 0.1, -step * 1e-3, step * 2.5e4) for nid in NODES}
+
+
+def _stress(step):
+    return {nid: tuple(step * (nid + i) * 1.5e6 for i in range(6)) for nid in NODES}
+
+
+def _values_ascii(values):
+    line = ""
+    for i in range(0, len(values), 6):
+        if i > 0:
+            line += "\n -2          "
+        line += "".join(f"{v:12.5E}" for v in values[i : i + 6])
+    return line
+
+
+def _write_ascii(frd_file):
+    lines = ["    1C", "    1UUSER"]
+    lines += [f"    2C{len(NODES):30d}{'':37s}1"]
+    lines += [f" -1{nid:10d}" + _values_ascii(xyz) for nid, xyz in NODES.items()]
+    lines += [" -3"]
+    lines += [f"    3C{len(ELEMENTS):30d}{'':37s}1"]
+    for el_id, el_type, nodes in ELEMENTS:
+        lines += [f" -1{el_id:10d}{el_type:5d}{0:5d}{1:5d}", " -2" + "".join(f"{n:10d}" for n in nodes)]
+    lines += [" -3"]
+
+    for step, value in STEPS:
+        for name, comps, data in [
+            ("DISP", ["D1", "D2", "D3", "ALL"], _disp(step)),
+            ("STRESS", list("ABCDEF"), _stress(step)),
+        ]:
+            lines += [f"  100CL{100 + step:5d}{value:12.5E}{len(NODES):12d}{'':20s}{1:2d}{step:5d}{'':10s}{1:2d}"]
+            lines += [f" -4  {name:8s}{len(comps):5d}{1:5d}"]
+            for comp in comps:
+                lines += [f" -5  {comp:8s}{1:5d}{2:5d}{1:5d}{0:5d}{1 if comp == 'ALL' else 0:5d}"]
+            lines += [f" -1{nid:10d}" + _values_ascii(vals) for nid, vals in data.items()]
+            lines += [" -3"]
+    lines += [" 9999"]
+    frd_file.write_text("\n".join(lines) + "\n")
+
+
+def _write_binary(frd_file):
+    with open(frd_file, "wb") as f:
+        f.write(b"    1C\n")
+        f.write(f"    2C{len(NODES):30d}{'':37s}3\n".encode())
+        for nid, xyz in NODES.items():
+            f.write(np.array([nid], dtype="<i4").tobytes() + np.array(xyz, dtype="<f8").tobytes())
+        f.write(f"    3C{len(ELEMENTS):30d}{'':37s}2\n".encode())
+        for el_id, el_type, nodes in ELEMENTS:
+            f.write(np.array([el_id, el_type, 0, 1] + nodes, dtype="<i4").tobytes())
+
+        for step, value in STEPS:
+            for name, comps, data in [("DISP", ["D1", "D2", "D3", "ALL"], _disp(step))]:
+                header = f"  100CL{100 + step:5d}{value:12.5E}{len(NODES):12d}{'':20s}{1:2d}{step:5d}{'':10s}{2:2d}\n"
+                f.write(header.encode())
+                f.write(f" -4  {name:8s}{len(comps):5d}{1:5d}\n".encode())
+                for comp in comps:
+                    f.write(f" -5  {comp:8s}{1:5d}{2:5d}{1:5d}{0:5d}{1 if comp == 'ALL' else 0:5d}\n".encode())
+                for nid, vals in data.items():
+                    f.write(np.array([nid], dtype="<i4").tobytes() + np.array(vals, dtype="<f4").tobytes())
+        f.write(b" 9999\n")
+
+
+@pytest.fixture
+def frd_dir(test_dir):
+    frd_dir = test_dir / "calculix_frd"
+    frd_dir.mkdir(parents=True, exist_ok=True)
+    return frd_dir
+
+
+@pytest.mark.parametrize("writer", [_write_ascii, _write_binary])
+def test_read_frd_mesh(frd_dir, writer):
+    frd_file = frd_dir / f"{writer.__name__}.frd"
+    writer(frd_file)
+    reader = FrdReader(frd_file, chunk_size=2)
+
+    assert reader.node_ids.tolist() == list(NODES.keys())
+    assert np.allclose(reader.coords, list(NODES.values()))
+    assert reader.elements["tetra"][1].tolist() == [[1, 2, 3, 5]]
+    assert reader.elements["quad"][1].tolist() == [[1, 2, 3, 4]]
+
+
+@pytest.mark.parametrize("writer", [_write_ascii, _write_binary])
+def test_read_frd_steps(frd_dir, writer):
+    frd_file = frd_dir / f"{writer.__name__}.frd"
+    writer(frd_file)
+    reader = FrdReader(frd_file, chunk_size=2)
+
+    steps = list(reader.iter_steps())
+    assert [(s.step, s.value) for s in steps] == STEPS
+
+    for frd_step in steps:
+        disp = frd_step.fields["DISP"]
+        assert disp.components == ["D1", "D2", "D3"]
+        assert disp.node_ids.tolist() == list(NODES.keys())
+        assert np.allclose(disp.values, list(_disp(frd_step.step).values()), rtol=1e-5)
+
+    if writer is _write_ascii:
+        stress = steps[-1].fields["STRESS"]
+        assert np.allclose(stress.values, list(_stress(2).values()), rtol=1e-5)
+
+
+def test_read_frd_last_step_to_meshio(frd_dir):
+    frd_file = frd_dir / "last_step.frd"
+    _write_ascii(frd_file)
+
+    mesh = read_frd_last_step(frd_file)
+    assert len(mesh.points) == len(NODES)
+    assert {c.type for c in mesh.cells} == {"tetra", "quad"}
+    assert np.allclose(mesh.point_data["DISP"], list(_disp(2).values()), rtol=1e-5)
+
+
+def test_frd_field_store_index(frd_dir):
+    frd_file = frd_dir / "field_store.frd"
+    _write_binary(frd_file)
+
+    store = FrdFieldStore(frd_file)
+    assert store.steps == [1, 2]
+    assert store.field_names == ["DISP"]
+
+    info = store.get_info("DISP", step=1)
+    assert info.components == ("D1", "D2", "D3")
+    assert info.shape == (len(NODES), 3)
+    assert np.allclose(store.read(info), list(_disp(1).values()), rtol=1e-5)
+
+    # The last step is returned when no step is given
+    assert store.get_info("DISP").step == 2
+
+    with pytest.raises(KeyError):
+        store.get_info("STRESS")
+
+
+@pytest.mark.parametrize("writer", [_write_ascii, _write_binary])
+def test_frd_field_index_skips_mesh(frd_dir, writer):
+    frd_file = frd_dir / f"index_{writer.__name__}.frd"
+    writer(frd_file)
+    reader = FrdReader(frd_file)
+
+    index = reader.get_field_index()
+    assert [(info.name, info.step) for info in index if info.name == "DISP"] == [("DISP", 1), ("DISP", 2)]
+    assert all(info.shape[0] == len(NODES) for info in index)
+    assert reader._node_ids is None and reader._elements is None
+
+    # The mesh is parsed when it is first requested
+    assert reader.elements["quad"][1].tolist() == [[1, 2, 3, 4]]
+    assert np.allclose(reader.read_field(index[0]).values, list(_disp(1).values()), rtol=1e-5)
+
+
+def test_results_get_field(frd_dir):
+    from ada.fem.results import Results
+
+    frd_file = frd_dir / "results_get_field.frd"
+    _write_ascii(frd_file)
+
+    res = Results(frd_file, field_cache_size=2)
+    assert res.steps == [1, 2]
+    assert res.field_names == ["DISP", "STRESS"]
+
+    disp = res.get_field("DISP", step=1)
+    assert disp is res.get_field("DISP", step=1)
+    assert np.allclose(disp, list(_disp(1).values()), rtol=1e-5)
+
+    stress = res.get_field("STRESS", node_ids=[5, 2])
+    assert np.allclose(stress, [_stress(2)[5], _stress(2)[2]], rtol=1e-5)
+
+
+def test_results_open_lazily(frd_dir, monkeypatch):
+    from ada.fem.formats.calculix.results import read_results
+    from ada.fem.results import Results
+
+    frd_file = frd_dir / "results_open_lazily.frd"
+    _write_ascii(frd_file)
+
+    mesh_reads = []
+
+    def read_last_step(file_ref):
+        mesh_reads.append(file_ref)
+        return read_frd_last_step(file_ref)
+
+    monkeypatch.setattr(read_results, "read_frd_last_step", read_last_step)
+
+    res = Results(frd_file)
+    assert res.fem_format == "calculix"
+    assert res.steps == [1, 2]
+    assert np.allclose(res.get_field("DISP"), list(_disp(2).values()), rtol=1e-5)
+    assert mesh_reads == []
+
+    # The mesh is read once, when it is first requested
+    assert len(res.result_mesh.vertices) == len(NODES)
+    assert len(res.result_mesh.vertices) == len(NODES)
+    assert mesh_reads == [frd_file]
+
+
+def test_results_mesh_from_frd(frd_dir):
+    from ada.fem.results import Results
+
+    frd_file = frd_dir / "results_mesh.frd"
+    _write_ascii(frd_file)
+
+    res = Results(frd_file)
+    result_mesh = res.result_mesh
+    assert result_mesh.fem_format == "calculix"
+    assert result_mesh.point_data == ["DISP", "STRESS"]
+    assert result_mesh.get_displacement_data_type() == "DISP"
+
+    part_mesh = result_mesh.to_part_mesh("frd", data_type="DISP")
+    displaced = part_mesh.id_map["DISP"].position.reshape(-1, 3)
+    assert np.allclose(displaced, np.array(list(NODES.values())) + list(_disp(2).values()), rtol=1e-5)
@@ -1,3 +1,16 @@
+from io import StringIO
+
+import numpy as np
+import pytest
+
+from ada.core.utils import map_ids
+from ada.fem.formats.sesam.read.helper_utils import (
+    ff_records_to_array,
+    ff_records_to_varying_array,
+    get_ff_records,
+)
+from ada.fem.formats.sesam.write.write_elements import nodal_row_sizes
+from ada.fem.formats.sesam.write.write_utils import write_ff_bulk
 from ada.fem.formats.sesam.write.writer import write_ff
 
 
@@ -18,3 +31,53 @@ def test_write_ff():
     ]
     test_str += write_ff(fflag, ddata)
     print(test_str)
+
+
+def test_write_ff_bulk():
+    rng = np.random.default_rng(0)
+    data = rng.random((25, 4)) * 200 - 100
+    data[0, 1] = -0.0
+    data[:, 0] = np.arange(1, 26)
+
+    stream = StringIO()
+    write_ff_bulk("GCOORD", data, stream, chunk_size=10)
+    assert stream.getvalue() == "".join(write_ff("GCOORD", [tuple(row)]) for row in data)
+
+
+def test_write_ff_bulk_multiline():
+    data = np.array([[100, 100, 28, 0, *range(1, 9)]])
+    row_sizes = (4, *nodal_row_sizes(8))
+
+    stream = StringIO()
+    write_ff_bulk("GELMNT1", data, stream, row_sizes)
+    assert stream.getvalue() == write_ff("GELMNT1", [(100, 100, 28, 0), (1, 2, 3, 4), (5, 6, 7, 8), ()])
+
+
+def test_read_ff_records():
+    bulk_str = (
+        write_ff("GNODE", [(1, 2, 6, 123456)])
+        + write_ff("GCOORD", [(2, 0.5, -1.0, 1e3)])
+        + write_ff("GELMNT1", [(1, 1, 28, 0), (1, 2, 3, 4), (5, 6, 7, 8), ()])
+        + write_ff("GELMNT1", [(2, 2, 15, 0), (2, 3)])
+        + write_ff("GELREF1", [(1, 1, 0, 0), (0, 0, 0, 0)])
+    )
+    records = get_ff_records(bulk_str, "GCOORD", "GELMNT1")
+    assert set(records.keys()) == {"GCOORD", "GELMNT1"}
+
+    gcoord = ff_records_to_array(records["GCOORD"], 4)
+    assert gcoord.tolist() == [[2, 0.5, -1.0, 1e3]]
+
+    values, starts, counts = ff_records_to_varying_array(records["GELMNT1"])
+    assert counts.tolist() == [12, 6]
+    assert values[starts[1] : starts[1] + counts[1]].tolist() == [2, 2, 15, 0, 2, 3]
+
+
+def test_missing_values_are_rejected():
+    with pytest.raises(ValueError):
+        write_ff_bulk("GELREF1", [[1, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, None]], StringIO())
+
+    with pytest.raises(ValueError):
+        ff_records_to_array(["1 2 nan 4"], 4)
+
+    with pytest.raises(ValueError):
+        map_ids(np.array([1.0, np.nan]), {1: 10})
@@ -0,0 +1,100 @@
+import sys
+
+import pytest
+
+from ada import Assembly
+from ada.config import Settings
+from ada.fem import StepImplicit
+from ada.fem.formats import SolverJobQueue
+from ada.fem.formats.job_queue import JobStatus
+
+STUB_SOLVER = """#!{python}
+import pathlib, sys, time
+
+name = sys.argv[-1]
+log = pathlib.Path(r"{events}")
+with open(log, "a") as f:
+    f.write(f"start {{name}} {{time.time()}}\\n")
+print(f"Solving {{name}}", flush=True)
+time.sleep(0.3)
+print("Job finished", flush=True)
+with open(log, "a") as f:
+    f.write(f"end {{name}} {{time.time()}}\\n")
+sys.exit(1 if name.startswith("fail") else 0)
+"""
+
+
+@pytest.fixture
+def stub_ccx(tmp_path, monkeypatch):
+    events = tmp_path / "events.log"
+    exe = tmp_path / "ccx"
+    exe.write_text(STUB_SOLVER.format(python=sys.executable, events=events))
+    exe.chmod(0o755)
+    monkeypatch.setitem(Settings.fem_exe_paths, "ccx", str(exe))
+    return events
+
+
+@pytest.fixture
+def model(example_files):
+    a = Assembly()
+    a.read_fem(example_files / "fem_files/calculix/contact2e.inp")
+    a.fem.add_step(StepImplicit("static", total_time=1, max_incr=1, init_incr=1))
+    return a
+
+
+def max_concurrent(events) -> int:
+    changes = []
+    for line in events.read_text().splitlines():
+        kind, _, t = line.split()
+        changes.append((float(t), 1 if kind == "start" else -1))
+
+    running, max_running = 0, 0
+    for _, change in sorted(changes):
+        running += change
+        max_running = max(max_running, running)
+    return max_running
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="The stub solver is a posix script")
+def test_job_queue_limits(model, stub_ccx, tmp_path):
+    jobs = SolverJobQueue(max_cpus=4, licenses=dict(calculix=2))
+    for i in range(5):
+        jobs.add(model, f"job{i}", "calculix", scratch_dir=tmp_path, overwrite=True)
+    jobs.add(model, "fail_job", "calculix", scratch_dir=tmp_path, overwrite=True)
+
+    finished = [job.name for job in jobs.as_completed()]
+    assert sorted(finished) == sorted(job.name for job in jobs.jobs)
+    assert max_concurrent(stub_ccx) == 2
+
+    for job in jobs.jobs:
+        assert job.results is not None
+        assert "Job finished" in job.log_file.read_text()
+        expected = JobStatus.FAILED if job.name == "fail_job" else JobStatus.FINISHED
+        assert job.status == expected
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="The stub solver is a posix script")
+def test_job_queue_save_output(model, stub_ccx, tmp_path):
+    jobs = SolverJobQueue(max_cpus=1)
+    jobs.add(model, "job0", "calculix", scratch_dir=tmp_path, overwrite=True)
+
+    (res,) = jobs.run()
+    assert res.output.returncode == 0
+
+    dest_file = tmp_path / "output" / "job0.log"
+    res.save_output(dest_file)
+    assert dest_file.read_text() == "Solving job0\nJob finished\n"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="The stub solver is a posix script")
+def test_job_queue_cpu_limit(model, stub_ccx, tmp_path):
+    jobs = SolverJobQueue(max_cpus=3)
+    for i in range(4):
+        jobs.add(model, f"job{i}", "calculix", scratch_dir=tmp_path, cpus=2, overwrite=True)
+
+    results = jobs.run()
+    assert [res.name for res in results] == [f"job{i}" for i in range(4)]
+    assert max_concurrent(stub_ccx) == 1
+
+    with pytest.raises(ValueError):
+        jobs.add(model, "too_large", "calculix", cpus=4)
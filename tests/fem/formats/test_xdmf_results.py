@@ -0,0 +1,57 @@
+import h5py
+import meshio
+import numpy as np
+
+from ada.fem.results import Results
+
+from .calculix.test_read_frd import NODES, STEPS, _disp, _write_ascii
+
+
+def test_frd_to_xdmf_time_series(test_dir):
+    frd_file = test_dir / "xdmf_series" / "series.frd"
+    frd_file.parent.mkdir(parents=True, exist_ok=True)
+    _write_ascii(frd_file)
+
+    res = Results(frd_file, "series", fem_format="calculix")
+    xdmf_file = res.to_xdmf(test_dir / "xdmf_series" / "series_export", chunk_size=2)
+
+    with h5py.File(xdmf_file.with_suffix(".h5"), "r") as f:
+        assert f["mesh/points"].shape == (len(NODES), 3)
+        assert f["fields/DISP/2"].chunks == (2, 3)
+        assert f["fields/DISP/2"].compression == "gzip"
+
+    # The mesh is stored once and referenced by every step of the temporal collection
+    assert xdmf_file.read_text().count("series_export.h5:/mesh/points") == len(STEPS)
+    with meshio.xdmf.TimeSeriesReader(xdmf_file) as reader:
+        points, _ = reader.read_points_cells()
+        assert len(points) == len(NODES)
+        assert reader.num_steps == len(STEPS)
+        time, point_data, _ = reader.read_data(1)
+        assert time == STEPS[1][1]
+        assert set(point_data.keys()) == {"DISP", "STRESS"}
+
+    xdmf_res = Results(xdmf_file, "series_export")
+    assert xdmf_res.fem_format == "calculix"
+    assert xdmf_res.steps == res.steps
+    assert xdmf_res.field_names == res.field_names
+    for step, _ in STEPS:
+        disp = xdmf_res.get_field("DISP", step, node_ids=[3])
+        assert np.allclose(disp[0, :3], _disp(step)[3], rtol=1e-5)
+        assert np.array_equal(xdmf_res.get_field("STRESS", step), res.get_field("STRESS", step))
+
+
+def test_rmed_to_xdmf_time_series(example_files, test_dir):
+    rmed_file = example_files / "fem_files/code_aster/Cantilever_CA_EIG_sh.rmed"
+    res = Results(rmed_file, "Cantilever_CA_EIG_sh", fem_format="code_aster")
+    xdmf_file = res.to_xdmf(test_dir / "xdmf_series" / "Cantilever_CA_EIG_sh", fields=res.field_names[:1])
+
+    xdmf_res = Results(xdmf_file)
+    assert xdmf_res.field_names == res.field_names[:1]
+    for step in xdmf_res.steps:
+        name = xdmf_res.field_names[0]
+        assert np.array_equal(xdmf_res.get_field(name, step), res.get_field(name, step), equal_nan=True)
+
+    points, cells = xdmf_res.field_store.get_mesh()
+    ref_points, ref_cells = res.field_store.get_mesh()
+    assert np.allclose(points, ref_points)
+    assert [cell_type for cell_type, _ in cells] == [cell_type for cell_type, _ in ref_cells]
@@ -0,0 +1,48 @@
+import numpy as np
+
+import ada
+from ada.concepts.containers import Nodes
+from ada.fem.meshing.utils import get_elements_from_entity
+
+ELEMENT_PROPERTIES = {
+    1: ("Line 2", 1, 1, 2, [], 2),
+    2: ("Triangle 3", 2, 1, 3, [], 3),
+    3: ("Quadrilateral 4", 2, 1, 4, [], 4),
+    15: ("Point", 0, 1, 1, [], 1),
+}
+
+
+class MixedEntityMesh:
+    """The gmsh.model.mesh functions used by get_elements_from_entity, returning a fixed mixed-type entity"""
+
+    def __init__(self, elem_types, elem_tags, elem_node_tags):
+        self.elements = elem_types, elem_tags, elem_node_tags
+
+    def getElements(self, dim, tag):
+        return self.elements
+
+    def getElementProperties(self, elem_type):
+        return ELEMENT_PROPERTIES[elem_type]
+
+
+class MixedEntityModel:
+    def __init__(self, *elements):
+        self.mesh = MixedEntityMesh(*elements)
+
+
+def test_elements_from_mixed_type_entity():
+    fem = ada.FEM("MixedFem")
+    coords = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)]
+    fem.nodes = Nodes(parent=fem, from_np_array=np.column_stack([np.arange(1, 6), coords]))
+
+    model = MixedEntityModel(
+        [15, 2, 3, 1],
+        [[1], [10, 11, 10], [11, 12], [12, 13]],
+        [[1], [1, 2, 3, 1, 3, 4, 1, 2, 3], [2, 5, 3, 4, 1, 2, 3, 4], [2, 5, 1, 4]],
+    )
+    elements = get_elements_from_entity(model, 1, fem, 2)
+
+    # Tags repeated within a type and tags used by a previous type are skipped
+    assert [(el.id, el.type) for el in elements] == [(10, "TRIANGLE"), (11, "TRIANGLE"), (12, "QUAD"), (13, "LINE")]
+    assert [n.id for n in elements[2].nodes] == [1, 2, 3, 4]
+    assert [n.id for n in elements[3].nodes] == [1, 4]
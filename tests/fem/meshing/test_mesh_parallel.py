@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import ada
+from ada.fem.meshing.multisession import MeshData, partition_connected_objects
+
+
+def stiffened_panels(num_panels: int) -> ada.Part:
+    """A row of plates sharing their edges, each with a stiffener across the middle"""
+    objects = []
+    for i in range(num_panels):
+        placement = ada.Placement(origin=(i, 0, 0), xdir=(1, 0, 0), zdir=(0, 0, 1))
+        objects.append(ada.Plate(f"pl{i}", [(0, 0), (1, 0), (1, 1), (0, 1)], 10e-3, placement=placement))
+        objects.append(ada.Beam(f"bm{i}", (i + 0.5, 0, 0), (i + 0.5, 1, 0), "IPE300"))
+
+    return ada.Part("Panels") / objects
+
+
+def test_partition_connected_objects():
+    p = stiffened_panels(3)
+    objects = list(p.get_all_physical_objects(sub_elements_only=False))
+    groups = partition_connected_objects(objects)
+
+    assert sorted(sorted(objects[i].name for i in group) for group in groups) == [
+        ["bm0", "pl0"],
+        ["bm1", "pl1"],
+        ["bm2", "pl2"],
+    ]
+
+
+def test_parallel_meshing_equals_serial():
+    p = stiffened_panels(4)
+    serial_fem = p.to_fem_obj(0.1)
+    parallel_fem = p.to_fem_obj(0.1, cpus=2)
+
+    assert Counter(el.type for el in parallel_fem.elements) == Counter(el.type for el in serial_fem.elements)
+    assert len(parallel_fem.sections) == len(serial_fem.sections)
+    assert sorted(s.name for s in parallel_fem.sections) == sorted(s.name for s in serial_fem.sections)
+    for el in parallel_fem.elements.lines:
+        assert el.fem_sec.section.name == "IPE300"
+
+    # The groups are joined by merging their coincident nodes. The serial session keeps the coincident nodes along
+    # the shared plate edges, so they are merged before the node counts are compared
+    serial_fem.nodes.merge_coincident()
+    assert len(parallel_fem.nodes) == len(serial_fem.nodes)
+
+
+@pytest.mark.benchmark
+def test_parallel_meshing_benchmark():
+    p = stiffened_panels(8)
+
+    start = time.perf_counter()
+    p.to_fem_obj(0.05)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    p.to_fem_obj(0.05, cpus=4)
+    parallel_time = time.perf_counter() - start
+
+    print(f"Serial meshing: {serial_time:.2f}s, parallel meshing (4 cpus): {parallel_time:.2f}s")
+
+
+def test_mesh_data_merge_coincident_nodes():
+    def line_mesh(name: str, x0: float) -> MeshData:
+        return MeshData(
+            nodes=np.array([(1, x0, 0, 0), (2, x0 + 1, 0, 0)], dtype=float),
+            el_ids=np.array([1]),
+            el_types=["LINE"],
+            el_nodes=np.array([1, 2]),
+            el_num_nodes=np.array([2]),
+            el_objects=np.array([0]),
+            sets=[(f"{name}_ends", "nset", np.array([1, 2])), (f"{name}_line", "elset", np.array([1]))],
+            sections=[],
+        )
+
+    objects = ["obj0", "obj1"]
+    merged = MeshData.merge([line_mesh("a", 0.0), line_mesh("b", 1.0)], [[0], [1]]).merge_coincident_nodes()
+
+    assert merged.nodes[:, 0].tolist() == [1, 2, 4]
+    assert merged.el_nodes.tolist() == [1, 2, 2, 4]
+    assert [(name, ids.tolist()) for name, _, ids in merged.sets] == [
+        ("a_ends", [1, 2]),
+        ("a_line", [1]),
+        ("b_ends", [2, 4]),
+        ("b_line", [2]),
+    ]
+
+    fem = merged.to_fem(objects)
+    el1, el2 = fem.elements
+    assert el1.nodes[1] is el2.nodes[0]
+    assert [el.refs[0] for el in (el1, el2)] == objects
+    assert fem.sets.get_nset_from_name("b_ends").members == el2.nodes
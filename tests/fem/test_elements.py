@@ -49,3 +49,20 @@ def test_from_iterables(elems):
     n = FemElements(g)
 
     assert len(n) == 3
+
+
+def test_type_views_are_updated(elems):
+    el1, el2, el3, el4 = elems
+    n = FemElements([el1, el4])
+
+    n.add(el2)
+    n.add(el3)
+    assert [el.id for el in n.lines] == [1, 2, 3]
+    assert [el.id for el in n.shell] == [4]
+
+    n.remove([el2, el4])
+    assert el2 not in n
+    assert [el.id for el in n.lines] == [1, 3]
+    assert list(n.shell) == []
+    assert [el.id for el in n.elements] == [1, 3]
+    assert [el_type for el_type, _ in n.group_by_type()] == ["LINE"]
@@ -0,0 +1,31 @@
+import numpy as np
+
+from ada.fem.concepts.fields import FieldCache
+
+
+def test_field_cache_evicts_least_recently_used():
+    loaded = []
+
+    def loader(key):
+        def load():
+            loaded.append(key)
+            return np.full(3, key)
+
+        return load
+
+    cache = FieldCache(maxsize=2)
+    cache.get(1, loader(1))
+    cache.get(2, loader(2))
+    cache.get(1, loader(1))
+    cache.get(3, loader(3))
+
+    assert loaded == [1, 2, 3]
+    assert 1 in cache and 3 in cache
+    assert 2 not in cache
+    assert len(cache) == 2
+
+
+def test_field_cache_disabled():
+    cache = FieldCache(maxsize=0)
+    cache.get("a", lambda: np.zeros(1))
+    assert len(cache) == 0
@@ -0,0 +1,90 @@
+import pytest
+
+from ada import Node
+from ada.fem import FEM, Elem, FemSet
+from ada.fem.containers import FemElements
+
+
+@pytest.fixture
+def fem() -> FEM:
+    fem = FEM("MyFem")
+    nodes = [fem.nodes.add(Node([float(i), 0.0, 0.0], i + 1)) for i in range(11)]
+    fem.elements = FemElements(
+        [Elem(i + 1, [n1, n2], "LINE", parent=fem) for i, (n1, n2) in enumerate(zip(nodes[:-1], nodes[1:]))],
+        fem_obj=fem,
+    )
+    return fem
+
+
+def test_set_algebra(fem):
+    elements = list(fem.elements)
+    fs1 = FemSet("set1", elements[:6], "elset", parent=fem)
+    fs2 = FemSet("set2", elements[4:], "elset", parent=fem)
+
+    assert elements[0] in fs1
+    assert elements[6] not in fs1
+    assert fs1.member_ids.tolist() == [1, 2, 3, 4, 5, 6]
+    assert [el.id for el in fs1.intersection(fs2)] == [5, 6]
+    assert [el.id for el in fs1.difference(fs2)] == [1, 2, 3, 4]
+    assert [el.id for el in fs1.union(fs2)] == list(range(1, 11))
+
+    fs1.members.append(elements[9])
+    assert elements[9] in fs1
+
+
+def test_merge_duplicate_sets(fem):
+    elements = list(fem.elements)
+    fem.sets.add(FemSet("overlap", elements[:6], "elset", parent=fem))
+    fem.sets.add(FemSet("overlap", elements[3:8], "elset", parent=fem), merge_sets_if_duplicate=True)
+
+    merged = fem.sets.get_elset_from_name("overlap")
+    assert [el.id for el in merged.members] == list(range(1, 9))
+
+
+def test_instantiate_generated_members(fem):
+    metadata = dict(generate=True, gen_mem=[1, 5, 2])
+    nset = fem.sets.add(FemSet("nodes", [], "nset", metadata=dict(metadata), parent=fem))
+    elset = fem.sets.add(FemSet("elements", [], "elset", metadata=dict(metadata), parent=fem))
+
+    assert [n.id for n in nset.members] == [1, 3, 5]
+    assert all(type(n) is Node for n in nset.members)
+    assert [el.id for el in elset.members] == [1, 3, 5]
+    assert fem.elements.from_id(3) in elset
+
+
+def test_set_ids_follow_renumbering(fem):
+    elements = list(fem.elements)
+    fs1 = FemSet("set1", elements[:6], "elset", parent=fem)
+    fs2 = FemSet("set2", elements[4:], "elset", parent=fem)
+    nset = FemSet("nodes", list(fem.nodes)[:3], "nset", parent=fem)
+    assert fs1.member_ids.tolist() == [1, 2, 3, 4, 5, 6]
+    assert 1 in nset
+
+    fem.elements.renumber(start_id=101)
+    fem.nodes.renumber(start_id=11)
+
+    assert fs1.member_ids.tolist() == [101, 102, 103, 104, 105, 106]
+    assert 101 in fs1 and 1 not in fs1
+    assert [el.id for el in fs1.intersection(fs2)] == [105, 106]
+    assert [el.id for el in fs1.difference(fs2)] == [101, 102, 103, 104]
+    assert [n.id for n in nset.members] == [11, 12, 13]
+    assert 11 in nset and 1 not in nset
+
+
+def test_set_ids_follow_in_place_member_edits(fem):
+    elements = list(fem.elements)
+    fs = FemSet("set1", elements[:3], "elset", parent=fem)
+    assert fs.member_ids.tolist() == [1, 2, 3]
+
+    fs.members[0] = elements[5]
+    assert elements[0] not in fs and elements[5] in fs
+    assert fs.member_ids.tolist() == [2, 3, 6]
+
+    fs.members.remove(elements[1])
+    assert elements[1] not in fs
+    assert [el.id for el in fs.difference(FemSet("set2", elements[2:3], "elset", parent=fem))] == [6]
+
+    fs.members.extend(elements[7:9])
+    del fs.members[:2]
+    assert fs.member_ids.tolist() == [8, 9]
+    assert elements[2] not in fs and elements[7] in fs
@@ -1,4 +1,7 @@
+import pytest
+
 from ada import Assembly, Beam, Part, Plate, Section, User
+from ada.base.changes import ChangeAction
 
 
 def test_export_basic(ifc_test_dir):
@@ -74,3 +77,88 @@ def test_profiles_to_ifc(ifc_test_dir):
     p.add_beam(Beam("bm5", n1=[0, 0, 4], n2=[2, 0, 4], sec="TUB200x10", colour="green"))
     a.add_part(p)
     _ = a.to_ifc(ifc_test_dir / "my_beam_profiles.ifc", file_obj_only=True)
+
+
+def test_sync_twice_reuses_beam_types():
+    a = Assembly("MyAssembly") / (Part("MyPart") / [Beam(f"bm{i}", (i, 0, 0), (i, 0, 1), "IPE220") for i in range(3)])
+    a.ifc_store.sync()
+
+    bm0 = a.get_by_name("bm0")
+    a.get_part("MyPart").add_beam(Beam("bm3", (3, 0, 0), (3, 0, 1), bm0.section, bm0.material))
+    a.ifc_store.sync()
+
+    f = a.ifc_store.f
+    (rel_type,) = f.by_type("IfcRelDefinesByType")
+    assert rel_type.RelatingType == a.ifc_store.get_beam_type(bm0.section)
+    assert sorted(x.Name for x in rel_type.RelatedObjects) == ["bm0", "bm1", "bm2", "bm3"]
+
+    rel_mat = a.ifc_store.get_material_rel(bm0.material.guid)
+    assert rel_mat == f.by_guid(bm0.material.guid)
+    assert sorted(x.Name for x in rel_mat.RelatedObjects) == ["bm0", "bm1", "bm2", "bm3"]
+
+
+def test_change_journal():
+    bm1 = Beam("bm1", (0, 0, 0), (1, 0, 0), "IPE220")
+    bm2 = Beam("bm2", (0, 1, 0), (1, 1, 0), "IPE220")
+    sub = Part("MySubPart") / bm2
+    a = Assembly("MyAssembly") / (Part("MyPart") / [bm1, sub])
+
+    assert [x.name for x in a.pop_changes()] == ["MyPart", "bm1", "MySubPart", "bm2"]
+    assert a.pop_changes() == []
+
+    bm2.change_type = ChangeAction.MODIFIED
+    assert a.pop_changes() == [bm2]
+
+    bm1.change_type = ChangeAction.MODIFIED
+    bm1.change_type = ChangeAction.NOCHANGE
+    assert a.pop_changes() == []
+
+
+def test_resync_only_changed_objects():
+    a = Assembly("MyAssembly") / (Part("MyPart") / [Beam(f"bm{i}", (i, 0, 0), (i, 0, 1), "IPE220") for i in range(3)])
+    a.ifc_store.sync()
+
+    p = a.get_part("MyPart")
+    p.add_beam(Beam("bm3", (3, 0, 0), (3, 0, 1), "IPE220"))
+    assert len(p.sections) == 1
+
+    a.ifc_store.sync()
+
+    assert len(p.sections) == 0
+    assert a.get_by_name("bm3").section is a.get_by_name("bm0").section
+    assert sorted(x.Name for x in a.ifc_store.f.by_type("IfcBeam")) == ["bm0", "bm1", "bm2", "bm3"]
+    assert all(bm.change_type == ChangeAction.NOCHANGE for bm in p.beams)
+
+
+def test_failed_sync_keeps_changes(monkeypatch):
+    from ada.ifc.write.write_ifc import IfcWriter
+
+    bm1 = Beam("bm1", (0, 0, 0), (1, 0, 0), "IPE220")
+    a = Assembly("MyAssembly") / (Part("MyPart") / bm1)
+
+    def fail_sync(self, *args, **kwargs):
+        raise ValueError("Sync failed")
+
+    with monkeypatch.context() as m:
+        m.setattr(IfcWriter, "sync_added_physical_objects", fail_sync)
+        with pytest.raises(ValueError):
+            a.ifc_store.sync()
+
+    assert bm1.change_type == ChangeAction.ADDED
+    a.ifc_store.sync()
+
+    assert [x.Name for x in a.ifc_store.f.by_type("IfcBeam")] == ["bm1"]
+    assert a.pop_changes() == []
+
+
+def test_consolidate_sections_checks_all_beams():
+    bm1 = Beam("bm1", (0, 0, 0), (1, 0, 0), "IPE220")
+    bm2 = Beam("bm2", (0, 1, 0), (1, 1, 0), "IPE220")
+    a = Assembly("MyAssembly") / [Part("MyPart") / bm1, Part("MyOtherPart") / bm2]
+    a.consolidate_sections()
+
+    # Beams in parts without sections are checked as well
+    bm2.section = Section("Orphan", from_str="IPE300")
+    a.add_part(Part("NewPart") / Beam("bm3", (0, 2, 0), (1, 2, 0), "IPE400"))
+    with pytest.raises(ValueError, match="not consolidated"):
+        a.consolidate_sections()
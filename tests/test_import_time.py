@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+# Generous upper limits in seconds, meant to catch regressions such as a heavy backend imported at module level
+IMPORT_BUDGET = 5.0
+FROM_FEM_BUDGET = 10.0
+
+# Optional backends which should only be loaded when they are first used
+LAZY_MODULES = ["pythreejs", "ipywidgets", "IPython", "OCC", "gmsh", "meshio", "trimesh"]
+
+
+def run_timed(code: str) -> dict:
+    script = textwrap.dedent(
+        f"""
+        import json
+        import sys
+        import time
+
+        start = time.perf_counter()
+        {code}
+        elapsed = time.perf_counter() - start
+        loaded = [m for m in {LAZY_MODULES!r} if m in sys.modules]
+        print(json.dumps(dict(elapsed=elapsed, loaded=loaded)))
+        """
+    )
+    res = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def test_import_time():
+    res = run_timed("import ada")
+
+    assert res["loaded"] == []
+    assert res["elapsed"] < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize("module", ["ada.fem.results", "ada.visualize.interface", "ada.fem.formats.general"])
+def test_import_without_backends(module):
+    res = run_timed(f"import {module}")
+
+    assert res["loaded"] == []
+
+
+def test_from_fem_time(example_files):
+    inp_file = (example_files / "fem_files/abaqus/box.inp").as_posix()
+    res = run_timed(f"import ada; ada.from_fem({inp_file!r})")
+
+    assert res["loaded"] == []
+    assert res["elapsed"] < FROM_FEM_BUDGET
@@ -0,0 +1,61 @@
+import numpy as np
+
+from ada.concepts.containers import Nodes
+from ada.fem import FEM, Elem
+from ada.fem.containers import FemElements
+from ada.visualize.fem_skin import get_fem_skin, get_skin
+
+HEX = [0, 1, 4, 3, 6, 7, 10, 9]
+
+
+def two_hex_fem() -> FEM:
+    """Two hexahedrons sharing a face, a shell on top of them and a line element. Node ids start at 100 and are
+    not contiguous"""
+    coords = np.array([(x, y, z) for z in (0, 1) for y in (0, 1) for x in (0, 1, 2)], dtype=float)
+    coords = np.vstack([coords, [(0, 0, 2)]])
+    node_ids = 100 + 2 * np.arange(len(coords))
+
+    fem = FEM("TwoHex")
+    fem.nodes = Nodes(parent=fem, from_np_array=np.column_stack([node_ids, coords]))
+    nodes = fem.nodes.from_ids(node_ids).tolist()
+
+    elements = [
+        Elem(1, [nodes[i] for i in HEX], "HEXAHEDRON", parent=fem),
+        Elem(2, [nodes[i + 1] for i in HEX], "HEXAHEDRON", parent=fem),
+        Elem(3, [nodes[i] for i in (6, 7, 10, 9)], "QUAD", parent=fem),
+        Elem(4, [nodes[6], nodes[12]], "LINE", parent=fem),
+    ]
+    fem.elements = FemElements(elements, fem_obj=fem)
+    return fem
+
+
+def test_fem_skin_removes_interior_faces():
+    fem = two_hex_fem()
+    vertices, faces, edges = get_fem_skin(fem)
+
+    assert len(vertices) == len(fem.nodes)
+    # 10 exterior hex faces and 1 shell quad, each split into two triangles
+    assert faces.shape == (22, 3)
+    # 20 hex edges and the line element. The shell edges coincide with hex edges
+    assert edges.shape == (21, 2)
+    assert faces.max() < len(vertices) and edges.max() < len(vertices)
+
+    shared_face = {1, 4, 7, 10}
+    assert not any(set(tri) <= shared_face for tri in faces.tolist())
+
+
+def test_skin_faces_point_outwards():
+    coords = np.array([(x, y, z) for z in (0, 1) for y in (0, 1) for x in (0, 1, 2)], dtype=float)
+    hexes = np.array([HEX, [i + 1 for i in HEX]])
+    faces, _ = get_skin([("HEXAHEDRON", hexes)])
+
+    tris = coords[faces]
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    outward = tris.mean(axis=1) - coords.mean(axis=0)
+    assert np.all(np.einsum("ij,ij->i", normals, outward) > 0)
+
+
+def test_skin_keeps_interior_faces_if_requested():
+    hexes = np.array([HEX, [i + 1 for i in HEX]])
+    faces, _ = get_skin([("HEXAHEDRON", hexes)], remove_interior=False)
+    assert len(faces) == 24
@@ -2,7 +2,7 @@ import pytest
 
 from ada import Assembly, Beam, Part
 from ada.fem.meshing import GmshSession
-from ada.visualize.femviz import get_edges_from_fem, get_faces_from_fem
+from ada.visualize.utils import get_edges_from_fem, get_faces_from_fem
 
 
 @pytest.fixture
@@ -1,6 +1,9 @@
+import numpy as np
 import pytest
 
 from ada import Assembly, Beam, Plate
+from ada.visualize.concept import ObjectMesh
+from ada.visualize.geom_cache import GeometryCache
 
 
 @pytest.fixture
@@ -39,3 +42,41 @@ def test_viz_to_binary_json(test_dir, model_with_components):
 
     res.to_binary_and_json(test_dir / "viz/binjson/beams")
     res.to_custom_json(test_dir / "viz/binjson/beams.json")
+
+
+def test_viz_geometry_cache(test_dir, model_with_components):
+    cache_file = test_dir / "viz/geom_cache/my_test_assembly.h5"
+    if cache_file.exists():
+        cache_file.unlink()
+
+    res = model_with_components.to_vis_mesh(merge_by_color=False)
+    res_first = model_with_components.to_vis_mesh(merge_by_color=False, use_cache=True, cache_file=cache_file)
+    res_cached = model_with_components.to_vis_mesh(merge_by_color=False, use_cache=True, cache_file=cache_file)
+
+    with GeometryCache(cache_file) as geom_cache:
+        assert len(geom_cache) == 6
+
+    assert res_first.num_polygons == res.num_polygons
+    assert res_cached.num_polygons == res.num_polygons
+    assert res_cached.world[0].id_map.keys() == res.world[0].id_map.keys()
+
+
+def test_geometry_cache_hash_mismatch(test_dir):
+    cache_file = test_dir / "viz/geom_cache/hash_mismatch.h5"
+    if cache_file.exists():
+        cache_file.unlink()
+
+    position = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype="float32")
+    obj_mesh = ObjectMesh("guid1", np.array([0, 1, 2]), position, None, [1.0, 0.0, 0.0, 1.0])
+
+    with GeometryCache(cache_file) as geom_cache:
+        geom_cache.add(obj_mesh, "hash1")
+
+    with GeometryCache(cache_file) as geom_cache:
+        assert geom_cache.get("guid1", "hash2") is None
+        cached = geom_cache.get("guid1", "hash1")
+        assert np.allclose(cached.position, position)
+        assert cached.color == [1.0, 0.0, 0.0, 1.0]
+
+        geom_cache.remove_unused([])
+        assert "guid1" not in geom_cache
@@ -0,0 +1,172 @@
+import json
+import struct
+
+import numpy as np
+
+from ada.visualize.colors import PbrMetallicRoughness, VisColor
+from ada.visualize.concept import ObjectMesh, PartMesh, VisMesh
+from ada.visualize.formats.gltf.write_gltf import instances_to_matrices, matrices_to_trs
+from ada.visualize.utils import merge_mesh_objects
+
+
+def read_glb(glb_file):
+    with open(glb_file, "rb") as f:
+        data = f.read()
+
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    assert magic == 0x46546C67
+    assert version == 2
+    assert length == len(data)
+
+    json_length, json_type = struct.unpack_from("<II", data, 12)
+    assert json_type == 0x4E4F534A
+    gltf = json.loads(data[20 : 20 + json_length])
+
+    bin_length, bin_type = struct.unpack_from("<II", data, 20 + json_length)
+    assert bin_type == 0x004E4942
+    assert bin_length == gltf["buffers"][0]["byteLength"]
+
+    return gltf, data[28 + json_length :]
+
+
+def read_accessor(gltf, buffer, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    dtype = "float32" if accessor["componentType"] == 5126 else "uint32"
+    width = dict(SCALAR=1, VEC3=3, VEC4=4)[accessor["type"]]
+    stride = view.get("byteStride", width * 4) // 4
+    start = view["byteOffset"] + accessor["byteOffset"]
+    data = np.frombuffer(buffer[start : start + accessor["count"] * stride * 4], dtype=dtype)
+    return data.reshape(-1, stride)[:, :width]
+
+
+def read_glb_meshes(glb_file):
+    """Return the arrays, material and placement of each mesh node of the GLB file by mesh name"""
+    gltf, buffer = read_glb(glb_file)
+    meshes = dict()
+    for node in gltf["nodes"]:
+        if "mesh" not in node:
+            continue
+        mesh = gltf["meshes"][node["mesh"]]
+        primitive = mesh["primitives"][0]
+        data = {key: read_accessor(gltf, buffer, acc) for key, acc in primitive["attributes"].items()}
+        data["INDEX"] = read_accessor(gltf, buffer, primitive["indices"])
+        data["COLOR"] = gltf["materials"][primitive["material"]]["pbrMetallicRoughness"]["baseColorFactor"]
+        data["MATRIX"] = node.get("matrix", None)
+        instancing = node.get("extensions", dict()).get("EXT_mesh_gpu_instancing", dict()).get("attributes", dict())
+        for key, acc in instancing.items():
+            data[f"INSTANCE_{key}"] = read_accessor(gltf, buffer, acc)
+        meshes[mesh["name"]] = data
+    return meshes
+
+
+def triangle(guid, x, color, instances=None):
+    position = np.array([[x, 0, 0], [x + 1, 0, 0], [x, 1, 0]], dtype="float32")
+    normal = np.array([[0, 0, 1]] * 3, dtype="float32")
+    return ObjectMesh(guid, np.array([0, 1, 2]), position, normal, color, instances=instances)
+
+
+def test_merge_mesh_objects():
+    objects = [triangle(f"guid{i}", i, [1.0, 0.0, 0.0, 1.0]) for i in range(3)]
+    merged = merge_mesh_objects(objects)
+
+    assert merged.faces.tolist() == [0, 1, 2, 3, 4, 5, 6, 7, 8]
+    assert merged.position.shape == (9, 3)
+    assert merged.normal.shape == (9, 3)
+    assert merged.id_sequence == {"guid0": (0, 2), "guid1": (3, 5), "guid2": (6, 8)}
+
+
+def test_glb_instancing_and_merge_by_color(test_dir):
+    instances = [["guid3", 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1], ["inst", 0, 0, 5, 0, 1, 0, -1, 0, 0, 0, 0, 1]]
+    id_map = {
+        "guid1": triangle("guid1", 0, [1.0, 0.0, 0.0, 1.0]),
+        "guid2": triangle("guid2", 2, [1.0, 0.0, 0.0, 1.0]),
+        "guid3": triangle("guid3", 4, [0.0, 0.0, 1.0, 0.5], instances=instances),
+    }
+    vis_mesh = VisMesh("my_vis_mesh", world=[PartMesh("my_part", id_map)])
+
+    glb_file = test_dir / "viz/gltf/objects.glb"
+    vis_mesh.to_gltf(glb_file)
+    gltf, buffer = read_glb(glb_file)
+    assert len(gltf["meshes"]) == 3
+    assert len(gltf["materials"]) == 2
+    assert gltf["extensionsUsed"] == ["EXT_mesh_gpu_instancing"]
+
+    instanced_node = next(node for node in gltf["nodes"] if "extensions" in node)
+    translation = gltf["accessors"][
+        instanced_node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"]["TRANSLATION"]
+    ]
+    assert translation["count"] == 2
+
+    position = gltf["accessors"][gltf["meshes"][0]["primitives"][0]["attributes"]["POSITION"]]
+    view = gltf["bufferViews"][position["bufferView"]]
+    start = view["byteOffset"] + position["byteOffset"]
+    vertices = np.frombuffer(buffer[start : start + position["count"] * 24], dtype="float32").reshape(-1, 6)
+    assert np.allclose(vertices[:, :3], id_map["guid1"].position)
+    assert position["min"] == [0.0, 0.0, 0.0]
+
+    vis_mesh.to_gltf(glb_file, merge_by_color=True)
+    gltf, _ = read_glb(glb_file)
+    assert len(gltf["meshes"]) == 2
+
+
+def test_matrices_to_trs():
+    rotation = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    matrices = np.tile(np.eye(4), (2, 1, 1))
+    matrices[1, :3, :3] = rotation * 2.0
+    matrices[1, :3, 3] = [1, 2, 3]
+
+    translation, quat, scale = matrices_to_trs(matrices)
+
+    assert np.allclose(translation[1], [1, 2, 3])
+    assert np.allclose(quat[0], [0, 0, 0, 1])
+    assert np.allclose(np.abs(quat[1]), [0, 0, np.sqrt(0.5), np.sqrt(0.5)])
+    assert np.allclose(scale[1], [2, 2, 2])
+
+
+def test_glb_from_cache_equals_glb_from_objects(test_dir):
+    instances = [["guid3", 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1], ["inst", 0, 0, 5, 0, 1, 0, -1, 0, 0, 0, 0, 1]]
+    id_map = {
+        "guid1": triangle("guid1", 0, [1.0, 0.0, 0.0, 1.0]),
+        "guid2": triangle("guid2", 2, [1.0, 0.0, 0.0, 1.0]),
+        "guid3": triangle("guid3", 4, [0.0, 0.0, 1.0, 0.5], instances=instances),
+    }
+    glb_file = test_dir / "viz/gltf/from_objects.glb"
+    VisMesh("my_vis_mesh", world=[PartMesh("my_part", id_map)]).to_gltf(glb_file)
+
+    # The cache stores the same meshes and instance matrices in millimetres
+    color_names = dict(guid1="red", guid2="red", guid3="blue")
+    cached = VisMesh("my_vis_mesh", cache_file=test_dir / "viz/gltf/meshes.h5", overwrite_cache=True)
+    with cached:
+        for guid, obj in id_map.items():
+            color = VisColor(color_names[guid], PbrMetallicRoughness(obj.color, 0.0, 1.0), [guid])
+            color = cached.add_color(color, guid)
+            matrix = None
+            if obj.instances is not None:
+                matrix = instances_to_matrices(obj.instances)
+                matrix[:, :3, 3] *= 1e3
+            cached.add_mesh(guid, "my_part", obj.position * 1e3, obj.faces, obj.normal, matrix, color.name)
+
+    cached_glb_file = test_dir / "viz/gltf/from_cache.glb"
+    cached.to_gltf(cached_glb_file)
+
+    from_objects = read_glb_meshes(glb_file)
+    from_cache = read_glb_meshes(cached_glb_file)
+    assert sorted(from_cache.keys()) == sorted(from_objects.keys())
+    for name, data in from_objects.items():
+        assert sorted(from_cache[name].keys()) == sorted(data.keys())
+        for key, value in data.items():
+            if value is None:
+                assert from_cache[name][key] is None
+            else:
+                assert np.allclose(from_cache[name][key], value, atol=1e-6), f"{name} {key}"
+
+    assert "INSTANCE_TRANSLATION" in from_cache["guid3"]
+    assert np.allclose(from_cache["guid3"]["INSTANCE_TRANSLATION"], [[0, 0, 0], [0, 0, 5]])
+
+    # Instanced meshes are kept out of the merged meshes
+    cached.to_gltf(cached_glb_file, merge_by_color=True)
+    merged = read_glb_meshes(cached_glb_file)
+    assert sorted(merged.keys()) == ["guid3", "red"]
+    assert np.allclose(merged["red"]["POSITION"], np.vstack([id_map["guid1"].position, id_map["guid2"].position]))
+    assert np.allclose(merged["guid3"]["INSTANCE_TRANSLATION"], [[0, 0, 0], [0, 0, 5]])
@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+
+from ada.visualize.concept import ObjectMesh, PartMesh, VisMesh
+from ada.visualize.tiling import (
+    bbox_proxy,
+    build_octree,
+    decimate_mesh,
+    expand_instances,
+)
+
+
+def grid_mesh(guid, origin, size, num_cells, color=None):
+    """A flat square mesh of num_cells x num_cells quads"""
+    x, y = np.meshgrid(np.linspace(0, size, num_cells + 1), np.linspace(0, size, num_cells + 1), indexing="ij")
+    position = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1) + origin
+    ids = np.arange(x.size).reshape(num_cells + 1, num_cells + 1)
+    a, b, c, d = ids[:-1, :-1].ravel(), ids[1:, :-1].ravel(), ids[1:, 1:].ravel(), ids[:-1, 1:].ravel()
+    faces = np.stack([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)], axis=1).reshape(-1)
+    color = [1.0, 0.0, 0.0, 1.0] if color is None else color
+    return ObjectMesh(guid, faces, position.astype("float32"), None, color)
+
+
+def test_decimate_mesh():
+    obj_mesh = grid_mesh("guid1", np.zeros(3), 1.0, 20)
+    decimated = decimate_mesh(obj_mesh, 0.1)
+
+    assert 0 < decimated.num_polygons < obj_mesh.num_polygons
+    assert decimated.faces.max() < len(decimated.position)
+    assert decimate_mesh(obj_mesh, 10.0) is None
+
+
+def test_bbox_proxy():
+    ends = np.array([[0, 0, 0], [0, 0.2, 0], [0, 0.2, 0.3], [0, 0, 0.3]], dtype="float32")
+    position = np.concatenate([ends, ends + [10, 0, 0]])
+    proxy = bbox_proxy(ObjectMesh("beam", np.arange(6), position, None))
+
+    assert proxy.num_polygons == 12
+    assert np.allclose(proxy.position.min(axis=0), position.min(axis=0), atol=1e-5)
+    assert np.allclose(proxy.position.max(axis=0), position.max(axis=0), atol=1e-5)
+
+
+def test_octree_and_tiles(test_dir):
+    id_map = dict()
+    for i in range(4):
+        for j in range(4):
+            guid = f"guid{i}{j}"
+            color = [0.0, 0.0, 1.0, 1.0] if i == j else None
+            id_map[guid] = grid_mesh(guid, np.array([i * 10, j * 10, 0]), 1.0, 10, color)
+    vis_mesh = VisMesh("tiled", world=[PartMesh("my_part", id_map)])
+
+    root = build_octree(list(id_map.values()), max_objects_per_tile=4)
+    leaves = [tile for tile in root.iter_tiles() if len(tile.children) == 0]
+    assert len(leaves) == 4
+    assert sum(len(tile.objects) for tile in leaves) == 16
+
+    dest_dir = test_dir / "viz/tiles"
+    manifest = vis_mesh.to_tiles(dest_dir, cell_sizes=[0.25], max_objects_per_tile=4)
+    with open(dest_dir / "manifest.json", "r") as f:
+        assert json.load(f)["root"] == manifest["root"]
+
+    tile = next(tile for tile in manifest["tiles"] if len(tile["lods"]) > 0)
+    full, coarse = tile["lods"]
+    assert coarse["num_polygons"] < full["num_polygons"]
+
+    mesh = full["meshes"][0]
+    data = (dest_dir / full["file"]).read_bytes()
+    position = np.frombuffer(data, dtype="float32", count=mesh["position"][1], offset=mesh["position"][0])
+    index = np.frombuffer(data, dtype="uint32", count=mesh["index"][1], offset=mesh["index"][0])
+    assert index.max() < len(position) // 3
+    assert len(mesh["id_sequence"]) > 0
+
+
+def test_expand_instances(test_dir):
+    obj_mesh = grid_mesh("guid1", np.zeros(3), 1.0, 2)
+    rot_z = [0, 1, 0, -1, 0, 0, 0, 0, 1]
+    obj_mesh.instances = [["guid1", 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1], ["guid2", 100, 0, 0, *rot_z]]
+
+    original, moved = expand_instances(obj_mesh)
+    assert (original.guid, moved.guid) == ("guid1", "guid2")
+    assert np.allclose(original.position, obj_mesh.position)
+    assert np.allclose(moved.position.min(axis=0), [99, 0, 0])
+    assert np.allclose(moved.position.max(axis=0), [100, 1, 0])
+
+    vis_mesh = VisMesh("instanced", world=[PartMesh("my_part", dict(guid1=obj_mesh))])
+    manifest = vis_mesh.to_tiles(test_dir / "viz/instanced_tiles", cell_sizes=[], max_objects_per_tile=1)
+    leaves = [tile for tile in manifest["tiles"] if len(tile["lods"]) > 0]
+    assert len(leaves) == 2